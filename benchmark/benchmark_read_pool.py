@@ -0,0 +1,102 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.split(os.path.split(os.path.realpath(__file__))[0])[0], "src"))
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+DB_NAME = "benchmark.db"
+TRACKER_NAMES = ["1.%i"%(i) for i in range(12)]
+DAYS = 90
+QUERIES = 96
+THREAD_COUNTS = [1, 2, 4, 8]
+
+def create_database(wd: str) -> tuple[DBConnector, DBTable]:
+    """
+    Create a tracker table with 15 minute data of all trackers in WAL mode.
+
+    Args:
+        wd (str): The working directory of the database.
+
+    Returns:
+        tuple[DBConnector, DBTable]: The writing connector and the table.
+    """
+    db_connector = DBConnector(wd, DB_NAME, journal_mode = "WAL")
+    table = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+    db_connector.create_table(table)
+    timestamps = pd.date_range("2023-01-01", periods = DAYS * 96, freq = "15min").strftime("%Y-%m-%d %H:%M")
+    for tracker_name in TRACKER_NAMES:
+        data = pd.DataFrame({"timestamp": timestamps, "tracker_name": tracker_name, "Production": np.random.default_rng(0).random(len(timestamps))})
+        db_connector.insert_data(table, data)
+    return db_connector, table
+
+def run_reads(read_connector: DBConnector, thread_count: int) -> float:
+    """
+    Run the range queries of all trackers with the given number of threads.
+
+    Args:
+        read_connector (DBConnector): The read only connector.
+        thread_count (int): The number of reading threads.
+
+    Returns:
+        float: The number of queries per second.
+    """
+    def query(i: int) -> int:
+        start = pd.Timestamp("2023-01-01") + pd.Timedelta(days = i % (DAYS - 30))
+        return len(read_connector.select_data_range("tracker_raw", start.strftime("%Y-%m-%d %H:%M"), (start + pd.Timedelta(days = 30)).strftime("%Y-%m-%d %H:%M"), tracker_names = [TRACKER_NAMES[i % len(TRACKER_NAMES)]]))
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(thread_count) as executor:
+        list(executor.map(query, range(QUERIES)))
+    return QUERIES / (time.perf_counter() - start_time)
+
+def run_writes(db_connector: DBConnector, table: DBTable, stop: threading.Event):
+    """
+    Append new rows until the benchmark is finished, to measure the reads during an ingest.
+
+    Args:
+        db_connector (DBConnector): The writing connector.
+        table (DBTable): The table to write.
+        stop (threading.Event): The event finishing the writes.
+    """
+    timestamp = pd.Timestamp("2023-01-01") + pd.Timedelta(days = DAYS)
+    while not stop.is_set():
+        db_connector.insert_data(table, pd.DataFrame({"timestamp": [timestamp.strftime("%Y-%m-%d %H:%M")] * len(TRACKER_NAMES), "tracker_name": TRACKER_NAMES, "Production": 1.0}))
+        timestamp += pd.Timedelta(minutes = 15)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as wd:
+        db_connector, table = create_database(wd)
+        stop = threading.Event()
+        writer = threading.Thread(target = run_writes, args = (db_connector, table, stop))
+        writer.start()
+        try:
+            for thread_count in THREAD_COUNTS:
+                read_connector = DBConnector(wd, DB_NAME, read_only = True, pool_size = thread_count)
+                print("threads: %2i  read only pool: %8.1f queries/s"%(thread_count, run_reads(read_connector, thread_count)))
+                read_connector.close()
+        finally:
+            stop.set()
+            writer.join()
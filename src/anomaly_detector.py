@@ -0,0 +1,161 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from kpi_engine import KPIEngine
+
+class AnomalyDetector:
+    """
+    The AnomalyDetector flags trackers producing less than their peers or less than usual (e.g. shaded, soiled or failed strings).
+    The daily output of each tracker is normalized by its sun factor, i.e. the production per square meter divided by the sum of the sun factor of the day.
+    Each day is compared with the median of all trackers of that day (peer ratio) and the peer ratio is compared with its rolling median of the previous days (baseline ratio),
+    so weather affecting all trackers alike is not flagged. The severity is the larger relative shortfall of both ratios.
+    """
+    RESULT_TABLE_NAME = "tracker_anomaly"
+    TIMESTAMP = KPIEngine.TIMESTAMP
+    TRACKER_NAME = KPIEngine.TRACKER_NAME
+    NORMALIZED_YIELD = "normalized_yield"
+    PEER_RATIO = "peer_ratio"
+    BASELINE_RATIO = "baseline_ratio"
+    SEVERITY = "severity"
+    FLAGGED = "flagged"
+    WINDOW_DAYS = 14
+    MIN_BASELINE_DAYS = 3
+    THRESHOLD = 0.2
+    DAY_KEY_LENGTH = 10
+
+    def __init__(self, db_connector: DBConnector, kpi_engine: KPIEngine, window_days: int = WINDOW_DAYS, min_baseline_days: int = MIN_BASELINE_DAYS, threshold: float = THRESHOLD, result_table_name: str = RESULT_TABLE_NAME):
+        """
+        Initialize the anomaly detector.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            kpi_engine (KPIEngine): The KPI engine providing the normalized production.
+            window_days (int, optional): The number of previous days of the rolling baseline. Defaults to 14.
+            min_baseline_days (int, optional): The minimum number of previous days required for a baseline. Defaults to 3.
+            threshold (float, optional): The severity from which a day is flagged. Defaults to 0.2.
+            result_table_name (str, optional): The name of the result table. Defaults to "tracker_anomaly".
+
+        Raises:
+            Exception: The exception is raised in case the window is invalid.
+        """
+        if window_days < 1 or min_baseline_days < 1 or min_baseline_days > window_days:
+            raise Exception("Invalid baseline window of %i days with at least %i days given!"%(window_days, min_baseline_days))
+        self.db_connector = db_connector
+        self.kpi_engine = kpi_engine
+        self.window_days = window_days
+        self.min_baseline_days = min_baseline_days
+        self.threshold = threshold
+        self.per_square_meter_column = "%s_%s"%(kpi_engine.value_column, KPIEngine.PER_SQUARE_METER)
+        kpi_types = kpi_engine.result_table.get_column_dict()
+        self.result_table = DBTable(
+            result_table_name,
+            pd.core.indexes.base.Index([self.TIMESTAMP, self.TRACKER_NAME, self.NORMALIZED_YIELD, self.PEER_RATIO, self.BASELINE_RATIO, self.SEVERITY, self.FLAGGED]),
+            [kpi_types[self.TIMESTAMP], kpi_types[self.TRACKER_NAME], "REAL", "REAL", "REAL", "REAL", "INTEGER"],
+            [self.TIMESTAMP, self.TRACKER_NAME]
+        )
+
+    def aggregate_daily(self, kpi_data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Sum the production per square meter and the sun factor per day and tracker.
+
+        Args:
+            kpi_data (pd.core.frame.DataFrame): The KPI data (or partial daily sums).
+
+        Returns:
+            pd.core.frame.DataFrame: The daily sums, the timestamp is the day (YYYY-MM-DD).
+        """
+        daily = kpi_data[[self.TIMESTAMP, self.TRACKER_NAME, self.per_square_meter_column, KPIEngine.SUN_FACTOR]].copy()
+        daily[self.TIMESTAMP] = daily[self.TIMESTAMP].astype(str).str.slice(0, self.DAY_KEY_LENGTH)
+        return daily.groupby([self.TIMESTAMP, self.TRACKER_NAME], as_index = False).sum()
+
+    def detect(self, daily: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Score each day of each tracker against its peers and its own rolling baseline.
+
+        Args:
+            daily (pd.core.frame.DataFrame): The daily sums of consecutive days, see aggregate_daily.
+
+        Returns:
+            pd.core.frame.DataFrame: The normalized yield, the peer ratio, the baseline ratio (NaN without enough history), the severity and the flag of each day and tracker.
+        """
+        sun_factor = daily[KPIEngine.SUN_FACTOR].values.astype(np.float64)
+        normalized = np.divide(daily[self.per_square_meter_column].values.astype(np.float64), sun_factor, out = np.full(len(daily), np.nan), where = sun_factor > 0)
+        matrix = pd.DataFrame({self.TIMESTAMP: daily[self.TIMESTAMP].values, self.TRACKER_NAME: daily[self.TRACKER_NAME].values, self.NORMALIZED_YIELD: normalized}).pivot(index = self.TIMESTAMP, columns = self.TRACKER_NAME, values = self.NORMALIZED_YIELD).sort_index()
+        values = matrix.values
+        peer_median = np.full(len(values), np.nan)
+        valid_days = ~np.all(np.isnan(values), axis = 1)
+        peer_median[valid_days] = np.nanmedian(values[valid_days], axis = 1)
+        peer_ratio = np.divide(values, peer_median[:, None], out = np.full(values.shape, np.nan), where = peer_median[:, None] > 0)
+        baseline = pd.DataFrame(peer_ratio).shift(1).rolling(self.window_days, min_periods = self.min_baseline_days).median().values
+        baseline_ratio = np.divide(peer_ratio, baseline, out = np.full(values.shape, np.nan), where = baseline > 0)
+        severity = np.clip(np.fmax(1 - peer_ratio, 1 - baseline_ratio), 0, 1)
+        severity[np.isnan(severity)] = 0
+        days = np.repeat(matrix.index.values, len(matrix.columns))
+        trackers = np.tile(matrix.columns.values, len(matrix.index))
+        result = pd.DataFrame({
+            self.TIMESTAMP: days,
+            self.TRACKER_NAME: trackers,
+            self.NORMALIZED_YIELD: values.ravel(),
+            self.PEER_RATIO: peer_ratio.ravel(),
+            self.BASELINE_RATIO: baseline_ratio.ravel(),
+            self.SEVERITY: severity.ravel(),
+            self.FLAGGED: (severity.ravel() >= self.threshold).astype(np.int64)
+        })
+        return result[~np.isnan(values.ravel())].reset_index(drop = True)
+
+    def run(self) -> int:
+        """
+        Update the KPIs and score the days since the newest stored day, the newest stored day is scored again as it may have been incomplete.
+        The scores of the rescored days are replaced in one transaction, they are kept, if no day can be scored (e.g. only night readings are new).
+
+        Returns:
+            int: The number of scored tracker days.
+        """
+        self.kpi_engine.run()
+        self.db_connector.create_table(self.result_table)
+        first_day = self.db_connector.select_max_timestamp(self.result_table.table_name)
+        start_day = None if first_day == None else str((pd.Timestamp(first_day) - pd.Timedelta(days = self.window_days)).date())
+        columns = [self.TIMESTAMP, self.TRACKER_NAME, self.per_square_meter_column, KPIEngine.SUN_FACTOR]
+        daily = [self.aggregate_daily(chunk) for chunk in self.db_connector.select_data_chunks(self.kpi_engine.result_table.table_name, self.kpi_engine.chunk_size, columns, start_timestamp = start_day)]
+        if len(daily) == 0:
+            return 0
+        result = self.detect(self.aggregate_daily(pd.concat(daily, ignore_index = True)))
+        if first_day != None:
+            result = result[result[self.TIMESTAMP] >= first_day]
+        if len(result) == 0:
+            return 0
+        self.db_connector.replace_data_range(self.result_table, result, first_day)
+        return len(result)
+
+    def select_flags(self, start_timestamp: str = None, end_timestamp: str = None) -> pd.core.frame.DataFrame:
+        """
+        Select the flagged tracker days.
+
+        Args:
+            start_timestamp (str, optional): The first day (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+
+        Returns:
+            pd.core.frame.DataFrame: The flagged tracker days ordered by the severity.
+        """
+        result = self.db_connector.select_data_range(self.result_table.table_name, start_timestamp, end_timestamp)
+        result = result[result[self.FLAGGED] == 1]
+        return result.sort_values([self.SEVERITY, self.TIMESTAMP], ascending = [False, True]).reset_index(drop = True)
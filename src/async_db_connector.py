@@ -0,0 +1,296 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+class AsyncDBConnector:
+    """
+    The AsyncDBConnector provides the DBConnector to asyncio applications without blocking the event loop.
+    The database and DataFrame work runs on a dedicated thread pool, whose size bounds the number of connections open at the same time, the writes are serialized.
+    A call, which is cancelled or exceeds its timeout, interrupts its running SQLite statement, an interrupted write is rolled back.
+    """
+    MAX_WORKERS = 4
+
+    def __init__(self, db_connector: DBConnector, max_workers: int = MAX_WORKERS, timeout: float = None):
+        """
+        Initialize the async connector.
+
+        Args:
+            db_connector (DBConnector): The connector of the database, a read only connector should have a pool size of at least max_workers.
+            max_workers (int, optional): The number of threads and therefore the maximum number of connections open at the same time. Defaults to 4.
+            timeout (float, optional): The default timeout of each call in seconds. Defaults to None (no timeout).
+
+        Raises:
+            Exception: The exception is raised in case the number of workers is invalid.
+        """
+        if max_workers < 1:
+            raise Exception("Invalid number of workers %i given!"%(max_workers))
+        self.db_connector = db_connector
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix = "AsyncDBConnector")
+        self.write_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """
+        Enter the async with statement.
+
+        Returns:
+            AsyncDBConnector: The as-return value.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Close the connector at the end of the async with statement.
+
+        Args:
+            exc_type (Type[BaseException], optional): The exception type, if any.
+            exc_value (BaseException, optional): The exception value, if any.
+            traceback (TracebackType, optional): The stacktrace of the exception, if any.
+        """
+        await self.close()
+
+    async def close(self):
+        """
+        Wait for the running calls, shut the thread pool down and close the connections of the connector.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, functools.partial(self.executor.shutdown, wait = True, cancel_futures = True))
+        self.db_connector.close()
+
+    async def run(self, function, *args, timeout: float = None, **kwargs):
+        """
+        Run any blocking function (e.g. of the DBConnector or working on its results) on the thread pool.
+
+        Args:
+            function (Callable): The blocking function.
+            *args: The positional arguments of the function.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+            **kwargs: The keyword arguments of the function.
+
+        Raises:
+            TimeoutError: The exception is raised in case the call exceeds the timeout.
+
+        Returns:
+            Any: The result of the function.
+        """
+        event = threading.Event()
+        future = self.executor.submit(self._call, event, function, args, kwargs)
+        return await self._wait(future, event, timeout)
+
+    async def test_table_exists(self, table_name: str, timeout: float = None) -> bool:
+        """
+        Test, if the input table name exists in the database.
+
+        Args:
+            table_name (str): The input table name.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            bool: True, if the table exists, False otherwise.
+        """
+        return await self.run(self.db_connector.test_table_exists, table_name, timeout = timeout)
+
+    async def create_table(self, table: DBTable, timeout: float = None):
+        """
+        Create the table, if it does not exist.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+        """
+        async with self.write_lock:
+            await self.run(self.db_connector.create_table, table, timeout = timeout)
+
+    async def insert_data(self, table: DBTable, data: pd.core.frame.DataFrame, timeout: float = None) -> int:
+        """
+        Insert the data into the table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        async with self.write_lock:
+            return await self.run(self.db_connector.insert_data, table, data, timeout = timeout)
+
+    async def upsert_data(self, table: DBTable, data: pd.core.frame.DataFrame, timeout: float = None) -> dict:
+        """
+        Insert the new rows and update the changed rows of the table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            dict: The number of "inserted", "updated" and "unchanged" rows.
+        """
+        async with self.write_lock:
+            return await self.run(self.db_connector.upsert_data, table, data, timeout = timeout)
+
+    async def delete_data_range(self, table: DBTable, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None, timeout: float = None) -> int:
+        """
+        Delete the rows of the given time range.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the deletion to the given trackers. Defaults to None (all trackers).
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        async with self.write_lock:
+            return await self.run(self.db_connector.delete_data_range, table, start_timestamp, end_timestamp, tracker_names, timeout = timeout)
+
+    async def select_data_unfiltered(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}, timeout: float = None) -> pd.core.frame.DataFrame:
+        """
+        Select all data of the table.
+
+        Args:
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        return await self.run(self.db_connector.select_data_unfiltered, table_name, select_columns, order_by, timeout = timeout)
+
+    async def select_data_range(self, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], order_by: dict[str, str] = {}, tracker_names: list[str] = None, timeout: float = None) -> pd.core.frame.DataFrame:
+        """
+        Select the data of the given time range.
+
+        Args:
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        return await self.run(self.db_connector.select_data_range, table_name, start_timestamp, end_timestamp, select_columns, order_by, tracker_names, timeout = timeout)
+
+    async def select_max_timestamp(self, table_name: str, timeout: float = None) -> str:
+        """
+        Select the newest timestamp of the table.
+
+        Args:
+            table_name (str): The input table name.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Returns:
+            str: The newest timestamp, None if the table is empty or does not exist.
+        """
+        return await self.run(self.db_connector.select_max_timestamp, table_name, timeout = timeout)
+
+    async def select_data_chunks(self, table_name: str, chunk_size: int, select_columns: list[str] = [], start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None, timeout: float = None):
+        """
+        Stream the data of the table in chunks, each chunk is read on the thread pool, when the consumer requests it.
+
+        Args:
+            table_name (str): The input table name.
+            chunk_size (int): The maximum number of rows per chunk.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+            timeout (float, optional): The timeout of reading one chunk in seconds. Defaults to None (the default timeout of the connector).
+
+        Yields:
+            pd.core.frame.DataFrame: The next chunk of the resulting data.
+        """
+        generator = self.db_connector.select_data_chunks(table_name, chunk_size, select_columns, start_timestamp, end_timestamp, tracker_names)
+        future = None
+        try:
+            while True:
+                event = threading.Event()
+                future = self.executor.submit(self._call, event, next, (generator, None), {})
+                chunk = await self._wait(future, event, timeout)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            # a generator must not be closed, while its interrupted chunk is still read
+            if future != None and not future.done():
+                future.add_done_callback(lambda _: generator.close())
+            else:
+                generator.close()
+
+    async def _wait(self, future, event: threading.Event, timeout: float = None):
+        """
+        Wait for the result of a call, a cancelled or timed out call is interrupted.
+
+        Args:
+            future (concurrent.futures.Future): The future of the call on the thread pool.
+            event (threading.Event): The cancel event of the call.
+            timeout (float, optional): The timeout in seconds. Defaults to None (the default timeout of the connector).
+
+        Raises:
+            TimeoutError: The exception is raised in case the call exceeds the timeout.
+
+        Returns:
+            Any: The result of the call.
+        """
+        timeout = timeout if timeout != None else self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            event.set()
+            future.cancel()
+            raise
+
+    def _call(self, event: threading.Event, function, args: tuple, kwargs: dict):
+        """
+        Run the function on the current thread of the pool, the connections opened meanwhile are interrupted by the cancel event.
+
+        Args:
+            event (threading.Event): The cancel event of the call.
+            function (Callable): The blocking function.
+            args (tuple): The positional arguments of the function.
+            kwargs (dict): The keyword arguments of the function.
+
+        Raises:
+            asyncio.CancelledError: The exception is raised in case the call has been cancelled before it started.
+
+        Returns:
+            Any: The result of the function.
+        """
+        if event.is_set():
+            raise asyncio.CancelledError()
+        self.db_connector.thread_state.cancel_event = event
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.db_connector.thread_state.cancel_event = None
@@ -0,0 +1,145 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from main import Main
+
+CREATE_TABLES = "create_tables"
+INSERT_RAW_DATA = "insert_raw_data"
+CALCULATE_KPIS = "calculate_kpis"
+CALCULATE_PERFORMANCE = "calculate_performance"
+DETECT_ANOMALIES = "detect_anomalies"
+CALCULATE_ENERGY_BALANCE = "calculate_energy_balance"
+CALCULATE_LOAD_PROFILES = "calculate_load_profiles"
+APPLY_RETENTION = "apply_retention"
+MAINTAIN_DATABASE = "maintain_database"
+REFRESH_SNAPSHOTS = "refresh_snapshots"
+STEPS = [CREATE_TABLES, INSERT_RAW_DATA, CALCULATE_KPIS, CALCULATE_PERFORMANCE, DETECT_ANOMALIES, CALCULATE_ENERGY_BALANCE, CALCULATE_LOAD_PROFILES, APPLY_RETENTION, MAINTAIN_DATABASE, REFRESH_SNAPSHOTS]
+DEFAULT_STEPS = [CREATE_TABLES, INSERT_RAW_DATA, CALCULATE_KPIS, CALCULATE_PERFORMANCE, DETECT_ANOMALIES, CALCULATE_ENERGY_BALANCE]
+
+def run_plant(config_path: str, steps: list[str] = DEFAULT_STEPS, upsert: bool = False) -> dict:
+    """
+    Run the steps of one plant, a failing step stops the plant and is reported instead of raised.
+
+    Args:
+        config_path (str): The full path to the config file of the plant.
+        steps (list[str], optional): The methods of Main to run in the given order. Defaults to DEFAULT_STEPS.
+        upsert (bool, optional): Insert the raw data in upsert mode, which reports the number of inserted and updated rows. Defaults to False.
+
+    Returns:
+        dict: The report of the plant, i.e. the config path, the status ("ok" or "failed"), the failed step, the error, the total seconds and the seconds and rows of each step (None, if a step reports no row count).
+    """
+    report = {"config_path": config_path, "status": "ok", "failed_step": None, "error": None}
+    start = time.perf_counter()
+    step = None
+    try:
+        main = Main(config_path)
+        for step in steps:
+            step_start = time.perf_counter()
+            if step == INSERT_RAW_DATA:
+                counts = main.insert_raw_data(upsert)
+                rows = counts["inserted"] + counts["updated"]
+            else:
+                rows = getattr(main, step)()
+            report["%s_seconds"%(step)] = time.perf_counter() - step_start
+            report["%s_rows"%(step)] = rows if isinstance(rows, int) else None
+    except Exception as e:
+        report["status"] = "failed"
+        report["failed_step"] = step
+        report["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+    report["total_seconds"] = time.perf_counter() - start
+    return report
+
+class BatchRunner:
+    """
+    The BatchRunner processes the plants of many config files (one config and one database per plant) in parallel processes.
+    The failure of a plant is isolated and reported, the other plants are processed nevertheless. The reports of all plants are consolidated into one table.
+    """
+    CONFIG_EXTENSION = ".json"
+    STATUS_OK = "ok"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, config_paths, max_workers: int = None, steps: list[str] = DEFAULT_STEPS, upsert: bool = False):
+        """
+        Initialize the batch runner.
+
+        Args:
+            config_paths (str | list[str]): The full paths to the config files or a directory containing them (*.json).
+            max_workers (int, optional): The number of plants processed in parallel. Defaults to None (the number of processors).
+            steps (list[str], optional): The methods of Main run for each plant in the given order. Defaults to DEFAULT_STEPS.
+            upsert (bool, optional): Insert the raw data in upsert mode. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case of an unknown step or an invalid number of workers.
+        """
+        invalid_steps = [i for i in steps if i not in STEPS]
+        if len(invalid_steps) != 0:
+            raise Exception("Invalid steps %s given, valid steps are %s"%(", ".join(invalid_steps), ", ".join(STEPS)))
+        if max_workers != None and max_workers < 1:
+            raise Exception("Invalid number of workers %i given!"%(max_workers))
+        self.config_paths = self.get_config_paths(config_paths)
+        self.max_workers = max_workers
+        self.steps = steps
+        self.upsert = upsert
+
+    def get_config_paths(self, config_paths) -> list[str]:
+        """
+        Get the config files to process.
+
+        Args:
+            config_paths (str | list[str]): The full paths to the config files or a directory containing them.
+
+        Returns:
+            list[str]: The sorted full paths of the config files.
+        """
+        if isinstance(config_paths, str):
+            if not os.path.isdir(config_paths):
+                return [config_paths]
+            return sorted([os.path.join(config_paths, i) for i in os.listdir(config_paths) if i.endswith(self.CONFIG_EXTENSION)])
+        return list(config_paths)
+
+    def run(self, report_path: str = None) -> pd.core.frame.DataFrame:
+        """
+        Process all plants in the process pool.
+
+        Args:
+            report_path (str, optional): The full path of a csv file the consolidated report is written to. Defaults to None (no file).
+
+        Returns:
+            pd.core.frame.DataFrame: The report of each plant in the order of the config files.
+        """
+        reports = {}
+        with ProcessPoolExecutor(self.max_workers) as executor:
+            futures = {executor.submit(run_plant, config_path, self.steps, self.upsert): config_path for config_path in self.config_paths}
+            for future in as_completed(futures):
+                config_path = futures[future]
+                try:
+                    reports[config_path] = future.result()
+                except Exception as e:
+                    # e.g. a crashed worker process
+                    reports[config_path] = {"config_path": config_path, "status": self.STATUS_FAILED, "failed_step": None, "error": "".join(traceback.format_exception_only(type(e), e)).strip()}
+        columns = ["config_path", "status", "failed_step", "error", "total_seconds"] + ["%s_%s"%(step, i) for step in self.steps for i in ["seconds", "rows"]]
+        report = pd.DataFrame([reports[i] for i in self.config_paths], columns = columns)
+        if report_path != None:
+            report.to_csv(report_path, index = False)
+        return report
@@ -0,0 +1,763 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable, retry_write
+
+VALUE_DTYPE = np.dtype("<f8")
+
+def encode_values(values: np.ndarray, compression_level: int = 6) -> bytes:
+    """
+    Encode the values of one chunk into a compressed blob of little endian doubles.
+
+    Args:
+        values (np.ndarray): The values, missing values are NaN.
+        compression_level (int, optional): The zlib compression level. Defaults to 6.
+
+    Returns:
+        bytes: The compressed blob.
+    """
+    return zlib.compress(np.ascontiguousarray(values, dtype = VALUE_DTYPE).tobytes(), compression_level)
+
+def decode_values(blob: bytes) -> np.ndarray:
+    """
+    Decode the blob of one chunk, the array is a read only view on the decompressed buffer (no copy).
+
+    Args:
+        blob (bytes): The compressed blob.
+
+    Returns:
+        np.ndarray: The values.
+    """
+    return np.frombuffer(zlib.decompress(blob), dtype = VALUE_DTYPE)
+
+def decode_chunks(blobs: list[bytes], n_values: int) -> np.ndarray:
+    """
+    Decode the blobs of several chunks of the same length into one matrix with a single copy.
+
+    Args:
+        blobs (list[bytes]): The compressed blobs.
+        n_values (int): The number of values per chunk.
+
+    Returns:
+        np.ndarray: The read only matrix of the values with one row per chunk.
+    """
+    if len(blobs) == 0:
+        return np.empty((0, n_values), dtype = VALUE_DTYPE)
+    return np.frombuffer(b"".join([zlib.decompress(i) for i in blobs]), dtype = VALUE_DTYPE).reshape(len(blobs), n_values)
+
+class ChunkStore(DBConnector):
+    """
+    The ChunkStore is a DBConnector storing tracker tables as one row per tracker and day.
+    The values of a day are stored as a compressed blob of doubles per value column on a fixed interval grid starting at midnight, a missing reading is NaN.
+    A table is stored in chunks, if its primary key is the timestamp and the tracker name and all other columns are numeric, all other tables are stored row by row.
+    The select functions return the same data frames as the DBConnector, the values are doubles and rows without any value are omitted.
+    """
+    CHUNK_SUFFIX = "_chunks"
+    TIMESTAMP = "timestamp"
+    DAY_COLUMN = "day"
+    INTERVAL_COLUMN = "interval_minutes"
+    CHUNK_KEY_COLUMNS = [DBConnector.TRACKER_COLUMN, DAY_COLUMN, INTERVAL_COLUMN]
+    INTERVAL_MINUTES = 15
+    COMPRESSION_LEVEL = 6
+    MINUTES_PER_DAY = 1440
+    DAY_KEY_LENGTH = 10
+
+    def __init__(self, wd: str, db_name: str, interval_minutes: int = INTERVAL_MINUTES, compression_level: int = COMPRESSION_LEVEL, cache_size: int = 0, read_only: bool = False, pool_size: int = 4, journal_mode: str = None, busy_timeout: float = DBConnector.BUSY_TIMEOUT, write_retries: int = DBConnector.WRITE_RETRIES, lock_file: bool = False, write_batch_size: int = DBConnector.WRITE_BATCH_SIZE, max_lock_seconds: float = DBConnector.MAX_LOCK_SECONDS):
+        """
+        Initialize the ChunkStore.
+
+        Args:
+            wd (str): The path to the database.
+            db_name (str): The name of the database.
+            interval_minutes (int, optional): The length of an interval in minutes, a day must consist of whole intervals. Defaults to 15.
+            compression_level (int, optional): The zlib compression level of the blobs. Defaults to 6.
+            cache_size (int, optional): The memory budget in bytes of the query result cache. Defaults to 0 (no cache).
+            read_only (bool, optional): Open read only connections from a bounded pool. Defaults to False.
+            pool_size (int, optional): The maximum number of read only connections open at the same time. Defaults to 4.
+            journal_mode (str, optional): The journal mode set on each read / write connection. Defaults to None (keep the journal mode of the database).
+            busy_timeout (float, optional): The time in seconds a statement waits for the lock of another connection. Defaults to 5.0.
+            write_retries (int, optional): The number of repetitions of a write call, which failed due to the lock of another connection. Defaults to 5.
+            lock_file (bool, optional): Queue the write calls of all processes using the lock file <db_name>.lock. Defaults to False.
+            write_batch_size (int, optional): The maximum number of readings inserted in one transaction. Defaults to 50000.
+            max_lock_seconds (float, optional): The target duration of a write transaction, the batch size adapts to it. Defaults to 0.5.
+
+        Raises:
+            Exception: The exception is raised in case the interval is invalid.
+        """
+        if interval_minutes < 1 or self.MINUTES_PER_DAY % interval_minutes != 0:
+            raise Exception("Invalid interval of %i minutes given, a day must consist of whole intervals!"%(interval_minutes))
+        super().__init__(wd, db_name, cache_size = cache_size, read_only = read_only, pool_size = pool_size, journal_mode = journal_mode, busy_timeout = busy_timeout, write_retries = write_retries, lock_file = lock_file, write_batch_size = write_batch_size, max_lock_seconds = max_lock_seconds)
+        self.interval_minutes = interval_minutes
+        self.compression_level = compression_level
+        self.slots_per_day = self.MINUTES_PER_DAY // interval_minutes
+        self.slot_times = np.array([" %02i:%02i"%divmod(i * interval_minutes, 60) for i in range(self.slots_per_day)])
+        self.chunk_layouts = {}
+
+    def get_chunk_table_name(self, table_name: str) -> str:
+        """
+        Get the name of the chunk table of the given table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The name of the chunk table.
+        """
+        return table_name + self.CHUNK_SUFFIX
+
+    def is_chunkable(self, table: DBTable) -> bool:
+        """
+        Test, if the table can be stored in chunks.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: True, if the primary key is the timestamp and the tracker name and all other columns are numeric, False otherwise.
+        """
+        if sorted(table.primary_key_list) != sorted([self.TIMESTAMP, self.TRACKER_COLUMN]):
+            return False
+        value_types = [table.data_types[i] for i in range(len(table.data_columns)) if table.data_columns[i] not in table.primary_key_list]
+        return len(value_types) != 0 and all([i.upper() in self.NUMERIC_TYPES for i in value_types])
+
+    @retry_write
+    def create_table(self, table: DBTable):
+        """
+        Create the table, a chunkable table is created as chunk table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+        """
+        super().create_table(self._get_chunk_table(table) if self.is_chunkable(table) else table)
+
+    @retry_write
+    def create_index(self, index_name: str, table_name: str, column_list: list[str], condition: str = None):
+        """
+        Create the index, the chunk tables are skipped, as their primary key already covers tracker and day.
+
+        Args:
+            index_name (str): The name of the index.
+            table_name (str): The name of the table.
+            column_list (list[str]): The list of columns to include in the index.
+            condition (str, optional): The where clause of a partial index. Defaults to None (all rows).
+        """
+        if not super().test_table_exists(self.get_chunk_table_name(table_name)):
+            super().create_index(index_name, table_name, column_list, condition)
+
+    def verify_indexes(self, table: DBTable) -> pd.core.frame.DataFrame:
+        """
+        Verify, that the standard range reads use the secondary indexes, chunk tables have none.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            pd.core.frame.DataFrame: The index name, the query plan and whether the index is used for each index of the table, empty for chunk tables.
+        """
+        if super().test_table_exists(self.get_chunk_table_name(table.table_name)):
+            return pd.DataFrame(columns = ["index_name", "plan", "used"])
+        return super().verify_indexes(table)
+
+    def get_column_types(self, table_name: str) -> dict:
+        """
+        Get the declared data types of the columns of the table, the readings of a chunk table are timestamp, tracker name and the real values.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            dict: The upper case data type of each column in the order of the rows read, empty if the table does not exist.
+        """
+        value_columns = self._get_stored_value_columns(table_name)
+        if value_columns == None:
+            return super().get_column_types(table_name)
+        return {self.TIMESTAMP: "DATE", self.TRACKER_COLUMN: "TEXT", **{i: "REAL" for i in value_columns}}
+
+    def test_table_exists(self, table_name: str) -> bool:
+        """
+        Test, if the input table name exists in the database, either row by row or in chunks.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            bool: True, if the given table exists in the database, False otherwise.
+        """
+        return super().test_table_exists(table_name) or super().test_table_exists(self.get_chunk_table_name(table_name))
+
+    @retry_write
+    def insert_data(self, table: DBTable, data: pd.core.frame.DataFrame, ignore_existing: bool = False) -> int:
+        """
+        Insert the data into the table, the readings of a chunkable table are merged into the chunks of their tracker and day.
+        Like for the DBConnector existing readings are kept.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            ignore_existing (bool, optional): Skip the existing rows of a table, which is not chunkable, by the primary key constraint instead of reading all stored keys. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case a timestamp is not on the interval grid.
+
+        Returns:
+            int: The number of inserted rows respectively readings.
+        """
+        if not self.is_chunkable(table):
+            return super().insert_data(table, data, ignore_existing)
+        self._check_writable()
+        if len(data) == 0:
+            raise Exception("There should be data available!")
+        return self._write_batches(data, self._insert_chunk_batch, table)
+
+    def _insert_chunk_batch(self, table: DBTable, data: pd.core.frame.DataFrame) -> int:
+        """
+        Merge a batch of readings into their chunks in one transaction.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The readings of the batch.
+
+        Returns:
+            int: The number of new readings.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            inserted = self._insert_chunks(ccm.get_cursor(), table, data)
+            ccm.commit()
+        return inserted
+
+    @retry_write
+    def upsert_data(self, table: DBTable, data: pd.core.frame.DataFrame) -> dict:
+        """
+        Insert the new readings and update the stored readings, whose values differ from the input, only the chunks with a new or changed reading are rewritten.
+        A chunk cannot store a NULL, so missing values of the input keep the stored values.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame, of duplicated readings the last row is used.
+
+        Raises:
+            Exception: The exception is raised in case a timestamp is not on the interval grid.
+
+        Returns:
+            dict: The number of "inserted", "updated" and "unchanged" readings.
+        """
+        if not self.is_chunkable(table):
+            return super().upsert_data(table, data)
+        self._check_writable()
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        data = data.drop_duplicates([self.TIMESTAMP, self.TRACKER_COLUMN], keep = "last")
+        if len(data) == 0:
+            return counts
+        value_columns = self._get_value_columns(table)
+        keys, matrices = self._build_chunks(data, value_columns)
+        incoming = self._get_present(matrices, value_columns)
+        chunk_table_name = self.get_chunk_table_name(table.table_name)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            days = keys[self.DAY_COLUMN].values
+            stored = np.zeros(incoming.shape, dtype = bool)
+            changed = np.zeros(incoming.shape, dtype = bool)
+            existing = self._select_chunks(cur, chunk_table_name, value_columns, "%s >= ? AND %s <= ?"%(self.DAY_COLUMN, self.DAY_COLUMN), [days.min(), days.max()], list(keys[self.TRACKER_COLUMN].unique()))
+            if len(existing[0]) != 0:
+                positions = keys.reset_index().merge(existing[0].reset_index(), on = [self.TRACKER_COLUMN, self.DAY_COLUMN], how = "inner", suffixes = ("", "_existing"))
+                index = positions["index"].values
+                stored[index] = self._get_present({column: existing[1][column][positions["index_existing"].values] for column in value_columns}, value_columns)
+                for column in value_columns:
+                    new_values = matrices[column][index]
+                    stored_values = existing[1][column][positions["index_existing"].values]
+                    changed[index] |= ~np.isnan(new_values) & (new_values != stored_values)
+                    matrices[column][index] = np.where(np.isnan(new_values), stored_values, new_values)
+            inserted = incoming & ~stored
+            updated = incoming & stored & changed
+            counts["inserted"] = int(inserted.sum())
+            counts["updated"] = int(updated.sum())
+            counts["unchanged"] = int((incoming & stored & ~changed).sum())
+            rewrite = np.flatnonzero((inserted | updated).any(axis = 1))
+            rows = [[keys[self.TRACKER_COLUMN].values[i], days[i], self.interval_minutes] + [sqlite3.Binary(encode_values(matrices[column][i], self.compression_level)) for column in value_columns] for i in rewrite]
+            if len(rows) != 0:
+                cur.executemany("""INSERT OR REPLACE INTO %s (%s) VALUES (%s);"""%(chunk_table_name, ", ".join(self.CHUNK_KEY_COLUMNS + value_columns), ", ".join(["?"] * (len(self.CHUNK_KEY_COLUMNS) + len(value_columns)))), rows)
+            ccm.commit()
+        return counts
+
+    def select_data_chunks(self, table_name: str, chunk_size: int, select_columns: list[str] = [], start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None):
+        """
+        Stream the data of the table in chunks, a chunk table is read in whole days per tracker ordered by day and tracker.
+
+        Args:
+            table_name (str): The input table name.
+            chunk_size (int): The maximum number of rows per chunk (at least one day of one tracker is read at once).
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Raises:
+            Exception: The exception is raised in case the chunk size is invalid.
+
+        Yields:
+            pd.core.frame.DataFrame: The next chunk of the resulting data.
+        """
+        value_columns = self._get_stored_value_columns(table_name)
+        if value_columns == None:
+            yield from super().select_data_chunks(table_name, chunk_size, select_columns, start_timestamp, end_timestamp, tracker_names)
+            return
+        if chunk_size < 1:
+            raise Exception("Invalid chunk size %i given!"%(chunk_size))
+        limit = max(chunk_size // self.slots_per_day, 1)
+        condition, parameters = self._prepare_day_condition(start_timestamp, end_timestamp)
+        last_key = None
+        while True:
+            conditions = [] if condition == None else [condition]
+            query_parameters = list(parameters)
+            if last_key != None:
+                conditions.append("(%s, %s) > (?, ?)"%(self.DAY_COLUMN, self.TRACKER_COLUMN))
+                query_parameters += last_key
+            with self._get_context_manager(self.db_fullpath) as ccm:
+                keys, matrices = self._select_chunks(ccm.get_cursor(), self.get_chunk_table_name(table_name), value_columns, " AND ".join(conditions) if len(conditions) != 0 else None, query_parameters, tracker_names, limit)
+            if len(keys) == 0:
+                break
+            last_key = [keys[self.DAY_COLUMN].values[-1], keys[self.TRACKER_COLUMN].values[-1]]
+            data = self._unpack_chunks(keys, matrices, value_columns, start_timestamp, end_timestamp)
+            if len(data) != 0:
+                yield self._finalize_result(data, select_columns, {})
+            if len(keys) < limit:
+                break
+
+    @retry_write
+    def delete_data_range(self, table: DBTable, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> int:
+        """
+        Delete the rows of the given time range, the readings of a chunk table are removed from their chunks.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the deletion to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        if not self.is_chunkable(table):
+            return super().delete_data_range(table, start_timestamp, end_timestamp, tracker_names)
+        self._check_writable()
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            deleted = self._delete_chunk_range(ccm.get_cursor(), table, start_timestamp, end_timestamp, tracker_names)
+            ccm.commit()
+        return deleted
+
+    @retry_write
+    def upsert_tables(self, tables: list[DBTable], data: list[pd.core.frame.DataFrame]) -> list[dict]:
+        """
+        Upsert the data of several tables in one transaction, the tables must not be stored in chunks.
+
+        Args:
+            tables (list[DBTable]): The DBTable objects of the tables.
+            data (list[pd.core.frame.DataFrame]): The input data frame of each table.
+
+        Raises:
+            Exception: The exception is raised in case a table is chunkable.
+
+        Returns:
+            list[dict]: The number of "inserted", "updated" and "unchanged" rows of each table.
+        """
+        chunkable = [i.table_name for i in tables if self.is_chunkable(i)]
+        if len(chunkable) != 0:
+            raise Exception("The chunk tables %s cannot be upserted together!"%(", ".join(chunkable)))
+        return super().upsert_tables(tables, data)
+
+    @retry_write
+    def replace_data_range(self, table: DBTable, data: pd.core.frame.DataFrame, start_timestamp: str = None, end_timestamp: str = None) -> int:
+        """
+        Replace the rows of the given time range by the data in one transaction, the readings of a chunk table are replaced in their chunks.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame, the rows must lie in the time range.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        if not self.is_chunkable(table):
+            return super().replace_data_range(table, data, start_timestamp, end_timestamp)
+        self._check_writable()
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            deleted = self._delete_chunk_range(cur, table, start_timestamp, end_timestamp)
+            if len(data) != 0:
+                self._insert_chunks(cur, table, data)
+            ccm.commit()
+        return deleted
+
+    def select_max_timestamp(self, table_name: str) -> str:
+        """
+        Select the newest timestamp of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The newest timestamp, None if the table does not exist or is empty.
+        """
+        value_columns = self._get_stored_value_columns(table_name)
+        if value_columns == None:
+            return super().select_max_timestamp(table_name)
+        chunk_table_name = self.get_chunk_table_name(table_name)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            max_day = cur.execute("""SELECT MAX(%s) FROM %s;"""%(self.DAY_COLUMN, chunk_table_name)).fetchall()[0][0]
+            if max_day == None:
+                return None
+            keys, matrices = self._select_chunks(cur, chunk_table_name, value_columns, "%s = ?"%(self.DAY_COLUMN), [max_day])
+        slots = np.flatnonzero(self._get_present(matrices, value_columns).any(axis = 0))
+        return max_day + self.slot_times[slots[-1]] if len(slots) != 0 else None
+
+    def select_min_timestamp(self, table_name: str) -> str:
+        """
+        Select the oldest timestamp of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The oldest timestamp, None if the table does not exist or is empty.
+        """
+        value_columns = self._get_stored_value_columns(table_name)
+        if value_columns == None:
+            return super().select_min_timestamp(table_name)
+        chunk_table_name = self.get_chunk_table_name(table_name)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            min_day = cur.execute("""SELECT MIN(%s) FROM %s;"""%(self.DAY_COLUMN, chunk_table_name)).fetchall()[0][0]
+            if min_day == None:
+                return None
+            keys, matrices = self._select_chunks(cur, chunk_table_name, value_columns, "%s = ?"%(self.DAY_COLUMN), [min_day])
+        slots = np.flatnonzero(self._get_present(matrices, value_columns).any(axis = 0))
+        return min_day + self.slot_times[slots[0]] if len(slots) != 0 else None
+
+    def _read_data_unfiltered(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}) -> pd.core.frame.DataFrame:
+        """
+        Read the data of the table bypassing the query cache, a chunk table is decoded into rows.
+
+        Args:
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {} (ordered by timestamp and tracker name).
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        return self._read_data_range(table_name, None, None, select_columns, order_by, None)
+
+    def _read_data_range(self, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], order_by: dict[str, str] = {}, tracker_names: list[str] = None) -> pd.core.frame.DataFrame:
+        """
+        Read the data of the given time range bypassing the query cache, only the chunks of the days in the range are decoded.
+
+        Args:
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {} (ordered by timestamp and tracker name).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        value_columns = self._get_stored_value_columns(table_name)
+        if value_columns == None:
+            if start_timestamp == None and end_timestamp == None and tracker_names == None:
+                return super()._read_data_unfiltered(table_name, select_columns, order_by)
+            return super()._read_data_range(table_name, start_timestamp, end_timestamp, select_columns, order_by, tracker_names)
+        condition, parameters = self._prepare_day_condition(start_timestamp, end_timestamp)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            keys, matrices = self._select_chunks(ccm.get_cursor(), self.get_chunk_table_name(table_name), value_columns, condition, parameters, tracker_names)
+        return self._finalize_result(self._unpack_chunks(keys, matrices, value_columns, start_timestamp, end_timestamp), select_columns, order_by)
+
+    def _insert_chunks(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> int:
+        """
+        Merge the readings into the chunks of their tracker and day, existing readings are kept.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the chunkable table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Raises:
+            Exception: The exception is raised in case a timestamp is not on the interval grid.
+
+        Returns:
+            int: The number of new readings.
+        """
+        value_columns = self._get_value_columns(table)
+        keys, matrices = self._build_chunks(data, value_columns)
+        chunk_table_name = self.get_chunk_table_name(table.table_name)
+        days = keys[self.DAY_COLUMN].values
+        present = self._get_present(matrices, value_columns)
+        inserted = int(present.sum())
+        existing = self._select_chunks(cur, chunk_table_name, value_columns, "%s >= ? AND %s <= ?"%(self.DAY_COLUMN, self.DAY_COLUMN), [days.min(), days.max()], list(keys[self.TRACKER_COLUMN].unique()))
+        if len(existing[0]) != 0:
+            positions = keys.reset_index().merge(existing[0].reset_index(), on = [self.TRACKER_COLUMN, self.DAY_COLUMN], how = "inner", suffixes = ("", "_existing"))
+            inserted -= int((present[positions["index"].values] & self._get_present(existing[1], value_columns)[positions["index_existing"].values]).sum())
+            for column in value_columns:
+                new_values = matrices[column][positions["index"].values]
+                stored_values = existing[1][column][positions["index_existing"].values]
+                matrices[column][positions["index"].values] = np.where(np.isnan(stored_values), new_values, stored_values)
+        rows = [[keys[self.TRACKER_COLUMN].values[i], days[i], self.interval_minutes] + [sqlite3.Binary(encode_values(matrices[column][i], self.compression_level)) for column in value_columns] for i in range(len(keys))]
+        cur.executemany("""INSERT OR REPLACE INTO %s (%s) VALUES (%s);"""%(chunk_table_name, ", ".join(self.CHUNK_KEY_COLUMNS + value_columns), ", ".join(["?"] * (len(self.CHUNK_KEY_COLUMNS) + len(value_columns)))), rows)
+        return inserted
+
+    def _delete_chunk_range(self, cur: sqlite3.Cursor, table: DBTable, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> int:
+        """
+        Remove the readings of the given time range from their chunks, chunks without remaining readings are deleted.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the chunkable table.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the deletion to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            int: The number of deleted readings.
+        """
+        value_columns = self._get_value_columns(table)
+        chunk_table_name = self.get_chunk_table_name(table.table_name)
+        if not self._test_table_exists(cur, chunk_table_name):
+            return 0
+        condition, parameters = self._prepare_day_condition(start_timestamp, end_timestamp)
+        keys, matrices = self._select_chunks(cur, chunk_table_name, value_columns, condition, parameters, tracker_names)
+        timestamps = np.char.add(keys[self.DAY_COLUMN].values.astype("U%i"%(self.DAY_KEY_LENGTH))[:, None], self.slot_times[None, :])
+        in_range = np.ones(timestamps.shape, dtype = bool)
+        if start_timestamp != None:
+            in_range &= timestamps >= start_timestamp
+        if end_timestamp != None:
+            in_range &= timestamps < end_timestamp
+        present = self._get_present(matrices, value_columns)
+        deleted = int((present & in_range).sum())
+        remaining = present & ~in_range
+        for i in np.flatnonzero((present & in_range).any(axis = 1)):
+            key = [keys[self.DAY_COLUMN].values[i], keys[self.TRACKER_COLUMN].values[i]]
+            if not remaining[i].any():
+                cur.execute("""DELETE FROM %s WHERE %s = ? AND %s = ?;"""%(chunk_table_name, self.DAY_COLUMN, self.TRACKER_COLUMN), key)
+                continue
+            blobs = [sqlite3.Binary(encode_values(np.where(in_range[i], np.nan, matrices[column][i]), self.compression_level)) for column in value_columns]
+            cur.execute("""UPDATE %s SET %s WHERE %s = ? AND %s = ?;"""%(chunk_table_name, ", ".join(["%s = ?"%(column) for column in value_columns]), self.DAY_COLUMN, self.TRACKER_COLUMN), blobs + key)
+        return deleted
+
+    def _get_chunk_table(self, table: DBTable) -> DBTable:
+        """
+        Get the chunk table of a chunkable table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            DBTable: The DBTable object of the chunk table.
+        """
+        value_columns = self._get_value_columns(table)
+        return DBTable(
+            self.get_chunk_table_name(table.table_name),
+            pd.core.indexes.base.Index(self.CHUNK_KEY_COLUMNS + value_columns),
+            [table.get_column_dict()[self.TRACKER_COLUMN], "DATE", "INTEGER"] + ["BLOB"] * len(value_columns),
+            [self.DAY_COLUMN, self.TRACKER_COLUMN]
+        )
+
+    def _get_value_columns(self, table: DBTable) -> list[str]:
+        """
+        Get the value columns of a chunkable table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            list[str]: The value columns.
+        """
+        return [i for i in table.data_columns if i not in table.primary_key_list]
+
+    def _get_stored_value_columns(self, table_name: str) -> list[str]:
+        """
+        Get the value columns of the chunk table of the given table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            list[str]: The value columns, None if the table is not stored in chunks.
+        """
+        if table_name in self.chunk_layouts:
+            return self.chunk_layouts[table_name]
+        chunk_table_name = self.get_chunk_table_name(table_name)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if not self._test_table_exists(cur, chunk_table_name):
+                return None
+            # the layout of an existing chunk table never changes, so it is looked up only once
+            self.chunk_layouts[table_name] = [i for i in self._get_table_column_names(cur, chunk_table_name) if i not in self.CHUNK_KEY_COLUMNS]
+        return self.chunk_layouts[table_name]
+
+    def _build_chunks(self, data: pd.core.frame.DataFrame, value_columns: list[str]) -> tuple[pd.core.frame.DataFrame, dict]:
+        """
+        Arrange the readings into one row of values per tracker and day.
+
+        Args:
+            data (pd.core.frame.DataFrame): The input data frame.
+            value_columns (list[str]): The value columns.
+
+        Raises:
+            Exception: The exception is raised in case a timestamp is not on the interval grid.
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, dict]: The tracker and day of each chunk and the matrix of the values per value column.
+        """
+        timestamps = pd.to_datetime(data[self.TIMESTAMP].astype(str))
+        minutes = (timestamps.dt.hour * 60 + timestamps.dt.minute).values
+        if (minutes % self.interval_minutes != 0).any() or (timestamps.dt.second != 0).any():
+            raise Exception("The timestamps are not on the grid of %i minutes!"%(self.interval_minutes))
+        days = timestamps.dt.strftime("%Y-%m-%d").values
+        codes, uniques = pd.MultiIndex.from_arrays([data[self.TRACKER_COLUMN].astype(str).values, days]).factorize()
+        keys = pd.core.frame.DataFrame({self.TRACKER_COLUMN: uniques.get_level_values(0), self.DAY_COLUMN: uniques.get_level_values(1)})
+        matrices = {}
+        for column in value_columns:
+            matrices[column] = np.full((len(keys), self.slots_per_day), np.nan)
+            matrices[column][codes, minutes // self.interval_minutes] = pd.to_numeric(data[column]).values.astype(np.float64)
+        return keys, matrices
+
+    def _select_chunks(self, cur: sqlite3.Cursor, chunk_table_name: str, value_columns: list[str], condition: str = None, parameters: list = [], tracker_names: list[str] = None, limit: int = None) -> tuple[pd.core.frame.DataFrame, dict]:
+        """
+        Select and decode the chunks ordered by day and tracker.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            chunk_table_name (str): The name of the chunk table.
+            value_columns (list[str]): The value columns.
+            condition (str, optional): The condition on the chunks. Defaults to None.
+            parameters (list, optional): The parameters of the condition. Defaults to [].
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+            limit (int, optional): The maximum number of chunks. Defaults to None (all chunks).
+
+        Raises:
+            Exception: The exception is raised in case the chunks were stored with another interval.
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, dict]: The tracker and day of each chunk and the read only matrix of the values per value column.
+        """
+        conditions = [] if condition == None else [condition]
+        parameters = list(parameters)
+        if tracker_names != None:
+            conditions.append("%s IN (%s)"%(self.TRACKER_COLUMN, ", ".join(["?"] * len(tracker_names))))
+            parameters += list(tracker_names)
+        rows = []
+        if self._test_table_exists(cur, chunk_table_name):
+            select_statement = self._prepare_select_statement(chunk_table_name, self.CHUNK_KEY_COLUMNS + value_columns, {self.DAY_COLUMN: "ASC", self.TRACKER_COLUMN: "ASC"}, None, " AND ".join(conditions) if len(conditions) != 0 else None)
+            rows = cur.execute(select_statement if limit == None else "%s LIMIT %i"%(select_statement, limit), parameters).fetchall()
+        if any([i[2] != self.interval_minutes for i in rows]):
+            raise Exception("The chunks of %s were not stored with an interval of %i minutes!"%(chunk_table_name, self.interval_minutes))
+        keys = pd.core.frame.DataFrame({self.TRACKER_COLUMN: [i[0] for i in rows], self.DAY_COLUMN: [i[1] for i in rows]})
+        matrices = {column: decode_chunks([i[3 + j] for i in rows], self.slots_per_day) for j, column in enumerate(value_columns)}
+        return keys, matrices
+
+    def _unpack_chunks(self, keys: pd.core.frame.DataFrame, matrices: dict, value_columns: list[str], start_timestamp: str = None, end_timestamp: str = None) -> pd.core.frame.DataFrame:
+        """
+        Convert the chunks into rows ordered by timestamp and tracker name, the readings without any value and outside the range are dropped.
+
+        Args:
+            keys (pd.core.frame.DataFrame): The tracker and day of each chunk ordered by day and tracker.
+            matrices (dict): The matrix of the values per value column.
+            value_columns (list[str]): The value columns.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+
+        Returns:
+            pd.core.frame.DataFrame: The rows of the timestamp, the tracker name and the values.
+        """
+        days = keys[self.DAY_COLUMN].values.astype("U%i"%(self.DAY_KEY_LENGTH))
+        chunk_index, slot_index = np.nonzero(self._get_present(matrices, value_columns))
+        # the chunks are ordered by day and tracker, so ordering by day, slot and chunk yields the order by timestamp and tracker
+        order = np.lexsort((chunk_index, slot_index, np.unique(days, return_inverse = True)[1][chunk_index]))
+        chunk_index, slot_index = chunk_index[order], slot_index[order]
+        timestamps = np.char.add(days[chunk_index], self.slot_times[slot_index])
+        in_range = np.ones(len(timestamps), dtype = bool)
+        if start_timestamp != None:
+            in_range &= timestamps >= start_timestamp
+        if end_timestamp != None:
+            in_range &= timestamps < end_timestamp
+        chunk_index, slot_index = chunk_index[in_range], slot_index[in_range]
+        data = {self.TIMESTAMP: timestamps[in_range].astype(object), self.TRACKER_COLUMN: keys[self.TRACKER_COLUMN].values[chunk_index]}
+        for column in value_columns:
+            data[column] = matrices[column][chunk_index, slot_index]
+        return pd.core.frame.DataFrame(data)
+
+    def _finalize_result(self, data: pd.core.frame.DataFrame, select_columns: list[str], order_by: dict[str, str]) -> pd.core.frame.DataFrame:
+        """
+        Order the rows and select the columns.
+
+        Args:
+            data (pd.core.frame.DataFrame): The unpacked rows ordered by timestamp and tracker name.
+            select_columns (list[str]): The columns to select, all columns if empty.
+            order_by (dict[str, str]): The order by of the columns, the order of the unpacked rows is kept if empty.
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        if len(order_by) != 0:
+            data = data.sort_values(list(order_by.keys()), ascending = [i.upper() != "DESC" for i in order_by.values()], kind = "stable").reset_index(drop = True)
+        return data if len(select_columns) == 0 else data[select_columns]
+
+    def _get_present(self, matrices: dict, value_columns: list[str]) -> np.ndarray:
+        """
+        Get the readings with at least one value.
+
+        Args:
+            matrices (dict): The matrix of the values per value column.
+            value_columns (list[str]): The value columns.
+
+        Returns:
+            np.ndarray: The boolean matrix of the existing readings.
+        """
+        present = np.zeros(matrices[value_columns[0]].shape, dtype = bool)
+        for column in value_columns:
+            present |= ~np.isnan(matrices[column])
+        return present
+
+    def _prepare_day_condition(self, start_timestamp: str = None, end_timestamp: str = None) -> tuple[str, list]:
+        """
+        Prepare the condition on the days of the chunks overlapping the time range.
+
+        Args:
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+
+        Returns:
+            tuple[str, list]: The condition (None, if the range is unbounded) and its parameters.
+        """
+        conditions = []
+        parameters = []
+        if start_timestamp != None:
+            conditions.append("%s >= ?"%(self.DAY_COLUMN))
+            parameters.append(start_timestamp[:self.DAY_KEY_LENGTH])
+        if end_timestamp != None:
+            conditions.append("%s <= ?"%(self.DAY_COLUMN))
+            parameters.append(end_timestamp[:self.DAY_KEY_LENGTH])
+        return (" AND ".join(conditions) if len(conditions) != 0 else None), parameters
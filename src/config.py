@@ -16,9 +16,10 @@
 # with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import json
+import os
 import pandas as pd
 
-from db_connector import DBTable
+from db_connector import DBConnector, DBIndex, DBTable
 
 class Config:
     """
@@ -30,10 +31,32 @@ class Config:
     DB_COLUMNS = "data.db.columns"
     SEPARATOR = "separator"
     DB_NAME = "db.name"
+    DB_SHARD = "db.shard"
+    DB_ZONE_MAP = "db.zone.map"
+    DB_CACHE_SIZE = "db.cache.size"
+    DB_JOURNAL_MODE = "db.journal.mode"
+    DB_CHUNK_STORE = "db.chunk.store"
+    DB_BUSY_TIMEOUT = "db.busy.timeout"
+    DB_WRITE_RETRIES = "db.write.retries"
+    DB_LOCK_FILE = "db.lock.file"
+    DB_WRITE_BATCH_SIZE = "db.write.batch.size"
+    DB_MAX_LOCK_SECONDS = "db.max.lock.seconds"
+    DB_RETENTION = "db.retention"
+    DB_RESAMPLE = "db.resample"
+    RESAMPLE_KEYS = ["interval.minutes", "fill", "max.gap", "tolerance.minutes"]
+    DB_VALIDATION = "db.validation"
+    DB_META_FILES = "db.meta.files"
+    DB_STAGING = "db.staging"
+    STAGING_MODES = ["memory", "file"]
+    META_FILE_EXTENSIONS = [".csv", ".jsonl"]
+    VALIDATION_KEYS = ["rules", "sum.tolerance", "limit.factor"]
     DB_TYPES = "db.types"
     DB_TABLES = "db.tables"
     DB_TABLE_COLUMNS = "columns"
     DB_TABLE_PRIMARY_KEY = "primary"
+    DB_TABLE_INDEXES = "indexes"
+    DB_INDEX_INCLUDE = "include"
+    DB_INDEX_CONDITION = "where"
     TABLE_NAME = "table.name"
     TRACKER_NAMES = "tracker.names"
 
@@ -52,6 +75,21 @@ class Config:
         self.data_columns = None
         self.separator = None
         self.db_name = None
+        self.db_shard = None
+        self.db_zone_map = False
+        self.db_cache_size = 0
+        self.db_journal_mode = None
+        self.db_chunk_store = False
+        self.db_busy_timeout = DBConnector.BUSY_TIMEOUT
+        self.db_write_retries = DBConnector.WRITE_RETRIES
+        self.db_lock_file = False
+        self.db_write_batch_size = DBConnector.WRITE_BATCH_SIZE
+        self.db_max_lock_seconds = DBConnector.MAX_LOCK_SECONDS
+        self.db_retention = {}
+        self.db_resample = None
+        self.db_validation = None
+        self.db_meta_files = {}
+        self.db_staging = None
         self.db_types = None
         self.db_columns = None
         self.tables = {}
@@ -129,25 +167,70 @@ class Config:
             self.separator = data[self.SEPARATOR]
         if self.DB_NAME in data:
             self.db_name = data[self.DB_NAME]
+        if self.DB_SHARD in data:
+            self.db_shard = data[self.DB_SHARD]
+        if self.DB_ZONE_MAP in data:
+            self.db_zone_map = data[self.DB_ZONE_MAP]
+        if self.DB_CACHE_SIZE in data:
+            self.db_cache_size = data[self.DB_CACHE_SIZE]
+        if self.DB_JOURNAL_MODE in data:
+            self.db_journal_mode = data[self.DB_JOURNAL_MODE]
+        if self.DB_CHUNK_STORE in data:
+            self.db_chunk_store = data[self.DB_CHUNK_STORE]
+            if self.db_chunk_store and (self.db_shard != None or self.db_zone_map):
+                raise Exception("The chunk store cannot be combined with %s or %s!"%(self.DB_SHARD, self.DB_ZONE_MAP))
+        if self.DB_BUSY_TIMEOUT in data:
+            self.db_busy_timeout = data[self.DB_BUSY_TIMEOUT]
+        if self.DB_WRITE_RETRIES in data:
+            self.db_write_retries = data[self.DB_WRITE_RETRIES]
+        if self.DB_LOCK_FILE in data:
+            self.db_lock_file = data[self.DB_LOCK_FILE]
+        if self.DB_WRITE_BATCH_SIZE in data:
+            self.db_write_batch_size = data[self.DB_WRITE_BATCH_SIZE]
+        if self.DB_MAX_LOCK_SECONDS in data:
+            self.db_max_lock_seconds = data[self.DB_MAX_LOCK_SECONDS]
         if self.DB_TYPES in data:
             self.db_types = data[self.DB_TYPES]
         else:
             raise Exception("No db types found!")
         if self.DB_TABLES in data:
+            data_keys = [i for i in data if self.DATA in i and isinstance(data[i], dict)]
             for table_key in data[self.DB_TABLES].keys():
                 self.__generate_dbtable(table_key, data[self.DB_TABLES][table_key])
-                table_data_keys = [i for i in data if table_key in i and self.DATA in i]
-                if len(table_data_keys) > 0:
-                    meta_data = pd.DataFrame(columns = self.tables[table_key].data_columns)
-                    for table_data_key in table_data_keys:
-                        for meta_data_values in data[table_data_key].values():
-                            meta_data_entry = [meta_data_values[i] if i in meta_data_values else False for i in meta_data.columns]
-                            if False not in meta_data_entry:
-                                meta_data = pd.concat([meta_data, pd.DataFrame([meta_data_entry], columns = meta_data.columns)], ignore_index = True)
-                    if len(meta_data) > 0:
-                        self.meta_data[table_key] = meta_data
+                columns = self.tables[table_key].data_columns
+                # the complete entries of all data keys of the table are collected and converted at once
+                rows = [[values[i] for i in columns] for key in data_keys if table_key in key for values in data[key].values() if isinstance(values, dict) and all([i in values for i in columns])]
+                if len(rows) > 0:
+                    self.meta_data[table_key] = pd.DataFrame(rows, columns = columns, dtype = object)
         if self.TRACKER_NAMES in data.keys():
             self.tracker_names = data[self.TRACKER_NAMES]
+        if self.DB_RETENTION in data:
+            invalid_keys = [key for key in data[self.DB_RETENTION].keys() if key not in self.tables.keys()]
+            if len(invalid_keys) != 0:
+                raise Exception("Retention defined for the undefined tables %s"%(str(invalid_keys)))
+            self.db_retention = data[self.DB_RETENTION]
+        if self.DB_RESAMPLE in data:
+            invalid_keys = [key for key in data[self.DB_RESAMPLE].keys() if key not in self.RESAMPLE_KEYS]
+            if len(invalid_keys) != 0:
+                raise Exception("Invalid resample settings %s, valid settings are %s"%(str(invalid_keys), ", ".join(self.RESAMPLE_KEYS)))
+            self.db_resample = data[self.DB_RESAMPLE]
+        if self.DB_VALIDATION in data:
+            invalid_keys = [key for key in data[self.DB_VALIDATION].keys() if key not in self.VALIDATION_KEYS]
+            if len(invalid_keys) != 0:
+                raise Exception("Invalid validation settings %s, valid settings are %s"%(str(invalid_keys), ", ".join(self.VALIDATION_KEYS)))
+            self.db_validation = data[self.DB_VALIDATION]
+        if self.DB_META_FILES in data:
+            invalid_keys = [key for key in data[self.DB_META_FILES].keys() if key not in self.tables.keys()]
+            if len(invalid_keys) != 0:
+                raise Exception("Meta files defined for the undefined tables %s"%(str(invalid_keys)))
+            for filename in data[self.DB_META_FILES].values():
+                if os.path.splitext(filename)[1].lower() not in self.META_FILE_EXTENSIONS:
+                    raise Exception("Invalid meta file %s, valid extensions are %s"%(filename, ", ".join(self.META_FILE_EXTENSIONS)))
+            self.db_meta_files = data[self.DB_META_FILES]
+        if self.DB_STAGING in data:
+            if data[self.DB_STAGING] not in self.STAGING_MODES:
+                raise Exception("Invalid staging mode %s, valid modes are %s"%(str(data[self.DB_STAGING]), ", ".join(self.STAGING_MODES)))
+            self.db_staging = data[self.DB_STAGING]
     
     def __generate_dbtable(self, table_name: str, table: dict):
         """
@@ -160,9 +243,9 @@ class Config:
         Raises:
             Exception: The exception is raised in case the json of the table is invalid.
         """
-        if (len(table.keys()) > 3):
+        if (len(table.keys()) > 4):
             raise Exception("Invalid number of entries for table %s found: %s"%(table_name, str(table.keys())))
-        invalid_keys = [key for key in table.keys() if key not in [self.DB_TABLE_COLUMNS, self.DB_TABLE_PRIMARY_KEY, self.TABLE_NAME]]
+        invalid_keys = [key for key in table.keys() if key not in [self.DB_TABLE_COLUMNS, self.DB_TABLE_PRIMARY_KEY, self.DB_TABLE_INDEXES, self.TABLE_NAME]]
         if len(invalid_keys) != 0:
             raise Exception("%s is undefined for table %s"%(str(invalid_keys), table_name))
         if self.TABLE_NAME not in table.keys():
@@ -176,5 +259,28 @@ class Config:
                 data_types.append(self.db_types[column])
             else:
                 raise Exception("No data type found for column %s"%(column))
-        self.tables[table_name] = DBTable(table[self.TABLE_NAME], columns, data_types, table[self.DB_TABLE_PRIMARY_KEY] if self.DB_TABLE_PRIMARY_KEY in table.keys() else [])
+        indexes = [self.__generate_dbindex(table_name, index_name, index) for index_name, index in table[self.DB_TABLE_INDEXES].items()] if self.DB_TABLE_INDEXES in table.keys() else []
+        self.tables[table_name] = DBTable(table[self.TABLE_NAME], columns, data_types, table[self.DB_TABLE_PRIMARY_KEY] if self.DB_TABLE_PRIMARY_KEY in table.keys() else [], indexes)
+
+    def __generate_dbindex(self, table_name: str, index_name: str, index: dict) -> DBIndex:
+        """
+        Generate the DBIndex object for the given index of a table.
+
+        Args:
+            table_name (str): The name of the table.
+            index_name (str): The name of the index.
+            index (dict): The input of the index parsed from json, i.e. the key columns, optionally the included columns (covering index) and the where clause (partial index).
+
+        Raises:
+            Exception: The exception is raised in case the json of the index is invalid.
+
+        Returns:
+            DBIndex: The DBIndex object.
+        """
+        invalid_keys = [key for key in index.keys() if key not in [self.DB_TABLE_COLUMNS, self.DB_INDEX_INCLUDE, self.DB_INDEX_CONDITION]]
+        if len(invalid_keys) != 0:
+            raise Exception("%s is undefined for index %s of table %s"%(str(invalid_keys), index_name, table_name))
+        if self.DB_TABLE_COLUMNS not in index.keys():
+            raise Exception("No columns defined for index %s of table %s"%(index_name, table_name))
+        return DBIndex(index_name, index[self.DB_TABLE_COLUMNS], index[self.DB_INDEX_INCLUDE] if self.DB_INDEX_INCLUDE in index.keys() else [], index[self.DB_INDEX_CONDITION] if self.DB_INDEX_CONDITION in index.keys() else None)
 
@@ -0,0 +1,126 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+import threading
+from urllib.parse import quote
+
+class ConnectionPool:
+    """
+    The ConnectionPool holds a bounded number of read only connections, which are shared by the threads of the process.
+    A thread borrows a connection for the duration of a query, a thread exceeding the bound waits until a connection is returned.
+    """
+    def __init__(self, max_connections: int = 4, timeout: float = None):
+        """
+        Initialize the connection pool.
+
+        Args:
+            max_connections (int, optional): The maximum number of connections open at the same time. Defaults to 4.
+            timeout (float, optional): The maximum time in seconds to wait for a free connection. Defaults to None (wait forever).
+
+        Raises:
+            Exception: The exception is raised in case the maximum number of connections is invalid.
+        """
+        if max_connections < 1:
+            raise Exception("Invalid number of connections %i given!"%(max_connections))
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.semaphore = threading.BoundedSemaphore(max_connections)
+        self.lock = threading.Lock()
+        self.idle_connections = {}
+        self.connection_count = 0
+
+    def acquire(self, db_fullpath: str) -> sqlite3.Connection:
+        """
+        Borrow a read only connection to the given database.
+
+        Args:
+            db_fullpath (str): The full path to the database.
+
+        Raises:
+            Exception: The exception is raised in case no connection became available within the timeout.
+
+        Returns:
+            sqlite3.Connection: The read only connection.
+        """
+        if not self.semaphore.acquire(timeout = self.timeout):
+            raise Exception("No connection to %s available within %s seconds!"%(db_fullpath, str(self.timeout)))
+        with self.lock:
+            idle_connections = self.idle_connections.get(db_fullpath, [])
+            if len(idle_connections) != 0:
+                return idle_connections.pop()
+            self._close_idle_connection()
+            self.connection_count += 1
+        try:
+            return sqlite3.connect(get_read_only_uri(db_fullpath), uri = True, check_same_thread = False)
+        except BaseException as e:
+            with self.lock:
+                self.connection_count -= 1
+            self.semaphore.release()
+            raise e
+
+    def release(self, db_fullpath: str, conn: sqlite3.Connection):
+        """
+        Return a borrowed connection to the pool.
+
+        Args:
+            db_fullpath (str): The full path to the database of the connection.
+            conn (sqlite3.Connection): The borrowed connection.
+        """
+        conn.rollback()
+        for attached in conn.execute("""PRAGMA database_list;""").fetchall():
+            if attached[1] not in ["main", "temp"]:
+                conn.execute("""DETACH DATABASE %s;"""%(attached[1]))
+        with self.lock:
+            self.idle_connections.setdefault(db_fullpath, []).append(conn)
+        self.semaphore.release()
+
+    def close(self):
+        """
+        Close all idle connections of the pool.
+        """
+        with self.lock:
+            for idle_connections in self.idle_connections.values():
+                for conn in idle_connections:
+                    conn.close()
+                    self.connection_count -= 1
+            self.idle_connections = {}
+
+    def _close_idle_connection(self):
+        """
+        Close an idle connection of another database, if the pool is full, the lock must be held.
+        """
+        if self.connection_count < self.max_connections:
+            return
+        for idle_connections in self.idle_connections.values():
+            if len(idle_connections) != 0:
+                idle_connections.pop(0).close()
+                self.connection_count -= 1
+                return
+
+def get_read_only_uri(db_fullpath: str) -> str:
+    """
+    Get the uri to open the database in read only mode.
+
+    Args:
+        db_fullpath (str): The full path to the database.
+
+    Returns:
+        str: The read only uri of the database.
+    """
+    return "file:%s?mode=ro"%(quote(os.path.abspath(db_fullpath)))
@@ -0,0 +1,190 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from kpi_engine import KPIEngine
+
+RULE_TIMESTAMP = "timestamp"
+RULE_DUPLICATE = "duplicate"
+RULE_NEGATIVE = "negative"
+RULE_PRODUCTION_SUM = "production_sum"
+RULE_LIMIT = "peak_power"
+
+class DataValidator:
+    """
+    The DataValidator checks the rows of the input files before they are written into the raw tables.
+    Each rule is evaluated as one column expression over all rows:
+    "timestamp" flags unparsable timestamps, "duplicate" flags the repeated timestamps of a file (the first row is kept),
+    "negative" flags negative production, "production_sum" flags a production deviating from the sum of the trackers by more than the relative tolerance
+    and "peak_power" flags a tracker producing more than its peak power derived from the meta data times the limit factor. Missing values fail no rule.
+    The failing rows are stored with their failed rules in the quarantine table and removed from the input, the number of rows failing each rule is stored per file in the report table.
+    """
+    QUARANTINE_TABLE_NAME = "raw_quarantine"
+    REPORT_TABLE_NAME = "raw_quality_report"
+    FILE_NAME = "file_name"
+    ROW_NUMBER = "row_number"
+    TIMESTAMP = "timestamp"
+    RULES_COLUMN = "rules"
+    DATA_COLUMN = "data"
+    ROW_COUNT = "row_count"
+    QUARANTINED = "quarantined"
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+    RULES = [RULE_TIMESTAMP, RULE_DUPLICATE, RULE_NEGATIVE, RULE_PRODUCTION_SUM, RULE_LIMIT]
+    SUM_TOLERANCE = 0.05
+    LIMIT_FACTOR = 1.25
+
+    def __init__(self, db_connector: DBConnector, tracker_columns: list[str], production_column: str = None, limits: dict = {}, rules: list[str] = RULES, sum_tolerance: float = SUM_TOLERANCE, quarantine_table_name: str = QUARANTINE_TABLE_NAME, report_table_name: str = REPORT_TABLE_NAME):
+        """
+        Initialize the data validator.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            tracker_columns (list[str]): The data columns of the production of the trackers.
+            production_column (str, optional): The data column of the production of the plant. Defaults to None (no plant production).
+            limits (dict, optional): The maximum value of each tracker column, see get_tracker_limits. Defaults to {} (no limits).
+            rules (list[str], optional): The rules to evaluate. Defaults to all rules.
+            sum_tolerance (float, optional): The tolerated deviation of the production from the sum of the trackers relative to the production. Defaults to 0.05.
+            quarantine_table_name (str, optional): The name of the quarantine table. Defaults to "raw_quarantine".
+            report_table_name (str, optional): The name of the report table. Defaults to "raw_quality_report".
+
+        Raises:
+            Exception: The exception is raised in case of an unknown rule.
+        """
+        invalid_rules = [i for i in rules if i not in self.RULES]
+        if len(invalid_rules) != 0:
+            raise Exception("Invalid rules %s, valid rules are %s"%(str(invalid_rules), ", ".join(self.RULES)))
+        self.db_connector = db_connector
+        self.tracker_columns = tracker_columns
+        self.production_column = production_column
+        self.limits = limits
+        self.rules = rules
+        self.sum_tolerance = sum_tolerance
+        self.quarantine_table = DBTable(
+            quarantine_table_name,
+            pd.core.indexes.base.Index([self.FILE_NAME, self.ROW_NUMBER, self.TIMESTAMP, self.RULES_COLUMN, self.DATA_COLUMN]),
+            ["TEXT", "INTEGER", "TEXT", "TEXT", "TEXT"],
+            [self.FILE_NAME, self.ROW_NUMBER]
+        )
+        self.report_table = DBTable(
+            report_table_name,
+            pd.core.indexes.base.Index([self.FILE_NAME, self.ROW_COUNT, self.QUARANTINED] + self.rules),
+            ["TEXT"] + ["INTEGER"] * (len(self.rules) + 2),
+            [self.FILE_NAME]
+        )
+
+    @staticmethod
+    def get_tracker_limits(meta_data: pd.core.frame.DataFrame, tracker_columns: dict, limit_factor: float = LIMIT_FACTOR) -> dict:
+        """
+        Get the maximum production of each tracker, i.e. its peak power in kW at 1000 W per square meter times the limit factor.
+
+        Args:
+            meta_data (pd.core.frame.DataFrame): The tracker meta data (panel size in mm and efficiency in percent).
+            tracker_columns (dict): The data column of each tracker name of the meta data, the trackers without data column are skipped.
+            limit_factor (float, optional): The factor of the peak power, e.g. to convert it into the unit of the production. Defaults to 1.25.
+
+        Returns:
+            dict: The maximum value of each tracker column.
+        """
+        meta_data = meta_data[meta_data[KPIEngine.TRACKER_NAME].isin(tracker_columns.keys())]
+        area = pd.to_numeric(meta_data[KPIEngine.SOLAR_PANEL_WIDTH]) * pd.to_numeric(meta_data[KPIEngine.SOLAR_PANEL_HEIGHT]) / 1e6
+        peak_power = area * pd.to_numeric(meta_data[KPIEngine.SOLAR_PANEL_EFFICIENCY]) / 100 * pd.to_numeric(meta_data[KPIEngine.SOLAR_PANEL_NUMBER])
+        return {tracker_columns[name]: float(limit) for name, limit in zip(meta_data[KPIEngine.TRACKER_NAME], peak_power * limit_factor)}
+
+    def evaluate(self, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Evaluate the rules.
+
+        Args:
+            data (pd.core.frame.DataFrame): The input rows, optionally with the file name column.
+
+        Returns:
+            pd.core.frame.DataFrame: True for each row (same index as the input) failing the rule (column).
+        """
+        result = {}
+        timestamps = pd.to_datetime(data[self.TIMESTAMP].astype(str), format = self.TIMESTAMP_FORMAT, errors = "coerce")
+        production_columns = [i for i in self.tracker_columns + [self.production_column] if i != None and i in data.columns]
+        values = data[production_columns].apply(pd.to_numeric, errors = "coerce")
+        if RULE_TIMESTAMP in self.rules:
+            result[RULE_TIMESTAMP] = timestamps.isna().values
+        if RULE_DUPLICATE in self.rules:
+            keys = [self.FILE_NAME, self.TIMESTAMP] if self.FILE_NAME in data.columns else [self.TIMESTAMP]
+            result[RULE_DUPLICATE] = data.duplicated(keys, keep = "first").values
+        if RULE_NEGATIVE in self.rules:
+            result[RULE_NEGATIVE] = (values < 0).any(axis = 1).values
+        if RULE_PRODUCTION_SUM in self.rules:
+            trackers = [i for i in self.tracker_columns if i in values.columns]
+            if self.production_column in values.columns and len(trackers) != 0:
+                production = values[self.production_column]
+                deviation = (production - values[trackers].sum(axis = 1, skipna = False)).abs()
+                result[RULE_PRODUCTION_SUM] = (deviation > self.sum_tolerance * production.abs()).values
+            else:
+                result[RULE_PRODUCTION_SUM] = np.zeros(len(data), dtype = bool)
+        if RULE_LIMIT in self.rules:
+            limited = [i for i in self.limits.keys() if i in values.columns]
+            limits = pd.Series([self.limits[i] for i in limited], index = limited, dtype = np.float64)
+            result[RULE_LIMIT] = values[limited].gt(limits, axis = 1).any(axis = 1).values if len(limited) != 0 else np.zeros(len(data), dtype = bool)
+        return pd.core.frame.DataFrame(result, index = data.index, columns = self.rules)
+
+    def validate(self, data: pd.core.frame.DataFrame) -> tuple[pd.core.frame.DataFrame, pd.core.frame.DataFrame]:
+        """
+        Evaluate the rules, quarantine the failing rows and store the report of each file.
+
+        Args:
+            data (pd.core.frame.DataFrame): The input rows, optionally with the file name column (see search_csv_files).
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, pd.core.frame.DataFrame]: The valid rows without the file name column and the report of each file.
+        """
+        if self.TIMESTAMP not in data.columns:
+            return data.drop(columns = [self.FILE_NAME], errors = "ignore"), pd.core.frame.DataFrame(columns = self.report_table.data_columns)
+        failed = self.evaluate(data)
+        failing = failed.any(axis = 1).values
+        file_names = data[self.FILE_NAME].astype(str) if self.FILE_NAME in data.columns else pd.Series([""] * len(data), index = data.index)
+        data_columns = [i for i in data.columns if i != self.FILE_NAME]
+        if failing.any():
+            rows = data[failing]
+            rule_names = np.array(self.rules, dtype = object)
+            quarantine = pd.core.frame.DataFrame({
+                self.FILE_NAME: file_names[failing].values,
+                self.ROW_NUMBER: file_names.groupby(file_names).cumcount().values[failing] + 1,
+                self.TIMESTAMP: rows[self.TIMESTAMP].astype(str).values,
+                self.RULES_COLUMN: [",".join(rule_names[i]) for i in failed.values[failing]],
+                self.DATA_COLUMN: rows[data_columns].to_json(orient = "records", lines = True).splitlines()
+            })
+            self._write_table(self.quarantine_table, quarantine)
+        report = failed.groupby(file_names.values).sum().astype(np.int64)
+        report.insert(0, self.QUARANTINED, pd.Series(failing, index = data.index).groupby(file_names.values).sum().astype(np.int64))
+        report.insert(0, self.ROW_COUNT, file_names.groupby(file_names.values).size().astype(np.int64))
+        report = report.rename_axis(self.FILE_NAME).reset_index()
+        if len(report) != 0:
+            self._write_table(self.report_table, report)
+        return data.loc[~failing, data_columns].reset_index(drop = True), report
+
+    def _write_table(self, table: DBTable, data: pd.core.frame.DataFrame):
+        """
+        Upsert the data into the table, which is created, if it does not exist.
+
+        Args:
+            table (DBTable): The quarantine or the report table.
+            data (pd.core.frame.DataFrame): The rows of the table.
+        """
+        if not self.db_connector.test_table_exists(table.table_name):
+            self.db_connector.create_table(table)
+        self.db_connector.upsert_data(table, data)
@@ -20,12 +20,99 @@ import os
 import pandas as pd
 import re
 import numpy as np
+import threading
+import time
+import random
+import contextlib
+import functools
+
+from query_cache import QueryCache
+from connection_pool import ConnectionPool, get_read_only_uri
+from write_lock import WriteLock
+
+def retry_write(function):
+    """
+    Decorate a write method of the DBConnector, so the method holds the lock file of the connector (if any) and is repeated with exponential backoff, while the database is locked by another connection.
+    Beside the busy timeout a retry is required, since SQLite fails immediately, if a reading transaction cannot be upgraded to a writing one. The committed work of an aborted call is skipped by the repetition (e.g. the existing rows are not inserted again).
+    A write method called by another one runs within the attempt of the outer method.
+
+    Args:
+        function (Callable): The write method.
+
+    Returns:
+        Callable: The decorated method.
+    """
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self.thread_state, "writing", False):
+            return function(self, *args, **kwargs)
+        attempt = 0
+        while True:
+            self.thread_state.writing = True
+            try:
+                with self._get_write_lock():
+                    return function(self, *args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e) or attempt >= self.write_retries:
+                    raise
+                # the jitter keeps competing writers from retrying at the same time
+                time.sleep(self.RETRY_DELAY * 2 ** attempt * (1 + random.random()))
+                attempt += 1
+            finally:
+                self.thread_state.writing = False
+    return wrapper
+
+def is_busy_error(error: sqlite3.OperationalError) -> bool:
+    """
+    Test, if the error is caused by the lock of another connection.
+
+    Args:
+        error (sqlite3.OperationalError): The error of SQLite.
+
+    Returns:
+        bool: True, if the database (or a table) is locked or busy, False otherwise.
+    """
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+class DBIndex:
+    """
+    Definition of a secondary index of a database table.
+    """
+    def __init__(self, index_name: str, column_list: list[str], include_list: list[str] = [], condition: str = None):
+        """
+        Initialize the database index.
+
+        Args:
+            index_name (str): The name of the index.
+            column_list (list[str]): The key columns of the index in the order of the lookup, e.g. tracker first.
+            include_list (list[str], optional): The columns appended to the key, so the index covers reads of these columns without visiting the table. Defaults to [].
+            condition (str, optional): The where clause of a partial index. Defaults to None (all rows).
+
+        Raises:
+            Exception: The exception is raised in case no key column is given.
+        """
+        if len(column_list) == 0:
+            raise Exception("Missing columns for the index %s!"%(index_name))
+        self.index_name = index_name
+        self.column_list = column_list
+        self.include_list = include_list
+        self.condition = condition
+
+    def get_indexed_columns(self) -> list[str]:
+        """
+        Get all columns stored in the index.
+
+        Returns:
+            list[str]: The key columns followed by the included columns.
+        """
+        return self.column_list + [i for i in self.include_list if i not in self.column_list]
 
 class DBTable:
     """
     Definition of a database table.
     """
-    def __init__(self, table_name: str, data_columns: pd.core.indexes.base.Index, data_types: list[str], primary_key_list: list[str] = []):
+    def __init__(self, table_name: str, data_columns: pd.core.indexes.base.Index, data_types: list[str], primary_key_list: list[str] = [], indexes: list[DBIndex] = []):
         """
         Initialize the database table.
 
@@ -34,19 +121,24 @@ class DBTable:
             data_columns (pd.core.indexes.base.Index): The column names of the table.
             data_types (list[str]): The data types of the data columns in the data base.
             primary_key_list (list[str], optional): A list of primary keys, is empty, if the table has none. Defaults to [].
+            indexes (list[DBIndex], optional): The secondary indexes of the table. Defaults to [].
 
         Raises:
-            Exception: The exception is raised in case the number of data columns is not equals to the numer of data types or the primary key is invalid.
+            Exception: The exception is raised in case the number of data columns is not equals to the numer of data types, the primary key or an index is invalid.
         """
         self.table_name = table_name
         self.data_columns = data_columns
         self.data_types = data_types
         self.primary_key_list = primary_key_list
+        self.indexes = indexes
         if len(data_columns) != len(data_types):
             raise Exception("Invalid data_columns = %s and data_types = %s given!"%(str(data_columns.tolist()), str(data_types)))
         not_in_data_columns = [i for i in primary_key_list if i not in data_columns]
         if len(not_in_data_columns) != 0:
             raise Exception("The following primary keys are not in the data_columns defined: %s"%(str(not_in_data_columns)))
+        not_in_data_columns = [i for index in indexes for i in index.get_indexed_columns() if i not in data_columns]
+        if len(not_in_data_columns) != 0:
+            raise Exception("The following index columns are not in the data_columns defined: %s"%(str(not_in_data_columns)))
     
     def get_column_dict(self) -> dict:
         """
@@ -65,18 +157,123 @@ class DBConnector:
     The DBConnector defines a connection to a sqlite DB.
     """
     PRIMARY_KEY = "PRIMARY KEY"
+    SHARD_COLUMN = "timestamp"
+    SHARD_YEAR = "year"
+    SHARD_MONTH = "month"
+    SHARD_KEY_LENGTH = {SHARD_YEAR: 4, SHARD_MONTH: 7}
+    SHARD_ALIAS = "shard_%i"
+    MAX_ATTACHED = 10
+    TRACKER_COLUMN = "tracker_name"
+    MONTH_KEY_LENGTH = 7
+    ZONE_MAP_TABLE_NAME = "zone_map"
+    CENTRAL_ALIAS = "central"
+    ZONE_MAP_COLUMNS = ["table_name", "tracker_name", "month", "min_timestamp", "max_timestamp", "row_count", "checksum"]
+    ZONE_MAP_TYPES = ["TEXT", "TEXT", "TEXT", "DATE", "DATE", "INTEGER", "INTEGER"]
+    NUMERIC_TYPES = ["REAL", "INTEGER", "INT", "NUMERIC", "FLOAT", "DOUBLE"]
+    ROLLUP_SUFFIX = "_hourly"
+    ROLLUP_COUNT_COLUMN = "sample_count"
+    CANCEL_CHECK_STEPS = 1000
+    BUSY_TIMEOUT = 5.0
+    WRITE_RETRIES = 5
+    RETRY_DELAY = 0.05
+    LOCK_EXTENSION = ".lock"
+    WRITE_BATCH_SIZE = 50000
+    MIN_WRITE_BATCH_SIZE = 500
+    MAX_LOCK_SECONDS = 0.5
 
-    def __init__(self, wd: str, db_name: str):
+    def __init__(self, wd: str, db_name: str, shard_by: str = None, zone_map: bool = False, cache_size: int = 0, read_only: bool = False, pool_size: int = 4, journal_mode: str = None, busy_timeout: float = BUSY_TIMEOUT, write_retries: int = WRITE_RETRIES, lock_file: bool = False, write_batch_size: int = WRITE_BATCH_SIZE, max_lock_seconds: float = MAX_LOCK_SECONDS):
         """
         Initialize the DBConnector
 
         Args:
             wd (str): The path to the database.
             db_name (str): The name of the database.
+            shard_by (str, optional): Route the rows of all tables with a timestamp column into per year ("year") or per month ("month") database files, the remaining tables stay in the central database. Defaults to None (no sharding).
+            zone_map (bool, optional): Maintain the zone map summary (min / max timestamp, row count and checksum per table, tracker and month) on every insert. Once a table has zone map entries, every connector keeps them in sync. Defaults to False.
+            cache_size (int, optional): The memory budget in bytes of the query result cache, the cache is invalidated as soon as any connection changes the database. Defaults to 0 (no cache).
+            read_only (bool, optional): Open read only connections from a bounded pool, which can be shared by the threads of the process. Defaults to False.
+            pool_size (int, optional): The maximum number of read only connections open at the same time. Defaults to 4.
+            journal_mode (str, optional): The journal mode set on each read / write connection, e.g. "WAL" to allow readers while writing. Defaults to None (keep the journal mode of the database).
+            busy_timeout (float, optional): The time in seconds a statement waits for the lock of another connection. Defaults to 5.0.
+            write_retries (int, optional): The number of repetitions of a write call, which failed due to the lock of another connection. Defaults to 5.
+            lock_file (bool, optional): Queue the write calls of all processes using the lock file <db_name>.lock. Defaults to False.
+            write_batch_size (int, optional): The maximum number of rows inserted in one transaction. Defaults to 50000.
+            max_lock_seconds (float, optional): The target duration of a write transaction, the batch size is halved, if a batch takes longer, and doubled (up to write_batch_size), if it is much faster. Defaults to 0.5.
+
+        Raises:
+            Exception: The exception is raised in case an invalid shard mode or write setting is given.
         """
+        if shard_by != None and shard_by not in self.SHARD_KEY_LENGTH.keys():
+            raise Exception("Invalid shard mode %s, valid modes are %s"%(shard_by, ", ".join(self.SHARD_KEY_LENGTH.keys())))
+        if busy_timeout < 0 or write_retries < 0 or write_batch_size < 1 or max_lock_seconds <= 0:
+            raise Exception("Invalid busy timeout %s, retries %i, batch size %i or lock duration %s given!"%(str(busy_timeout), write_retries, write_batch_size, str(max_lock_seconds)))
         self.wd = wd
         self.db_name = db_name
         self.db_fullpath = os.path.join(wd, db_name)
+        self.shard_by = shard_by
+        self.zone_map = zone_map
+        self.zone_map_table = DBTable(self.ZONE_MAP_TABLE_NAME, pd.core.indexes.base.Index(self.ZONE_MAP_COLUMNS), self.ZONE_MAP_TYPES, self.ZONE_MAP_COLUMNS[:3])
+        self.query_cache = QueryCache(cache_size) if cache_size > 0 else None
+        self.version_connections = {}
+        self.version_lock = threading.Lock()
+        self.read_only = read_only
+        self.connection_pool = ConnectionPool(pool_size) if read_only else None
+        self.journal_mode = journal_mode
+        self.busy_timeout = busy_timeout
+        self.write_retries = write_retries
+        self.lock_fullpath = self.db_fullpath + self.LOCK_EXTENSION if lock_file else None
+        self.write_batch_size = write_batch_size
+        self.max_lock_seconds = max_lock_seconds
+        self.thread_state = threading.local()
+
+    def get_shard_name(self, shard_key: str) -> str:
+        """
+        Get the file name of the shard for the given shard key.
+
+        Args:
+            shard_key (str): The shard key, i.e. the year (YYYY) or the month (YYYY-MM).
+
+        Returns:
+            str: The file name of the shard.
+        """
+        name, extension = os.path.splitext(self.db_name)
+        return "%s_%s%s"%(name, shard_key, extension)
+
+    def get_rollup_table_name(self, table_name: str) -> str:
+        """
+        Get the name of the hourly rollup table of the given table.
+        A rollup table has the columns of its table, the numeric columns hold the hourly mean, and the number of aggregated rows in the column sample_count.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The name of the rollup table.
+        """
+        return table_name + self.ROLLUP_SUFFIX
+
+    def get_shard_keys(self) -> list[str]:
+        """
+        Get the keys of all shards existing in the working directory.
+
+        Returns:
+            list[str]: The sorted shard keys, empty if sharding is disabled.
+        """
+        if self.shard_by == None or not os.path.isdir(self.wd):
+            return []
+        name, extension = os.path.splitext(self.db_name)
+        key_pattern = r"\d{4}" if self.shard_by == self.SHARD_YEAR else r"\d{4}-\d{2}"
+        shard_regex = re.compile(r"%s_(%s)%s"%(re.escape(name), key_pattern, re.escape(extension)))
+        return sorted([match.group(1) for match in [shard_regex.fullmatch(i) for i in os.listdir(self.wd)] if match])
+
+    def get_shard_fullpaths(self) -> list[str]:
+        """
+        Get the full paths of all shards existing in the working directory, e.g. for archiving old shards.
+
+        Returns:
+            list[str]: The full paths of the shards, empty if sharding is disabled.
+        """
+        return [os.path.join(self.wd, self.get_shard_name(i)) for i in self.get_shard_keys()]
     
     def create_table(self, table: DBTable, data: pd.core.frame.DataFrame):
         """
@@ -86,13 +283,14 @@ class DBConnector:
             table (DBTable): The DBTable object of the table.
             data (pd.core.frame.DataFrame): The input data frame.
         """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
+        with self._get_context_manager(self.db_fullpath) as ccm:
             cur = ccm.get_cursor()
             if not self._test_table_exists(cur, table.table_name):
                 self._create_table(cur, table)
             self._insert_table_rows(cur, table, data)
             ccm.commit()
 
+    @retry_write
     def create_table(self, table: DBTable):
         """
         Create an empty table.
@@ -100,13 +298,15 @@ class DBConnector:
         Args:
             table (DBTable): The DBTable object of the table.
         """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
+        self._check_writable()
+        with self._get_context_manager(self.db_fullpath) as ccm:
             cur = ccm.get_cursor()
             if not self._test_table_exists(cur, table.table_name):
                 self._create_table(cur, table)
                 ccm.commit()
 
-    def create_index(self, index_name: str, table_name: str, column_list: list[str]):
+    @retry_write
+    def create_index(self, index_name: str, table_name: str, column_list: list[str], condition: str = None):
         """
         Function for creating indexes.
 
@@ -114,269 +314,875 @@ class DBConnector:
             index_name (str): The name of the index.
             table_name (str): The name of the table.
             column_list (list[str]): The list of columns to include in the index.
+            condition (str, optional): The where clause of a partial index. Defaults to None (all rows).
         
         Raises:
             Exception: The exception is raised, if the table does not exist or invalid columns are given.
         """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
-            self._create_index(ccm.get_cursor(), index_name, table_name, column_list)
+        self._check_writable()
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            self._create_index(ccm.get_cursor(), index_name, table_name, column_list, condition)
             ccm.commit()
+        for shard_fullpath in self.get_shard_fullpaths():
+            with self._get_context_manager(shard_fullpath) as ccm:
+                cur = ccm.get_cursor()
+                if self._test_table_exists(cur, table_name):
+                    self._create_index(cur, index_name, table_name, column_list, condition)
+                    ccm.commit()
 
-    def insert_data(self, table: DBTable, data: pd.core.frame.DataFrame):
-        """
-        Insert the data into the table.
-
-        Args:
-            table (DBTable): The DBTable object of the table.
-            data (pd.core.frame.DataFrame): The input data frame.
-        """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
-            self._insert_table_rows(ccm.get_cursor(), table, data)
-            ccm.commit()
-    
-    def select_data_unfiltered(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}) -> pd.core.frame.DataFrame:
+    def explain_data_range(self, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], order_by: dict[str, str] = {}, tracker_names: list[str] = None, condition: str = None) -> list[str]:
         """
-        Internal function for selecting data.
+        Get the query plan of the select of select_data_range. The plan is taken from the central database, whose schema the shards share.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
             select_columns (list[str], optional): The columns of the table to select. Defaults to [].
             order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+            condition (str, optional): An additional where clause, e.g. the condition of a partial index. Defaults to None.
 
         Returns:
-            pd.core.frame.DataFrame: The resulting data.
+            list[str]: The steps of the query plan, e.g. "SEARCH main_raw USING COVERING INDEX idx_main_raw_production (timestamp>? AND timestamp<?)".
         """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
-            return self._select_data_unfiltered(ccm.get_cursor(), table_name, select_columns, order_by)
+        range_condition, parameters = self._prepare_range_condition(start_timestamp, end_timestamp, tracker_names)
+        conditions = [i for i in [range_condition, condition] if i != None]
+        statement = self._prepare_select_statement(table_name, select_columns, order_by, None, " AND ".join(conditions) if len(conditions) != 0 else None)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            return [i[-1] for i in ccm.get_cursor().execute("""EXPLAIN QUERY PLAN %s;"""%(statement), parameters).fetchall()]
 
-    def test_table_exists(self, table_name: str) -> bool:
+    def verify_indexes(self, table: DBTable) -> pd.core.frame.DataFrame:
         """
-        Test, if the input table name exists in the database.
+        Verify, that the standard range reads of the table use its secondary indexes.
+        For each index the read restricts the leading timestamp respectively tracker column (or orders by any other leading column), selects the indexed columns of a covering index (all columns otherwise) and adds the condition of a partial index.
 
         Args:
-            table_name (str): The input table name.
-        
+            table (DBTable): The DBTable object of the table.
+
         Returns:
-            bool: True, if the given table exists in the database, False otherwise.
+            pd.core.frame.DataFrame: The index name, the query plan and whether the index is used for each index of the table.
         """
-        with self.ConnectorContextManager(self.db_fullpath) as ccm:
-            return self._test_table_exists(ccm.get_cursor(), table_name)
+        result = []
+        for index in table.indexes:
+            leading_column = index.column_list[0]
+            range_arguments = {}
+            order_by = {}
+            if leading_column == self.SHARD_COLUMN:
+                range_arguments = {"start_timestamp": "0000-01-01 00:00", "end_timestamp": "9999-12-31 23:59"}
+            elif leading_column == self.TRACKER_COLUMN:
+                range_arguments = {"tracker_names": [""]}
+            else:
+                order_by = {leading_column: "ASC"}
+            select_columns = index.get_indexed_columns() if len(index.include_list) != 0 else []
+            plan = self.explain_data_range(table.table_name, select_columns = select_columns, order_by = order_by, condition = index.condition, **range_arguments)
+            used = any([re.search(r"USING (COVERING )?INDEX %s\b"%(re.escape(index.index_name)), i) != None for i in plan])
+            result.append([index.index_name, "\n".join(plan), used])
+        return pd.DataFrame(result, columns = ["index_name", "plan", "used"])
 
-    def _test_table_exists(self, cur: sqlite3.Cursor, table_name: str) -> bool:
+    @retry_write
+    def insert_data(self, table: DBTable, data: pd.core.frame.DataFrame, ignore_existing: bool = False) -> int:
         """
-        Test, if the input table name exists in the given database.
+        Insert the data into the table, the existing rows are kept.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
-            table_name (str): The input table name.
-        
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            ignore_existing (bool, optional): Skip the existing rows by the primary key constraint instead of reading all stored keys, e.g. for the rows past the newest stored timestamp of a result table.
+                The stored keys are still read for a table with zone map, since its entries require the rows actually inserted. Defaults to False.
+
         Returns:
-            bool: True, if the given table exists in the input database, False otherwise.
+            int: The number of inserted rows.
         """
-        table_list = cur.execute("""SELECT name FROM sqlite_master WHERE type='table' AND name='%s';"""%table_name).fetchall()
-        return table_list != []
-    
-    def _create_table(self, cur: sqlite3.Cursor, table: DBTable):
+        self._check_writable()
+        if self._is_sharded_table(table):
+            return self._insert_sharded_data(table, data, ignore_existing)
+        return self._write_batches(data, self._insert_batch, table, ignore_existing)
+
+    def upsert_data(self, table: DBTable, data: pd.core.frame.DataFrame) -> dict:
         """
-        Internal function to create a table in the database.
+        Insert the new rows and update the stored rows, whose values differ from the input (e.g. a corrected re-export of a month).
+        If the zone map is enabled, the trackers and months whose row count and checksum equal the stored ones are skipped without reading them, the remaining rows are compared with the stored values by their primary key.
+        Each transaction (the rows of the central database or of one shard) is repeated on its own while the database is locked, so the rows of a committed transaction are counted once.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table (DBTable): The DBTable object of the table.
-        
+            data (pd.core.frame.DataFrame): The input data frame, of duplicated primary keys the last row is used.
+
         Raises:
-            Exception: The exception is raised in case no column data exist.
+            Exception: The exception is raised in case the table has no primary key.
+
+        Returns:
+            dict: The number of "inserted", "updated" and "unchanged" rows.
         """
-        column_data_type = table.get_column_dict()
-        if len(column_data_type) == 0:
-            raise Exception("Column data found!")
-        column_statement = ", ".join(["%s %s"%(key, column_data_type[key]) for key in column_data_type.keys()])
-        if len(table.primary_key_list) != 0:
-            column_statement += ", %s (%s)"%(self.PRIMARY_KEY, ", ".join([i for i in table.primary_key_list]))
-        create_statement = """CREATE TABLE %s(%s);"""%(table.table_name, column_statement)
-        cur.execute(create_statement)
+        self._check_writable()
+        if len(table.primary_key_list) == 0:
+            raise Exception("No primary key exists for table %s!"%(table.table_name))
+        data = data.drop_duplicates(table.primary_key_list, keep = "last")
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        data, counts["unchanged"], zone_map, schema_statements = self._prepare_upsert(table, data)
+        if len(data) == 0:
+            return counts
+        if self._is_sharded_table(table):
+            changed_data = [self._upsert_rows(table, shard_data, zone_map, shard_key, schema_statements) for shard_key, shard_data in data.groupby(self._get_shard_keys_of_data(data), sort = True)]
+        else:
+            changed_data = [self._upsert_rows(table, data, zone_map)]
+        counts["inserted"] = sum([i[0] for i in changed_data])
+        counts["updated"] = sum([i[1] for i in changed_data])
+        counts["unchanged"] += sum([i[2] for i in changed_data])
+        return counts
 
-    def _create_index(self, cur: sqlite3.Cursor, index_name: str, table_name: str, column_list: list[str]):
+    def select_data_range(self, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], order_by: dict[str, str] = {}, tracker_names: list[str] = None) -> pd.core.frame.DataFrame:
         """
-        Internal function for creating indexes.
+        Select the data of the given time range. If the zone map is enabled, months (and shards) without data in the range are pruned before the table is read.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
-            index_name (str): The name of the index.
-            table_name (str): The name of the table.
-            column_list (list[str]): The list of columns to include in the index.
-        
-        Raises:
-            Exception: The exception is raised, if the table does not exist or invalid columns are given.
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
         """
-        if not(self._test_table_exists(cur, table_name)):
-            raise Exception("The table %s does not exist!"%(table_name))
-        if len(column_list) != 0:
-            table_columns = self._get_table_column_names(cur, table_name)
-            missing_columns = [i for i in column_list if i not in table_columns]
-            if len(missing_columns) != 0:
-                raise Exception("The input columns %s do not exist in table %s!"%(", ".join(missing_columns), table_name))
-            if not self._test_index_exists(cur, index_name, table_name):
-                cur.execute("""CREATE INDEX %s ON %s(%s);"""%(index_name, table_name,", ".join(column_list)))
-        else:
-            raise Exception("Missing columns for creating an index!")
+        cache_key = ("select_data_range", table_name, start_timestamp, end_timestamp, tuple(select_columns), self._get_order_by_key(order_by), None if tracker_names == None else tuple(sorted(tracker_names)))
+        return self._select_cached(cache_key, self._read_data_range, table_name, start_timestamp, end_timestamp, select_columns, order_by, tracker_names)
 
-    def _test_index_exists(self, cur: sqlite3.Cursor, index_name: str, table_name: str) -> bool:
+    def _read_data_range(self, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], order_by: dict[str, str] = {}, tracker_names: list[str] = None) -> pd.core.frame.DataFrame:
         """
-        Test, if the index exists.
-        
+        Read the data of the given time range from the database bypassing the query cache.
+
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
-            index_name (str): The name of the index.
-            table_name (str): The name of the table.
-        
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
         Returns:
-            bool: True, if the index exists, false otherwise.
+            pd.core.frame.DataFrame: The resulting data.
         """
-        return len(cur.execute("""SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='%s' AND name='%s';"""%(table_name, index_name)).fetchall()) != 0
-    
-    def _insert_table_rows(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame):
+        condition, parameters = self._prepare_range_condition(start_timestamp, end_timestamp, tracker_names)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            months = None
+            if self.zone_map and self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+                months = self._get_zone_map_months(cur, table_name, start_timestamp, end_timestamp, tracker_names)
+            if months != None and len(months) == 0:
+                return self._select_data_unfiltered(cur, table_name, select_columns, order_by, None, "0", [])
+            if self.shard_by != None and self.SHARD_COLUMN in self._get_table_column_names(cur, table_name):
+                shard_keys = self.get_shard_keys()
+                if months != None:
+                    shard_keys = [i for i in shard_keys if i in set([month[:self.SHARD_KEY_LENGTH[self.shard_by]] for month in months])]
+                return self._select_sharded_data(cur, table_name, select_columns, order_by, shard_keys, condition, parameters)
+            return self._select_data_unfiltered(cur, table_name, select_columns, order_by, None, condition, parameters)
+
+    def select_data_chunks(self, table_name: str, chunk_size: int, select_columns: list[str] = [], start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None):
         """
-        Insert the data into the table of the database.
+        Stream the data of the table in chunks ordered by the primary key (the rowid, if there is none), so only one chunk is held in memory at a time.
+        Each chunk is read in a short transaction of its own (keyset pagination), so the caller may write into the database between the chunks. The query cache is bypassed.
+        If the table is sharded, the central database and the shards are read one after another in chronological order.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
-            table (DBTable): The DBTable object of the table.
-            data (pd.core.frame.DataFrame): The input data frame.
+            table_name (str): The input table name.
+            chunk_size (int): The maximum number of rows per chunk.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
 
         Raises:
-            Exception: The exception is raised in case the data could not be inserted due to an internal exception.
+            Exception: The exception is raised in case the chunk size is invalid.
+
+        Yields:
+            pd.core.frame.DataFrame: The next chunk of the resulting data.
         """
-        if (len(table.data_columns) != len(data.columns)):
-            raise Exception("The number of columns %i in table %s is different from the number of columns in the data %i"%(len(table.data_columns), table.table_name, len(data.columns)))
-        insert_statement = self._prepare_insert_column_statement(cur, table)
-        data_statement = self._prepare_data_statement(cur, table, data)
-        if data_statement == None:
-            return
-        execute_statement = """%s\n%s"""%(insert_statement, data_statement)
-        cur.execute(execute_statement)
+        if chunk_size < 1:
+            raise Exception("Invalid chunk size %i given!"%(chunk_size))
+        condition, parameters = self._prepare_range_condition(start_timestamp, end_timestamp, tracker_names)
+        db_fullpaths = [self.db_fullpath]
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if self.shard_by != None and self._test_table_exists(cur, table_name) and self.SHARD_COLUMN in self._get_table_column_names(cur, table_name):
+                db_fullpaths += self.get_shard_fullpaths()
+        for db_fullpath in db_fullpaths:
+            last_key = None
+            while True:
+                with self._get_context_manager(db_fullpath) as ccm:
+                    cur = ccm.get_cursor()
+                    if not self._test_table_exists(cur, table_name):
+                        break
+                    columns = list(self._get_result_columns(cur, table_name, select_columns))
+                    key_columns = list(self._get_table_column_names(cur, table_name, None, True))
+                    key_columns = key_columns if len(key_columns) != 0 else ["rowid"]
+                    query_columns = columns + [i for i in key_columns if i not in columns]
+                    conditions = [] if condition == None else [condition]
+                    query_parameters = list(parameters)
+                    if last_key != None:
+                        conditions.append("(%s) > (%s)"%(", ".join(key_columns), ", ".join(["?"] * len(key_columns))))
+                        query_parameters += last_key
+                    select_statement = self._prepare_select_statement(table_name, query_columns, {i: "ASC" for i in key_columns}, None, " AND ".join(conditions) if len(conditions) != 0 else None)
+                    rows = cur.execute("%s LIMIT %i"%(select_statement, chunk_size), query_parameters).fetchall()
+                if len(rows) == 0:
+                    break
+                last_key = [rows[-1][query_columns.index(i)] for i in key_columns]
+                yield pd.core.frame.DataFrame(rows, columns = query_columns)[columns]
+                if len(rows) < chunk_size:
+                    break
 
-    def _prepare_insert_column_statement(self, cur: sqlite3.Cursor, table: DBTable) -> str:
+    @retry_write
+    def delete_data_range(self, table: DBTable, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> int:
         """
-        This function generates the insert into table with columns statements.
+        Delete the rows of the given time range, the zone map entries of the affected months are recomputed.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table (DBTable): The DBTable object of the table.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the deletion to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        self._check_writable()
+        condition, parameters = self._prepare_range_condition(start_timestamp, end_timestamp, tracker_names)
+        months = []
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if self._has_zone_map(cur, table) and self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+                months = self._get_zone_map_months(cur, table.table_name, start_timestamp, end_timestamp, tracker_names) or []
+        deleted = 0
+        shard_keys = self.get_shard_keys() if self._is_sharded_table(table) else []
+        for shard_key, db_fullpath in zip([None] + shard_keys, [self.db_fullpath] + [os.path.join(self.wd, self.get_shard_name(i)) for i in shard_keys]):
+            # the zone map entries of the months of a shard are recomputed in the transaction of the deletion
+            shard_months = [i for i in months if shard_key == None or i.startswith(shard_key)]
+            with self._get_context_manager(db_fullpath) as ccm:
+                cur = ccm.get_cursor()
+                zone_map_schema = self._attach_central(cur) if shard_key != None and len(shard_months) != 0 else "main"
+                if self._test_table_exists(cur, table.table_name):
+                    count = cur.execute("""DELETE FROM %s%s;"""%(table.table_name, "" if condition == None else " WHERE " + condition), parameters).rowcount
+                    if count != 0 and len(shard_months) != 0:
+                        self._rebuild_zone_map(cur, table, shard_months, zone_map_schema)
+                    deleted += count
+                    ccm.commit()
+        return deleted
+
+    @retry_write
+    def upsert_tables(self, tables: list[DBTable], data: list[pd.core.frame.DataFrame]) -> list[dict]:
+        """
+        Upsert the data of several tables in one transaction, e.g. derived results together with the state of their computation, so either all or none of the tables are changed.
+
+        Args:
+            tables (list[DBTable]): The DBTable objects of the tables, the tables must not be sharded.
+            data (list[pd.core.frame.DataFrame]): The input data frame of each table, of duplicated primary keys the last row is used.
 
         Raises:
-            Exception: The exception is raised in case the table does not exist or invalid columns are given.
+            Exception: The exception is raised in case the number of tables and data frames differ, a table is sharded, has no primary key or does not exist.
 
         Returns:
-            str: The insert statement.
+            list[dict]: The number of "inserted", "updated" and "unchanged" rows of each table.
         """
-        if not self._test_table_exists(cur, table.table_name):
-            raise Exception("The table %s does not exist!"%(table.table_name))
-        column_matches = self._get_column_raw_data(cur, table.table_name)
-        table_column_names = self._get_table_column_names(cur, table.table_name, column_matches, False)
-        table_primary_column_names = self._get_table_column_names(cur, table.table_name, column_matches, True)
-        if not all([i in table_column_names for i in table.data_columns]):
-            raise Exception("Invalid columns %s are given for table %s!"%(str(table.data_columns), table.table_name))
-        if not all([i in table.data_columns for i in table_primary_column_names]):
-            raise Exception("The primary keys %s are required for the table %s!"%(" ".join(table_primary_column_names), table.table_name))
-        insert_statement = "INSERT INTO %s (%s)"%(table.table_name, ", ".join(table.data_columns))
-        return insert_statement
-    
-    def _prepare_data_statement(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> str:
+        self._check_writable()
+        if len(tables) != len(data):
+            raise Exception("%i tables and %i data frames given!"%(len(tables), len(data)))
+        for table in tables:
+            if len(table.primary_key_list) == 0:
+                raise Exception("No primary key exists for table %s!"%(table.table_name))
+            if self._is_sharded_table(table):
+                raise Exception("The table %s is sharded!"%(table.table_name))
+        result = []
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            for table, table_data in zip(tables, data):
+                if not self._test_table_exists(cur, table.table_name):
+                    raise Exception("The table %s does not exist!"%(table.table_name))
+                table_data, unchanged = self._skip_unchanged_months(cur, table, table_data.drop_duplicates(table.primary_key_list, keep = "last"))
+                counts = {"inserted": 0, "updated": 0, "unchanged": unchanged}
+                if len(table_data) != 0:
+                    inserted_data, updated_data, counts["unchanged"] = self._upsert_table_rows(cur, table, table_data)
+                    counts["unchanged"] += unchanged
+                    counts["inserted"] = len(inserted_data)
+                    counts["updated"] = len(updated_data)
+                    if self._has_zone_map(cur, table):
+                        self._fold_upserted_rows(cur, table, inserted_data, updated_data)
+                result.append(counts)
+            ccm.commit()
+        return result
+
+    @retry_write
+    def replace_data_range(self, table: DBTable, data: pd.core.frame.DataFrame, start_timestamp: str = None, end_timestamp: str = None) -> int:
         """
-        Prepare the data statement for the given data.
+        Replace the rows of the given time range by the data, e.g. recomputed results. The rows are deleted and the data inserted in one transaction, for a sharded table in one transaction per shard.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table (DBTable): The DBTable object of the table.
-            data (pd.core.frame.DataFrame): The input data frame.
+            data (pd.core.frame.DataFrame): The input data frame, the rows must lie in the time range.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
 
         Raises:
-            Exception: The exception is raised in case no data are available.
+            Exception: The exception is raised in case the table does not exist.
 
         Returns:
-            str: The data part of the sql statement for the given data.
+            int: The number of deleted rows.
         """
-        values = data.values
-        if (len(values) == 0):
-            raise Exception("There should be data available!")
-        reduced_data = self._reduce_data(cur, table, data)
-        values = reduced_data.values
-        if (len(values) == 0):
-            return None
-        data_statement = "VALUES\n" + ",\n".join(["  (%s)"%(k) for k in [", ".join(["'%s'"%(str(j)) for j in i]) for i in values]]) + ";"
-        return data_statement
+        self._check_writable()
+        condition, parameters = self._prepare_range_condition(start_timestamp, end_timestamp)
+        delete_statement = """DELETE FROM %s%s;"""%(table.table_name, "" if condition == None else " WHERE " + condition)
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if not self._test_table_exists(cur, table.table_name):
+                raise Exception("The table %s does not exist!"%(table.table_name))
+            months = []
+            if self._has_zone_map(cur, table):
+                self._prepare_zone_map(cur, table, data)
+                if self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+                    # the months of the deleted and of the inserted rows are recomputed
+                    months = self._get_zone_map_months(cur, table.table_name, start_timestamp, end_timestamp) or []
+                    months = sorted(set(months) | set(data[self.SHARD_COLUMN].astype(str).str.slice(0, self.MONTH_KEY_LENGTH)))
+            if not self._is_sharded_table(table):
+                deleted = cur.execute(delete_statement, parameters).rowcount
+                if len(data) != 0:
+                    self._insert_table_rows(cur, table, data)
+                if len(months) != 0:
+                    self._rebuild_zone_map(cur, table, months)
+                ccm.commit()
+                return deleted
+            schema_statements = self._get_schema_statements(cur, table.table_name)
+            ccm.commit()
+        shard_data = dict(list(data.groupby(self._get_shard_keys_of_data(data), sort = True))) if len(data) != 0 else {}
+        deleted = 0
+        for shard_key in sorted(set(self.get_shard_keys()) | set(shard_data.keys())):
+            shard_months = [i for i in months if i.startswith(shard_key)]
+            with self._get_context_manager(os.path.join(self.wd, self.get_shard_name(shard_key))) as ccm:
+                cur = ccm.get_cursor()
+                zone_map_schema = self._attach_central(cur) if len(shard_months) != 0 else "main"
+                if not self._test_table_exists(cur, table.table_name):
+                    if shard_key not in shard_data:
+                        continue
+                    for statement in schema_statements:
+                        cur.execute(statement)
+                deleted += cur.execute(delete_statement, parameters).rowcount
+                if shard_key in shard_data:
+                    self._insert_table_rows(cur, table, shard_data[shard_key])
+                if len(shard_months) != 0:
+                    self._rebuild_zone_map(cur, table, shard_months, zone_map_schema)
+                ccm.commit()
+        return deleted
 
-    def _reduce_data(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+    def select_max_timestamp(self, table_name: str) -> str:
         """
-        Remove all data, that exist in the data base.
+        Select the newest timestamp of the table, including all shards.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
-            table (DBTable): The DBTable object of the table.
-            data (pd.core.frame.DataFrame): The input data frame.
+            table_name (str): The input table name.
 
         Returns:
-            pd.core.frame.DataFrame: The reduced data frame.
-
+            str: The newest timestamp, None if the table does not exist or is empty.
         """
-        if len(table.primary_key_list) == 0:
-            raise Exception("No primary key exists for table %s!"%(table.table_name))
-        select_statement = "SELECT " + ", ".join(table.primary_key_list)
-        result = cur.execute("""%s\nFROM %s"""%(select_statement, table.table_name)).fetchall()
-        pd_result = pd.core.frame.DataFrame(result, columns = table.primary_key_list)
-        merged = data.merge(pd_result, on=table.primary_key_list, how="left", indicator=True)
-        result_indices = merged[merged["_merge"] == "left_only"].index
-        reduced_data = data.loc[result_indices]
-        return reduced_data
+        max_timestamps = []
+        for db_fullpath in [self.db_fullpath] + self.get_shard_fullpaths():
+            with self._get_context_manager(db_fullpath) as ccm:
+                cur = ccm.get_cursor()
+                if self._test_table_exists(cur, table_name):
+                    max_timestamps.append(cur.execute("""SELECT MAX(%s) FROM %s;"""%(self.SHARD_COLUMN, table_name)).fetchall()[0][0])
+        max_timestamps = [i for i in max_timestamps if i != None]
+        return max(max_timestamps) if len(max_timestamps) != 0 else None
 
-    def _get_column_raw_data(self, cur: sqlite3.Cursor, table_name: str) -> list[str]:
+    def select_min_timestamp(self, table_name: str) -> str:
         """
-        Obtain the raw column data.
+        Select the oldest timestamp of the table, including all shards.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table_name (str): The input table name.
-        
+
         Returns:
-            list[str] : The raw column data of the table.
-        
-        Raises:
-            Exception: The exception is raised in case the table data could not be found.
+            str: The oldest timestamp, None if the table does not exist or is empty.
         """
-        statement = cur.execute("""SELECT sql FROM sqlite_master WHERE type='table' AND name='%s';"""%(table_name)).fetchall()[0][0]
-        pattern = r"CREATE TABLE %s\((.*)\)"%(table_name)
-        matches = re.findall(pattern, statement)
-        if (len(matches) != 1):
-            raise Exception("Invalid data columns found!")
-        split_pattern = r",\s+(?![^()]*\))"
-        column_matches: list[str] = re.split(split_pattern, matches[0])
-        return column_matches
+        min_timestamps = []
+        for db_fullpath in [self.db_fullpath] + self.get_shard_fullpaths():
+            with self._get_context_manager(db_fullpath) as ccm:
+                cur = ccm.get_cursor()
+                if self._test_table_exists(cur, table_name):
+                    min_timestamps.append(cur.execute("""SELECT MIN(%s) FROM %s;"""%(self.SHARD_COLUMN, table_name)).fetchall()[0][0])
+        min_timestamps = [i for i in min_timestamps if i != None]
+        return min(min_timestamps) if len(min_timestamps) != 0 else None
 
-    def _get_table_column_names(self, cur: sqlite3.Cursor, table_name: str, column_matches: list[str] = None, only_primary_columns: bool = False) -> pd.core.indexes.base.Index:
+    def get_column_types(self, table_name: str) -> dict:
         """
-        Obtain the column names of the given table.
+        Get the declared data types of the columns of the table.
 
         Args:
-            cur (sqlite3.Cursor): The Cursor object of the database.
             table_name (str): The input table name.
-            column_matches (list[str], optional): The raw column data of the table. Defaults to None (in this case the raw data will be retrieved).
-            only_primary_columns (bool, optional): Return only primary columns. Defaults to False.
-        
+
         Returns:
-            pd.core.indexes.base.Index : column names of the table.
-        
-        Raises:
-            Exception: The exception is raised in case the table data could not be found.
+            dict: The upper case data type of each column in the order of the table, empty if the table does not exist.
         """
-        if column_matches == None:
-            column_matches = self._get_column_raw_data(cur, table_name)
-        column_names = []
-        primary_key_matcher = re.compile(r"%s \(([\w\s,]+)\)"%(self.PRIMARY_KEY))
-        for column in column_matches:
-            match = primary_key_matcher.search(column)
-            if match:
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            return {i[1]: i[2].upper() for i in ccm.get_cursor().execute("""PRAGMA table_info('%s');"""%(table_name)).fetchall()}
+
+    def get_cache_statistics(self) -> dict:
+        """
+        Get the statistics of the query result cache.
+
+        Returns:
+            dict: The hits, misses, evictions, invalidations, entries, used size and memory budget of the cache, empty if the cache is disabled.
+        """
+        if self.query_cache == None:
+            return {}
+        return self.query_cache.get_statistics()
+
+    def close(self):
+        """
+        Close the connections used to track the version of the database and the idle connections of the read only pool.
+        """
+        with self.version_lock:
+            for conn in self.version_connections.values():
+                conn[1].close()
+            self.version_connections = {}
+        if self.connection_pool != None:
+            self.connection_pool.close()
+
+    def check_writable(self):
+        """
+        Check, if the database may be changed by this connector.
+
+        Raises:
+            Exception: The exception is raised in case the connector is read only.
+        """
+        self._check_writable()
+
+    def is_sharded_table(self, table: DBTable) -> bool:
+        """
+        Test, if the rows of the given table are routed into the shards.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: True, if sharding is enabled and the table has a timestamp column, False otherwise.
+        """
+        return self._is_sharded_table(table)
+
+    def get_create_statement(self, table: DBTable) -> str:
+        """
+        Get the create statement of a table, e.g. to create the table in another database.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Raises:
+            Exception: The exception is raised in case no column data exist.
+
+        Returns:
+            str: The create statement of the table.
+        """
+        column_data_type = table.get_column_dict()
+        if len(column_data_type) == 0:
+            raise Exception("Column data found!")
+        column_statement = ", ".join(["%s %s"%(key, column_data_type[key]) for key in column_data_type.keys()])
+        if len(table.primary_key_list) != 0:
+            column_statement += ", %s (%s)"%(self.PRIMARY_KEY, ", ".join([i for i in table.primary_key_list]))
+        return """CREATE TABLE %s(%s);"""%(table.table_name, column_statement)
+
+    @retry_write
+    def run_write(self, function, *args, **kwargs):
+        """
+        Run a write function of another connection (e.g. a transaction writing into the attached database) like a write method of the connector,
+        i.e. the function holds the lock file of the connector (if any) and is repeated with exponential backoff, while the database is locked by another connection.
+        The function must roll back its transaction on an error.
+
+        Args:
+            function (Callable): The write function.
+            args: The arguments of the write function.
+            kwargs: The keyword arguments of the write function.
+
+        Raises:
+            Exception: The exception is raised in case the connector is read only.
+
+        Returns:
+            Any: The return value of the write function.
+        """
+        self._check_writable()
+        return function(*args, **kwargs)
+
+    def has_zone_map(self, table: DBTable) -> bool:
+        """
+        Test, if the zone map is maintained for the given table, i.e. the zone map is enabled or has entries of the table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: True, if each write of the table updates the zone map, False otherwise.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            return self._has_zone_map(ccm.get_cursor(), table)
+
+    @retry_write
+    def rebuild_zone_map(self, table: DBTable):
+        """
+        Recompute the zone map entries of the given table from the stored data.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+        """
+        self._check_writable()
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            self._rebuild_zone_map(cur, table)
+            ccm.commit()
+
+    def get_zone_map(self, table_name: str) -> pd.core.frame.DataFrame:
+        """
+        Get the zone map entries of the given table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            pd.core.frame.DataFrame: The zone map entries ordered by tracker and month, empty if no zone map exists.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if not self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+                return pd.core.frame.DataFrame(columns = self.ZONE_MAP_COLUMNS)
+            return self._select_data_unfiltered(cur, self.ZONE_MAP_TABLE_NAME, self.ZONE_MAP_COLUMNS, {"tracker_name": "ASC", "month": "ASC"}, None, "table_name = ?", [table_name])
+    
+    def select_data_unfiltered(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}) -> pd.core.frame.DataFrame:
+        """
+        Internal function for selecting data.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        cache_key = ("select_data_unfiltered", table_name, tuple(select_columns), self._get_order_by_key(order_by))
+        return self._select_cached(cache_key, self._read_data_unfiltered, table_name, select_columns, order_by)
+
+    def _read_data_unfiltered(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}) -> pd.core.frame.DataFrame:
+        """
+        Read the data of the table from the database bypassing the query cache.
+
+        Args:
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if self.shard_by != None and self._test_table_exists(cur, table_name) and self.SHARD_COLUMN in self._get_table_column_names(cur, table_name):
+                return self._select_sharded_data(cur, table_name, select_columns, order_by)
+            return self._select_data_unfiltered(cur, table_name, select_columns, order_by)
+
+    def test_table_exists(self, table_name: str) -> bool:
+        """
+        Test, if the input table name exists in the database.
+
+        Args:
+            table_name (str): The input table name.
+        
+        Returns:
+            bool: True, if the given table exists in the database, False otherwise.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            return self._test_table_exists(ccm.get_cursor(), table_name)
+
+    def _test_table_exists(self, cur: sqlite3.Cursor, table_name: str) -> bool:
+        """
+        Test, if the input table name exists in the given database.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+        
+        Returns:
+            bool: True, if the given table exists in the input database, False otherwise.
+        """
+        table_list = cur.execute("""SELECT name FROM sqlite_master WHERE type='table' AND name='%s';"""%table_name).fetchall()
+        return table_list != []
+    
+    def _create_table(self, cur: sqlite3.Cursor, table: DBTable):
+        """
+        Internal function to create a table in the database.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+        
+        Raises:
+            Exception: The exception is raised in case no column data exist.
+        """
+        cur.execute(self.get_create_statement(table))
+
+    def _create_index(self, cur: sqlite3.Cursor, index_name: str, table_name: str, column_list: list[str], condition: str = None):
+        """
+        Internal function for creating indexes.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            index_name (str): The name of the index.
+            table_name (str): The name of the table.
+            column_list (list[str]): The list of columns to include in the index.
+            condition (str, optional): The where clause of a partial index. Defaults to None (all rows).
+        
+        Raises:
+            Exception: The exception is raised, if the table does not exist or invalid columns are given.
+        """
+        if not(self._test_table_exists(cur, table_name)):
+            raise Exception("The table %s does not exist!"%(table_name))
+        if len(column_list) != 0:
+            table_columns = self._get_table_column_names(cur, table_name)
+            missing_columns = [i for i in column_list if i not in table_columns]
+            if len(missing_columns) != 0:
+                raise Exception("The input columns %s do not exist in table %s!"%(", ".join(missing_columns), table_name))
+            if not self._test_index_exists(cur, index_name, table_name):
+                cur.execute("""CREATE INDEX %s ON %s(%s)%s;"""%(index_name, table_name,", ".join(column_list), " WHERE " + condition if condition != None else ""))
+        else:
+            raise Exception("Missing columns for creating an index!")
+
+    def _test_index_exists(self, cur: sqlite3.Cursor, index_name: str, table_name: str) -> bool:
+        """
+        Test, if the index exists.
+        
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            index_name (str): The name of the index.
+            table_name (str): The name of the table.
+        
+        Returns:
+            bool: True, if the index exists, false otherwise.
+        """
+        return len(cur.execute("""SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='%s' AND name='%s';"""%(table_name, index_name)).fetchall()) != 0
+    
+    def _insert_table_rows(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame, skip_reduce: bool = False, ignore_existing: bool = False) -> pd.core.frame.DataFrame:
+        """
+        Insert the data into the table of the database.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            skip_reduce (bool, optional): Skip the check for existing rows, e.g. if the zone map proves, that the data are new. Defaults to False.
+            ignore_existing (bool, optional): Skip the existing rows by the primary key constraint (INSERT OR IGNORE) instead of reading the stored keys. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case the data could not be inserted due to an internal exception.
+
+        Returns:
+            pd.core.frame.DataFrame: The rows actually inserted, all rows of the input, if the existing rows are ignored.
+        """
+        if (len(table.data_columns) != len(data.columns)):
+            raise Exception("The number of columns %i in table %s is different from the number of columns in the data %i"%(len(table.data_columns), table.table_name, len(data.columns)))
+        insert_statement = self._prepare_insert_column_statement(cur, table)
+        if (len(data.values) == 0):
+            raise Exception("There should be data available!")
+        if ignore_existing:
+            insert_statement = insert_statement.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+        reduced_data = data if skip_reduce or ignore_existing else self._reduce_data(cur, table, data)
+        data_statement = self._prepare_data_statement(cur, table, reduced_data)
+        if data_statement == None:
+            return reduced_data
+        execute_statement = """%s\n%s"""%(insert_statement, data_statement)
+        cur.execute(execute_statement)
+        return reduced_data
+
+    def _prepare_insert_column_statement(self, cur: sqlite3.Cursor, table: DBTable) -> str:
+        """
+        This function generates the insert into table with columns statements.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+
+        Raises:
+            Exception: The exception is raised in case the table does not exist or invalid columns are given.
+
+        Returns:
+            str: The insert statement.
+        """
+        if not self._test_table_exists(cur, table.table_name):
+            raise Exception("The table %s does not exist!"%(table.table_name))
+        column_matches = self._get_column_raw_data(cur, table.table_name)
+        table_column_names = self._get_table_column_names(cur, table.table_name, column_matches, False)
+        table_primary_column_names = self._get_table_column_names(cur, table.table_name, column_matches, True)
+        if not all([i in table_column_names for i in table.data_columns]):
+            raise Exception("Invalid columns %s are given for table %s!"%(str(table.data_columns), table.table_name))
+        if not all([i in table.data_columns for i in table_primary_column_names]):
+            raise Exception("The primary keys %s are required for the table %s!"%(" ".join(table_primary_column_names), table.table_name))
+        insert_statement = "INSERT INTO %s (%s)"%(table.table_name, ", ".join(table.data_columns))
+        return insert_statement
+    
+    def _prepare_data_statement(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> str:
+        """
+        Prepare the data statement for the given data.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame, the existing rows must already be removed.
+
+        Returns:
+            str: The data part of the sql statement for the given data, None if there are no data.
+        """
+        values = data.values
+        if (len(values) == 0):
+            return None
+        data_statement = "VALUES\n" + ",\n".join(["  (%s)"%(k) for k in [", ".join(["NULL" if pd.isna(j) else "'%s'"%(str(j)) for j in i]) for i in values]]) + ";"
+        return data_statement
+
+    def _skip_unchanged_months(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> tuple[pd.core.frame.DataFrame, int]:
+        """
+        Remove the rows of the trackers and months, whose row count and checksum equal the zone map, i.e. which are stored unchanged.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame without duplicated primary keys.
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, int]: The remaining rows and the number of skipped rows.
+        """
+        if len(data) == 0 or not self._has_zone_map(cur, table):
+            return data, 0
+        self._prepare_zone_map(cur, table, data)
+        stored = pd.core.frame.DataFrame(cur.execute("""SELECT tracker_name, month, row_count, checksum FROM %s WHERE table_name = ?;"""%(self.ZONE_MAP_TABLE_NAME), (table.table_name,)).fetchall(), columns = ["tracker_name", "month", "row_count", "checksum"])
+        if len(stored) == 0:
+            return data, 0
+        summary = self._summarize_zone_map(table, data)
+        summary["checksum"] = [self._to_signed_checksum(int(i)) for i in summary["checksum"]]
+        unchanged = summary.merge(stored, on = ["tracker_name", "month", "row_count", "checksum"], how = "inner")
+        if len(unchanged) == 0:
+            return data, 0
+        tracker_names = data[self.TRACKER_COLUMN].astype(str).values if self.TRACKER_COLUMN in table.data_columns else np.full(len(data), "")
+        months = data[self.SHARD_COLUMN].astype(str).str.slice(0, self.MONTH_KEY_LENGTH).values
+        skip = pd.MultiIndex.from_arrays([tracker_names, months]).isin(pd.MultiIndex.from_frame(unchanged[["tracker_name", "month"]]))
+        return data[~skip], int(skip.sum())
+
+    def _upsert_table_rows(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> tuple[pd.core.frame.DataFrame, pd.core.frame.DataFrame, int]:
+        """
+        Compare the data with the stored rows of the same primary keys, insert the new rows and update the changed rows.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame without duplicated primary keys.
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, pd.core.frame.DataFrame, int]: The inserted rows, the updated rows and the number of unchanged rows.
+        """
+        conditions = []
+        parameters = []
+        if self.SHARD_COLUMN in table.primary_key_list:
+            timestamps = data[self.SHARD_COLUMN].astype(str)
+            conditions.append("%s >= ? AND %s <= ?"%(self.SHARD_COLUMN, self.SHARD_COLUMN))
+            parameters += [timestamps.min(), timestamps.max()]
+        if self.TRACKER_COLUMN in table.primary_key_list:
+            tracker_names = list(data[self.TRACKER_COLUMN].astype(str).unique())
+            conditions.append("%s IN (%s)"%(self.TRACKER_COLUMN, ", ".join(["?"] * len(tracker_names))))
+            parameters += tracker_names
+        stored = self._select_data_unfiltered(cur, table.table_name, list(table.data_columns), {}, None, " AND ".join(conditions) if len(conditions) != 0 else None, parameters)
+        keys = pd.MultiIndex.from_arrays([data[i].astype(str).values for i in table.primary_key_list])
+        stored_keys = pd.MultiIndex.from_arrays([stored[i].astype(str).values for i in table.primary_key_list])
+        positions = stored_keys.get_indexer(keys)
+        exists = positions >= 0
+        changed = np.zeros(len(data), dtype = bool)
+        if exists.any():
+            changed[exists] = self._hash_rows(table, data[exists]) != self._hash_rows(table, stored.iloc[positions[exists]])
+        inserted_data = data[~exists]
+        updated_data = data[changed]
+        if len(inserted_data) != 0:
+            self._insert_table_rows(cur, table, inserted_data, True)
+        if len(updated_data) != 0:
+            value_columns = [i for i in table.data_columns if i not in table.primary_key_list]
+            column_data_type = table.get_column_dict()
+            rows = updated_data[value_columns + table.primary_key_list].astype(object)
+            for column in value_columns:
+                if column_data_type[column].upper() in self.NUMERIC_TYPES:
+                    rows[column] = pd.to_numeric(updated_data[column]).astype(object)
+            rows = rows.where(pd.notna(rows), None)
+            cur.executemany("""UPDATE %s SET %s WHERE %s;"""%(table.table_name, ", ".join(["%s = ?"%(i) for i in value_columns]), " AND ".join(["%s = ?"%(i) for i in table.primary_key_list])), rows.values.tolist())
+        return inserted_data, updated_data, int((exists & ~changed).sum())
+
+    def _reduce_data(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Remove all data, that exist in the data base.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            pd.core.frame.DataFrame: The reduced data frame.
+
+        """
+        if len(table.primary_key_list) == 0:
+            raise Exception("No primary key exists for table %s!"%(table.table_name))
+        select_statement = "SELECT " + ", ".join(table.primary_key_list)
+        result = cur.execute("""%s\nFROM %s"""%(select_statement, table.table_name)).fetchall()
+        pd_result = pd.core.frame.DataFrame(result, columns = table.primary_key_list)
+        merged = data.merge(pd_result, on=table.primary_key_list, how="left", indicator=True)
+        reduced_data = data[(merged["_merge"] == "left_only").values]
+        return reduced_data
+
+    def _get_column_raw_data(self, cur: sqlite3.Cursor, table_name: str) -> list[str]:
+        """
+        Obtain the raw column data.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+        
+        Returns:
+            list[str] : The raw column data of the table.
+        
+        Raises:
+            Exception: The exception is raised in case the table data could not be found.
+        """
+        statement = cur.execute("""SELECT sql FROM sqlite_master WHERE type='table' AND name='%s';"""%(table_name)).fetchall()[0][0]
+        pattern = r"CREATE TABLE %s\((.*)\)"%(table_name)
+        matches = re.findall(pattern, statement)
+        if (len(matches) != 1):
+            raise Exception("Invalid data columns found!")
+        split_pattern = r",\s+(?![^()]*\))"
+        column_matches: list[str] = re.split(split_pattern, matches[0])
+        return column_matches
+
+    def _get_table_column_names(self, cur: sqlite3.Cursor, table_name: str, column_matches: list[str] = None, only_primary_columns: bool = False) -> pd.core.indexes.base.Index:
+        """
+        Obtain the column names of the given table.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+            column_matches (list[str], optional): The raw column data of the table. Defaults to None (in this case the raw data will be retrieved).
+            only_primary_columns (bool, optional): Return only primary columns. Defaults to False.
+        
+        Returns:
+            pd.core.indexes.base.Index : column names of the table.
+        
+        Raises:
+            Exception: The exception is raised in case the table data could not be found.
+        """
+        if column_matches == None:
+            column_matches = self._get_column_raw_data(cur, table_name)
+        column_names = []
+        primary_key_matcher = re.compile(r"%s \(([\w\s,]+)\)"%(self.PRIMARY_KEY))
+        for column in column_matches:
+            match = primary_key_matcher.search(column)
+            if match:
                 column_names += match.group(1).split(", ")
             else:
                 column_elements = column.split(" ")
@@ -384,41 +1190,662 @@ class DBConnector:
                     column_names.append(column_elements[0])
         return pd.core.indexes.base.Index(column_names)
     
-    def _select_data_unfiltered(self, cur: sqlite3.Cursor, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}) -> pd.core.frame.DataFrame:
+    def _select_data_unfiltered(self, cur: sqlite3.Cursor, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}, source: str = None, condition: str = None, parameters: list = []) -> pd.core.frame.DataFrame:
+        """
+        Internal function for selecting data.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            source (str, optional): The from clause of the select, e.g. a union over several shards. Defaults to None (the table itself).
+            condition (str, optional): The where clause of the select. Defaults to None (no filter).
+            parameters (list, optional): The parameters bound to the placeholders of the condition. Defaults to [].
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        select_statement = self._prepare_select_statement(table_name, select_columns, order_by, source, condition)
+        result = cur.execute(select_statement, parameters).fetchall()
+        pd_result = pd.core.frame.DataFrame(result, columns = self._get_result_columns(cur, table_name, select_columns))
+        return pd_result
+
+    def _prepare_select_statement(self, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}, source: str = None, condition: str = None) -> str:
+        """
+        Prepare the select statement.
+
+        Args:
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [].
+            order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            source (str, optional): The from clause of the select, e.g. a union over several shards. Defaults to None (the table itself).
+            condition (str, optional): The where clause of the select. Defaults to None (no filter).
+
+        Returns:
+            str: The select statement.
+        """
+        return "SELECT " + ("* " if len(select_columns) == 0 else ", ".join(select_columns)) + " FROM " + (table_name if source == None else source) + (" WHERE " + condition if condition != None else "") + (" ORDER BY " + ", ".join(key + " " + value for key, value in order_by.items()) if len(order_by) != 0 else "")
+
+    def _get_result_columns(self, cur: sqlite3.Cursor, table_name: str, select_columns: list[str] = []) -> pd.core.indexes.base.Index:
+        """
+        Obtain the column names of the result of a select.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            table_name (str): The input table name.
+            select_columns (list[str], optional): The columns of the table to select. Defaults to [] (all columns of the table).
+
+        Returns:
+            pd.core.indexes.base.Index: The column names of the result.
+        """
+        if len(select_columns) != 0:
+            return pd.core.indexes.base.Index(select_columns)
+        cols = self._get_table_column_names(cur, table_name)
+        p_cols = self._get_table_column_names(cur, table_name, None, True)
+        return cols if len(p_cols) == 0 else cols[:-len(p_cols)]
+
+    def _prepare_range_condition(self, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> tuple[str, list]:
+        """
+        Prepare the where clause selecting a time range and trackers.
+
+        Args:
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            tuple[str, list]: The where clause (None, if there is no restriction) and its parameters.
+        """
+        conditions = []
+        parameters = []
+        if start_timestamp != None:
+            conditions.append("%s >= ?"%(self.SHARD_COLUMN))
+            parameters.append(start_timestamp)
+        if end_timestamp != None:
+            conditions.append("%s < ?"%(self.SHARD_COLUMN))
+            parameters.append(end_timestamp)
+        if tracker_names != None:
+            conditions.append("%s IN (%s)"%(self.TRACKER_COLUMN, ", ".join(["?"] * len(tracker_names))))
+            parameters += tracker_names
+        return (" AND ".join(conditions) if len(conditions) != 0 else None), parameters
+    
+    def _is_sharded_table(self, table: DBTable) -> bool:
         """
-        Internal function for selecting data.
+        Test, if the rows of the given table are routed into the shards.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: True, if sharding is enabled and the table has a timestamp column, False otherwise.
+        """
+        return self.shard_by != None and self.SHARD_COLUMN in table.data_columns
+
+    def _get_shard_keys_of_data(self, data: pd.core.frame.DataFrame) -> pd.core.series.Series:
+        """
+        Compute the shard key of each row of the data.
+
+        Args:
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            pd.core.series.Series: The shard key of each row.
+        """
+        return data[self.SHARD_COLUMN].astype(str).str.slice(0, self.SHARD_KEY_LENGTH[self.shard_by])
+
+    def _get_schema_statements(self, cur: sqlite3.Cursor, table_name: str) -> list[str]:
+        """
+        Obtain the create statements of the table and its indexes.
 
         Args:
             cur (sqlite3.Cursor): The Cursor object of the database.
             table_name (str): The input table name.
+
+        Returns:
+            list[str]: The create statements, the table statement comes first.
+        """
+        return [i[0] for i in cur.execute("""SELECT sql FROM sqlite_master WHERE tbl_name='%s' AND sql IS NOT NULL ORDER BY type DESC;"""%(table_name)).fetchall()]
+
+    def _insert_sharded_data(self, table: DBTable, data: pd.core.frame.DataFrame, ignore_existing: bool = False) -> int:
+        """
+        Insert the data into the shards given by the timestamp of each row. Missing shards are created with the schema of the central database.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+            ignore_existing (bool, optional): Skip the existing rows by the primary key constraint, if the table has no zone map. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case the table does not exist in the central database.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if not self._test_table_exists(cur, table.table_name):
+                raise Exception("The table %s does not exist!"%(table.table_name))
+            schema_statements = self._get_schema_statements(cur, table.table_name)
+            skip_reduce = self._prepare_zone_map(cur, table, data)
+            zone_map = self._has_zone_map(cur, table)
+            ccm.commit()
+        if len(data) == 0:
+            raise Exception("There should be data available!")
+        inserted = 0
+        for shard_key, shard_data in data.groupby(self._get_shard_keys_of_data(data), sort = True):
+            inserted += self._write_batches(shard_data, self._insert_shard_batch, table, shard_key, schema_statements, zone_map, skip_reduce, ignore_existing and not zone_map)
+        return inserted
+
+    def _insert_shard_batch(self, table: DBTable, shard_key: str, schema_statements: list[str], zone_map: bool, skip_reduce: bool, ignore_existing: bool, data: pd.core.frame.DataFrame) -> int:
+        """
+        Insert a batch of rows into the shard in one transaction, the zone map is changed in the transaction of the rows. A missing shard is created with the given schema.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            shard_key (str): The key of the shard.
+            schema_statements (list[str]): The create statements of the table and its indexes.
+            zone_map (bool): Update the zone map of the table.
+            skip_reduce (bool): Skip the check for existing rows, if the zone map proved, that all rows of the insert are new.
+            ignore_existing (bool): Skip the existing rows by the primary key constraint.
+            data (pd.core.frame.DataFrame): The rows of the batch.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        with self._get_context_manager(os.path.join(self.wd, self.get_shard_name(shard_key))) as ccm:
+            cur = ccm.get_cursor()
+            zone_map_schema = self._attach_central(cur) if zone_map else None
+            if not self._test_table_exists(cur, table.table_name):
+                for statement in schema_statements:
+                    cur.execute(statement)
+            changes = ccm.conn.total_changes
+            inserted_data = self._insert_table_rows(cur, table, data, skip_reduce, ignore_existing)
+            inserted = ccm.conn.total_changes - changes if ignore_existing else len(inserted_data)
+            if zone_map:
+                self._update_zone_map(cur, table, inserted_data, zone_map_schema)
+            ccm.commit()
+        return inserted
+
+    def _select_sharded_data(self, cur: sqlite3.Cursor, table_name: str, select_columns: list[str] = [], order_by: dict[str, str] = {}, shard_keys: list[str] = None, condition: str = None, parameters: list = []) -> pd.core.frame.DataFrame:
+        """
+        Select the data of a sharded table by attaching the shards to the central database and building the union of the tables.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database.
+            table_name (str): The input table name.
             select_columns (list[str], optional): The columns of the table to select. Defaults to [].
             order_by (dict[str, str], optional): The order by of the columns. Defaults to {}.
+            shard_keys (list[str], optional): The shards to read. Defaults to None (all shards).
+            condition (str, optional): The where clause of the select. Defaults to None (no filter).
+            parameters (list, optional): The parameters bound to the placeholders of the condition. Defaults to [].
 
         Returns:
             pd.core.frame.DataFrame: The resulting data.
         """
-        select_statement = "SELECT " + ("* " if len(select_columns) == 0 else ", ".join(select_columns)) + "FROM " + table_name + (" ORDER BY " + ", ".join(key + " " + value for key, value in order_by.items()) if len(order_by) != 0 else "")
-        result = cur.execute(select_statement).fetchall()
-        
-        cols = self._get_table_column_names(cur, table_name)
-        p_cols = self._get_table_column_names(cur, table_name, None, True)
-        np_cols = cols if len(p_cols) == 0 else cols[:-len(p_cols)]
-        columns = pd.core.indexes.base.Index(select_columns) if len(select_columns) != 0 else np_cols
-        pd_result = pd.core.frame.DataFrame(result, columns = columns)
-        return pd_result
-    
+        shard_keys = self.get_shard_keys() if shard_keys == None else shard_keys
+        batches = [shard_keys[i:i + self.MAX_ATTACHED] for i in range(0, len(shard_keys), self.MAX_ATTACHED)]
+        if len(batches) == 0:
+            return self._select_data_unfiltered(cur, table_name, select_columns, order_by, None, condition, parameters)
+        results = []
+        for batch_number, batch in enumerate(batches):
+            aliases = []
+            for i, shard_key in enumerate(batch):
+                cur.execute("""ATTACH DATABASE ? AS %s;"""%(self.SHARD_ALIAS%(i)), (os.path.join(self.wd, self.get_shard_name(shard_key)),))
+                if self._test_attached_table_exists(cur, self.SHARD_ALIAS%(i), table_name):
+                    aliases.append(self.SHARD_ALIAS%(i))
+            sources = (["main.%s"%(table_name)] if batch_number == 0 else []) + ["%s.%s"%(alias, table_name) for alias in aliases]
+            if len(sources) != 0:
+                source = "(%s)"%(" UNION ALL ".join(["SELECT * FROM %s"%(i) for i in sources]))
+                results.append(self._select_data_unfiltered(cur, table_name, select_columns, order_by if len(batches) == 1 else {}, source, condition, parameters))
+            for i in range(len(batch)):
+                cur.execute("""DETACH DATABASE %s;"""%(self.SHARD_ALIAS%(i)))
+        result = pd.concat(results, ignore_index = True)
+        if len(batches) > 1 and len(order_by) != 0:
+            result = result.sort_values(list(order_by.keys()), ascending = [value.upper() != "DESC" for value in order_by.values()], ignore_index = True)
+        return result
+
+    def _test_attached_table_exists(self, cur: sqlite3.Cursor, schema_name: str, table_name: str) -> bool:
+        """
+        Test, if the input table name exists in the attached database.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the database.
+            schema_name (str): The name of the attached database.
+            table_name (str): The input table name.
+
+        Returns:
+            bool: True, if the given table exists in the attached database, False otherwise.
+        """
+        return cur.execute("""SELECT name FROM %s.sqlite_master WHERE type='table' AND name='%s';"""%(schema_name, table_name)).fetchall() != []
+
+    def _get_order_by_key(self, order_by: dict[str, str]) -> tuple:
+        """
+        Normalize the order by for the use in a cache key.
+
+        Args:
+            order_by (dict[str, str]): The order by of the columns.
+
+        Returns:
+            tuple: The columns and their upper case directions in order.
+        """
+        return tuple([(key, value.upper()) for key, value in order_by.items()])
+
+    def _select_cached(self, cache_key: tuple, read_function, *args) -> pd.core.frame.DataFrame:
+        """
+        Return the cached result of the query or read it from the database and store it in the cache.
+
+        Args:
+            cache_key (tuple): The normalized query and its parameters.
+            read_function (Callable): The function reading the data from the database.
+            args: The arguments of the read function.
+
+        Returns:
+            pd.core.frame.DataFrame: The resulting data.
+        """
+        if self.query_cache == None:
+            return read_function(*args)
+        version = self._get_data_version()
+        result = self.query_cache.get(cache_key, version)
+        if result is None:
+            result = read_function(*args)
+            self.query_cache.put(cache_key, version, result)
+        return result
+
+    def _get_data_version(self) -> tuple:
+        """
+        Obtain the version of the central database and all shards. The version changes, whenever a file is replaced or another connection (of any process) commits a change.
+
+        Returns:
+            tuple: The path, inode and data version of each database file.
+        """
+        version = []
+        with self.version_lock:
+            for fullpath in [self.db_fullpath] + self.get_shard_fullpaths():
+                if not os.path.isfile(fullpath):
+                    version.append((fullpath, None, None))
+                    continue
+                inode = os.stat(fullpath).st_ino
+                if fullpath not in self.version_connections or self.version_connections[fullpath][0] != inode:
+                    if fullpath in self.version_connections:
+                        self.version_connections[fullpath][1].close()
+                    self.version_connections[fullpath] = (inode, sqlite3.connect(get_read_only_uri(fullpath), uri = True, check_same_thread = False))
+                version.append((fullpath, inode, self.version_connections[fullpath][1].execute("""PRAGMA data_version;""").fetchall()[0][0]))
+        return tuple(version)
+
+    def _get_context_manager(self, db_fullpath: str):
+        """
+        Get the context manager for a connection to the given database, the connection is borrowed from the pool in read only mode.
+        If a cancel event is set for the current thread (see AsyncDBConnector), the statements of the connection are interrupted as soon as the event is set.
+
+        Args:
+            db_fullpath (str): The full path to the database.
+
+        Returns:
+            ConnectorContextManager: The context manager of the connection.
+        """
+        return self.ConnectorContextManager(db_fullpath, self.connection_pool, self.journal_mode, getattr(self.thread_state, "cancel_event", None), self.busy_timeout)
+
+    def _get_write_lock(self):
+        """
+        Get the lock file of the write calls.
+
+        Returns:
+            WriteLock: The lock file, a context manager doing nothing, if no lock file is used.
+        """
+        return WriteLock(self.lock_fullpath) if self.lock_fullpath != None else contextlib.nullcontext()
+
+    def _write_batches(self, data: pd.core.frame.DataFrame, write_function, *args) -> int:
+        """
+        Write the data in consecutive batches, each in a transaction of its own, so other writers are not locked out for the whole write.
+        The size of the batches adapts to the duration of their transactions, the write function is called at least once.
+
+        Args:
+            data (pd.core.frame.DataFrame): The input data frame.
+            write_function (Callable): The function writing a batch in one transaction and returning the number of written rows, the batch is passed after the arguments.
+            args: The arguments of the write function.
+
+        Returns:
+            int: The number of written rows of all batches.
+        """
+        batch_size = self.write_batch_size
+        position = 0
+        written = 0
+        while True:
+            start = time.perf_counter()
+            batch = data.iloc[position:position + batch_size]
+            written += write_function(*args, batch)
+            position += len(batch)
+            if position >= len(data):
+                break
+            batch_size = self._adapt_write_batch_size(batch_size, time.perf_counter() - start)
+        return written
+
+    def _insert_batch(self, table: DBTable, ignore_existing: bool, data: pd.core.frame.DataFrame) -> int:
+        """
+        Insert a batch of rows into the table of the central database in one transaction together with their zone map entries.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            ignore_existing (bool): Skip the existing rows by the primary key constraint, if the table has no zone map.
+            data (pd.core.frame.DataFrame): The rows of the batch.
+
+        Returns:
+            int: The number of inserted rows.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            zone_map = self._has_zone_map(cur, table)
+            skip_reduce = self._prepare_zone_map(cur, table, data)
+            ignore_existing = ignore_existing and not zone_map
+            changes = ccm.conn.total_changes
+            inserted_data = self._insert_table_rows(cur, table, data, skip_reduce, ignore_existing)
+            inserted = ccm.conn.total_changes - changes if ignore_existing else len(inserted_data)
+            if zone_map:
+                self._update_zone_map(cur, table, inserted_data)
+            ccm.commit()
+        return inserted
+
+    @retry_write
+    def _prepare_upsert(self, table: DBTable, data: pd.core.frame.DataFrame) -> tuple[pd.core.frame.DataFrame, int, bool, list[str]]:
+        """
+        Prepare the zone map of an upsert and remove the rows of the unchanged trackers and months.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame without duplicated primary keys.
+
+        Raises:
+            Exception: The exception is raised in case the table does not exist.
+
+        Returns:
+            tuple[pd.core.frame.DataFrame, int, bool, list[str]]: The remaining rows, the number of skipped rows, whether the zone map is maintained and the create statements of the table.
+        """
+        with self._get_context_manager(self.db_fullpath) as ccm:
+            cur = ccm.get_cursor()
+            if not self._test_table_exists(cur, table.table_name):
+                raise Exception("The table %s does not exist!"%(table.table_name))
+            data, unchanged = self._skip_unchanged_months(cur, table, data)
+            zone_map = self._has_zone_map(cur, table)
+            schema_statements = self._get_schema_statements(cur, table.table_name)
+            ccm.commit()
+        return data, unchanged, zone_map, schema_statements
+
+    @retry_write
+    def _upsert_rows(self, table: DBTable, data: pd.core.frame.DataFrame, zone_map: bool, shard_key: str = None, schema_statements: list[str] = []) -> tuple[int, int, int]:
+        """
+        Upsert the rows into the central database or a shard in one transaction together with their zone map entries. A missing shard is created with the given schema.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame without duplicated primary keys.
+            zone_map (bool): Update the zone map of the table.
+            shard_key (str, optional): The key of the shard. Defaults to None (the central database).
+            schema_statements (list[str], optional): The create statements of the table and its indexes. Defaults to [].
+
+        Returns:
+            tuple[int, int, int]: The number of inserted, updated and unchanged rows.
+        """
+        with self._get_context_manager(self.db_fullpath if shard_key == None else os.path.join(self.wd, self.get_shard_name(shard_key))) as ccm:
+            cur = ccm.get_cursor()
+            zone_map_schema = self._attach_central(cur) if zone_map and shard_key != None else "main"
+            if not self._test_table_exists(cur, table.table_name):
+                for statement in schema_statements:
+                    cur.execute(statement)
+            inserted_data, updated_data, unchanged = self._upsert_table_rows(cur, table, data)
+            if zone_map:
+                self._fold_upserted_rows(cur, table, inserted_data, updated_data, zone_map_schema)
+            ccm.commit()
+        return len(inserted_data), len(updated_data), unchanged
+
+    def _adapt_write_batch_size(self, batch_size: int, seconds: float) -> int:
+        """
+        Adapt the size of the next write batch to the duration of the last one.
+
+        Args:
+            batch_size (int): The size of the last batch.
+            seconds (float): The duration of the transaction of the last batch.
+
+        Returns:
+            int: The size of the next batch.
+        """
+        if seconds > self.max_lock_seconds:
+            return max(self.MIN_WRITE_BATCH_SIZE, batch_size // 2)
+        if seconds < self.max_lock_seconds / 4:
+            return min(self.write_batch_size, batch_size * 2)
+        return batch_size
+
+    def _check_writable(self):
+        """
+        Check, if the database may be changed by this connector.
+
+        Raises:
+            Exception: The exception is raised in case the connector is read only.
+        """
+        if self.read_only:
+            raise Exception("The database %s is opened read only!"%(self.db_fullpath))
+
+    def _has_zone_map(self, cur: sqlite3.Cursor, table: DBTable) -> bool:
+        """
+        Test, if the zone map is maintained for the given table. The zone map entries of a table are maintained by any connector, so they never fall behind the stored rows.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database.
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: True, if the table has a timestamp column and the zone map is enabled or has entries of the table, False otherwise.
+        """
+        if self.SHARD_COLUMN not in table.data_columns or table.table_name == self.ZONE_MAP_TABLE_NAME:
+            return False
+        if self.zone_map:
+            return True
+        return self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME) and cur.execute("""SELECT EXISTS (SELECT 1 FROM %s WHERE table_name = ?);"""%(self.ZONE_MAP_TABLE_NAME), (table.table_name,)).fetchall()[0][0] == 1
+
+    def _attach_central(self, cur: sqlite3.Cursor) -> str:
+        """
+        Attach the central database to the connection of a shard, so the zone map is changed in the transaction of the rows of the shard.
+        The commit is atomic across both files, unless the journal mode is WAL.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the shard.
+
+        Returns:
+            str: The schema name of the central database.
+        """
+        cur.execute("""ATTACH DATABASE ? AS %s;"""%(self.CENTRAL_ALIAS), (self.db_fullpath,))
+        return self.CENTRAL_ALIAS
+
+    def _prepare_zone_map(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame) -> bool:
+        """
+        Make sure the zone map of the table exists and test, if the data lie entirely beyond the stored data of the table.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            bool: True, if all rows are newer than the newest stored row (no existence check required), False otherwise.
+        """
+        if len(data) == 0 or not self._has_zone_map(cur, table):
+            return False
+        if not self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+            self._create_table(cur, self.zone_map_table)
+        max_timestamp = cur.execute("""SELECT MAX(max_timestamp), COUNT(*) FROM %s WHERE table_name = ?;"""%(self.ZONE_MAP_TABLE_NAME), (table.table_name,)).fetchall()[0]
+        if max_timestamp[1] == 0:
+            self._rebuild_zone_map(cur, table)
+            max_timestamp = cur.execute("""SELECT MAX(max_timestamp), COUNT(*) FROM %s WHERE table_name = ?;"""%(self.ZONE_MAP_TABLE_NAME), (table.table_name,)).fetchall()[0]
+        return max_timestamp[0] == None or data[self.SHARD_COLUMN].astype(str).min() > max_timestamp[0]
+
+    def _rebuild_zone_map(self, cur: sqlite3.Cursor, table: DBTable, months: list[str] = None, zone_map_schema: str = "main"):
+        """
+        Internal function to recompute the zone map entries of the table from the stored data.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database or of a shard with the central database attached.
+            table (DBTable): The DBTable object of the table.
+            months (list[str], optional): The sorted months (YYYY-MM) to recompute. Defaults to None (all months).
+            zone_map_schema (str, optional): The schema name of the central database, if it is not "main", only the rows of the shard are read, i.e. the months must lie in the shard. Defaults to "main".
+        """
+        condition, parameters = (None, [])
+        if months != None:
+            condition, parameters = self._prepare_range_condition(months[0], str(pd.Period(months[-1], freq = "M") + 1))
+        if self._is_sharded_table(table) and zone_map_schema == "main":
+            data = self._select_sharded_data(cur, table.table_name, list(table.data_columns), {}, None, condition, parameters)
+        else:
+            data = self._select_data_unfiltered(cur, table.table_name, list(table.data_columns), {}, None, condition, parameters)
+        if zone_map_schema == "main" and not self._test_table_exists(cur, self.ZONE_MAP_TABLE_NAME):
+            self._create_table(cur, self.zone_map_table)
+        if months != None:
+            cur.execute("""DELETE FROM %s.%s WHERE table_name = ? AND month >= ? AND month <= ?;"""%(zone_map_schema, self.ZONE_MAP_TABLE_NAME), (table.table_name, months[0], months[-1]))
+        else:
+            cur.execute("""DELETE FROM %s.%s WHERE table_name = ?;"""%(zone_map_schema, self.ZONE_MAP_TABLE_NAME), (table.table_name,))
+        self._update_zone_map(cur, table, data, zone_map_schema)
+
+    def _fold_upserted_rows(self, cur: sqlite3.Cursor, table: DBTable, inserted_data: pd.core.frame.DataFrame, updated_data: pd.core.frame.DataFrame, zone_map_schema: str = "main"):
+        """
+        Fold the rows of an upsert into the zone map of the table.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database or of a shard with the central database attached.
+            table (DBTable): The DBTable object of the table.
+            inserted_data (pd.core.frame.DataFrame): The inserted rows.
+            updated_data (pd.core.frame.DataFrame): The updated rows.
+            zone_map_schema (str, optional): The schema name of the central database. Defaults to "main".
+        """
+        if len(updated_data) == 0:
+            self._update_zone_map(cur, table, inserted_data, zone_map_schema)
+            return
+        # the checksums of updated months can only be recomputed from the stored rows
+        months = sorted(pd.concat([inserted_data, updated_data])[self.SHARD_COLUMN].astype(str).str.slice(0, self.MONTH_KEY_LENGTH).unique())
+        self._rebuild_zone_map(cur, table, months, zone_map_schema)
+
+    def _hash_rows(self, table: DBTable, data: pd.core.frame.DataFrame) -> np.ndarray:
+        """
+        Compute a hash for each row. The values are normalized to their data base representation before, so stored and incoming rows give the same hash.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            np.ndarray: The unsigned 64 bit hash of each row.
+        """
+        column_data_type = table.get_column_dict()
+        normalized = pd.core.frame.DataFrame({column: pd.to_numeric(data[column]).astype(np.float64) if column_data_type[column].upper() in self.NUMERIC_TYPES else data[column].astype(str) for column in table.data_columns})
+        return pd.util.hash_pandas_object(normalized, index = False).values
+
+    def _summarize_zone_map(self, table: DBTable, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Compute the zone map entries of the data grouped by tracker and month.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            pd.core.frame.DataFrame: The zone map entries of the data, the checksum is the unsigned sum of the row hashes.
+        """
+        timestamps = data[self.SHARD_COLUMN].astype(str).values
+        summary = pd.core.frame.DataFrame({
+            "tracker_name": data[self.TRACKER_COLUMN].astype(str).values if self.TRACKER_COLUMN in table.data_columns else "",
+            "month": pd.Series(timestamps).str.slice(0, self.MONTH_KEY_LENGTH).values,
+            "min_timestamp": timestamps,
+            "max_timestamp": timestamps,
+            "row_count": 1,
+            "checksum": self._hash_rows(table, data)
+        })
+        return summary.groupby(["tracker_name", "month"], as_index = False).agg({"min_timestamp": "min", "max_timestamp": "max", "row_count": "sum", "checksum": "sum"})
+
+    def _update_zone_map(self, cur: sqlite3.Cursor, table: DBTable, data: pd.core.frame.DataFrame, zone_map_schema: str = "main"):
+        """
+        Fold the inserted rows into the zone map of the table.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database or of a shard with the central database attached.
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The inserted rows.
+            zone_map_schema (str, optional): The schema name of the central database. Defaults to "main".
+        """
+        if len(data) == 0:
+            return
+        summary = self._summarize_zone_map(table, data)
+        stored = {(i[0], i[1]): i[2:] for i in cur.execute("""SELECT tracker_name, month, min_timestamp, max_timestamp, row_count, checksum FROM %s.%s WHERE table_name = ?;"""%(zone_map_schema, self.ZONE_MAP_TABLE_NAME), (table.table_name,)).fetchall()}
+        rows = []
+        for tracker_name, month, min_timestamp, max_timestamp, row_count, checksum in summary.itertuples(index = False):
+            checksum = int(checksum)
+            if (tracker_name, month) in stored:
+                old = stored[(tracker_name, month)]
+                min_timestamp = min(min_timestamp, old[0])
+                max_timestamp = max(max_timestamp, old[1])
+                row_count += old[2]
+                checksum += old[3]
+            rows.append((table.table_name, tracker_name, month, min_timestamp, max_timestamp, int(row_count), self._to_signed_checksum(checksum)))
+        cur.executemany("""INSERT OR REPLACE INTO %s.%s (%s) VALUES (%s);"""%(zone_map_schema, self.ZONE_MAP_TABLE_NAME, ", ".join(self.ZONE_MAP_COLUMNS), ", ".join(["?"] * len(self.ZONE_MAP_COLUMNS))), rows)
+
+    def _to_signed_checksum(self, checksum: int) -> int:
+        """
+        Wrap the checksum into the signed 64 bit range of SQLite integers.
+
+        Args:
+            checksum (int): The input checksum.
+
+        Returns:
+            int: The checksum modulo 2^64 as signed 64 bit integer.
+        """
+        checksum = checksum % (1 << 64)
+        return checksum - (1 << 64) if checksum >= (1 << 63) else checksum
+
+    def _get_zone_map_months(self, cur: sqlite3.Cursor, table_name: str, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> list[str]:
+        """
+        Obtain the months of the table, that contain data in the given range.
+
+        Args:
+            cur (sqlite3.Cursor): The Cursor object of the central database.
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the months to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            list[str]: The sorted months, None if the table has no zone map.
+        """
+        if cur.execute("""SELECT COUNT(*) FROM %s WHERE table_name = ?;"""%(self.ZONE_MAP_TABLE_NAME), (table_name,)).fetchall()[0][0] == 0:
+            return None
+        conditions = ["table_name = ?"]
+        parameters = [table_name]
+        if start_timestamp != None:
+            conditions.append("max_timestamp >= ?")
+            parameters.append(start_timestamp)
+        if end_timestamp != None:
+            conditions.append("min_timestamp < ?")
+            parameters.append(end_timestamp)
+        if tracker_names != None:
+            conditions.append("tracker_name IN (%s)"%(", ".join(["?"] * len(tracker_names))))
+            parameters += tracker_names
+        return [i[0] for i in cur.execute("""SELECT DISTINCT month FROM %s WHERE %s ORDER BY month;"""%(self.ZONE_MAP_TABLE_NAME, " AND ".join(conditions)), parameters).fetchall()]
+
     class ConnectorContextManager:
         """
         The ConnectorContextManager is used to handle the cursor and connection to the database in a with clause.
         """
-        def __init__(self, db_fullpath):
+        def __init__(self, db_fullpath, connection_pool: ConnectionPool = None, journal_mode: str = None, cancel_event: threading.Event = None, busy_timeout: float = 5.0):
             """
             Initialize the ConnectorContextManager.
 
             Args:
                 db_fullpath (str): The full path to the database.
+                connection_pool (ConnectionPool, optional): The pool to borrow a read only connection from. Defaults to None (open a read / write connection).
+                journal_mode (str, optional): The journal mode set on a read / write connection. Defaults to None (keep the journal mode of the database).
+                cancel_event (threading.Event, optional): The event interrupting the running statement, once it is set. Defaults to None (no interruption).
+                busy_timeout (float, optional): The time in seconds a statement of a read / write connection waits for the lock of another connection. Defaults to 5.0.
             """
             self.db_fullpath = db_fullpath
+            self.connection_pool = connection_pool
+            self.journal_mode = journal_mode
+            self.cancel_event = cancel_event
+            self.busy_timeout = busy_timeout
             self.conn = None
             self.cur = None
 
@@ -430,7 +1857,18 @@ class DBConnector:
                 ConnectorContextManager: The as-return value.
             """
             if (self.conn == None):
-                self.conn = sqlite3.connect(self.db_fullpath)
+                if self.connection_pool != None:
+                    self.conn = self.connection_pool.acquire(self.db_fullpath)
+                else:
+                    new_database = not os.path.exists(self.db_fullpath)
+                    self.conn = sqlite3.connect(self.db_fullpath, timeout = self.busy_timeout)
+                    if new_database:
+                        # the free pages of new databases can be returned in steps by the maintenance
+                        self.conn.execute("""PRAGMA auto_vacuum=INCREMENTAL;""")
+                    if self.journal_mode != None:
+                        self.conn.execute("""PRAGMA journal_mode=%s;"""%(self.journal_mode))
+                if self.cancel_event != None:
+                    self.conn.set_progress_handler(self.cancel_event.is_set, DBConnector.CANCEL_CHECK_STEPS)
                 self.cur = None
             return self
         
@@ -451,7 +1889,14 @@ class DBConnector:
             """
             result = False
             if (self.conn != None):
-                self.conn.close()
+                if self.cur != None:
+                    self.cur.close()
+                if self.connection_pool != None:
+                    if self.cancel_event != None:
+                        self.conn.set_progress_handler(None, 0)
+                    self.connection_pool.release(self.db_fullpath, self.conn)
+                else:
+                    self.conn.close()
                 self.conn = None
                 self.cur = None
                 result = True
@@ -0,0 +1,296 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, is_busy_error
+
+class DBMaintenance:
+    """
+    The DBMaintenance keeps the database files (the central database and all shards) in shape after many ingests.
+    It gathers the statistics of the query planner, returns free pages to the file system by incremental vacuum steps, checks the integrity and reports the storage of each table and index.
+    Each step runs in its own short transaction and is interrupted as soon as the time budget is exhausted, so the maintenance does not block the ingest for long.
+    """
+    AUTO_VACUUM_INCREMENTAL = 2
+    AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+    VACUUM_PAGES = 1000
+    ANALYSIS_LIMIT = 1000
+    PROGRESS_STEPS = 10000
+    INTEGRITY_OK = "ok"
+    SKIPPED = "skipped"
+    DATABASE_COLUMNS = ["database", "page_size", "page_count", "freelist_count", "auto_vacuum", "analyzed_tables", "vacuumed_pages", "integrity", "complete"]
+    OBJECT_COLUMNS = ["database", "name", "type", "table_name", "row_count", "page_count", "unused_bytes", "fill_ratio", "fragmentation"]
+
+    def __init__(self, db_connector: DBConnector, time_budget: float = None, vacuum_pages: int = VACUUM_PAGES, analysis_limit: int = ANALYSIS_LIMIT):
+        """
+        Initialize the database maintenance.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            time_budget (float, optional): The maximum duration of a run in seconds. Defaults to None (unlimited).
+            vacuum_pages (int, optional): The number of free pages released in one transaction. Defaults to 1000.
+            analysis_limit (int, optional): The approximate number of index rows sampled by ANALYZE per index. Defaults to 1000 (0 scans each index completely).
+
+        Raises:
+            Exception: The exception is raised in case the budget or the number of pages is invalid.
+        """
+        if (time_budget != None and time_budget <= 0) or vacuum_pages < 1 or analysis_limit < 0:
+            raise Exception("Invalid time budget %s, vacuum step of %i pages or analysis limit %i given!"%(str(time_budget), vacuum_pages, analysis_limit))
+        self.db_connector = db_connector
+        self.time_budget = time_budget
+        self.vacuum_pages = vacuum_pages
+        self.analysis_limit = analysis_limit
+        self.deadline = None
+
+    def run(self, full_check: bool = False, convert_auto_vacuum: bool = False) -> dict:
+        """
+        Maintain the central database and all shards within the time budget.
+        The steps are ordered by their benefit: gathering statistics, incremental vacuum, integrity check and the storage report.
+        Steps not started before the deadline are skipped, interrupted steps are rolled back and repeated by the next run.
+
+        Args:
+            full_check (bool, optional): Run the complete integrity check including the consistency of the indexes instead of the quick check. Defaults to False.
+            convert_auto_vacuum (bool, optional): Rebuild databases without incremental auto vacuum (created before it was enabled) by a complete vacuum, which needs time in the order of copying the file. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case the connector is read only.
+
+        Returns:
+            dict: The report of each database file ("databases") and of each table and index ("objects") as data frames.
+        """
+        self.db_connector.check_writable()
+        self.deadline = time.monotonic() + self.time_budget if self.time_budget != None else None
+        databases = []
+        objects = []
+        for db_fullpath in [self.db_connector.db_fullpath] + self.db_connector.get_shard_fullpaths():
+            if not os.path.isfile(db_fullpath):
+                continue
+            with self.db_connector._get_context_manager(db_fullpath) as ccm:
+                cur = ccm.get_cursor()
+                ccm.conn.set_progress_handler(self._is_expired, self.PROGRESS_STEPS)
+                database = os.path.basename(db_fullpath)
+                analyzed = self.analyze(cur)
+                vacuumed = self.vacuum(cur, convert_auto_vacuum)
+                integrity = self.check_integrity(cur, full_check)
+                statistics = self.get_storage_statistics(cur)
+                statistics.insert(0, "database", database)
+                complete = not self._is_expired()
+                ccm.conn.set_progress_handler(None, 0)
+                objects.append(statistics)
+                databases.append([database, self._get_pragma(cur, "page_size"), self._get_pragma(cur, "page_count"), self._get_pragma(cur, "freelist_count"),
+                    self.AUTO_VACUUM_MODES.get(self._get_pragma(cur, "auto_vacuum")), analyzed, vacuumed, integrity, complete])
+        return {
+            "databases": pd.DataFrame(databases, columns = self.DATABASE_COLUMNS),
+            "objects": pd.concat(objects, ignore_index = True) if len(objects) != 0 else pd.DataFrame(columns = self.OBJECT_COLUMNS)
+        }
+
+    def analyze(self, cur: sqlite3.Cursor) -> int:
+        """
+        Gather the statistics of the query planner table by table, each table is committed separately.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+
+        Returns:
+            int: The number of analyzed tables.
+        """
+        cur.execute("""PRAGMA analysis_limit=%i;"""%(self.analysis_limit))
+        analyzed = 0
+        for table_name in self._get_table_names(cur):
+            if not self._execute_step(cur, """ANALYZE "%s";"""%(table_name)):
+                break
+            analyzed += 1
+        return analyzed
+
+    def vacuum(self, cur: sqlite3.Cursor, convert_auto_vacuum: bool = False) -> int:
+        """
+        Release the free pages of the database in steps of vacuum_pages pages, each step is committed separately.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+            convert_auto_vacuum (bool, optional): Enable the incremental auto vacuum by a complete vacuum, if it is disabled. Defaults to False.
+
+        Returns:
+            int: The number of released pages.
+        """
+        if self._get_pragma(cur, "auto_vacuum") != self.AUTO_VACUUM_INCREMENTAL:
+            if not convert_auto_vacuum:
+                return 0
+            freelist_count = self._get_pragma(cur, "freelist_count")
+            cur.execute("""PRAGMA auto_vacuum=INCREMENTAL;""")
+            if not self._execute_step(cur, """VACUUM;"""):
+                return 0
+            return freelist_count
+        released = 0
+        freelist_count = self._get_pragma(cur, "freelist_count")
+        while freelist_count > 0 and self._execute_step(cur, """PRAGMA incremental_vacuum(%i);"""%(self.vacuum_pages)):
+            remaining = self._get_pragma(cur, "freelist_count")
+            released += freelist_count - remaining
+            freelist_count = remaining
+        return released
+
+    def check_integrity(self, cur: sqlite3.Cursor, full_check: bool = False) -> str:
+        """
+        Check the integrity of the database.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+            full_check (bool, optional): Verify the indexes against their tables as well. Defaults to False.
+
+        Returns:
+            str: "ok", the reported problems separated by new lines or "skipped", if the time budget is exhausted.
+        """
+        if self._is_expired():
+            return self.SKIPPED
+        try:
+            result = cur.execute("""PRAGMA %s;"""%("integrity_check" if full_check else "quick_check")).fetchall()
+        except sqlite3.OperationalError:
+            if self._is_expired():
+                return self.SKIPPED
+            raise
+        return "\n".join([str(i[0]) for i in result])
+
+    def get_storage_statistics(self, cur: sqlite3.Cursor) -> pd.core.frame.DataFrame:
+        """
+        Get the row count, the pages, the unused bytes, the fill ratio and the fragmentation of each table and index.
+        The fragmentation is the share of pages, which do not directly follow their predecessor in the b-tree, i.e. 0 for a freshly vacuumed object.
+        Without the dbstat virtual table (or if the time budget is exhausted) only the row counts are reported.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+
+        Returns:
+            pd.core.frame.DataFrame: The statistics of the tables and indexes ordered by table and name.
+        """
+        objects = pd.DataFrame(cur.execute("""SELECT name, type, tbl_name FROM sqlite_master WHERE type IN ('table', 'index') AND rootpage > 0 ORDER BY tbl_name, type DESC, name;""").fetchall(), columns = self.OBJECT_COLUMNS[1:4])
+        row_counts = {}
+        for table_name in objects[objects["type"] == "table"]["name"]:
+            if self._is_expired():
+                break
+            try:
+                row_counts[table_name] = cur.execute("""SELECT COUNT(*) FROM "%s";"""%(table_name)).fetchall()[0][0]
+            except sqlite3.OperationalError:
+                if not self._is_expired():
+                    raise
+        objects["row_count"] = [row_counts.get(i, np.nan) for i in objects["table_name"]]
+        pages = self._select_pages(cur)
+        if pages is None:
+            for column in self.OBJECT_COLUMNS[5:]:
+                objects[column] = np.nan
+            return objects
+        page_size = self._get_pragma(cur, "page_size")
+        page_numbers = pages["pageno"].values
+        names = pages["name"].values
+        # the pages are listed in the order of the b-tree traversal, each page not following its predecessor is a seek
+        continued = np.r_[False, (names[1:] == names[:-1])]
+        seeks = continued & (page_numbers != np.r_[0, page_numbers[:-1] + 1])
+        summary = pd.DataFrame({"name": names, "pages": 1, "unused": pages["unused"].values, "seeks": seeks}).groupby("name").sum()
+        summary = summary.reindex(objects["name"])
+        objects["page_count"] = summary["pages"].values
+        objects["unused_bytes"] = summary["unused"].values
+        objects["fill_ratio"] = 1 - summary["unused"].values / (summary["pages"].values * page_size)
+        objects["fragmentation"] = np.divide(summary["seeks"].values, summary["pages"].values - 1, out = np.zeros(len(summary)), where = summary["pages"].values > 1)
+        return objects
+
+    def _select_pages(self, cur: sqlite3.Cursor) -> pd.core.frame.DataFrame:
+        """
+        Select the pages of all tables and indexes from the dbstat virtual table.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+
+        Returns:
+            pd.core.frame.DataFrame: The name, the page number and the unused bytes of each page in the order of the b-tree traversal, None if dbstat is not available or the time budget is exhausted.
+        """
+        if self._is_expired():
+            return None
+        try:
+            return pd.DataFrame(cur.execute("""SELECT name, pageno, unused FROM dbstat;""").fetchall(), columns = ["name", "pageno", "unused"])
+        except sqlite3.OperationalError:
+            return None
+
+    def _execute_step(self, cur: sqlite3.Cursor, statement: str) -> bool:
+        """
+        Execute one maintenance step in its own transaction, a step interrupted by the deadline is rolled back.
+        A step failing due to the lock of a concurrent writer is repeated with exponential backoff like the write calls of the connector.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+            statement (str): The statement of the step.
+
+        Raises:
+            Exception: The exception is raised in case the step failed for another reason than the deadline.
+
+        Returns:
+            bool: True, if the step has been completed, False, if the time budget is exhausted.
+        """
+        attempt = 0
+        while True:
+            if self._is_expired():
+                return False
+            try:
+                cur.execute(statement).fetchall()
+                cur.connection.commit()
+                return True
+            except sqlite3.OperationalError as e:
+                if cur.connection.in_transaction:
+                    cur.connection.rollback()
+                if self._is_expired():
+                    return False
+                if not is_busy_error(e) or attempt >= self.db_connector.write_retries:
+                    raise
+                time.sleep(DBConnector.RETRY_DELAY * 2 ** attempt)
+                attempt += 1
+
+    def _get_table_names(self, cur: sqlite3.Cursor) -> list[str]:
+        """
+        Get the names of the tables of the database, the internal tables of sqlite are excluded.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+
+        Returns:
+            list[str]: The sorted table names.
+        """
+        return [i[0] for i in cur.execute("""SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;""").fetchall()]
+
+    def _get_pragma(self, cur: sqlite3.Cursor, name: str) -> int:
+        """
+        Read the value of the given pragma.
+
+        Args:
+            cur (sqlite3.Cursor): The cursor of the database.
+            name (str): The name of the pragma.
+
+        Returns:
+            int: The value of the pragma.
+        """
+        return cur.execute("""PRAGMA %s;"""%(name)).fetchall()[0][0]
+
+    def _is_expired(self) -> bool:
+        """
+        Test, if the time budget is exhausted. It is used as progress handler, so sqlite interrupts the running statement after the deadline.
+
+        Returns:
+            bool: True, if the deadline has passed, False otherwise.
+        """
+        return self.deadline != None and time.monotonic() > self.deadline
@@ -0,0 +1,180 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector
+
+LTTB = "lttb"
+MIN_MAX = "minmax"
+
+def get_lttb_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Select the points of the series by the largest-triangle-three-buckets algorithm.
+    The first and the last point are kept, each bucket in between contributes the point spanning the largest triangle with the previously selected point and the mean of the next bucket.
+
+    Args:
+        x (np.ndarray): The ascending x values.
+        y (np.ndarray): The y values.
+        n_points (int): The number of points to select.
+
+    Returns:
+        np.ndarray: The ascending indices of the selected points.
+    """
+    n = len(x)
+    if n_points >= n:
+        return np.arange(n)
+    if n_points < 3:
+        return np.unique(np.array([0, n - 1], dtype = np.int64)[:max(n_points, 0)])
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    edges = (np.arange(n_points - 1, dtype = np.float64) * (n - 2) / (n_points - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # the mean of each bucket (and of the last point) is the third corner of the triangle of the preceding bucket
+    x_sum = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    y_sum = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    x_mean = np.append(x_sum / counts, x[-1])
+    y_mean = np.append(y_sum / counts, y[-1])
+    indices = np.empty(n_points, dtype = np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    selected = 0
+    for i in range(n_points - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[selected] - x_mean[i + 1]) * (y[start:end] - y[selected]) - (x[selected] - x[start:end]) * (y_mean[i + 1] - y[selected]))
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+    return indices
+
+def get_min_max_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Select the minimum and the maximum of each of n_points / 2 buckets of equal width along the x axis.
+
+    Args:
+        x (np.ndarray): The ascending x values.
+        y (np.ndarray): The y values.
+        n_points (int): The maximum number of points to select.
+
+    Returns:
+        np.ndarray: The ascending indices of the selected points.
+    """
+    n = len(x)
+    if n_points >= n:
+        return np.arange(n)
+    n_buckets = max(n_points // 2, 1)
+    x = np.asarray(x, dtype = np.float64)
+    y = np.asarray(y, dtype = np.float64)
+    width = (x[-1] - x[0]) / n_buckets
+    buckets = np.minimum(((x - x[0]) / width).astype(np.int64), n_buckets - 1) if width > 0 else np.zeros(n, dtype = np.int64)
+    order = np.lexsort((y, buckets))
+    sorted_buckets = buckets[order]
+    first = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    last = np.r_[first[1:], n] - 1
+    return np.unique(np.concatenate([order[first], order[last]]))
+
+class Downsampler:
+    """
+    The Downsampler provides shape preserving reduced series for plotting.
+    Only the timestamp and the requested column are read, the reduction runs vectorized on the arrays of the result.
+    """
+    TIMESTAMP = "timestamp"
+    TRACKER_NAME = "tracker_name"
+    METHODS = {LTTB: get_lttb_indices, MIN_MAX: get_min_max_indices}
+
+    def __init__(self, db_connector: DBConnector):
+        """
+        Initialize the downsampler.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+        """
+        self.db_connector = db_connector
+
+    def select_downsampled(self, table_name: str, column: str, n_points: int, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None, method: str = LTTB, use_rollup: bool = False) -> pd.core.frame.DataFrame:
+        """
+        Select the column of the table in the given time range reduced to at most n_points per series.
+
+        Args:
+            table_name (str): The input table name.
+            column (str): The numeric column to plot.
+            n_points (int): The maximum number of points per series.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): The trackers to plot, each tracker is reduced separately. Defaults to None (the table has no tracker column or all trackers form one series).
+            method (str, optional): The reduction, "lttb" (largest-triangle-three-buckets) or "minmax" (minimum and maximum per bucket). Defaults to "lttb".
+            use_rollup (bool, optional): Read the hourly means of the rollup table, if it exists, and the raw rows only after the newest rollup hour. Defaults to False.
+
+        Raises:
+            Exception: The exception is raised in case the method is unknown.
+
+        Returns:
+            pd.core.frame.DataFrame: The timestamp, the tracker name (if trackers are given) and the column of the selected points ordered by tracker and time.
+        """
+        if method not in self.METHODS.keys():
+            raise Exception("Invalid downsampling method %s, valid methods are %s"%(method, ", ".join(self.METHODS.keys())))
+        group_columns = [] if tracker_names == None else [self.TRACKER_NAME]
+        data = self._select_series(table_name, [self.TIMESTAMP] + group_columns + [column], start_timestamp, end_timestamp, tracker_names, use_rollup)
+        data = data[pd.notna(data[column])].reset_index(drop = True)
+        if len(group_columns) == 0:
+            return data.iloc[self._get_indices(data, column, n_points, method)].reset_index(drop = True)
+        result = [group.iloc[self._get_indices(group, column, n_points, method)] for _, group in data.groupby(self.TRACKER_NAME, sort = True)]
+        return pd.concat(result, ignore_index = True) if len(result) != 0 else data
+
+    def _select_series(self, table_name: str, columns: list[str], start_timestamp: str, end_timestamp: str, tracker_names: list[str], use_rollup: bool) -> pd.core.frame.DataFrame:
+        """
+        Select the series ordered by time, optionally preceded by the hourly means of the rollup table.
+
+        Args:
+            table_name (str): The input table name.
+            columns (list[str]): The columns to select.
+            start_timestamp (str): The first timestamp of the range (inclusive).
+            end_timestamp (str): The end of the range (exclusive).
+            tracker_names (list[str]): The trackers to select.
+            use_rollup (bool): Use the rollup table, if it exists.
+
+        Returns:
+            pd.core.frame.DataFrame: The selected series.
+        """
+        order_by = {self.TIMESTAMP: "ASC"}
+        rollup_table_name = self.db_connector.get_rollup_table_name(table_name)
+        if not use_rollup or not self.db_connector.test_table_exists(rollup_table_name):
+            return self.db_connector.select_data_range(table_name, start_timestamp, end_timestamp, columns, order_by, tracker_names)
+        rollup = self.db_connector.select_data_range(rollup_table_name, start_timestamp, end_timestamp, columns, order_by, tracker_names)
+        if len(rollup) == 0:
+            return self.db_connector.select_data_range(table_name, start_timestamp, end_timestamp, columns, order_by, tracker_names)
+        next_hour = str(pd.Timestamp(rollup[self.TIMESTAMP].astype(str).max()) + pd.Timedelta(hours = 1))[:16]
+        raw_start = next_hour if start_timestamp == None else max(start_timestamp, next_hour)
+        raw = self.db_connector.select_data_range(table_name, raw_start, end_timestamp, columns, order_by, tracker_names)
+        return pd.concat([rollup, raw], ignore_index = True)
+
+    def _get_indices(self, data: pd.core.frame.DataFrame, column: str, n_points: int, method: str) -> np.ndarray:
+        """
+        Get the indices of the selected points of one series.
+
+        Args:
+            data (pd.core.frame.DataFrame): The series ordered by time.
+            column (str): The column to plot.
+            n_points (int): The maximum number of points.
+            method (str): The reduction.
+
+        Returns:
+            np.ndarray: The positional indices of the selected points.
+        """
+        x = pd.to_datetime(data[self.TIMESTAMP].astype(str)).values.astype(np.int64) / 6e10
+        return self.METHODS[method](x, pd.to_numeric(data[column]).values, n_points)
@@ -0,0 +1,163 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+class EnergyBalance:
+    """
+    The EnergyBalance computes the self-consumption, the grid import and export estimates and the autarky of the plant.
+    Within an interval the production covers the consumption first, the surplus is exported and the deficit is imported.
+    The interval results are stored together with daily and monthly aggregates, whose ratios are recomputed from the summed energies.
+    A run processes the rows of the main table from the newest stored interval on only, hence rows inserted later before it (e.g. a backfilled older file) are never processed.
+    """
+    INTERVAL_TABLE_NAME = "energy_balance"
+    DAILY_TABLE_NAME = "energy_balance_daily"
+    MONTHLY_TABLE_NAME = "energy_balance_monthly"
+    CHUNK_SIZE = 100000
+    TIMESTAMP = "timestamp"
+    PRODUCTION = "Production"
+    CONSUMPTION = "Consumption"
+    SELF_CONSUMPTION = "self_consumption"
+    GRID_EXPORT = "grid_export"
+    GRID_IMPORT = "grid_import"
+    SELF_CONSUMPTION_RATIO = "self_consumption_ratio"
+    AUTARKY = "autarky"
+    DAY_KEY_LENGTH = 10
+    MONTH_KEY_LENGTH = 7
+
+    def __init__(self, db_connector: DBConnector, main_table: DBTable, production_column: str = PRODUCTION, consumption_column: str = CONSUMPTION, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the energy balance.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            main_table (DBTable): The main raw table containing the timestamp, the production and the consumption of each interval.
+            production_column (str, optional): The column of the production. Defaults to "Production".
+            consumption_column (str, optional): The column of the consumption. Defaults to "Consumption".
+            chunk_size (int, optional): The number of raw rows processed at once. Defaults to 100000.
+
+        Raises:
+            Exception: The exception is raised in case the main table misses a column.
+        """
+        missing_columns = [i for i in [self.TIMESTAMP, production_column, consumption_column] if i not in main_table.data_columns]
+        if len(missing_columns) != 0:
+            raise Exception("The main table %s misses the columns %s"%(main_table.table_name, ", ".join(missing_columns)))
+        self.db_connector = db_connector
+        self.main_table = main_table
+        self.production_column = production_column
+        self.consumption_column = consumption_column
+        self.chunk_size = chunk_size
+        self.energy_columns = [production_column, consumption_column, self.SELF_CONSUMPTION, self.GRID_EXPORT, self.GRID_IMPORT]
+        columns = pd.core.indexes.base.Index([self.TIMESTAMP] + self.energy_columns + [self.SELF_CONSUMPTION_RATIO, self.AUTARKY])
+        data_types = [main_table.get_column_dict()[self.TIMESTAMP]] + ["REAL"] * (len(columns) - 1)
+        self.interval_table = DBTable(self.INTERVAL_TABLE_NAME, columns, data_types, [self.TIMESTAMP])
+        self.daily_table = DBTable(self.DAILY_TABLE_NAME, columns, data_types, [self.TIMESTAMP])
+        self.monthly_table = DBTable(self.MONTHLY_TABLE_NAME, columns, data_types, [self.TIMESTAMP])
+
+    def calculate(self, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Calculate the energy balance of each interval.
+
+        Args:
+            data (pd.core.frame.DataFrame): The main raw data.
+
+        Returns:
+            pd.core.frame.DataFrame: The energies and the ratios of each interval (NaN, if there is no production respectively consumption).
+        """
+        production = pd.to_numeric(data[self.production_column]).values.astype(np.float64)
+        consumption = pd.to_numeric(data[self.consumption_column]).values.astype(np.float64)
+        self_consumption = np.minimum(production, consumption)
+        result = pd.DataFrame({
+            self.TIMESTAMP: data[self.TIMESTAMP].values,
+            self.production_column: production,
+            self.consumption_column: consumption,
+            self.SELF_CONSUMPTION: self_consumption,
+            self.GRID_EXPORT: np.clip(production - consumption, 0, None),
+            self.GRID_IMPORT: np.clip(consumption - production, 0, None)
+        })
+        return self._add_ratios(result)
+
+    def aggregate(self, results: pd.core.frame.DataFrame, key_length: int) -> pd.core.frame.DataFrame:
+        """
+        Aggregate the results by the prefix of the timestamp.
+
+        Args:
+            results (pd.core.frame.DataFrame): The interval results (or partial aggregates).
+            key_length (int): The length of the timestamp prefix, i.e. DAY_KEY_LENGTH or MONTH_KEY_LENGTH.
+
+        Returns:
+            pd.core.frame.DataFrame: The summed energies and the ratios of each day respectively month.
+        """
+        aggregated = results[[self.TIMESTAMP] + self.energy_columns].copy()
+        aggregated[self.TIMESTAMP] = aggregated[self.TIMESTAMP].astype(str).str.slice(0, key_length)
+        return self._add_ratios(aggregated.groupby(self.TIMESTAMP, as_index = False).sum())
+
+    def run(self) -> int:
+        """
+        Calculate the energy balance of all intervals newer than the newest stored interval and recompute the aggregates of the affected days and months.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        for table in [self.interval_table, self.daily_table, self.monthly_table]:
+            self.db_connector.create_table(table)
+        start_timestamp = self.db_connector.select_max_timestamp(self.interval_table.table_name)
+        processed = 0
+        first_timestamp = None
+        for chunk in self.db_connector.select_data_chunks(self.main_table.table_name, self.chunk_size, [self.TIMESTAMP, self.production_column, self.consumption_column], start_timestamp = start_timestamp):
+            if len(chunk) != 0:
+                self.db_connector.insert_data(self.interval_table, self.calculate(chunk), ignore_existing = True)
+                chunk_first_timestamp = chunk[self.TIMESTAMP].astype(str).min()
+                first_timestamp = chunk_first_timestamp if first_timestamp == None else min(first_timestamp, chunk_first_timestamp)
+            processed += len(chunk)
+        if first_timestamp != None:
+            first_day = first_timestamp[:self.DAY_KEY_LENGTH]
+            daily = [self.aggregate(chunk, self.DAY_KEY_LENGTH) for chunk in self.db_connector.select_data_chunks(self.interval_table.table_name, self.chunk_size, list(self.interval_table.data_columns), start_timestamp = first_day)]
+            self._replace_aggregates(self.daily_table, self.aggregate(pd.concat(daily, ignore_index = True), self.DAY_KEY_LENGTH), first_day)
+            first_month = first_timestamp[:self.MONTH_KEY_LENGTH]
+            daily = self.db_connector.select_data_range(self.daily_table.table_name, first_month)
+            self._replace_aggregates(self.monthly_table, self.aggregate(daily, self.MONTH_KEY_LENGTH), first_month)
+        return processed
+
+    def _add_ratios(self, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Add the self-consumption ratio (share of the production consumed on site) and the autarky (share of the consumption covered by the production).
+
+        Args:
+            data (pd.core.frame.DataFrame): The energies.
+
+        Returns:
+            pd.core.frame.DataFrame: The energies extended by the ratios.
+        """
+        self_consumption = data[self.SELF_CONSUMPTION].values
+        for column, reference in [(self.SELF_CONSUMPTION_RATIO, data[self.production_column].values), (self.AUTARKY, data[self.consumption_column].values)]:
+            data[column] = np.divide(self_consumption, reference, out = np.full(len(data), np.nan), where = reference > 0)
+        return data
+
+    def _replace_aggregates(self, table: DBTable, data: pd.core.frame.DataFrame, start_timestamp: str):
+        """
+        Replace the stored aggregates from the given day respectively month on in one transaction.
+
+        Args:
+            table (DBTable): The aggregate table.
+            data (pd.core.frame.DataFrame): The recomputed aggregates.
+            start_timestamp (str): The first day respectively month of the aggregates.
+        """
+        self.db_connector.replace_data_range(table, data[list(table.data_columns)], start_timestamp)
@@ -0,0 +1,163 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from kpi_engine import KPIEngine
+from sun_position import TIME_ZONE, get_sun_position, get_sun_factor
+
+class ExpectedYieldModel(KPIEngine):
+    """
+    The ExpectedYieldModel estimates the clear-sky production of each tracker and the performance ratio of the measured production.
+    The irradiance on the tilted plane follows the Meinel model for the direct irradiance with the Kasten-Young air mass and an isotropic diffuse share.
+    The angle of incidence uses the sun factor of src/metadata.R, i.e. the inclination angle is measured from the vertical.
+    Like for the KPIEngine, raw rows inserted later before the newest stored result (e.g. a backfilled older file) are never processed.
+    """
+    RESULT_TABLE_NAME = "tracker_performance"
+    DAILY_TABLE_NAME = "tracker_performance_daily"
+    EXPECTED = "expected"
+    PERFORMANCE_RATIO = "performance_ratio"
+    SOLAR_CONSTANT = 1353.0
+    DIFFUSE_SHARE = 0.1
+    INTERVAL_MINUTES = 15
+    ENERGY_SCALE = 0.001
+    DAY_KEY_LENGTH = 10
+
+    def __init__(self, db_connector: DBConnector, raw_table: DBTable, meta_table: DBTable, interval_minutes: int = INTERVAL_MINUTES, energy_scale: float = ENERGY_SCALE, chunk_size: int = KPIEngine.CHUNK_SIZE, time_zone: str = TIME_ZONE):
+        """
+        Initialize the expected yield model.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            raw_table (DBTable): The tracker raw table, i.e. timestamp, tracker name and one value column.
+            meta_table (DBTable): The tracker meta table.
+            interval_minutes (int, optional): The length of an interval of the raw data in minutes. Defaults to 15.
+            energy_scale (float, optional): The factor converting Wh into the unit of the raw data. Defaults to 0.001 (kWh).
+            chunk_size (int, optional): The number of raw rows processed at once. Defaults to 100000.
+            time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+        """
+        super().__init__(db_connector, raw_table, meta_table, self.RESULT_TABLE_NAME, chunk_size, time_zone)
+        self.interval_minutes = interval_minutes
+        self.energy_scale = energy_scale
+        self.expected_column = "%s_%s"%(self.EXPECTED, self.value_column)
+        raw_types = raw_table.get_column_dict()
+        columns = pd.core.indexes.base.Index([self.TIMESTAMP, self.TRACKER_NAME, self.value_column, self.expected_column, self.PERFORMANCE_RATIO])
+        data_types = [raw_types[self.TIMESTAMP], raw_types[self.TRACKER_NAME], "REAL", "REAL", "REAL"]
+        self.result_table = DBTable(self.RESULT_TABLE_NAME, columns, data_types, [self.TIMESTAMP, self.TRACKER_NAME])
+        self.daily_table = DBTable(self.DAILY_TABLE_NAME, columns, data_types, [self.TIMESTAMP, self.TRACKER_NAME])
+
+    def get_clear_sky_irradiance(self, timestamps, latitude, longitude, inclination_angle, direction) -> np.ndarray:
+        """
+        Estimate the clear-sky irradiance on the tilted plane.
+
+        Args:
+            timestamps (array-like): The local timestamps.
+            latitude (array-like): The latitude in degree.
+            longitude (array-like): The longitude in degree.
+            inclination_angle (array-like): The inclination angle of the solar field in degree.
+            direction (array-like): The direction of the solar field in degree (measured from north clockwise).
+
+        Returns:
+            np.ndarray: The irradiance in W/m^2, zero while the sun is below the horizon.
+        """
+        altitude, _ = get_sun_position(timestamps, latitude, longitude, self.time_zone)
+        altitude_degree = np.degrees(altitude)
+        above_horizon = altitude > 0
+        air_mass = np.where(above_horizon, 1 / (np.sin(np.clip(altitude, 1e-6, None)) + 0.50572 * np.power(np.clip(altitude_degree, 0, None) + 6.07995, -1.6364)), np.inf)
+        direct = np.where(above_horizon, self.SOLAR_CONSTANT * np.power(0.7, np.power(air_mass, 0.678)), 0)
+        sky_view = (1 + np.sin(np.radians(np.asarray(inclination_angle, dtype = np.float64)))) / 2
+        sun_factor = get_sun_factor(timestamps, latitude, longitude, inclination_angle, direction, self.time_zone)
+        return direct * sun_factor + self.DIFFUSE_SHARE * direct * sky_view
+
+    def calculate(self, data: pd.core.frame.DataFrame, meta_data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Calculate the expected production and the performance ratio of each interval for all trackers in one vectorized pass.
+
+        Args:
+            data (pd.core.frame.DataFrame): The raw data of the trackers.
+            meta_data (pd.core.frame.DataFrame): The meta data of the trackers.
+
+        Returns:
+            pd.core.frame.DataFrame: The measured and expected production and the performance ratio (NaN, if no production is expected).
+        """
+        joined = self._join_meta_data(data, meta_data)
+        irradiance = self.get_clear_sky_irradiance(joined[self.TIMESTAMP].values, joined[self.LATITUDE].values, joined[self.LONGITUDE].values, joined[self.INCLINATION_ANGLE].values, joined[self.DIRECTION].values)
+        efficiency = joined[self.SOLAR_PANEL_EFFICIENCY].values / 100
+        expected = irradiance * self._get_panel_area(joined) * efficiency * self.interval_minutes / 60 * self.energy_scale
+        result = joined[[self.TIMESTAMP, self.TRACKER_NAME, self.value_column]].copy()
+        result[self.expected_column] = expected
+        result[self.PERFORMANCE_RATIO] = self._get_performance_ratio(result[self.value_column].values, expected)
+        return result
+
+    def aggregate_daily(self, results: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Aggregate the interval results into daily results per tracker.
+
+        Args:
+            results (pd.core.frame.DataFrame): The interval results (or partial daily sums).
+
+        Returns:
+            pd.core.frame.DataFrame: The daily measured and expected production and the performance ratio, the timestamp is the day (YYYY-MM-DD).
+        """
+        daily = results[[self.TIMESTAMP, self.TRACKER_NAME, self.value_column, self.expected_column]].copy()
+        daily[self.TIMESTAMP] = daily[self.TIMESTAMP].astype(str).str.slice(0, self.DAY_KEY_LENGTH)
+        daily = daily.groupby([self.TIMESTAMP, self.TRACKER_NAME], as_index = False).sum()
+        daily[self.PERFORMANCE_RATIO] = self._get_performance_ratio(daily[self.value_column].values, daily[self.expected_column].values)
+        return daily
+
+    def run(self) -> int:
+        """
+        Calculate the interval results of all raw rows newer than the newest stored result and recompute the daily results of the affected days.
+        The existing interval results are skipped by the primary key and the daily results of the affected days are replaced in one transaction.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        meta_data = self.db_connector.select_data_unfiltered(self.meta_table.table_name)
+        self.db_connector.create_table(self.result_table)
+        self.db_connector.create_table(self.daily_table)
+        start_timestamp = self.db_connector.select_max_timestamp(self.result_table.table_name)
+        processed = 0
+        first_day = None
+        for chunk in self.db_connector.select_data_chunks(self.raw_table.table_name, self.chunk_size, list(self.raw_table.data_columns), start_timestamp = start_timestamp):
+            result = self.calculate(chunk, meta_data)
+            if len(result) != 0:
+                self.db_connector.insert_data(self.result_table, result, ignore_existing = True)
+                chunk_first_day = result[self.TIMESTAMP].astype(str).min()[:self.DAY_KEY_LENGTH]
+                first_day = chunk_first_day if first_day == None else min(first_day, chunk_first_day)
+            processed += len(chunk)
+        if first_day != None:
+            daily = [self.aggregate_daily(chunk) for chunk in self.db_connector.select_data_chunks(self.result_table.table_name, self.chunk_size, list(self.result_table.data_columns), start_timestamp = first_day)]
+            daily = self.aggregate_daily(pd.concat(daily, ignore_index = True))
+            self.db_connector.replace_data_range(self.daily_table, daily[list(self.daily_table.data_columns)], first_day)
+        return processed
+
+    def _get_performance_ratio(self, measured: np.ndarray, expected: np.ndarray) -> np.ndarray:
+        """
+        Calculate the ratio of the measured and the expected production.
+
+        Args:
+            measured (np.ndarray): The measured production.
+            expected (np.ndarray): The expected production.
+
+        Returns:
+            np.ndarray: The performance ratio, NaN if no production is expected.
+        """
+        expected = np.asarray(expected, dtype = np.float64)
+        return np.divide(np.asarray(measured, dtype = np.float64), expected, out = np.full(len(expected), np.nan), where = expected > 0)
@@ -0,0 +1,156 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from sun_position import TIME_ZONE, get_sun_factor
+
+class KPIEngine:
+    """
+    The KPIEngine computes the normalized production of all trackers (the Python counterpart of Metadata$calculateResult in src/metadata.R).
+    The raw data are joined with the meta data once and streamed in chunks, the results are persisted into a table readable by the R scripts.
+    A run processes the raw rows from the newest stored result (the watermark) on only, hence raw rows inserted later before the watermark (e.g. a backfilled older file) are never processed, the result table must be dropped to recompute them.
+    """
+    RESULT_TABLE_NAME = "tracker_kpi"
+    CHUNK_SIZE = 100000
+    TIMESTAMP = "timestamp"
+    TRACKER_NAME = "tracker_name"
+    DIRECTION = "direction"
+    INCLINATION_ANGLE = "inclination_angle"
+    LATITUDE = "latitude"
+    LONGITUDE = "longitude"
+    SOLAR_PANEL_WIDTH = "solar_panel_width"
+    SOLAR_PANEL_HEIGHT = "solar_panel_height"
+    SOLAR_PANEL_EFFICIENCY = "solar_panel_energy_conversion_efficiency"
+    SOLAR_PANEL_NUMBER = "solar_panel_number"
+    META_COLUMNS = [DIRECTION, INCLINATION_ANGLE, LATITUDE, LONGITUDE, SOLAR_PANEL_WIDTH, SOLAR_PANEL_HEIGHT, SOLAR_PANEL_EFFICIENCY, SOLAR_PANEL_NUMBER]
+    PER_PANEL = "per_panel"
+    PER_SQUARE_METER = "per_square_meter"
+    PER_PANEL_SUN_FACTOR = "per_panel_sun_factor"
+    PER_SQUARE_METER_SUN_FACTOR = "per_square_meter_sun_factor"
+    SUN_FACTOR = "sun_factor"
+
+    def __init__(self, db_connector: DBConnector, raw_table: DBTable, meta_table: DBTable, result_table_name: str = RESULT_TABLE_NAME, chunk_size: int = CHUNK_SIZE, time_zone: str = TIME_ZONE):
+        """
+        Initialize the KPI engine.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            raw_table (DBTable): The tracker raw table, i.e. timestamp, tracker name and one value column.
+            meta_table (DBTable): The tracker meta table.
+            result_table_name (str, optional): The name of the result table. Defaults to "tracker_kpi".
+            chunk_size (int, optional): The number of raw rows processed at once. Defaults to 100000.
+            time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+
+        Raises:
+            Exception: The exception is raised in case the raw or meta table is invalid.
+        """
+        if self.TIMESTAMP not in raw_table.data_columns or self.TRACKER_NAME not in raw_table.data_columns or len(raw_table.data_columns) != 3:
+            raise Exception("Invalid tracker table %s"%(raw_table.table_name))
+        missing_columns = [i for i in [self.TRACKER_NAME] + self.META_COLUMNS if i not in meta_table.data_columns]
+        if len(missing_columns) != 0:
+            raise Exception("The meta table %s misses the columns %s"%(meta_table.table_name, ", ".join(missing_columns)))
+        self.db_connector = db_connector
+        self.raw_table = raw_table
+        self.meta_table = meta_table
+        self.chunk_size = chunk_size
+        self.time_zone = time_zone
+        self.value_column = [i for i in raw_table.data_columns if i not in [self.TIMESTAMP, self.TRACKER_NAME]][0]
+        self.kpi_columns = ["%s_%s"%(self.value_column, i) for i in [self.PER_PANEL, self.PER_SQUARE_METER, self.PER_PANEL_SUN_FACTOR, self.PER_SQUARE_METER_SUN_FACTOR]] + [self.SUN_FACTOR]
+        raw_types = raw_table.get_column_dict()
+        self.result_table = DBTable(
+            result_table_name,
+            pd.core.indexes.base.Index([self.TIMESTAMP, self.TRACKER_NAME, self.value_column] + self.kpi_columns),
+            [raw_types[self.TIMESTAMP], raw_types[self.TRACKER_NAME], raw_types[self.value_column]] + ["REAL"] * len(self.kpi_columns),
+            [self.TIMESTAMP, self.TRACKER_NAME]
+        )
+
+    def calculate(self, data: pd.core.frame.DataFrame, meta_data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Calculate the KPIs of all trackers in one vectorized pass.
+
+        Args:
+            data (pd.core.frame.DataFrame): The raw data of the trackers.
+            meta_data (pd.core.frame.DataFrame): The meta data of the trackers.
+
+        Returns:
+            pd.core.frame.DataFrame: The raw data of all trackers with meta data extended by the KPI columns.
+        """
+        joined = self._join_meta_data(data, meta_data)
+        value = joined[self.value_column].values
+        panel_number = joined[self.SOLAR_PANEL_NUMBER].values
+        panel_area = self._get_panel_area(joined)
+        sun_factor = get_sun_factor(joined[self.TIMESTAMP].values, joined[self.LATITUDE].values, joined[self.LONGITUDE].values, joined[self.INCLINATION_ANGLE].values, joined[self.DIRECTION].values, self.time_zone)
+        per_panel = value / panel_number
+        per_square_meter = value / (panel_number * panel_area)
+        result = joined[[self.TIMESTAMP, self.TRACKER_NAME, self.value_column]].copy()
+        for column, values in zip(self.kpi_columns, [per_panel, per_square_meter, per_panel * sun_factor, per_square_meter * sun_factor, sun_factor]):
+            result[column] = values
+        return result
+
+    def _join_meta_data(self, data: pd.core.frame.DataFrame, meta_data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Join the raw data with the numeric meta data of the trackers, rows of trackers without meta data are dropped.
+
+        Args:
+            data (pd.core.frame.DataFrame): The raw data of the trackers.
+            meta_data (pd.core.frame.DataFrame): The meta data of the trackers.
+
+        Returns:
+            pd.core.frame.DataFrame: The joined data in the order of the raw data.
+        """
+        meta_data = meta_data[[self.TRACKER_NAME] + self.META_COLUMNS].copy()
+        meta_data[self.TRACKER_NAME] = meta_data[self.TRACKER_NAME].astype(str)
+        meta_data[self.META_COLUMNS] = meta_data[self.META_COLUMNS].apply(pd.to_numeric).astype(np.float64)
+        return pd.DataFrame({
+            self.TIMESTAMP: data[self.TIMESTAMP].values,
+            self.TRACKER_NAME: data[self.TRACKER_NAME].astype(str).values,
+            self.value_column: pd.to_numeric(data[self.value_column]).astype(np.float64).values
+        }).merge(meta_data, on = self.TRACKER_NAME, how = "inner")
+
+    def _get_panel_area(self, joined: pd.core.frame.DataFrame) -> np.ndarray:
+        """
+        Calculate the area of all panels of each tracker in square meter like Metadata$calculateSolarPanelArea.
+
+        Args:
+            joined (pd.core.frame.DataFrame): The raw data joined with the meta data.
+
+        Returns:
+            np.ndarray: The panel area of each row.
+        """
+        return joined[self.SOLAR_PANEL_WIDTH].values / 1000 * joined[self.SOLAR_PANEL_HEIGHT].values / 1000 * joined[self.SOLAR_PANEL_NUMBER].values
+
+    def run(self) -> int:
+        """
+        Calculate the KPIs of all raw rows newer than the newest stored result and insert them into the result table.
+        The chunks lie at or after the newest stored result, so the existing results are skipped by the primary key instead of reading all stored keys for each chunk.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        meta_data = self.db_connector.select_data_unfiltered(self.meta_table.table_name)
+        self.db_connector.create_table(self.result_table)
+        start_timestamp = self.db_connector.select_max_timestamp(self.result_table.table_name)
+        processed = 0
+        for chunk in self.db_connector.select_data_chunks(self.raw_table.table_name, self.chunk_size, list(self.raw_table.data_columns), start_timestamp = start_timestamp):
+            result = self.calculate(chunk, meta_data)
+            if len(result) != 0:
+                self.db_connector.insert_data(self.result_table, result, ignore_existing = True)
+            processed += len(chunk)
+        return processed
@@ -0,0 +1,253 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+DAY = "day"
+WEEK = "week"
+
+class LoadProfile:
+    """
+    The LoadProfile estimates the typical day and the typical week of the production and the consumption, i.e. quantiles per slot (e.g. 15 minutes) of the day respectively the week, for the whole year and per season.
+    Each slot keeps a quantile sketch of logarithmic buckets: a value v > 0 is counted in the bucket ceil(log(v) / log(gamma)) with gamma = (1 + accuracy) / (1 - accuracy), so any quantile is estimated within the relative accuracy,
+    the values below MIN_VALUE (e.g. the production at night or negative readings) are counted as zero. The sketches are merged by adding the counts of equal buckets.
+    The counts are stored in the sketch table and a run folds in the raw rows newer than the newest processed timestamp (the watermark) only, the raw data are read in chunks.
+    Hence raw rows inserted later at or before the watermark (e.g. a backfilled older file) are never folded in, the sketches must be rebuilt by removing the sketch and the state table of the main table.
+    """
+    SKETCH_TABLE_NAME = "load_profile_sketch"
+    STATE_TABLE_NAME = "load_profile_state"
+    RESULT_TABLE_NAME = "load_profile"
+    CHUNK_SIZE = 100000
+    TIMESTAMP = "timestamp"
+    PRODUCTION = "Production"
+    CONSUMPTION = "Consumption"
+    PROFILE = "profile"
+    SEASON = "season"
+    SLOT = "slot"
+    QUANTITY = "quantity"
+    BUCKET = "bucket"
+    COUNT = "count"
+    TABLE_NAME = "table_name"
+    MAX_TIMESTAMP = "max_timestamp"
+    ALL_SEASONS = "all"
+    SEASONS = {12: "winter", 1: "winter", 2: "winter", 3: "spring", 4: "spring", 5: "spring", 6: "summer", 7: "summer", 8: "summer", 9: "autumn", 10: "autumn", 11: "autumn"}
+    PROFILES = [DAY, WEEK]
+    QUANTILES = [0.1, 0.5, 0.9]
+    INTERVAL_MINUTES = 15
+    ACCURACY = 0.01
+    MIN_VALUE = 1e-6
+    ZERO_BUCKET = -1000000000
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+    def __init__(self, db_connector: DBConnector, main_table: DBTable, value_columns: list[str] = [PRODUCTION, CONSUMPTION], interval_minutes: int = INTERVAL_MINUTES, quantiles: list[float] = QUANTILES, accuracy: float = ACCURACY, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the load profile.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            main_table (DBTable): The main raw table containing the timestamp and the value columns.
+            value_columns (list[str], optional): The columns to profile. Defaults to ["Production", "Consumption"].
+            interval_minutes (int, optional): The length of a slot in minutes. Defaults to 15.
+            quantiles (list[float], optional): The quantiles of the result table. Defaults to [0.1, 0.5, 0.9].
+            accuracy (float, optional): The relative accuracy of the quantiles, it must not change, once the sketches are stored. Defaults to 0.01.
+            chunk_size (int, optional): The number of raw rows processed at once. Defaults to 100000.
+
+        Raises:
+            Exception: The exception is raised in case the main table misses a column or the interval, a quantile or the accuracy is invalid.
+        """
+        missing_columns = [i for i in [self.TIMESTAMP] + value_columns if i not in main_table.data_columns]
+        if len(missing_columns) != 0:
+            raise Exception("The main table %s misses the columns %s"%(main_table.table_name, ", ".join(missing_columns)))
+        if interval_minutes < 1 or 1440 % interval_minutes != 0:
+            raise Exception("Invalid interval of %i minutes given, a day must consist of whole intervals!"%(interval_minutes))
+        if any([i < 0 or i > 1 for i in quantiles]) or accuracy <= 0 or accuracy >= 1:
+            raise Exception("Invalid quantiles %s or accuracy %s given!"%(str(quantiles), str(accuracy)))
+        self.db_connector = db_connector
+        self.main_table = main_table
+        self.value_columns = value_columns
+        self.interval_minutes = interval_minutes
+        self.quantiles = quantiles
+        self.chunk_size = chunk_size
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.keys = [self.PROFILE, self.SEASON, self.SLOT, self.QUANTITY]
+        self.sketch_table = DBTable(self.SKETCH_TABLE_NAME, pd.core.indexes.base.Index(self.keys + [self.BUCKET, self.COUNT]), ["TEXT", "TEXT", "INTEGER", "TEXT", "INTEGER", "INTEGER"], self.keys + [self.BUCKET])
+        self.state_table = DBTable(self.STATE_TABLE_NAME, pd.core.indexes.base.Index([self.TABLE_NAME, self.MAX_TIMESTAMP]), ["TEXT", "TEXT"], [self.TABLE_NAME])
+        self.quantile_columns = [self.get_quantile_column(i) for i in quantiles]
+        self.result_table = DBTable(self.RESULT_TABLE_NAME, pd.core.indexes.base.Index(self.keys + [self.COUNT] + self.quantile_columns), ["TEXT", "TEXT", "INTEGER", "TEXT", "INTEGER"] + ["REAL"] * len(quantiles), self.keys)
+
+    def get_quantile_column(self, quantile: float) -> str:
+        """
+        Get the column of the quantile in the result table.
+
+        Args:
+            quantile (float): The quantile, e.g. 0.1.
+
+        Returns:
+            str: The column name, e.g. "q10".
+        """
+        return "q%s"%(("%g"%(quantile * 100)).replace(".", "_"))
+
+    def build_sketches(self, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Count the values of the raw data in the buckets of the sketches of their slots.
+
+        Args:
+            data (pd.core.frame.DataFrame): The timestamp and the value columns.
+
+        Returns:
+            pd.core.frame.DataFrame: The profile, season, slot, quantity, bucket and count of each non-empty bucket.
+        """
+        timestamps = pd.to_datetime(data[self.TIMESTAMP].astype(str), format = self.TIMESTAMP_FORMAT)
+        day_slots = ((timestamps.dt.hour * 60 + timestamps.dt.minute) // self.interval_minutes).values
+        slots = {DAY: day_slots, WEEK: timestamps.dt.weekday.values * (1440 // self.interval_minutes) + day_slots}
+        seasons = timestamps.dt.month.map(self.SEASONS).values
+        result = []
+        for column in self.value_columns:
+            values = pd.to_numeric(data[column]).values.astype(np.float64)
+            present = ~np.isnan(values)
+            buckets = np.full(len(values), self.ZERO_BUCKET, dtype = np.int64)
+            positive = present & (values >= self.MIN_VALUE)
+            buckets[positive] = np.ceil(np.log(values[positive]) / np.log(self.gamma)).astype(np.int64)
+            for profile in self.PROFILES:
+                for season in [seasons[present], np.full(int(present.sum()), self.ALL_SEASONS, dtype = object)]:
+                    result.append(pd.core.frame.DataFrame({self.PROFILE: profile, self.SEASON: season, self.SLOT: slots[profile][present], self.QUANTITY: column, self.BUCKET: buckets[present], self.COUNT: 1}))
+        return self.merge_sketches(result)
+
+    def merge_sketches(self, sketches: list[pd.core.frame.DataFrame]) -> pd.core.frame.DataFrame:
+        """
+        Merge sketches by adding the counts of equal buckets.
+
+        Args:
+            sketches (list[pd.core.frame.DataFrame]): The sketches (see build_sketches).
+
+        Returns:
+            pd.core.frame.DataFrame: The merged sketch.
+        """
+        sketches = [i for i in sketches if len(i) != 0]
+        if len(sketches) == 0:
+            return pd.core.frame.DataFrame(columns = self.sketch_table.data_columns)
+        merged = pd.concat(sketches, ignore_index = True)
+        merged[self.COUNT] = merged[self.COUNT].astype(np.int64)
+        return merged.groupby(self.keys + [self.BUCKET], as_index = False, sort = True)[self.COUNT].sum()
+
+    def estimate(self, sketches: pd.core.frame.DataFrame, quantiles: list[float] = None) -> pd.core.frame.DataFrame:
+        """
+        Estimate the quantiles of each sketch.
+
+        Args:
+            sketches (pd.core.frame.DataFrame): The merged sketches (see merge_sketches).
+            quantiles (list[float], optional): The quantiles. Defaults to None (the quantiles of the result table).
+
+        Returns:
+            pd.core.frame.DataFrame: The profile, season, slot, quantity, count and quantile columns of each sketch.
+        """
+        sketches = sketches.sort_values(self.keys + [self.BUCKET], kind = "stable").reset_index(drop = True)
+        groups = sketches.groupby(self.keys, sort = False)[self.COUNT]
+        cumulative = groups.cumsum().values
+        totals = groups.transform("sum").values
+        buckets = sketches[self.BUCKET].values
+        # the value of a bucket is the midpoint of its bounds gamma^(i-1) and gamma^i
+        values = np.where(buckets == self.ZERO_BUCKET, 0.0, 2 * np.power(self.gamma, buckets.astype(np.float64)) / (self.gamma + 1))
+        result = sketches[self.keys].drop_duplicates().reset_index(drop = True)
+        result[self.COUNT] = groups.sum().values
+        quantiles = quantiles if quantiles != None else self.quantiles
+        for quantile in quantiles:
+            reached = cumulative > quantile * (totals - 1)
+            first = sketches[reached].groupby(self.keys, sort = False).head(1).index
+            result[self.get_quantile_column(quantile)] = values[first]
+        return result
+
+    def select_sketches(self, profile: str = None, season: str = None) -> pd.core.frame.DataFrame:
+        """
+        Read the stored sketches.
+
+        Args:
+            profile (str, optional): Restrict the result to "day" or "week". Defaults to None (both).
+            season (str, optional): Restrict the result to a season (or "all"). Defaults to None (all seasons).
+
+        Returns:
+            pd.core.frame.DataFrame: The stored buckets.
+        """
+        if not self.db_connector.test_table_exists(self.sketch_table.table_name):
+            return pd.core.frame.DataFrame(columns = self.sketch_table.data_columns)
+        sketches = self.db_connector.select_data_unfiltered(self.sketch_table.table_name)
+        mask = np.full(len(sketches), True)
+        if profile != None:
+            mask &= (sketches[self.PROFILE] == profile).values
+        if season != None:
+            mask &= (sketches[self.SEASON] == season).values
+        return sketches[mask]
+
+    def get_profile(self, profile: str = DAY, season: str = ALL_SEASONS, quantiles: list[float] = None) -> pd.core.frame.DataFrame:
+        """
+        Estimate the quantiles of the stored sketches of a profile and a season, e.g. other quantiles than the ones of the result table.
+
+        Args:
+            profile (str, optional): "day" or "week". Defaults to "day".
+            season (str, optional): "winter", "spring", "summer", "autumn" or "all". Defaults to "all".
+            quantiles (list[float], optional): The quantiles. Defaults to None (the quantiles of the load profile).
+
+        Returns:
+            pd.core.frame.DataFrame: The count and the quantiles of each slot and quantity.
+        """
+        sketches = self.select_sketches(profile, season)
+        if len(sketches) == 0:
+            return pd.core.frame.DataFrame(columns = self.keys + [self.COUNT] + [self.get_quantile_column(i) for i in (quantiles if quantiles != None else self.quantiles)])
+        return self.estimate(sketches, quantiles).sort_values([self.QUANTITY, self.SLOT], kind = "stable").reset_index(drop = True)
+
+    def run(self) -> int:
+        """
+        Fold the raw rows newer than the newest processed timestamp into the stored sketches and update the result table.
+        The sketches, the result and the newest processed timestamp are written in one transaction, so a failed run folds in the same rows again.
+        Raw rows at or before the newest processed timestamp, which were inserted after the last run (e.g. a backfilled older file), are never folded in.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        for table in [self.sketch_table, self.state_table, self.result_table]:
+            self.db_connector.create_table(table)
+        state = self.db_connector.select_data_unfiltered(self.state_table.table_name)
+        state = state[state[self.TABLE_NAME] == self.main_table.table_name]
+        watermark = str(state[self.MAX_TIMESTAMP].iloc[0]) if len(state) != 0 else None
+        sketches = []
+        processed = 0
+        max_timestamp = watermark
+        for chunk in self.db_connector.select_data_chunks(self.main_table.table_name, self.chunk_size, [self.TIMESTAMP] + self.value_columns, start_timestamp = watermark):
+            timestamps = chunk[self.TIMESTAMP].astype(str)
+            # the start of the range is inclusive, the rows of the watermark are processed already
+            chunk = chunk[(timestamps > watermark).values] if watermark != None else chunk
+            if len(chunk) == 0:
+                continue
+            sketches = [self.merge_sketches(sketches + [self.build_sketches(chunk)])]
+            processed += len(chunk)
+            chunk_max_timestamp = chunk[self.TIMESTAMP].astype(str).max()
+            max_timestamp = chunk_max_timestamp if max_timestamp == None else max(max_timestamp, chunk_max_timestamp)
+        if processed == 0:
+            return 0
+        touched = sketches[0][self.keys].drop_duplicates()
+        stored = self.select_sketches()
+        stored = stored.merge(touched, on = self.keys, how = "inner")
+        merged = self.merge_sketches([stored, sketches[0]])
+        self.db_connector.upsert_tables([self.sketch_table, self.result_table, self.state_table], [
+            merged,
+            self.estimate(merged)[list(self.result_table.data_columns)],
+            pd.core.frame.DataFrame([[self.main_table.table_name, max_timestamp]], columns = self.state_table.data_columns)
+        ])
+        return processed
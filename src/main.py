@@ -17,13 +17,14 @@
 
 from config import Config
 from db_connector import DBConnector, DBTable
-from read_pv_csv import search_csv_files
 
+import os
 import pandas as pd
 
 class Main:
     """
     The main class
+    The modules of the single steps are imported, when the step is run, so a short command only imports the modules it needs.
     """
     TRACKER_KEY = "tracker_name"
     META_KEY = "meta"
@@ -36,7 +37,29 @@ class Main:
             config_path (str): The full path to the config file.
         """
         self.config = Config(config_path)
-        self.db_connector = DBConnector(self.config.wd, self.config.db_name)
+        if self.config.db_chunk_store:
+            from chunk_store import ChunkStore
+            self.db_connector = ChunkStore(self.config.wd, self.config.db_name,
+                cache_size = self.config.db_cache_size,
+                journal_mode = self.config.db_journal_mode,
+                busy_timeout = self.config.db_busy_timeout,
+                write_retries = self.config.db_write_retries,
+                lock_file = self.config.db_lock_file,
+                write_batch_size = self.config.db_write_batch_size,
+                max_lock_seconds = self.config.db_max_lock_seconds
+            )
+        else:
+            self.db_connector = DBConnector(self.config.wd, self.config.db_name,
+                shard_by = self.config.db_shard,
+                zone_map = self.config.db_zone_map,
+                cache_size = self.config.db_cache_size,
+                journal_mode = self.config.db_journal_mode,
+                busy_timeout = self.config.db_busy_timeout,
+                write_retries = self.config.db_write_retries,
+                lock_file = self.config.db_lock_file,
+                write_batch_size = self.config.db_write_batch_size,
+                max_lock_seconds = self.config.db_max_lock_seconds
+            )
     
     def create_tables(self):
         """
@@ -45,67 +68,378 @@ class Main:
         for table_name in self.config.tables.keys():
             table = self.config.tables[table_name]
             self.db_connector.create_table(table)
-            if len(table.primary_key_list) != 0:
+            for index in table.indexes:
+                self.db_connector.create_index(index.index_name, table.table_name, index.get_indexed_columns(), index.condition)
+            # the configured indexes replace the default index on the primary key
+            if len(table.primary_key_list) != 0 and len(table.indexes) == 0:
                 self.db_connector.create_index("idx_" + table.table_name, table.table_name, table.primary_key_list)
             if table_name in self.config.meta_data.keys():
                 self._insert_table_data(table, self.config.meta_data[table_name])
+            if table_name in self.config.db_meta_files.keys():
+                self.insert_meta_file(table_name)
+
+    def insert_meta_file(self, table_key: str) -> int:
+        """
+        Insert the meta file of the table (relative to the working directory) in chunks, the stored rows are kept.
+
+        Args:
+            table_key (str): The key of the table in the config, e.g. "tracker.meta".
+
+        Returns:
+            int: The number of complete rows read from the file.
+        """
+        from read_pv_csv import read_meta_file
+        table = self.config.tables[table_key]
+        count = 0
+        for chunk in read_meta_file(os.path.join(self.config.wd, self.config.db_meta_files[table_key]), table.data_columns, self.config.separator):
+            self._insert_table_data(table, chunk)
+            count += len(chunk)
+        return count
     
-    def insert_raw_data(self):
+    def verify_indexes(self) -> pd.core.frame.DataFrame:
+        """
+        Verify, that the standard range reads of the configured tables use their configured indexes.
+
+        Returns:
+            pd.core.frame.DataFrame: The table name, the index name, the query plan and whether the index is used for each configured index.
+        """
+        result = []
+        for table in self.config.tables.values():
+            if len(table.indexes) != 0 and self.db_connector.test_table_exists(table.table_name):
+                verified = self.db_connector.verify_indexes(table)
+                verified.insert(0, "table_name", table.table_name)
+                result.append(verified)
+        return pd.concat(result, ignore_index = True) if len(result) != 0 else pd.DataFrame(columns = ["table_name", "index_name", "plan", "used"])
+
+    def export_table(self, table_key: str, output_path: str, file_format: str = "csv", start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> dict:
+        """
+        Export the configured table (or a time range and trackers of it) in chunks to compressed, typed files with a sidecar schema, e.g. for the R analysis.
+
+        Args:
+            table_key (str): The key of the table in the config, e.g. "tracker.raw".
+            output_path (str): The full path of the output without extension.
+            file_format (str, optional): "csv" or "columnar". Defaults to "csv".
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the export to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            dict: The schema of the export.
+        """
+        from table_export import TableExporter
+        return TableExporter(self.db_connector).export(self.config.tables[table_key].table_name, output_path, file_format, [], start_timestamp, end_timestamp, tracker_names)
+
+    def maintain_database(self, time_budget: float = None, full_check: bool = False) -> dict:
+        """
+        Gather the statistics of the query planner, release free pages, check the integrity and report the storage of the database and all shards.
+
+        Args:
+            time_budget (float, optional): The maximum duration in seconds, e.g. the nightly window. Defaults to None (unlimited).
+            full_check (bool, optional): Run the complete integrity check instead of the quick check. Defaults to False.
+
+        Returns:
+            dict: The report of each database file ("databases") and of each table and index ("objects") as data frames.
+        """
+        from db_maintenance import DBMaintenance
+        return DBMaintenance(self.db_connector, time_budget).run(full_check)
+
+    def insert_raw_data(self, upsert: bool = False) -> dict:
         """
-        Insert the raw input data into the database.
+        Insert the raw input data into the database. The rows before the cutoff of the last retention of their table are dropped, since they are archived already.
+        If the raw data are resampled (db.resample), the slots without reading and fill are not stored, filled slots are replaced by a later reading in upsert mode only.
+
+        Args:
+            upsert (bool, optional): Update the stored rows, whose values differ from the input (e.g. corrected exports), instead of keeping them. Defaults to False.
 
         Raises:
-            Exception: The exception is raised, in case the insertion of the raw data failed.
+            Exception: The exception is raised, in case the insertion of the raw data failed or the staging area (db.staging) is combined with the upsert mode, since staged rows are never updated.
+
+        Returns:
+            dict: The number of "inserted", "updated" and "unchanged" (already stored) rows of all tables, without upsert mode no row is updated.
         """
-        data = search_csv_files(self.config.wd, self.config.separator)
+        if upsert and self.config.db_staging != None:
+            raise Exception("The staging area (%s) cannot be used in upsert mode!"%(self.config.DB_STAGING))
+        from read_pv_csv import search_csv_files
+        from retention import RetentionManager
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        retention_manager = RetentionManager(self.db_connector)
+        resampler = self._get_resampler()
+        validator = self._get_data_validator()
+        if validator != None:
+            data, _ = validator.validate(search_csv_files(self.config.wd, self.config.separator, validator.FILE_NAME))
+        else:
+            data = search_csv_files(self.config.wd, self.config.separator)
         # check, if the columns match to the config
         if not self.config.data_columns.equals(data.columns):
             raise Exception("The data columns of the config %s does not match the actual data columns %s!"%(
                 ", ".join(self.config.data_columns.to_list()),
                 ", ".join(data.data_columns.to_list())
             ))
-        # fill the tables
-        for table_name in self.config.tables.keys():
-            table = self.config.tables[table_name]
-            table_data = pd.DataFrame()
-            # check, if all columns of the table are in the data => insert
-            if all([col in self.config.db_columns for col in table.data_columns]):
-                table_data = data[[self.config.get_data_column_name(col) for col in table.data_columns]]
-            elif self.TRACKER_KEY in table.data_columns and self.META_KEY not in table.table_name:
-                if (len(table.primary_key_list) + 1) != len(table.data_columns):
-                    raise Exception("Invalid tracker table " + table.table_name)
-                data_column_name = [i for i in table.data_columns if i not in table.primary_key_list][0]
-                for tracker_name in self.config.tracker_names:
-                    tracker_table_data = pd.DataFrame()
-                    for p_col in table.primary_key_list:
-                        if p_col != self.TRACKER_KEY:
-                            x = data[[self.config.get_data_column_name(p_col)]]
-                            tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
-                        else:
-                            x = pd.DataFrame(data.shape[0] * [self.config.get_data_column_name(tracker_name)], columns = [p_col])
-                            tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
-                    # Map the tracker data
-                    data_name = self.config.get_data_column_name(tracker_name)
-                    x = data[[data_name]]
-                    x.columns = [data_column_name]
-                    tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
-                    table_data = pd.concat([table_data, tracker_table_data], ignore_index = True)
-            else:
-                break
-            # save table
-            table_data.columns = [col if col in table.data_columns else self.config.get_db_column_name(col) for col in table_data.columns]
-            self._insert_table_data(table, table_data)
-
-    def _insert_table_data(self, table: DBTable, data: pd.core.frame.DataFrame):
+        staging_area = None
+        if self.config.db_staging != None:
+            from staging_area import StagingArea
+            staging_area = StagingArea(self.db_connector, self.config.db_staging == "memory")
+        try:
+            # fill the tables
+            for table_name in self.config.tables.keys():
+                table = self.config.tables[table_name]
+                table_data = pd.DataFrame()
+                # check, if all columns of the table are in the data => insert
+                if all([col in self.config.db_columns for col in table.data_columns]):
+                    table_data = data[[self.config.get_data_column_name(col) for col in table.data_columns]]
+                elif self.TRACKER_KEY in table.data_columns and self.META_KEY not in table.table_name:
+                    if (len(table.primary_key_list) + 1) != len(table.data_columns):
+                        raise Exception("Invalid tracker table " + table.table_name)
+                    data_column_name = [i for i in table.data_columns if i not in table.primary_key_list][0]
+                    for tracker_name in self.config.tracker_names:
+                        tracker_table_data = pd.DataFrame()
+                        for p_col in table.primary_key_list:
+                            if p_col != self.TRACKER_KEY:
+                                x = data[[self.config.get_data_column_name(p_col)]]
+                                tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
+                            else:
+                                x = pd.DataFrame(data.shape[0] * [self.config.get_data_column_name(tracker_name)], columns = [p_col])
+                                tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
+                        # Map the tracker data
+                        data_name = self.config.get_data_column_name(tracker_name)
+                        x = data[[data_name]]
+                        x.columns = [data_column_name]
+                        tracker_table_data = pd.concat([tracker_table_data, x], axis = 1)
+                        table_data = pd.concat([table_data, tracker_table_data], ignore_index = True)
+                else:
+                    break
+                # save table
+                table_data.columns = [col if col in table.data_columns else self.config.get_db_column_name(col) for col in table_data.columns]
+                if resampler != None and resampler.TIMESTAMP in table_data.columns:
+                    table_data = resampler.resample(table_data)
+                    # the unfilled slots are not stored, so the reading of a later file is not blocked by a NULL row of its primary key
+                    table_data = table_data.dropna(how = "all", subset = [i for i in table_data.columns if i not in [resampler.TIMESTAMP, resampler.TRACKER_NAME]])
+                table_data = retention_manager.remove_expired(table, table_data)
+                if len(table_data) == 0:
+                    continue
+                if upsert:
+                    self._check_table_exists(table.table_name)
+                    for key, value in self.db_connector.upsert_data(table, table_data).items():
+                        counts[key] += value
+                elif staging_area != None:
+                    self._check_table_exists(table.table_name)
+                    staging_area.stage(table, table_data)
+                else:
+                    inserted = self._insert_table_data(table, table_data)
+                    counts["inserted"] += inserted
+                    counts["unchanged"] += len(table_data) - inserted
+            if staging_area != None:
+                for table_counts in staging_area.transfer().values():
+                    counts["inserted"] += table_counts["transferred"]
+                    counts["unchanged"] += table_counts["duplicated"]
+        finally:
+            if staging_area != None:
+                staging_area.close()
+        return counts
+
+    def calculate_kpis(self) -> int:
+        """
+        Calculate the normalized production of all trackers for the newly inserted raw data and store it in the KPI table.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        from kpi_engine import KPIEngine
+        raw_table, meta_table = self._get_tracker_tables()
+        return KPIEngine(self.db_connector, raw_table, meta_table).run()
+
+    def calculate_performance(self) -> int:
+        """
+        Calculate the clear-sky expected production and the performance ratio of all trackers for the newly inserted raw data.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        from expected_yield import ExpectedYieldModel
+        raw_table, meta_table = self._get_tracker_tables()
+        return ExpectedYieldModel(self.db_connector, raw_table, meta_table).run()
+
+    def detect_anomalies(self) -> int:
+        """
+        Update the KPIs and flag the trackers underperforming their peers or their own baseline on the newly inserted days.
+
+        Returns:
+            int: The number of scored tracker days.
+        """
+        from kpi_engine import KPIEngine
+        from anomaly_detector import AnomalyDetector
+        raw_table, meta_table = self._get_tracker_tables()
+        return AnomalyDetector(self.db_connector, KPIEngine(self.db_connector, raw_table, meta_table)).run()
+
+    def calculate_energy_balance(self) -> int:
+        """
+        Calculate the self-consumption, the grid import and export and the autarky for the newly inserted main raw data.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        from energy_balance import EnergyBalance
+        return EnergyBalance(self.db_connector, self._get_main_table()).run()
+
+    def calculate_load_profiles(self) -> int:
+        """
+        Fold the newly inserted main raw data into the quantile sketches of the typical day and week and update the load profiles.
+
+        Returns:
+            int: The number of raw rows processed.
+        """
+        from load_profile import LoadProfile
+        return LoadProfile(self.db_connector, self._get_main_table()).run()
+
+    def apply_retention(self, now: str = None) -> int:
+        """
+        Archive the raw rows older than the retention period of their table, keep their hourly means and delete them from the live database.
+
+        Args:
+            now (str, optional): The current time. Defaults to None (now).
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        from retention import RetentionManager
+        retention_manager = RetentionManager(self.db_connector)
+        deleted = 0
+        for table_key, retention_days in self.config.db_retention.items():
+            table = self.config.tables[table_key]
+            if self.db_connector.test_table_exists(table.table_name):
+                deleted += retention_manager.apply(table, retention_days, now)
+        return deleted
+
+    def refresh_snapshots(self) -> int:
+        """
+        Refresh the memory mappable per month snapshots of the raw tables, only the new and the last snapshotted months are built.
+
+        Returns:
+            int: The number of built months.
+        """
+        from snapshot_store import SnapshotStore
+        snapshot_store = SnapshotStore(self.db_connector)
+        built = 0
+        for table in self.config.tables.values():
+            if SnapshotStore.TIMESTAMP in table.data_columns and self.db_connector.test_table_exists(table.table_name):
+                built += len(snapshot_store.refresh(table.table_name))
+        return built
+
+    def _get_data_validator(self):
+        """
+        Get the validator of the input rows, the limits of the trackers are derived from the tracker meta data of the config.
+
+        Returns:
+            DataValidator: The validator configured by db.validation, None if the input rows are not validated.
+        """
+        if self.config.db_validation == None:
+            return None
+        from data_validation import DataValidator
+        from energy_balance import EnergyBalance
+        from kpi_engine import KPIEngine
+        settings = self.config.db_validation
+        tracker_columns = [self.config.get_data_column_name(i) for i in self.config.tracker_names]
+        production_column = self.config.get_data_column_name(EnergyBalance.PRODUCTION) if EnergyBalance.PRODUCTION in self.config.db_columns else None
+        limits = {}
+        for meta_data in self._get_meta_data():
+            if all([i in meta_data.columns for i in [KPIEngine.TRACKER_NAME] + KPIEngine.META_COLUMNS]):
+                limits.update(DataValidator.get_tracker_limits(meta_data, {i: i for i in tracker_columns}, settings.get("limit.factor", DataValidator.LIMIT_FACTOR)))
+        return DataValidator(
+            self.db_connector,
+            tracker_columns,
+            production_column,
+            limits,
+            settings.get("rules", DataValidator.RULES),
+            settings.get("sum.tolerance", DataValidator.SUM_TOLERANCE)
+        )
+
+    def _get_meta_data(self) -> list[pd.core.frame.DataFrame]:
+        """
+        Get the meta data of the config and the stored rows of the meta tables loaded from meta files.
+
+        Returns:
+            list[pd.core.frame.DataFrame]: The meta data of each table.
+        """
+        meta_data = list(self.config.meta_data.values())
+        for table_key in self.config.db_meta_files.keys():
+            table_name = self.config.tables[table_key].table_name
+            if self.db_connector.test_table_exists(table_name):
+                meta_data.append(self.db_connector.select_data_unfiltered(table_name))
+        return meta_data
+
+    def _get_resampler(self):
+        """
+        Get the resampler of the raw data, the location of the night fill is the mean location of the trackers over all meta data files.
+
+        Returns:
+            Resampler: The resampler configured by db.resample, None if the raw data is not resampled.
+        """
+        if self.config.db_resample == None:
+            return None
+        from resampling import Resampler
+        from kpi_engine import KPIEngine
+        settings = self.config.db_resample
+        latitude = None
+        longitude = None
+        meta_data = [i for i in self._get_meta_data() if KPIEngine.LATITUDE in i.columns and KPIEngine.LONGITUDE in i.columns]
+        if len(meta_data) != 0:
+            locations = pd.concat([i[[KPIEngine.LATITUDE, KPIEngine.LONGITUDE]] for i in meta_data], ignore_index = True).apply(pd.to_numeric)
+            latitude = float(locations[KPIEngine.LATITUDE].mean())
+            longitude = float(locations[KPIEngine.LONGITUDE].mean())
+        return Resampler(
+            settings.get("interval.minutes", Resampler.INTERVAL_MINUTES),
+            settings.get("fill", "none"),
+            settings.get("max.gap", Resampler.MAX_GAP),
+            settings.get("tolerance.minutes", Resampler.TOLERANCE_MINUTES),
+            latitude,
+            longitude
+        )
+
+    def _get_main_table(self) -> DBTable:
+        """
+        Get the main raw table of the config, i.e. the table of the production and the consumption of the plant.
+
+        Raises:
+            Exception: The exception is raised, in case the table is not configured.
+
+        Returns:
+            DBTable: The main raw table.
+        """
+        from energy_balance import EnergyBalance
+        main_tables = [table for table in self.config.tables.values() if self.TRACKER_KEY not in table.data_columns and EnergyBalance.PRODUCTION in table.data_columns and EnergyBalance.CONSUMPTION in table.data_columns]
+        if len(main_tables) != 1:
+            raise Exception("Exactly one main raw table is required!")
+        return main_tables[0]
+
+    def _get_tracker_tables(self) -> tuple[DBTable, DBTable]:
+        """
+        Get the tracker raw table and the tracker meta table of the config.
+
+        Raises:
+            Exception: The exception is raised, in case one of the tables is not configured.
+
+        Returns:
+            tuple[DBTable, DBTable]: The tracker raw table and the tracker meta table.
+        """
+        raw_tables = [table for table in self.config.tables.values() if self.TRACKER_KEY in table.data_columns and self.META_KEY not in table.table_name]
+        meta_tables = [table for table in self.config.tables.values() if self.TRACKER_KEY in table.data_columns and self.META_KEY in table.table_name]
+        if len(raw_tables) != 1 or len(meta_tables) != 1:
+            raise Exception("Exactly one tracker raw table and one tracker meta table are required!")
+        return raw_tables[0], meta_tables[0]
+
+    def _insert_table_data(self, table: DBTable, data: pd.core.frame.DataFrame) -> int:
         """
         Insert the data into the table. If the table does not exist, it is created.
 
         Args:
             table (DBTable): The DBTable object of the table.
             data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            int: The number of inserted rows.
         """
         self._check_table_exists(table.table_name)
-        self.db_connector.insert_data(table, data)
+        return self.db_connector.insert_data(table, data)
 
     def _check_table_exists(self, table_name: str):
         """
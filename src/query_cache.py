@@ -0,0 +1,136 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+class QueryCache:
+    """
+    The QueryCache is an in-process LRU cache for query results with a memory budget.
+    Each entry is stored together with the version of the database it has been read from, an entry of an older version is never returned.
+    """
+    HITS = "hits"
+    MISSES = "misses"
+    EVICTIONS = "evictions"
+    INVALIDATIONS = "invalidations"
+    ENTRIES = "entries"
+    SIZE = "size"
+    MAX_SIZE = "max_size"
+
+    def __init__(self, max_size: int):
+        """
+        Initialize the query cache.
+
+        Args:
+            max_size (int): The memory budget of the cache in bytes.
+
+        Raises:
+            Exception: The exception is raised in case the memory budget is negative.
+        """
+        if max_size < 0:
+            raise Exception("Invalid cache size %i given!"%(max_size))
+        self.max_size = max_size
+        self.size = 0
+        self.version = None
+        self.entries = OrderedDict()
+        self.statistics = {self.HITS: 0, self.MISSES: 0, self.EVICTIONS: 0, self.INVALIDATIONS: 0}
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple, version: tuple) -> pd.core.frame.DataFrame:
+        """
+        Get the cached result of the query.
+
+        Args:
+            key (tuple): The normalized query and its parameters.
+            version (tuple): The current version of the database.
+
+        Returns:
+            pd.core.frame.DataFrame: A copy of the cached result, None if the query is not cached.
+        """
+        with self.lock:
+            self._check_version(version)
+            if key not in self.entries:
+                self.statistics[self.MISSES] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.statistics[self.HITS] += 1
+            return self.entries[key][0].copy()
+
+    def put(self, key: tuple, version: tuple, data: pd.core.frame.DataFrame):
+        """
+        Store the result of the query, the least recently used entries are evicted until the memory budget is met.
+
+        Args:
+            key (tuple): The normalized query and its parameters.
+            version (tuple): The version of the database the data have been read from.
+            data (pd.core.frame.DataFrame): The result of the query.
+        """
+        size = int(data.memory_usage(index = True, deep = True).sum())
+        if size > self.max_size:
+            return
+        with self.lock:
+            self._check_version(version)
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            while self.size + size > self.max_size:
+                self.size -= self.entries.popitem(last = False)[1][1]
+                self.statistics[self.EVICTIONS] += 1
+            self.entries[key] = (data.copy(), size)
+            self.size += size
+
+    def invalidate(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self.lock:
+            self._invalidate()
+
+    def get_statistics(self) -> dict:
+        """
+        Get the statistics of the cache.
+
+        Returns:
+            dict: The number of hits, misses, evictions and invalidations, the number of entries, the used size and the memory budget in bytes.
+        """
+        with self.lock:
+            statistics = dict(self.statistics)
+            statistics[self.ENTRIES] = len(self.entries)
+            statistics[self.SIZE] = self.size
+            statistics[self.MAX_SIZE] = self.max_size
+            return statistics
+
+    def _check_version(self, version: tuple):
+        """
+        Drop all entries, if the database version changed.
+
+        Args:
+            version (tuple): The current version of the database.
+        """
+        if version != self.version:
+            if len(self.entries) != 0:
+                self._invalidate()
+            self.version = version
+
+    def _invalidate(self):
+        """
+        Internal function to remove all entries from the cache, the lock must be held.
+        """
+        self.entries.clear()
+        self.size = 0
+        self.statistics[self.INVALIDATIONS] += 1
@@ -52,7 +52,7 @@ def aggregate_csv_data(pv_data: pd.core.frame.DataFrame, data: pd.core.frame.Dat
         pv_data = pd.concat([pv_data, data], ignore_index = True)
     return pv_data
 
-def aggregate_csv_file_data(wd: str, filename: str, separator: str, pv_data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+def aggregate_csv_file_data(wd: str, filename: str, separator: str, pv_data: pd.core.frame.DataFrame, file_column: str = None) -> pd.core.frame.DataFrame:
     """
     Aggregate the csv data of the input file to the result.
 
@@ -61,27 +61,58 @@ def aggregate_csv_file_data(wd: str, filename: str, separator: str, pv_data: pd.
         filename (str): The name of a single csv file.
         separator (str): The separator to parse the columns of the file.
         pv_data (pd.core.frame.DataFrame): The DataFrame containing the aggregated data.
+        file_column (str, optional): The name of the column appended with the filename. Defaults to None (no filename column).
 
     Returns:
         pd.core.frame.DataFrame: The DataFrame containing the aggregated data.
     """
     if csvRegex.fullmatch(filename):
         data = read_csv_file(wd, filename, separator)
+        if file_column != None:
+            data[file_column] = filename
         pv_data = aggregate_csv_data(pv_data, data)
     return pv_data
 
-def search_csv_files(wd: str, separator: str) -> pd.core.frame.DataFrame:
+def search_csv_files(wd: str, separator: str, file_column: str = None) -> pd.core.frame.DataFrame:
     """
     Read all csv files in the given working directory, where the data columns are equals to the given index.
 
     Args:
         wd (str): The working directory.
         separator (str): The separator to parse the columns of the file.
+        file_column (str, optional): The name of the last column containing the filename of each row, e.g. for the quality report. Defaults to None (no filename column).
 
     Returns:
         pd.core.frame.DataFrame: The DataFrame containing the data of the files found in the working directory.
     """
     pv_data = pd.DataFrame()
     for filename in os.listdir(wd):
-        pv_data = aggregate_csv_file_data(wd, filename, separator, pv_data)
+        pv_data = aggregate_csv_file_data(wd, filename, separator, pv_data, file_column)
     return pv_data
+
+def read_meta_file(filepath: str, columns: list[str], separator: str, chunk_size: int = 10000):
+    """
+    Read the meta data file (csv or json lines) in chunks, e.g. the trackers of a large plant.
+
+    Args:
+        filepath (str): The full path of the .csv or .jsonl file.
+        columns (list[str]): The columns of the meta table.
+        separator (str): The separator to parse the columns of a csv file.
+        chunk_size (int, optional): The number of rows of each chunk. Defaults to 10000.
+
+    Raises:
+        Exception: The exception is raised in case the file misses columns of the meta table.
+
+    Yields:
+        pd.core.frame.DataFrame: The complete rows of the next chunk in the columns of the meta table, the values are kept as they are given (no type conversion).
+    """
+    if filepath.lower().endswith(".jsonl"):
+        reader = pd.read_json(filepath, lines = True, dtype = False, chunksize = chunk_size)
+    else:
+        reader = pd.read_csv(filepath, sep = separator, dtype = str, chunksize = chunk_size)
+    with reader:
+        for chunk in reader:
+            missing_columns = [i for i in columns if i not in chunk.columns]
+            if len(missing_columns) != 0:
+                raise Exception("The meta file %s misses the columns %s"%(filepath, ", ".join(missing_columns)))
+            yield chunk[list(columns)].dropna().astype(object)
@@ -0,0 +1,220 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector
+from sun_position import TIME_ZONE, get_sun_position
+
+FILL_NONE = "none"
+FILL_LINEAR = "linear"
+FILL_NIGHT = "night"
+
+class Resampler:
+    """
+    The Resampler aligns the series of each tracker (or the single series of a table without trackers) onto a fixed interval grid, e.g. before the R analysis compares the trackers slot by slot.
+    A reading belongs to the slot starting at or before it, a reading up to tolerance_minutes before a slot (e.g. of a shifted clock) belongs to that slot. The readings of a slot (e.g. 5 minute data in a 15 minute grid) are averaged.
+    The missing slots are left NULL ("none"), interpolated linearly over gaps of at most max_gap slots ("linear") or set to zero, while the sun is below the horizon ("night").
+    All series are resampled at once on a matrix of one row per series and one column per slot.
+    """
+    TIMESTAMP = "timestamp"
+    TRACKER_NAME = DBConnector.TRACKER_COLUMN
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+    FILLS = [FILL_NONE, FILL_LINEAR, FILL_NIGHT]
+    INTERVAL_MINUTES = 15
+    TOLERANCE_MINUTES = 2
+    MAX_GAP = 4
+    MONTH_KEY_LENGTH = DBConnector.MONTH_KEY_LENGTH
+
+    def __init__(self, interval_minutes: int = INTERVAL_MINUTES, fill: str = FILL_NONE, max_gap: int = MAX_GAP, tolerance_minutes: int = TOLERANCE_MINUTES, latitude: float = None, longitude: float = None, time_zone: str = TIME_ZONE):
+        """
+        Initialize the resampler.
+
+        Args:
+            interval_minutes (int, optional): The length of a slot in minutes, a day must consist of whole slots. Defaults to 15.
+            fill (str, optional): The fill strategy of the missing slots, "none", "linear" or "night". Defaults to "none".
+            max_gap (int, optional): The maximum number of consecutive missing slots interpolated linearly. Defaults to 4.
+            tolerance_minutes (int, optional): The minutes a reading may precede its slot. Defaults to 2.
+            latitude (float, optional): The latitude of the plant in degree, required by the night fill. Defaults to None.
+            longitude (float, optional): The longitude of the plant in degree, required by the night fill. Defaults to None.
+            time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+
+        Raises:
+            Exception: The exception is raised in case of an invalid interval, tolerance or fill strategy or a night fill without location.
+        """
+        if interval_minutes < 1 or 1440 % interval_minutes != 0:
+            raise Exception("Invalid interval of %i minutes given, a day must consist of whole intervals!"%(interval_minutes))
+        if tolerance_minutes < 0 or tolerance_minutes >= interval_minutes:
+            raise Exception("Invalid tolerance of %i minutes given!"%(tolerance_minutes))
+        if fill not in self.FILLS:
+            raise Exception("Invalid fill strategy %s, valid strategies are %s"%(fill, ", ".join(self.FILLS)))
+        if fill == FILL_NIGHT and (latitude == None or longitude == None):
+            raise Exception("The night fill requires the latitude and the longitude!")
+        self.interval_minutes = interval_minutes
+        self.fill = fill
+        self.max_gap = max_gap
+        self.tolerance_minutes = tolerance_minutes
+        self.latitude = latitude
+        self.longitude = longitude
+        self.time_zone = time_zone
+
+    def resample(self, data: pd.core.frame.DataFrame, start_timestamp: str = None, end_timestamp: str = None) -> pd.core.frame.DataFrame:
+        """
+        Align the data onto the interval grid.
+
+        Args:
+            data (pd.core.frame.DataFrame): The timestamp, optionally the tracker name, and the numeric value columns.
+            start_timestamp (str, optional): The first slot of the grid (inclusive). Defaults to None (the first slot of the data).
+            end_timestamp (str, optional): The end of the grid (exclusive). Defaults to None (after the last slot of the data).
+                Without both bounds the grid covers the first to the last slot of each day with readings, e.g. the days between two files get no rows.
+
+        Returns:
+            pd.core.frame.DataFrame: One row per series and slot in the columns of the input ordered by timestamp and tracker name.
+        """
+        has_tracker = self.TRACKER_NAME in data.columns
+        value_columns = [i for i in data.columns if i not in [self.TIMESTAMP, self.TRACKER_NAME]]
+        slots = self.get_slots(data[self.TIMESTAMP])
+        first = self.get_slots(pd.Series([start_timestamp]), True)[0] if start_timestamp != None else (slots.min() if len(slots) != 0 else None)
+        last = self.get_slots(pd.Series([end_timestamp]), True)[0] - self.interval_minutes if end_timestamp != None else (slots.max() if len(slots) != 0 else None)
+        if first == None or last == None or last < first:
+            return pd.core.frame.DataFrame(columns = data.columns)
+        grid = np.arange(first, last + self.interval_minutes, self.interval_minutes, dtype = np.int64)
+        if start_timestamp == None and end_timestamp == None:
+            grid = grid[self.get_day_span_mask(grid, slots)]
+        series = data[self.TRACKER_NAME].astype(str).values if has_tracker else np.zeros(len(data), dtype = object)
+        series_names, series_codes = np.unique(series, return_inverse = True)
+        in_grid = (slots >= first) & (slots <= last)
+        positions = series_codes[in_grid] * len(grid) + np.searchsorted(grid, slots[in_grid])
+        timestamps = pd.to_datetime(grid, unit = "m").strftime(self.TIMESTAMP_FORMAT).values
+        night = None
+        result = {}
+        for column in value_columns:
+            values = pd.to_numeric(data[column]).values.astype(np.float64)[in_grid]
+            present = ~np.isnan(values)
+            # the mean of the readings of each slot
+            sums = np.bincount(positions[present], values[present], len(series_names) * len(grid))
+            counts = np.bincount(positions[present], None, len(series_names) * len(grid))
+            matrix = np.divide(sums, counts, out = np.full(len(sums), np.nan), where = counts != 0).reshape(len(series_names), len(grid))
+            if self.fill == FILL_LINEAR:
+                matrix = self.interpolate(matrix, grid)
+            elif self.fill == FILL_NIGHT:
+                if night is None:
+                    night = get_sun_position(timestamps, self.latitude, self.longitude, self.time_zone)[0] < 0
+                matrix = np.where(np.isnan(matrix) & night[np.newaxis, :], 0.0, matrix)
+            # the rows are ordered by timestamp and tracker name like the primary key
+            result[column] = matrix.T.reshape(-1)
+        result[self.TIMESTAMP] = np.repeat(timestamps, len(series_names))
+        if has_tracker:
+            result[self.TRACKER_NAME] = np.tile(series_names, len(grid))
+        return pd.core.frame.DataFrame(result)[list(data.columns)]
+
+    def select_resampled(self, db_connector: DBConnector, table_name: str, start_timestamp: str = None, end_timestamp: str = None, select_columns: list[str] = [], tracker_names: list[str] = None) -> pd.core.frame.DataFrame:
+        """
+        Read the data of the table month by month and align each month onto the interval grid, so only one month is held in memory beside the result.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            table_name (str): The input table name.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (the oldest timestamp of the table).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (after the newest timestamp of the table).
+            select_columns (list[str], optional): The timestamp, the tracker name (if any) and the numeric columns to resample. Defaults to [] (all columns).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            pd.core.frame.DataFrame: The resampled data.
+        """
+        start_timestamp = start_timestamp if start_timestamp != None else db_connector.select_min_timestamp(table_name)
+        max_timestamp = db_connector.select_max_timestamp(table_name)
+        if start_timestamp == None or max_timestamp == None:
+            return db_connector.select_data_range(table_name, start_timestamp, end_timestamp, select_columns, {}, tracker_names)
+        if end_timestamp == None:
+            end_timestamp = str(pd.to_datetime(self.get_slots(pd.Series([max_timestamp]))[0] + self.interval_minutes, unit = "m").strftime(self.TIMESTAMP_FORMAT))
+        result = []
+        for month in pd.period_range(start_timestamp[:self.MONTH_KEY_LENGTH], end_timestamp[:self.MONTH_KEY_LENGTH], freq = "M"):
+            month_start = max(start_timestamp, str(month.start_time.date()))
+            month_end = min(end_timestamp, str((month + 1).start_time.date()))
+            if month_start >= month_end:
+                continue
+            # the readings preceding the first slot within the tolerance belong to it
+            read_start = str((pd.Timestamp(month_start) - pd.Timedelta(minutes = self.tolerance_minutes)).strftime(self.TIMESTAMP_FORMAT))
+            read_end = str((pd.Timestamp(month_end) - pd.Timedelta(minutes = self.tolerance_minutes)).strftime(self.TIMESTAMP_FORMAT))
+            data = db_connector.select_data_range(table_name, read_start, read_end, select_columns, {}, tracker_names)
+            result.append(self.resample(data, month_start, month_end))
+        result = [i for i in result if len(i) != 0]
+        return pd.concat(result, ignore_index = True) if len(result) != 0 else db_connector.select_data_range(table_name, start_timestamp, end_timestamp, select_columns, {}, tracker_names).iloc[0:0]
+
+    def get_slots(self, timestamps: pd.core.series.Series, ceil: bool = False) -> np.ndarray:
+        """
+        Get the slot of each timestamp.
+
+        Args:
+            timestamps (pd.core.series.Series): The timestamps (YYYY-MM-DD HH:MM).
+            ceil (bool, optional): Get the first slot at or after the timestamp instead of the slot containing it, e.g. for the bounds of the grid. Defaults to False.
+
+        Returns:
+            np.ndarray: The start of the slot in minutes since 1970-01-01 00:00.
+        """
+        minutes = pd.to_datetime(timestamps.astype(str)).values.astype("datetime64[m]").astype(np.int64)
+        if ceil:
+            return -(-minutes // self.interval_minutes) * self.interval_minutes
+        return (minutes + self.tolerance_minutes) // self.interval_minutes * self.interval_minutes
+
+    def get_day_span_mask(self, grid: np.ndarray, slots: np.ndarray) -> np.ndarray:
+        """
+        Get the slots of the grid between the first and the last slot with readings of their day.
+
+        Args:
+            grid (np.ndarray): The ascending slots of the grid.
+            slots (np.ndarray): The slots of the readings.
+
+        Returns:
+            np.ndarray: True for each slot of the grid within the span of its day.
+        """
+        days, day_codes = np.unique(slots // 1440, return_inverse = True)
+        day_first = np.full(len(days), np.iinfo(np.int64).max)
+        day_last = np.full(len(days), np.iinfo(np.int64).min)
+        np.minimum.at(day_first, day_codes, slots)
+        np.maximum.at(day_last, day_codes, slots)
+        grid_days = np.clip(np.searchsorted(days, grid // 1440), 0, len(days) - 1)
+        return (days[grid_days] == grid // 1440) & (grid >= day_first[grid_days]) & (grid <= day_last[grid_days])
+
+    def interpolate(self, matrix: np.ndarray, grid: np.ndarray) -> np.ndarray:
+        """
+        Interpolate the gaps of at most max_gap slots linearly, gaps at the beginning or the end of a series and longer gaps stay NaN.
+
+        Args:
+            matrix (np.ndarray): The values with one row per series and one column per slot.
+            grid (np.ndarray): The ascending slots of the columns, which may skip days.
+
+        Returns:
+            np.ndarray: The interpolated values.
+        """
+        n_slots = matrix.shape[1]
+        columns = np.arange(n_slots)
+        present = ~np.isnan(matrix)
+        previous = np.maximum.accumulate(np.where(present, columns, -1), axis = 1)
+        following = np.minimum.accumulate(np.where(present, columns, n_slots)[:, ::-1], axis = 1)[:, ::-1]
+        previous_slots = grid[np.clip(previous, 0, n_slots - 1)]
+        following_slots = grid[np.clip(following, 0, n_slots - 1)]
+        gaps = (following_slots - previous_slots) // self.interval_minutes - 1
+        inside = ~present & (previous >= 0) & (following < n_slots) & (gaps <= self.max_gap)
+        rows = np.arange(matrix.shape[0])[:, np.newaxis]
+        previous_values = matrix[rows, np.clip(previous, 0, n_slots - 1)]
+        following_values = matrix[rows, np.clip(following, 0, n_slots - 1)]
+        weights = (grid - previous_slots) / np.maximum(following_slots - previous_slots, 1)
+        return np.where(inside, previous_values + (following_values - previous_values) * weights, matrix)
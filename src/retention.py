@@ -0,0 +1,327 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+class RetentionManager:
+    """
+    The RetentionManager moves the raw rows older than the retention period out of the live database.
+    The expired rows are appended to compressed per table and year archive files (gzip csv) and summarized into the hourly rollup table, afterwards they are deleted in batches of days.
+    The archive is written before anything is deleted, so an interrupted run is repeated by the next run, duplicates in the archive are dropped when it is read.
+    The cutoff of each table is stored in the state table, so the ingest drops the expired rows of input files, which are read again, instead of restoring them.
+    """
+    STATE_TABLE_NAME = "retention_state"
+    TABLE_NAME = "table_name"
+    CUTOFF = "cutoff"
+    ARCHIVE_DIR = "archive"
+    ARCHIVE_EXTENSION = ".csv.gz"
+    TIMESTAMP = "timestamp"
+    TRACKER_NAME = DBConnector.TRACKER_COLUMN
+    CHUNK_SIZE = 100000
+    BATCH_DAYS = 7
+    DAY_KEY_LENGTH = 10
+    HOUR_KEY_LENGTH = 13
+    YEAR_KEY_LENGTH = 4
+
+    def __init__(self, db_connector: DBConnector, archive_path: str = None, chunk_size: int = CHUNK_SIZE, batch_days: int = BATCH_DAYS):
+        """
+        Initialize the retention manager.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            archive_path (str, optional): The directory of the archive files. Defaults to None (the directory archive in the working directory of the database).
+            chunk_size (int, optional): The number of expired rows archived at once. Defaults to 100000.
+            batch_days (int, optional): The number of days deleted in one transaction. Defaults to 7.
+
+        Raises:
+            Exception: The exception is raised in case the batch size is invalid.
+        """
+        if chunk_size < 1 or batch_days < 1:
+            raise Exception("Invalid chunk size %i or batch of %i days given!"%(chunk_size, batch_days))
+        self.db_connector = db_connector
+        self.archive_path = archive_path if archive_path != None else os.path.join(db_connector.wd, self.ARCHIVE_DIR)
+        self.chunk_size = chunk_size
+        self.batch_days = batch_days
+        self.state_table = DBTable(self.STATE_TABLE_NAME, pd.core.indexes.base.Index([self.TABLE_NAME, self.CUTOFF]), ["TEXT", "DATE"], [self.TABLE_NAME])
+
+    def get_cutoff(self, retention_days: int, now: str = None) -> str:
+        """
+        Get the first day kept in the live database.
+
+        Args:
+            retention_days (int): The number of days the raw rows are kept.
+            now (str, optional): The current time. Defaults to None (now).
+
+        Returns:
+            str: The first day kept (YYYY-MM-DD), all rows before are expired.
+        """
+        return str((pd.Timestamp(now if now != None else pd.Timestamp.now()).normalize() - pd.Timedelta(days = retention_days)).date())
+
+    def get_stored_cutoff(self, table_name: str) -> str:
+        """
+        Get the cutoff of the last retention of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The first day kept (YYYY-MM-DD), None if no retention was applied to the table.
+        """
+        if not self.db_connector.test_table_exists(self.STATE_TABLE_NAME):
+            return None
+        state = self.db_connector.select_data_unfiltered(self.STATE_TABLE_NAME)
+        state = state[state[self.TABLE_NAME] == table_name]
+        return str(state[self.CUTOFF].iloc[0]) if len(state) != 0 else None
+
+    def remove_expired(self, table: DBTable, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Remove the rows before the stored cutoff of the table, e.g. the rows of input files, which were archived and deleted already.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The input data frame.
+
+        Returns:
+            pd.core.frame.DataFrame: The rows, which are not expired.
+        """
+        if self.TIMESTAMP not in data.columns:
+            return data
+        cutoff = self.get_stored_cutoff(table.table_name)
+        if cutoff == None:
+            return data
+        return data[(data[self.TIMESTAMP].astype(str) >= cutoff).values]
+
+    def get_archive_fullpath(self, table_name: str, year: str) -> str:
+        """
+        Get the full path of the archive file of the table and year.
+
+        Args:
+            table_name (str): The input table name.
+            year (str): The year (YYYY).
+
+        Returns:
+            str: The full path of the archive file.
+        """
+        return os.path.join(self.archive_path, "%s_%s%s"%(table_name, year, self.ARCHIVE_EXTENSION))
+
+    def get_rollup_table(self, table: DBTable) -> DBTable:
+        """
+        Get the hourly rollup table of the table, i.e. the hourly mean of each numeric column and the number of aggregated rows.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            DBTable: The DBTable object of the rollup table.
+        """
+        key_columns = self._get_key_columns(table)
+        value_columns = self._get_value_columns(table)
+        column_types = table.get_column_dict()
+        return DBTable(
+            self.db_connector.get_rollup_table_name(table.table_name),
+            pd.core.indexes.base.Index(key_columns + value_columns + [DBConnector.ROLLUP_COUNT_COLUMN]),
+            [column_types[i] for i in key_columns + value_columns] + ["INTEGER"],
+            key_columns
+        )
+
+    def rollup(self, table: DBTable, data: pd.core.frame.DataFrame) -> pd.core.frame.DataFrame:
+        """
+        Aggregate the rows into hourly means.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The rows of complete hours.
+
+        Returns:
+            pd.core.frame.DataFrame: The hourly rows, the timestamp is the start of the hour (YYYY-MM-DD HH:00).
+        """
+        key_columns = self._get_key_columns(table)
+        value_columns = self._get_value_columns(table)
+        hourly = data[key_columns + value_columns].copy()
+        hourly[self.TIMESTAMP] = hourly[self.TIMESTAMP].astype(str).str.slice(0, self.HOUR_KEY_LENGTH) + ":00"
+        hourly[value_columns] = hourly[value_columns].apply(pd.to_numeric).astype(np.float64)
+        grouped = hourly.groupby(key_columns, as_index = False, sort = True)
+        result = grouped[value_columns].mean() if len(value_columns) != 0 else grouped.size()[key_columns]
+        result[DBConnector.ROLLUP_COUNT_COLUMN] = grouped.size()["size"].values
+        return result
+
+    def apply(self, table: DBTable, retention_days: int, now: str = None) -> int:
+        """
+        Archive, roll up and delete the expired rows of the table.
+
+        Args:
+            table (DBTable): The DBTable object of the table, it must have a timestamp column.
+            retention_days (int): The number of days the raw rows are kept.
+            now (str, optional): The current time. Defaults to None (now).
+
+        Raises:
+            Exception: The exception is raised in case the table has no timestamp column.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        if self.TIMESTAMP not in table.data_columns:
+            raise Exception("The table %s has no column %s, no retention possible!"%(table.table_name, self.TIMESTAMP))
+        cutoff = self.get_cutoff(retention_days, now)
+        rollup_table = self.get_rollup_table(table)
+        self.db_connector.create_table(rollup_table)
+        first_day = None
+        pending = None
+        for chunk in self.db_connector.select_data_chunks(table.table_name, self.chunk_size, list(table.data_columns), end_timestamp = cutoff):
+            if len(chunk) == 0:
+                continue
+            first_day = chunk[self.TIMESTAMP].astype(str).min()[:self.DAY_KEY_LENGTH] if first_day == None else first_day
+            self._append_archive(table, chunk)
+            # the rows of the last hour may continue in the next chunk, so they are rolled up with it
+            data = chunk if pending is None else pd.concat([pending, chunk], ignore_index = True)
+            hours = data[self.TIMESTAMP].astype(str).str.slice(0, self.HOUR_KEY_LENGTH)
+            complete = (hours != hours.max()).values
+            self._insert_rollup(table, rollup_table, data[complete])
+            pending = data[~complete]
+        if pending is not None:
+            self._insert_rollup(table, rollup_table, pending)
+        # the cutoff is stored before the rows are deleted, so the ingest never restores rows of the archive
+        self._store_cutoff(table, cutoff)
+        if first_day == None:
+            return 0
+        deleted = 0
+        for start_day in pd.date_range(first_day, cutoff, freq = "%iD"%(self.batch_days)):
+            end_day = min(str((start_day + pd.Timedelta(days = self.batch_days)).date()), cutoff)
+            deleted += self.db_connector.delete_data_range(table, str(start_day.date()), end_day)
+        return deleted
+
+    def select_archived(self, table: DBTable, start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> pd.core.frame.DataFrame:
+        """
+        Read the archived rows of the given time range, only the archive files of the years in the range are read.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the result to the given trackers. Defaults to None (all trackers).
+
+        Returns:
+            pd.core.frame.DataFrame: The archived rows ordered by the primary key.
+        """
+        data = []
+        for year in self.get_archive_years(table.table_name):
+            if (start_timestamp != None and year < start_timestamp[:self.YEAR_KEY_LENGTH]) or (end_timestamp != None and year > end_timestamp[:self.YEAR_KEY_LENGTH]):
+                continue
+            data.append(pd.read_csv(self.get_archive_fullpath(table.table_name, year), dtype = {i: str for i in table.data_columns if table.get_column_dict()[i].upper() not in DBConnector.NUMERIC_TYPES}))
+        if len(data) == 0:
+            return pd.core.frame.DataFrame(columns = table.data_columns)
+        data = pd.concat(data, ignore_index = True)
+        timestamps = data[self.TIMESTAMP].astype(str)
+        in_range = np.ones(len(data), dtype = bool)
+        if start_timestamp != None:
+            in_range &= (timestamps >= start_timestamp).values
+        if end_timestamp != None:
+            in_range &= (timestamps < end_timestamp).values
+        if tracker_names != None and self.TRACKER_NAME in data.columns:
+            in_range &= data[self.TRACKER_NAME].isin(tracker_names).values
+        data = data[in_range]
+        key_columns = table.primary_key_list if len(table.primary_key_list) != 0 else list(table.data_columns)
+        return data.drop_duplicates(key_columns, keep = "first").sort_values(key_columns, kind = "stable").reset_index(drop = True)
+
+    def get_archive_years(self, table_name: str) -> list[str]:
+        """
+        Get the years archived for the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            list[str]: The archived years in ascending order.
+        """
+        if not os.path.isdir(self.archive_path):
+            return []
+        prefix = table_name + "_"
+        years = [i[len(prefix):-len(self.ARCHIVE_EXTENSION)] for i in os.listdir(self.archive_path) if i.startswith(prefix) and i.endswith(self.ARCHIVE_EXTENSION)]
+        return sorted([i for i in years if len(i) == self.YEAR_KEY_LENGTH and i.isdigit()])
+
+    def _append_archive(self, table: DBTable, data: pd.core.frame.DataFrame):
+        """
+        Append the rows to the archive files of their years, each call appends one gzip member per file.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            data (pd.core.frame.DataFrame): The expired rows.
+        """
+        os.makedirs(self.archive_path, exist_ok = True)
+        years = data[self.TIMESTAMP].astype(str).str.slice(0, self.YEAR_KEY_LENGTH)
+        for year in years.unique():
+            archive_fullpath = self.get_archive_fullpath(table.table_name, year)
+            header = not os.path.exists(archive_fullpath)
+            with gzip.open(archive_fullpath, "at", newline = "") as file:
+                data[(years == year).values].to_csv(file, header = header, index = False)
+                file.flush()
+
+    def _store_cutoff(self, table: DBTable, cutoff: str):
+        """
+        Store the cutoff of the table, an earlier cutoff (e.g. of a longer retention period) keeps the stored one.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            cutoff (str): The first day kept (YYYY-MM-DD).
+        """
+        self.db_connector.create_table(self.state_table)
+        stored = self.get_stored_cutoff(table.table_name)
+        if stored == None or cutoff > stored:
+            self.db_connector.upsert_data(self.state_table, pd.core.frame.DataFrame([[table.table_name, cutoff]], columns = self.state_table.data_columns))
+
+    def _insert_rollup(self, table: DBTable, rollup_table: DBTable, data: pd.core.frame.DataFrame):
+        """
+        Insert the hourly means of the rows into the rollup table, existing hours are kept.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+            rollup_table (DBTable): The DBTable object of the rollup table.
+            data (pd.core.frame.DataFrame): The rows of complete hours.
+        """
+        if len(data) != 0:
+            self.db_connector.insert_data(rollup_table, self.rollup(table, data)[list(rollup_table.data_columns)])
+
+    def _get_key_columns(self, table: DBTable) -> list[str]:
+        """
+        Get the key columns of the rollup, i.e. the timestamp and the tracker name, if the table has one.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            list[str]: The key columns.
+        """
+        return [self.TIMESTAMP] + ([self.TRACKER_NAME] if self.TRACKER_NAME in table.data_columns else [])
+
+    def _get_value_columns(self, table: DBTable) -> list[str]:
+        """
+        Get the numeric columns aggregated by the rollup.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            list[str]: The numeric columns, which are no key columns.
+        """
+        column_types = table.get_column_dict()
+        return [i for i in table.data_columns if i not in self._get_key_columns(table) and column_types[i].upper() in DBConnector.NUMERIC_TYPES]
@@ -0,0 +1,291 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector
+
+class SnapshotStore:
+    """
+    The SnapshotStore materializes tables with a timestamp column per month into NumPy files, which are loaded memory mapped.
+    The files of a month are the timestamps (int64 minutes since 1970-01-01 00:00 of the local time), the tracker codes (int32, if the table has a tracker name) and one float64 file per numeric column.
+    The rows of a month are ordered by timestamp and tracker name, the tracker codes index the tracker names of the manifest, which are only appended, so the codes are equal in all months.
+    A refresh rebuilds the last snapshotted month and builds the newer months, older months are only rebuilt, if their checksum changed. Months deleted from the database (e.g. by the retention) are kept.
+    The checksum of a month is the row count and checksum of the zone map, without zone map each refresh reads all rows once to compute the row count, the newest timestamp and the sum of the row hashes of each month.
+    Several processes loading the same month share the page cache instead of each holding a copy.
+    """
+    SNAPSHOT_DIR = "snapshot"
+    MANIFEST_FILE = "manifest.json"
+    TEMP_SUFFIX = ".tmp"
+    FILE_EXTENSION = ".npy"
+    TIMESTAMP = "timestamp"
+    TRACKER_NAME = DBConnector.TRACKER_COLUMN
+    TRACKER_CODE = "tracker_code"
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+    MONTH_KEY_LENGTH = DBConnector.MONTH_KEY_LENGTH
+    CHUNK_SIZE = 100000
+    HASH_MODULUS = 2 ** 64
+
+    def __init__(self, db_connector: DBConnector, snapshot_path: str = None):
+        """
+        Initialize the snapshot store.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            snapshot_path (str, optional): The directory of the snapshots. Defaults to None (the directory snapshot in the working directory of the database).
+        """
+        self.db_connector = db_connector
+        self.snapshot_path = snapshot_path if snapshot_path != None else os.path.join(db_connector.wd, self.SNAPSHOT_DIR)
+
+    def get_table_path(self, table_name: str) -> str:
+        """
+        Get the directory of the snapshot of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            str: The directory containing the manifest and one directory per month.
+        """
+        return os.path.join(self.snapshot_path, table_name)
+
+    def get_manifest(self, table_name: str) -> dict:
+        """
+        Get the manifest of the snapshot of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            dict: The value columns, the tracker names and the row count, max timestamp and checksum of each month, None if there is no snapshot.
+        """
+        manifest_fullpath = os.path.join(self.get_table_path(table_name), self.MANIFEST_FILE)
+        if not os.path.exists(manifest_fullpath):
+            return None
+        with open(manifest_fullpath) as file:
+            return json.load(file)
+
+    def get_months(self, table_name: str) -> list[str]:
+        """
+        Get the snapshotted months of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            list[str]: The months (YYYY-MM) in ascending order.
+        """
+        manifest = self.get_manifest(table_name)
+        return sorted(manifest["months"].keys()) if manifest != None else []
+
+    def refresh(self, table_name: str) -> list[str]:
+        """
+        Build the months of the table, which are new or may have changed since the last refresh.
+
+        Args:
+            table_name (str): The input table name.
+
+        Raises:
+            Exception: The exception is raised in case the table does not exist or has no timestamp column.
+
+        Returns:
+            list[str]: The built months in ascending order.
+        """
+        column_types = self.db_connector.get_column_types(table_name)
+        if self.TIMESTAMP not in column_types:
+            raise Exception("The table %s does not exist or has no column %s, no snapshot possible!"%(table_name, self.TIMESTAMP))
+        value_columns = [i for i in column_types.keys() if i not in [self.TIMESTAMP, self.TRACKER_NAME] and column_types[i] in DBConnector.NUMERIC_TYPES]
+        manifest = self.get_manifest(table_name)
+        if manifest == None or manifest["value_columns"] != value_columns:
+            shutil.rmtree(self.get_table_path(table_name), ignore_errors = True)
+            manifest = {"table_name": table_name, "value_columns": value_columns, "has_tracker": self.TRACKER_NAME in column_types, "tracker_names": [], "months": {}}
+        max_timestamp = self.db_connector.select_max_timestamp(table_name)
+        if max_timestamp == None:
+            return []
+        if len(manifest["months"]) != 0:
+            start_month = max(manifest["months"].keys())
+        else:
+            start_month = self.db_connector.select_min_timestamp(table_name)[:self.MONTH_KEY_LENGTH]
+        months = [str(i) for i in pd.period_range(start_month, max_timestamp[:self.MONTH_KEY_LENGTH], freq = "M")]
+        select_columns = [i for i in column_types.keys() if i in [self.TIMESTAMP, self.TRACKER_NAME] + value_columns]
+        checksums = self._get_zone_map_checksums(table_name)
+        if len(checksums) == 0:
+            checksums = self._get_month_checksums(table_name, select_columns)
+        months = sorted(set(months + [i for i in manifest["months"].keys() if i in checksums and checksums[i] != manifest["months"][i]["checksum"]]))
+        built = []
+        for month in months:
+            period = pd.Period(month, freq = "M")
+            data = self.db_connector.select_data_range(table_name, str(period.start_time.date()), str((period + 1).start_time.date()), select_columns)
+            if len(data) == 0:
+                continue
+            self._write_month(table_name, month, data, manifest)
+            manifest["months"][month] = {"row_count": len(data), "max_timestamp": data[self.TIMESTAMP].astype(str).max(), "checksum": checksums.get(month)}
+            # the manifest is written after each month, so an interrupted refresh keeps the months built so far
+            self._write_manifest(table_name, manifest)
+            built.append(month)
+        return built
+
+    def load_month(self, table_name: str, month: str, columns: list[str] = []) -> dict:
+        """
+        Load the snapshot of one month as read only views of the memory mapped files, nothing is copied.
+
+        Args:
+            table_name (str): The input table name.
+            month (str): The month (YYYY-MM).
+            columns (list[str], optional): The files to load, e.g. "timestamp", "tracker_code" and the value columns. Defaults to [] (all files).
+
+        Raises:
+            Exception: The exception is raised in case the month is not snapshotted.
+
+        Returns:
+            dict: The array of each column.
+        """
+        manifest = self.get_manifest(table_name)
+        if manifest == None or month not in manifest["months"]:
+            raise Exception("The month %s of the table %s is not snapshotted!"%(month, table_name))
+        columns = columns if len(columns) != 0 else self._get_file_columns(manifest)
+        return {i: np.load(os.path.join(self.get_table_path(table_name), month, i + self.FILE_EXTENSION), mmap_mode = "r") for i in columns}
+
+    def load(self, table_name: str, start_month: str = None, end_month: str = None, columns: list[str] = []) -> dict:
+        """
+        Load the snapshots of the months in the range as read only memory mapped views.
+
+        Args:
+            table_name (str): The input table name.
+            start_month (str, optional): The first month (inclusive, YYYY-MM). Defaults to None (unbounded).
+            end_month (str, optional): The last month (inclusive, YYYY-MM). Defaults to None (unbounded).
+            columns (list[str], optional): The files to load. Defaults to [] (all files).
+
+        Returns:
+            dict: The arrays of each month (see load_month) in ascending order of the months.
+        """
+        return {i: self.load_month(table_name, i, columns) for i in self.get_months(table_name) if (start_month == None or i >= start_month) and (end_month == None or i <= end_month)}
+
+    def to_timestamps(self, minutes: np.ndarray) -> np.ndarray:
+        """
+        Convert the snapshotted timestamps into the timestamps of the database.
+
+        Args:
+            minutes (np.ndarray): The minutes since 1970-01-01 00:00.
+
+        Returns:
+            np.ndarray: The timestamps (YYYY-MM-DD HH:MM).
+        """
+        return pd.to_datetime(np.asarray(minutes), unit = "m").strftime(self.TIMESTAMP_FORMAT).values
+
+    def _write_month(self, table_name: str, month: str, data: pd.core.frame.DataFrame, manifest: dict):
+        """
+        Write the files of the month into a temporary directory and replace the month with it.
+
+        Args:
+            table_name (str): The input table name.
+            month (str): The month (YYYY-MM).
+            data (pd.core.frame.DataFrame): The rows of the month.
+            manifest (dict): The manifest of the table, new tracker names are appended.
+        """
+        month_path = os.path.join(self.get_table_path(table_name), month)
+        temp_path = month_path + self.TEMP_SUFFIX
+        shutil.rmtree(temp_path, ignore_errors = True)
+        os.makedirs(temp_path)
+        order_by = [self.TIMESTAMP] + ([self.TRACKER_NAME] if manifest["has_tracker"] else [])
+        data = data.sort_values(order_by, kind = "stable")
+        minutes = pd.to_datetime(data[self.TIMESTAMP].astype(str), format = self.TIMESTAMP_FORMAT).values.astype("datetime64[m]").astype(np.int64)
+        np.save(os.path.join(temp_path, self.TIMESTAMP + self.FILE_EXTENSION), minutes)
+        if manifest["has_tracker"]:
+            codes = {name: code for code, name in enumerate(manifest["tracker_names"])}
+            for name in data[self.TRACKER_NAME].astype(str).unique():
+                if name not in codes:
+                    codes[name] = len(manifest["tracker_names"])
+                    manifest["tracker_names"].append(name)
+            np.save(os.path.join(temp_path, self.TRACKER_CODE + self.FILE_EXTENSION), data[self.TRACKER_NAME].astype(str).map(codes).values.astype(np.int32))
+        for column in manifest["value_columns"]:
+            np.save(os.path.join(temp_path, column + self.FILE_EXTENSION), pd.to_numeric(data[column]).values.astype(np.float64))
+        # open memory maps of the replaced files stay valid, until they are closed
+        shutil.rmtree(month_path, ignore_errors = True)
+        os.rename(temp_path, month_path)
+
+    def _write_manifest(self, table_name: str, manifest: dict):
+        """
+        Replace the manifest of the table atomically.
+
+        Args:
+            table_name (str): The input table name.
+            manifest (dict): The manifest of the table.
+        """
+        manifest_fullpath = os.path.join(self.get_table_path(table_name), self.MANIFEST_FILE)
+        with open(manifest_fullpath + self.TEMP_SUFFIX, "w") as file:
+            json.dump(manifest, file, indent = 2)
+        os.replace(manifest_fullpath + self.TEMP_SUFFIX, manifest_fullpath)
+
+    def _get_zone_map_checksums(self, table_name: str) -> dict:
+        """
+        Get the row count and checksum of each month of the zone map, which change, if a month is changed.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            dict: The [row count, checksum] of each month, empty if the table has no zone map.
+        """
+        zone_map = self.db_connector.get_zone_map(table_name)
+        if len(zone_map) == 0:
+            return {}
+        summary = zone_map.groupby("month")[["row_count", "checksum"]].apply(lambda i: [int(i["row_count"].sum()), int(sum(int(j) for j in i["checksum"]))])
+        return summary.to_dict()
+
+    def _get_month_checksums(self, table_name: str, select_columns: list[str]) -> dict:
+        """
+        Compute the checksum of each month from the stored rows, which changes, if a row of the month is inserted, deleted or corrected.
+
+        Args:
+            table_name (str): The input table name.
+            select_columns (list[str]): The snapshotted columns.
+
+        Returns:
+            dict: The [row count, max timestamp, sum of the row hashes modulo 2^64] of each month.
+        """
+        checksums = {}
+        for chunk in self.db_connector.select_data_chunks(table_name, self.CHUNK_SIZE, select_columns):
+            chunk = chunk.astype({self.TIMESTAMP: str})
+            months = chunk[self.TIMESTAMP].str.slice(0, self.MONTH_KEY_LENGTH).values
+            hashes = pd.util.hash_pandas_object(chunk, index = False).values
+            for month in np.unique(months):
+                in_month = months == month
+                row_count, max_timestamp, checksum = checksums.get(month, [0, "", 0])
+                checksums[month] = [
+                    row_count + int(in_month.sum()),
+                    max(max_timestamp, chunk[self.TIMESTAMP].values[in_month].max()),
+                    (checksum + int(hashes[in_month].sum(dtype = np.uint64))) % self.HASH_MODULUS
+                ]
+        return checksums
+
+    def _get_file_columns(self, manifest: dict) -> list[str]:
+        """
+        Get the files of each month.
+
+        Args:
+            manifest (dict): The manifest of the table.
+
+        Returns:
+            list[str]: The timestamp, the tracker code (if any) and the value columns.
+        """
+        return [self.TIMESTAMP] + ([self.TRACKER_CODE] if manifest["has_tracker"] else []) + manifest["value_columns"]
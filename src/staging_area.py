@@ -0,0 +1,254 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+import tempfile
+
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+
+class StagingArea:
+    """
+    The StagingArea collects the batches of an ingest run in a private SQLite database (in memory or a temporary file) with the schema of the live tables.
+    Duplicated primary keys of the run are dropped (the first row is kept) and the rows with a missing primary key or an invalid timestamp are rejected while staging.
+    The transfer removes the rows existing in the live database with one set based statement per table, before the write lock is taken,
+    and then copies the remaining rows of all tables ordered by their primary key into the attached live database in one transaction.
+    The tables of shards, the tables with zone map and the tables of a chunk store are written by the connector from the deduplicated staged rows instead.
+    """
+    MEMORY = ":memory:"
+    LIVE_ALIAS = "live"
+    STAGING_SUFFIX = ".staging.db"
+    TIMESTAMP = DBConnector.SHARD_COLUMN
+    TIMESTAMP_PATTERN = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*"
+
+    def __init__(self, db_connector: DBConnector, in_memory: bool = True):
+        """
+        Initialize the staging area.
+
+        Args:
+            db_connector (DBConnector): The connector of the live database.
+            in_memory (bool, optional): Stage in memory, otherwise in a temporary file in the working directory of the database, e.g. for runs larger than the memory. Defaults to True.
+        """
+        self.db_connector = db_connector
+        self.staging_fullpath = None
+        if not in_memory:
+            handle, self.staging_fullpath = tempfile.mkstemp(suffix = self.STAGING_SUFFIX, dir = db_connector.wd)
+            os.close(handle)
+        self.connection = sqlite3.connect(self.staging_fullpath if self.staging_fullpath != None else self.MEMORY, timeout = db_connector.busy_timeout, isolation_level = None)
+        self.tables = {}
+        self.rejected = {}
+
+    def __enter__(self):
+        """
+        Enter the with statement.
+
+        Returns:
+            StagingArea: The as-return value.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Close the staging area at the end of the with statement.
+
+        Args:
+            exc_type (Type[BaseException], optional): The exception type, if any.
+            exc_value (BaseException, optional): The exception value, if any.
+            traceback (TracebackType, optional): The stacktrace of the exception, if any.
+        """
+        self.close()
+
+    def stage(self, table: DBTable, data: pd.core.frame.DataFrame) -> int:
+        """
+        Add the rows of a batch to the staged rows of the table.
+
+        Args:
+            table (DBTable): The DBTable object of the live table.
+            data (pd.core.frame.DataFrame): The rows in the columns of the table.
+
+        Raises:
+            Exception: The exception is raised in case the table has no primary key.
+
+        Returns:
+            int: The number of newly staged rows.
+        """
+        if len(table.primary_key_list) == 0:
+            raise Exception("No primary key exists for table %s!"%(table.table_name))
+        cur = self.connection.cursor()
+        if table.table_name not in self.tables:
+            cur.execute(self.db_connector.get_create_statement(table))
+            self.tables[table.table_name] = table
+            self.rejected[table.table_name] = 0
+        if len(data) == 0:
+            return 0
+        rows = data[list(table.data_columns)].astype(object)
+        for column, data_type in table.get_column_dict().items():
+            if data_type.upper() in DBConnector.NUMERIC_TYPES:
+                rows[column] = pd.to_numeric(data[column], errors = "coerce").astype(object)
+            else:
+                rows[column] = data[column].where(pd.isna(data[column]), data[column].astype(str))
+        rows = rows.where(pd.notna(rows), None)
+        cur.execute("""BEGIN;""")
+        try:
+            before = self.connection.total_changes
+            cur.executemany("""INSERT OR IGNORE INTO %s (%s) VALUES (%s);"""%(table.table_name, ", ".join(table.data_columns), ", ".join(["?"] * len(table.data_columns))), rows.values.tolist())
+            staged = self.connection.total_changes - before
+            invalid = ["%s IS NULL"%(i) for i in table.primary_key_list]
+            if self.TIMESTAMP in table.primary_key_list:
+                invalid.append("%s NOT GLOB '%s'"%(self.TIMESTAMP, self.TIMESTAMP_PATTERN))
+            rejected = cur.execute("""DELETE FROM %s WHERE %s;"""%(table.table_name, " OR ".join(invalid))).rowcount
+            cur.execute("""COMMIT;""")
+        except Exception:
+            cur.execute("""ROLLBACK;""")
+            raise
+        self.rejected[table.table_name] += rejected
+        return staged - rejected
+
+    def transfer(self) -> dict:
+        """
+        Move the staged rows of all tables into the live database and empty the staging area.
+
+        Raises:
+            Exception: The exception is raised in case the connector is read only or a live table does not exist.
+
+        Returns:
+            dict: The number of "transferred" (new), "duplicated" (already stored) and "rejected" rows of each table name.
+        """
+        self.db_connector.check_writable()
+        result = {}
+        for table in self.tables.values():
+            if not self.db_connector.test_table_exists(table.table_name):
+                raise Exception("The table %s does not exist!"%(table.table_name))
+            result[table.table_name] = {"transferred": 0, "duplicated": 0, "rejected": self.rejected[table.table_name]}
+        direct_tables = [i for i in self.tables.values() if self._is_direct(i)]
+        if len(direct_tables) != 0:
+            self._attach_live()
+            try:
+                # the rows of the live database are removed by reading only, so the write lock is held for the copy alone
+                for table in direct_tables:
+                    result[table.table_name]["duplicated"] = self._remove_stored_rows(table)
+                for table_name, count in self.db_connector.run_write(self._copy_tables, direct_tables).items():
+                    result[table_name]["transferred"] = count
+                    result[table_name]["duplicated"] += self._count_rows(table_name) - count
+            finally:
+                self.connection.execute("""DETACH DATABASE %s;"""%(self.LIVE_ALIAS))
+        for table in self.tables.values():
+            if not self._is_direct(table):
+                data = self._read_staged(table)
+                if len(data) != 0:
+                    result[table.table_name]["transferred"] = self.db_connector.insert_data(table, data)
+                    result[table.table_name]["duplicated"] = len(data) - result[table.table_name]["transferred"]
+        for table_name in self.tables.keys():
+            self.connection.execute("""DELETE FROM %s;"""%(table_name))
+            self.rejected[table_name] = 0
+        return result
+
+    def close(self):
+        """
+        Close the staging database and remove its temporary file (if any).
+        """
+        self.connection.close()
+        if self.staging_fullpath != None and os.path.exists(self.staging_fullpath):
+            os.remove(self.staging_fullpath)
+
+    def _is_direct(self, table: DBTable) -> bool:
+        """
+        Test, if the staged rows of the table are copied directly into the live table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            bool: False for the tables of shards, with zone map or stored in chunks, True otherwise.
+        """
+        if self.db_connector.is_sharded_table(table) or self.db_connector.has_zone_map(table):
+            return False
+        return not (hasattr(self.db_connector, "is_chunkable") and self.db_connector.is_chunkable(table))
+
+    def _attach_live(self):
+        """
+        Attach the live database to the staging connection.
+        """
+        self.connection.execute("""ATTACH DATABASE ? AS %s;"""%(self.LIVE_ALIAS), (self.db_connector.db_fullpath,))
+
+    def _remove_stored_rows(self, table: DBTable) -> int:
+        """
+        Remove the staged rows, whose primary key is stored in the live table.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            int: The number of removed rows.
+        """
+        key_condition = " AND ".join(["stored.%s = %s.%s"%(i, table.table_name, i) for i in table.primary_key_list])
+        cur = self.connection.cursor()
+        cur.execute("""BEGIN;""")
+        removed = cur.execute("""DELETE FROM main.%s WHERE EXISTS (SELECT 1 FROM %s.%s AS stored WHERE %s);"""%(table.table_name, self.LIVE_ALIAS, table.table_name, key_condition)).rowcount
+        cur.execute("""COMMIT;""")
+        return removed
+
+    def _copy_tables(self, tables: list[DBTable]) -> dict:
+        """
+        Copy the staged rows of the tables into the live tables in one transaction, rows stored since the removal are skipped.
+        The copy is run by the connector, which holds its lock file and repeats the copy, while the live database is locked.
+
+        Args:
+            tables (list[DBTable]): The DBTable objects of the tables.
+
+        Returns:
+            dict: The number of inserted rows of each table name.
+        """
+        cur = self.connection.cursor()
+        cur.execute("""BEGIN IMMEDIATE;""")
+        try:
+            result = {}
+            for table in tables:
+                columns = ", ".join(table.data_columns)
+                result[table.table_name] = cur.execute("""INSERT OR IGNORE INTO %s.%s (%s) SELECT %s FROM main.%s ORDER BY %s;"""%(self.LIVE_ALIAS, table.table_name, columns, columns, table.table_name, ", ".join(table.primary_key_list))).rowcount
+            cur.execute("""COMMIT;""")
+        except Exception:
+            cur.execute("""ROLLBACK;""")
+            raise
+        return result
+
+    def _count_rows(self, table_name: str) -> int:
+        """
+        Count the staged rows of the table.
+
+        Args:
+            table_name (str): The input table name.
+
+        Returns:
+            int: The number of staged rows.
+        """
+        return self.connection.execute("""SELECT COUNT(*) FROM main.%s;"""%(table_name)).fetchall()[0][0]
+
+    def _read_staged(self, table: DBTable) -> pd.core.frame.DataFrame:
+        """
+        Read the staged rows of the table ordered by the primary key.
+
+        Args:
+            table (DBTable): The DBTable object of the table.
+
+        Returns:
+            pd.core.frame.DataFrame: The staged rows in the columns of the table.
+        """
+        rows = self.connection.execute("""SELECT %s FROM main.%s ORDER BY %s;"""%(", ".join(table.data_columns), table.table_name, ", ".join(table.primary_key_list))).fetchall()
+        return pd.core.frame.DataFrame(rows, columns = table.data_columns)
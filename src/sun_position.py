@@ -0,0 +1,102 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+# The sun position follows the algorithm of the suncalc library used by src/metadata.R.
+RAD = np.pi / 180
+J1970 = 2440588
+J2000 = 2451545
+OBLIQUITY = RAD * 23.4397
+TIME_ZONE = "CET"
+
+def get_days_since_j2000(timestamps, time_zone: str = TIME_ZONE) -> np.ndarray:
+    """
+    Convert the local timestamps into days since the epoch J2000.
+
+    Args:
+        timestamps (array-like): The local timestamps, e.g. strings of the format YYYY-MM-DD HH:MM.
+        time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+
+    Returns:
+        np.ndarray: The days since J2000 of each timestamp.
+    """
+    local_time = pd.Series(pd.to_datetime(pd.Series(timestamps)).values)
+    utc_time = local_time.dt.tz_localize(time_zone, ambiguous = np.zeros(len(local_time), dtype = bool), nonexistent = "shift_forward").dt.tz_convert("UTC")
+    days_since_1970 = ((utc_time - pd.Timestamp("1970-01-01", tz = "UTC")) / pd.Timedelta(days = 1)).values
+    return days_since_1970 - 0.5 + J1970 - J2000
+
+def get_sun_position(timestamps, latitude, longitude, time_zone: str = TIME_ZONE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the sun position for each timestamp.
+
+    Args:
+        timestamps (array-like): The local timestamps.
+        latitude (array-like): The latitude in degree, either a scalar or one value per timestamp.
+        longitude (array-like): The longitude in degree, either a scalar or one value per timestamp.
+        time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The altitude and the azimuth (measured from south to west) of the sun in rad.
+    """
+    d = get_days_since_j2000(timestamps, time_zone)
+    phi = RAD * np.asarray(latitude, dtype = np.float64)
+    lw = RAD * -np.asarray(longitude, dtype = np.float64)
+    mean_anomaly = RAD * (357.5291 + 0.98560028 * d)
+    center = RAD * (1.9148 * np.sin(mean_anomaly) + 0.02 * np.sin(2 * mean_anomaly) + 0.0003 * np.sin(3 * mean_anomaly))
+    ecliptic_longitude = mean_anomaly + center + RAD * 102.9372 + np.pi
+    declination = np.arcsin(np.sin(OBLIQUITY) * np.sin(ecliptic_longitude))
+    right_ascension = np.arctan2(np.sin(ecliptic_longitude) * np.cos(OBLIQUITY), np.cos(ecliptic_longitude))
+    hour_angle = RAD * (280.16 + 360.9856235 * d) - lw - right_ascension
+    altitude = np.arcsin(np.sin(phi) * np.sin(declination) + np.cos(phi) * np.cos(declination) * np.cos(hour_angle))
+    azimuth = np.arctan2(np.sin(hour_angle), np.cos(hour_angle) * np.sin(phi) - np.tan(declination) * np.cos(phi))
+    return altitude, azimuth
+
+def get_suncalc_direction(direction) -> np.ndarray:
+    """
+    Convert the direction of the solar field (measured from north clockwise) into the suncalc format measured from south to west (positive) and east (negative).
+
+    Args:
+        direction (array-like): The direction in degree.
+
+    Returns:
+        np.ndarray: The direction in rad in [-pi, pi].
+    """
+    suncalc_direction = np.asarray(direction, dtype = np.float64) - 180
+    suncalc_direction = np.where((suncalc_direction < -180) | (suncalc_direction > 180), (suncalc_direction + 180) % 360 - 180, suncalc_direction)
+    return suncalc_direction * RAD
+
+def get_sun_factor(timestamps, latitude, longitude, inclination_angle, direction, time_zone: str = TIME_ZONE) -> np.ndarray:
+    """
+    Calculate the influence of the sun position on the solar field, i.e. the cosine of the angle of incidence on the tilted plane clipped at zero.
+
+    Args:
+        timestamps (array-like): The local timestamps.
+        latitude (array-like): The latitude in degree.
+        longitude (array-like): The longitude in degree.
+        inclination_angle (array-like): The inclination angle of the solar field in degree.
+        direction (array-like): The direction of the solar field in degree (measured from north clockwise).
+        time_zone (str, optional): The time zone of the timestamps. Defaults to "CET".
+
+    Returns:
+        np.ndarray: The sun factor of each timestamp.
+    """
+    altitude, azimuth = get_sun_position(timestamps, latitude, longitude, time_zone)
+    inclination = RAD * np.asarray(inclination_angle, dtype = np.float64)
+    cos_theta = np.sin(altitude) * np.sin(inclination) + np.cos(altitude) * np.cos(inclination) * np.cos(azimuth - get_suncalc_direction(direction))
+    return np.clip(cos_theta, 0, None)
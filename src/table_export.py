@@ -0,0 +1,229 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector
+
+CSV = "csv"
+COLUMNAR = "columnar"
+
+class TableExporter:
+    """
+    The TableExporter streams a table or a filtered slice of it chunk by chunk into compressed files, so the memory does not grow with the size of the table.
+    The csv format is one gzip csv file, the columnar format is a directory with one gzip file of little endian values per column (e.g. for readBin in R).
+    A sidecar schema (json) describes the columns, their types and encodings, the filters and the number of rows.
+    """
+    CHUNK_SIZE = 100000
+    CSV_EXTENSION = ".csv.gz"
+    COLUMN_EXTENSION = ".bin.gz"
+    SCHEMA_EXTENSION = ".schema.json"
+    NA_VALUE = "NA"
+    DATE_TYPES = ["DATE", "DATETIME", "TIMESTAMP"]
+    TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+    DOUBLE_ENCODING = "float64"
+    CODE_ENCODING = "int32"
+    MINUTES_ENCODING = "minutes_since_epoch_float64"
+    NA_CODE = -1
+
+    def __init__(self, db_connector: DBConnector, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the exporter.
+
+        Args:
+            db_connector (DBConnector): The connector of the database.
+            chunk_size (int, optional): The number of rows read and written at once. Defaults to 100000.
+
+        Raises:
+            Exception: The exception is raised in case the chunk size is invalid.
+        """
+        if chunk_size < 1:
+            raise Exception("Invalid chunk size %i given!"%(chunk_size))
+        self.db_connector = db_connector
+        self.chunk_size = chunk_size
+
+    def export(self, table_name: str, output_path: str, file_format: str = CSV, select_columns: list[str] = [], start_timestamp: str = None, end_timestamp: str = None, tracker_names: list[str] = None) -> dict:
+        """
+        Export the table (or the given columns, time range and trackers) in chunks.
+
+        Args:
+            table_name (str): The input table name.
+            output_path (str): The full path of the output without extension, the schema is written to <output_path>.schema.json.
+            file_format (str, optional): "csv" (<output_path>.csv.gz) or "columnar" (directory <output_path> with <column>.bin.gz). Defaults to "csv".
+            select_columns (list[str], optional): The columns to export. Defaults to [] (all columns).
+            start_timestamp (str, optional): The first timestamp of the range (inclusive). Defaults to None (unbounded).
+            end_timestamp (str, optional): The end of the range (exclusive). Defaults to None (unbounded).
+            tracker_names (list[str], optional): Restrict the export to the given trackers. Defaults to None (all trackers).
+
+        Raises:
+            Exception: The exception is raised in case the format is unknown or the table does not exist.
+
+        Returns:
+            dict: The schema of the export.
+        """
+        if file_format not in [CSV, COLUMNAR]:
+            raise Exception("Invalid export format %s, valid formats are %s, %s"%(file_format, CSV, COLUMNAR))
+        if not self.db_connector.test_table_exists(table_name):
+            raise Exception("The table %s does not exist!"%(table_name))
+        column_types = self.db_connector.get_column_types(table_name)
+        columns = select_columns if len(select_columns) != 0 else list(column_types.keys())
+        schema = {
+            "table_name": table_name,
+            "format": file_format,
+            "filters": {"start_timestamp": start_timestamp, "end_timestamp": end_timestamp, "tracker_names": tracker_names},
+            "columns": [{"name": i, "sql_type": column_types[i], "r_type": self._get_r_type(column_types[i])} for i in columns],
+            "row_count": 0
+        }
+        chunks = self.db_connector.select_data_chunks(table_name, self.chunk_size, columns, start_timestamp, end_timestamp, tracker_names)
+        if file_format == CSV:
+            schema["file"] = os.path.basename(output_path) + self.CSV_EXTENSION
+            schema["na"] = self.NA_VALUE
+            schema["row_count"] = self._write_csv(chunks, output_path + self.CSV_EXTENSION, columns)
+        else:
+            schema["row_count"] = self._write_columnar(chunks, output_path, schema["columns"])
+        with open(output_path + self.SCHEMA_EXTENSION, "w") as file:
+            json.dump(schema, file, indent = 2)
+        return schema
+
+    def read_columnar(self, output_path: str) -> pd.core.frame.DataFrame:
+        """
+        Read a columnar export back, e.g. to verify it.
+
+        Args:
+            output_path (str): The full path of the export without extension.
+
+        Returns:
+            pd.core.frame.DataFrame: The exported rows with the timestamps as text and the codes replaced by their values.
+        """
+        with open(output_path + self.SCHEMA_EXTENSION) as file:
+            schema = json.load(file)
+        data = {}
+        for column in schema["columns"]:
+            with gzip.open(os.path.join(output_path, column["file"]), "rb") as file:
+                values = np.frombuffer(file.read(), dtype = "<f8" if column["encoding"] != self.CODE_ENCODING else "<i4")
+            if column["encoding"] == self.MINUTES_ENCODING:
+                timestamps = pd.to_datetime(values * 60, unit = "s").strftime(self.TIMESTAMP_FORMAT)
+                data[column["name"]] = np.where(np.isnan(values), None, timestamps.values.astype(object))
+            elif column["encoding"] == self.CODE_ENCODING:
+                levels = np.array(column["levels"] + [None], dtype = object)
+                data[column["name"]] = levels[np.where(values == self.NA_CODE, len(levels) - 1, values)]
+            else:
+                data[column["name"]] = values
+        return pd.core.frame.DataFrame(data, columns = [i["name"] for i in schema["columns"]])
+
+    def _write_csv(self, chunks, fullpath: str, columns: list[str]) -> int:
+        """
+        Append the chunks to one gzip csv file.
+
+        Args:
+            chunks (Iterator[pd.core.frame.DataFrame]): The chunks of the export.
+            fullpath (str): The full path of the csv file.
+            columns (list[str]): The exported columns.
+
+        Returns:
+            int: The number of written rows.
+        """
+        row_count = 0
+        with gzip.open(fullpath, "wt", newline = "") as file:
+            pd.core.frame.DataFrame(columns = columns).to_csv(file, index = False)
+            for chunk in chunks:
+                chunk.to_csv(file, header = False, index = False, na_rep = self.NA_VALUE)
+                row_count += len(chunk)
+        return row_count
+
+    def _write_columnar(self, chunks, output_path: str, columns: list[dict]) -> int:
+        """
+        Append the chunks to one gzip file of little endian values per column.
+        Numeric columns are stored as float64 (NaN for NULL), timestamps as float64 minutes since 1970-01-01 00:00 of the local time and text as int32 codes (-1 for NULL) of the levels listed in the schema.
+
+        Args:
+            chunks (Iterator[pd.core.frame.DataFrame]): The chunks of the export.
+            output_path (str): The directory of the column files.
+            columns (list[dict]): The column entries of the schema, which are extended by the file, the encoding and the levels.
+
+        Returns:
+            int: The number of written rows.
+        """
+        os.makedirs(output_path, exist_ok = True)
+        levels = {}
+        for column in columns:
+            column["file"] = column["name"] + self.COLUMN_EXTENSION
+            if column["r_type"] == "POSIXct":
+                column["encoding"] = self.MINUTES_ENCODING
+            elif column["r_type"] == "factor":
+                column["encoding"] = self.CODE_ENCODING
+                levels[column["name"]] = {}
+            else:
+                column["encoding"] = self.DOUBLE_ENCODING
+        files = [gzip.open(os.path.join(output_path, i["file"]), "wb") for i in columns]
+        row_count = 0
+        try:
+            for chunk in chunks:
+                for column, file in zip(columns, files):
+                    file.write(self._encode_column(chunk[column["name"]], column, levels.get(column["name"])).tobytes())
+                row_count += len(chunk)
+        finally:
+            for file in files:
+                file.close()
+        for column in columns:
+            if column["name"] in levels:
+                column["levels"] = list(levels[column["name"]].keys())
+        return row_count
+
+    def _encode_column(self, values: pd.core.series.Series, column: dict, levels: dict) -> np.ndarray:
+        """
+        Encode the values of a column of one chunk.
+
+        Args:
+            values (pd.core.series.Series): The values of the chunk.
+            column (dict): The column entry of the schema.
+            levels (dict): The code of each text value seen so far, new values are appended (only for text columns).
+
+        Returns:
+            np.ndarray: The little endian encoded values.
+        """
+        if column["encoding"] == self.MINUTES_ENCODING:
+            timestamps = pd.to_datetime(values, format = self.TIMESTAMP_FORMAT)
+            minutes = timestamps.values.astype("datetime64[m]").astype(np.int64).astype("<f8")
+            minutes[pd.isna(timestamps).values] = np.nan
+            return minutes
+        if column["encoding"] == self.CODE_ENCODING:
+            codes, uniques = pd.factorize(values.astype(object))
+            mapping = np.array([levels.setdefault(str(i), len(levels)) for i in uniques] + [self.NA_CODE], dtype = "<i4")
+            return mapping[codes]
+        return pd.to_numeric(values).values.astype("<f8")
+
+    def _get_r_type(self, sql_type: str) -> str:
+        """
+        Get the R type of the declared data type, like castColumnData of the R connector.
+
+        Args:
+            sql_type (str): The declared data type.
+
+        Returns:
+            str: "POSIXct", "numeric" or "factor".
+        """
+        if sql_type in self.DATE_TYPES:
+            return "POSIXct"
+        if sql_type in DBConnector.NUMERIC_TYPES:
+            return "numeric"
+        return "factor"
@@ -0,0 +1,133 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+class WriteLock:
+    """
+    The WriteLock is an advisory lock file, which lets the writers of several processes (or threads) queue for the database instead of competing for the SQLite lock.
+    The lock is released by the operating system, if the holding process dies, so no stale lock file blocks the next writer.
+    """
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, lock_fullpath: str, timeout: float = None):
+        """
+        Initialize the write lock.
+
+        Args:
+            lock_fullpath (str): The full path of the lock file, it is created if it does not exist.
+            timeout (float, optional): The maximum time in seconds to wait for the lock. Defaults to None (wait forever).
+
+        Raises:
+            Exception: The exception is raised in case the platform supports no file locks.
+        """
+        if fcntl == None and msvcrt == None:
+            raise Exception("No file locks are supported on this platform!")
+        self.lock_fullpath = lock_fullpath
+        self.timeout = timeout
+        self.file = None
+
+    def __enter__(self):
+        """
+        Acquire the lock in the with statement.
+
+        Returns:
+            WriteLock: The as-return value.
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Release the lock at the end of the with statement.
+
+        Args:
+            exc_type (Type[BaseException], optional): The exception type, if any.
+            exc_value (BaseException, optional): The exception value, if any.
+            traceback (TracebackType, optional): The stacktrace of the exception, if any.
+        """
+        self.release()
+
+    def acquire(self):
+        """
+        Wait for the lock and acquire it.
+
+        Raises:
+            Exception: The exception is raised in case the lock is held by another writer for longer than the timeout.
+        """
+        file = open(self.lock_fullpath, "a+b")
+        deadline = time.monotonic() + self.timeout if self.timeout != None else None
+        while True:
+            try:
+                self._lock(file)
+                self.file = file
+                return
+            except OSError:
+                if deadline != None and time.monotonic() >= deadline:
+                    file.close()
+                    raise Exception("The lock %s is held by another writer for more than %s seconds!"%(self.lock_fullpath, str(self.timeout)))
+                time.sleep(self.POLL_INTERVAL)
+
+    def release(self):
+        """
+        Release the lock, if it is held.
+        """
+        if self.file == None:
+            return
+        try:
+            self._unlock(self.file)
+        finally:
+            self.file.close()
+            self.file = None
+
+    def _lock(self, file):
+        """
+        Try to lock the file without waiting.
+
+        Args:
+            file (BufferedRandom): The opened lock file.
+
+        Raises:
+            OSError: The exception is raised in case the file is locked by another writer.
+        """
+        if fcntl != None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(self, file):
+        """
+        Unlock the file.
+
+        Args:
+            file (BufferedRandom): The locked file.
+        """
+        if fcntl != None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
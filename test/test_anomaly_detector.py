@@ -0,0 +1,90 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from kpi_engine import KPIEngine
+from anomaly_detector import AnomalyDetector
+
+DB_NAME = "test_anomaly.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+META_COLUMNS = ["tracker_name", "direction", "inclination_angle", "latitude", "longitude", "solar_panel_width", "solar_panel_height", "solar_panel_energy_conversion_efficiency", "solar_panel_number"]
+META_TABLE = DBTable("tracker_meta", pd.core.indexes.base.Index(META_COLUMNS), ["TEXT"] + ["REAL"] * 8, ["tracker_name"])
+META_DATA = pd.DataFrame([[name, 180, 53, 52.37352, 7.1011, 1000, 1000, 20, 10] for name in ["A", "B", "C"]], columns = META_COLUMNS)
+
+def __get_raw_data(days: list[str], factors: dict) -> pd.core.frame.DataFrame:
+    """
+    Internal function to generate the raw data of the trackers, the weather of each day scales all trackers alike.
+    """
+    rows = []
+    for i, day in enumerate(days):
+        weather = 1.0 if i % 2 == 0 else 0.4
+        for time in ["11:00", "12:00", "13:00"]:
+            for name in ["A", "B", "C"]:
+                rows.append(["%s %s"%(day, time), name, weather * factors.get((day, name), 1.0)])
+    return pd.DataFrame(rows, columns = RAW_TABLE.data_columns)
+
+def test_detect():
+    """
+    Test the peer and baseline ratios of a tracker losing half of its production.
+    """
+    days = [str(day.date()) for day in pd.date_range("2023-06-01", periods = 8)]
+    engine = KPIEngine(None, RAW_TABLE, META_TABLE)
+    detector = AnomalyDetector(None, engine, window_days = 5)
+    kpi_data = engine.calculate(__get_raw_data(days, {(days[-1], "C"): 0.5}), META_DATA)
+    result = detector.detect(detector.aggregate_daily(kpi_data))
+    assert 24 == len(result)
+    assert np.allclose(1.0, result["peer_ratio"].values[:-3])
+    assert 0 == result["flagged"].values[:-1].sum()
+    last = result.iloc[-1]
+    assert "C" == last["tracker_name"] and 1 == last["flagged"]
+    assert np.isclose(0.5, last["peer_ratio"]) and np.isclose(0.5, last["baseline_ratio"]) and np.isclose(0.5, last["severity"])
+    assert np.isnan(result["baseline_ratio"][0])
+
+def test_run():
+    """
+    Test the incremental scoring of the newly ingested days.
+    """
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        days = [str(day.date()) for day in pd.date_range("2023-06-01", periods = 6)]
+        db_connector.create_table(META_TABLE)
+        db_connector.insert_data(META_TABLE, META_DATA)
+        db_connector.create_table(RAW_TABLE)
+        detector = AnomalyDetector(db_connector, KPIEngine(db_connector, RAW_TABLE, META_TABLE), window_days = 3, min_baseline_days = 2)
+        # a night only ingest scores no day
+        db_connector.insert_data(RAW_TABLE, pd.DataFrame([["%s 00:00"%(days[0]), name, 0.0] for name in ["A", "B"]], columns = RAW_TABLE.data_columns))
+        assert 0 == detector.run()
+        db_connector.insert_data(RAW_TABLE, __get_raw_data(days[:4], {}))
+        assert 12 == detector.run()
+        assert 0 == len(detector.select_flags())
+        db_connector.insert_data(RAW_TABLE, __get_raw_data(days, {(days[5], "B"): 0.1}).iloc[36:])
+        assert 9 == detector.run()
+        assert 18 == len(db_connector.select_data_unfiltered(AnomalyDetector.RESULT_TABLE_NAME))
+        flags = detector.select_flags()
+        assert [[days[5], "B"]] == flags[["timestamp", "tracker_name"]].values.tolist()
+        assert np.isclose(0.9, flags["severity"][0])
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
@@ -0,0 +1,97 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from async_db_connector import AsyncDBConnector
+
+DB_NAME = "test_async_db_connector.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+TIMESTAMPS = pd.date_range("2023-03-01 00:00", "2023-03-10 23:45", freq = "15min").strftime("%Y-%m-%d %H:%M")
+RAW_DATA = pd.DataFrame({"timestamp": np.repeat(TIMESTAMPS, 2), "tracker_name": np.tile(["a", "b"], len(TIMESTAMPS)), "Production": np.arange(len(TIMESTAMPS) * 2, dtype = np.float64)})
+
+def test_async_db_connector():
+    async def run():
+        async with AsyncDBConnector(DBConnector(tu.get_test_results_path(), DB_NAME), max_workers = 2) as connector:
+            assert not await connector.test_table_exists(RAW_TABLE.table_name)
+            await connector.create_table(RAW_TABLE)
+            await connector.insert_data(RAW_TABLE, RAW_DATA)
+            assert {"inserted": 0, "updated": 0, "unchanged": 2} == await connector.upsert_data(RAW_TABLE, RAW_DATA.iloc[:2])
+            results = await asyncio.gather(*[connector.select_data_range(RAW_TABLE.table_name, "2023-03-0%i"%(i), "2023-03-0%i"%(i + 1), tracker_names = ["a"]) for i in range(1, 9)])
+            assert [96] * 8 == [len(i) for i in results]
+            assert "2023-03-10 23:45" == await connector.select_max_timestamp(RAW_TABLE.table_name)
+            chunks = [len(i) async for i in connector.select_data_chunks(RAW_TABLE.table_name, 500)]
+            assert len(RAW_DATA) == sum(chunks) and 500 == chunks[0]
+            async for chunk in connector.select_data_chunks(RAW_TABLE.table_name, 100):
+                break
+            assert 96 * 2 == await connector.delete_data_range(RAW_TABLE, "2023-03-10")
+            assert len(RAW_DATA) - 96 * 2 == len(await connector.select_data_unfiltered(RAW_TABLE.table_name))
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    try:
+        asyncio.run(run())
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_timeout():
+    async def run():
+        connector = AsyncDBConnector(DBConnector(tu.get_test_results_path(), DB_NAME), max_workers = 1, timeout = 0.05)
+        try:
+            ticks = []
+            async def tick():
+                for _ in range(5):
+                    ticks.append(time.monotonic())
+                    await asyncio.sleep(0.01)
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.gather(connector.run(time.sleep, 0.3), tick())
+            # the event loop was not blocked by the call and the call was abandoned before its end
+            assert time.monotonic() - start < 0.3 and len(ticks) >= 1
+            assert 1 == await connector.run(int, "1", timeout = 1)
+        finally:
+            await connector.close()
+    asyncio.run(run())
+
+def test_cancel_event():
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        db_connector.create_table(RAW_TABLE)
+        db_connector.insert_data(RAW_TABLE, RAW_DATA)
+        db_connector.thread_state.cancel_event = threading.Event()
+        assert len(RAW_DATA) == len(db_connector.select_data_unfiltered(RAW_TABLE.table_name))
+        db_connector.thread_state.cancel_event.set()
+        with pytest.raises(sqlite3.OperationalError):
+            db_connector.select_data_unfiltered(RAW_TABLE.table_name)
+        db_connector.thread_state.cancel_event = None
+        assert len(RAW_DATA) == len(db_connector.select_data_unfiltered(RAW_TABLE.table_name))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_invalid_workers():
+    with pytest.raises(Exception):
+        AsyncDBConnector(DBConnector(tu.get_test_results_path(), DB_NAME), max_workers = 0)
@@ -0,0 +1,99 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import json
+import shutil
+
+import pandas as pd
+
+import batch_runner
+from batch_runner import BatchRunner
+
+CONFIG_FILENAME_VALID = "config_valid.json"
+CONFIG_DIR = "test_batch_configs"
+DATA_DIR = "data"
+PLANTS = ["plant_a", "plant_b"]
+
+def test_batch_runner():
+    config_dir = __create_configs()
+    try:
+        runner = BatchRunner(config_dir, max_workers = 2, steps = [batch_runner.CREATE_TABLES, batch_runner.INSERT_RAW_DATA, batch_runner.CALCULATE_ENERGY_BALANCE], upsert = True)
+        assert [os.path.join(config_dir, "%s.json"%(i)) for i in ["broken"] + PLANTS] == runner.config_paths
+        report_path = os.path.join(config_dir, "report.csv")
+        report = runner.run(report_path)
+        assert ["failed", "ok", "ok"] == report["status"].tolist()
+        assert report["error"].iloc[0] != None and report["failed_step"].iloc[0] == None
+        assert [48, 48] == report["insert_raw_data_rows"].iloc[1:].tolist()
+        assert [12, 12] == report["calculate_energy_balance_rows"].iloc[1:].tolist()
+        assert (report["total_seconds"] >= 0).all()
+        assert report.columns.tolist() == pd.read_csv(report_path).columns.tolist()
+        assert 0 == runner.run()["insert_raw_data_rows"].iloc[1]
+    finally:
+        shutil.rmtree(config_dir, ignore_errors = True)
+        for plant in PLANTS:
+            tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, "%s.db"%(plant)))
+
+def test_batch_runner_insert():
+    config_dir = __create_configs()
+    try:
+        runner = BatchRunner(config_dir, max_workers = 2, steps = [batch_runner.CREATE_TABLES, batch_runner.INSERT_RAW_DATA])
+        assert [48, 48] == runner.run()["insert_raw_data_rows"].iloc[1:].tolist()
+        assert [0, 0] == runner.run()["insert_raw_data_rows"].iloc[1:].tolist()
+    finally:
+        shutil.rmtree(config_dir, ignore_errors = True)
+        for plant in PLANTS:
+            tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, "%s.db"%(plant)))
+
+def test_run_plant_failed_step():
+    config_dir = __create_configs()
+    try:
+        with open(os.path.join(config_dir, "plant_a.json")) as file:
+            config = json.load(file)
+        config["wd"] = os.path.join(config_dir, "missing")
+        config_path = os.path.join(config_dir, "plant_missing.json")
+        with open(config_path, "w") as file:
+            json.dump(config, file)
+        report = batch_runner.run_plant(config_path, [batch_runner.INSERT_RAW_DATA])
+        assert "failed" == report["status"] and batch_runner.INSERT_RAW_DATA == report["failed_step"]
+        assert "insert_raw_data_seconds" not in report and report["total_seconds"] >= 0
+    finally:
+        shutil.rmtree(config_dir, ignore_errors = True)
+
+def test_invalid_steps():
+    with pytest.raises(Exception):
+        BatchRunner([], steps = ["unknown"])
+    BatchRunner([], steps = [batch_runner.CALCULATE_LOAD_PROFILES, batch_runner.REFRESH_SNAPSHOTS])
+    assert all([hasattr(batch_runner.Main, i) for i in batch_runner.STEPS])
+
+def __create_configs() -> str:
+    config_dir = os.path.join(tu.get_test_results_path(), CONFIG_DIR)
+    os.makedirs(config_dir, exist_ok = True)
+    with open(os.path.join(tu.get_test_data_path(), CONFIG_FILENAME_VALID)) as file:
+        config = json.load(file)
+    config["wd"] = os.path.join(tu.get_test_data_path(), DATA_DIR)
+    for plant in PLANTS:
+        config["db.name"] = "%s.db"%(plant)
+        with open(os.path.join(config_dir, "%s.json"%(plant)), "w") as file:
+            json.dump(config, file)
+    with open(os.path.join(config_dir, "broken.json"), "w") as file:
+        file.write("{")
+    return config_dir
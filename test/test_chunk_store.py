@@ -0,0 +1,115 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from chunk_store import ChunkStore, encode_values, decode_values, decode_chunks
+
+DB_NAME = "test_chunk_store.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+META_TABLE = DBTable("tracker_meta", pd.core.indexes.base.Index(["tracker_name", "direction"]), ["TEXT", "REAL"], ["tracker_name"])
+RAW_DATA = pd.DataFrame([["2023-03-01 23:45", "a", 1.0], ["2023-03-02 00:00", "a", 2.0], ["2023-03-02 00:00", "b", 3.0], ["2023-03-02 16:15", "a", 0.0]], columns = RAW_TABLE.data_columns)
+
+def test_encode_values():
+    values = np.array([0.0, np.nan, 1.5, -2.0])
+    decoded = decode_values(encode_values(values))
+    assert np.array_equal(values, decoded, equal_nan = True)
+    assert not decoded.flags.writeable
+    matrix = decode_chunks([encode_values(values), encode_values(values * 2)], 4)
+    assert (2, 4) == matrix.shape and np.isclose(3.0, matrix[1, 2])
+    assert (0, 4) == decode_chunks([], 4).shape
+
+def test_chunk_store():
+    store = ChunkStore(tu.get_test_results_path(), DB_NAME)
+    try:
+        assert store.is_chunkable(RAW_TABLE) and not store.is_chunkable(META_TABLE)
+        for table in [RAW_TABLE, META_TABLE]:
+            store.create_table(table)
+            store.create_index("idx_" + table.table_name, table.table_name, table.primary_key_list)
+        assert store.test_table_exists(RAW_TABLE.table_name) and store.test_table_exists("tracker_raw_chunks")
+        store.insert_data(META_TABLE, pd.DataFrame([["a", 180.0]], columns = META_TABLE.data_columns))
+        assert 1 == len(store.select_data_unfiltered(META_TABLE.table_name))
+        store.insert_data(RAW_TABLE, RAW_DATA.iloc[:2])
+        store.insert_data(RAW_TABLE, pd.concat([RAW_DATA, pd.DataFrame([["2023-03-02 00:00", "a", 9.0]], columns = RAW_TABLE.data_columns)], ignore_index = True))
+        assert 3 == len(store.select_data_unfiltered("tracker_raw_chunks"))
+        assert [["2023-03-01 23:45", "a", 1.0], ["2023-03-02 00:00", "a", 2.0], ["2023-03-02 00:00", "b", 3.0], ["2023-03-02 16:15", "a", 0.0]] == store.select_data_unfiltered(RAW_TABLE.table_name).values.tolist()
+        data = store.select_data_range(RAW_TABLE.table_name, "2023-03-02 00:00", "2023-03-02 16:15", ["timestamp", "Production"], {"Production": "DESC"})
+        assert [["2023-03-02 00:00", 3.0], ["2023-03-02 00:00", 2.0]] == data.values.tolist()
+        assert [["2023-03-02 16:15", "a", 0.0]] == store.select_data_range(RAW_TABLE.table_name, "2023-03-02 00:15", tracker_names = ["a"]).values.tolist()
+        assert "2023-03-02 16:15" == store.select_max_timestamp(RAW_TABLE.table_name)
+        assert [1, 2, 1] == [len(i) for i in store.select_data_chunks(RAW_TABLE.table_name, 1)]
+        with pytest.raises(Exception):
+            store.insert_data(RAW_TABLE, pd.DataFrame([["2023-03-02 00:05", "a", 1.0]], columns = RAW_TABLE.data_columns))
+        assert 2 == store.delete_data_range(RAW_TABLE, "2023-03-02 00:00", tracker_names = ["a"])
+        assert [["2023-03-01 23:45", "a"], ["2023-03-02 00:00", "b"]] == store.select_data_unfiltered(RAW_TABLE.table_name, ["timestamp", "tracker_name"]).values.tolist()
+        assert 2 == len(store.select_data_unfiltered("tracker_raw_chunks"))
+        with pytest.raises(Exception):
+            ChunkStore(tu.get_test_results_path(), DB_NAME, interval_minutes = 7)
+        with pytest.raises(Exception):
+            ChunkStore(tu.get_test_results_path(), DB_NAME, interval_minutes = 30).select_data_unfiltered(RAW_TABLE.table_name)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_upsert_data():
+    store = ChunkStore(tu.get_test_results_path(), DB_NAME)
+    try:
+        store.create_table(RAW_TABLE)
+        store.insert_data(RAW_TABLE, RAW_DATA)
+        corrected = pd.DataFrame([["2023-03-02 00:00", "a", 2.0], ["2023-03-02 00:00", "b", 4.0], ["2023-03-02 00:15", "b", 5.0], ["2023-03-02 16:15", "a", None]], columns = RAW_TABLE.data_columns)
+        assert {"inserted": 1, "updated": 1, "unchanged": 1} == store.upsert_data(RAW_TABLE, corrected)
+        assert [1.0, 2.0, 4.0, 5.0, 0.0] == store.select_data_unfiltered(RAW_TABLE.table_name)["Production"].tolist()
+        assert {"inserted": 0, "updated": 0, "unchanged": 3} == store.upsert_data(RAW_TABLE, corrected)
+        assert 4 == store.replace_data_range(RAW_TABLE, pd.DataFrame([["2023-03-02 00:15", "b", 6.0]], columns = RAW_TABLE.data_columns), "2023-03-02 00:00")
+        assert [["2023-03-01 23:45", "a", 1.0], ["2023-03-02 00:15", "b", 6.0]] == store.select_data_unfiltered(RAW_TABLE.table_name).values.tolist()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_write_batches():
+    store = ChunkStore(tu.get_test_results_path(), DB_NAME, write_batch_size = 1)
+    try:
+        store.create_table(RAW_TABLE)
+        assert 2 == store.insert_data(RAW_TABLE, RAW_DATA.iloc[:2])
+        assert 2 == store.insert_data(RAW_TABLE, RAW_DATA)
+        assert RAW_DATA.values.tolist() == store.select_data_unfiltered(RAW_TABLE.table_name).values.tolist()
+        assert 3 == len(store.select_data_unfiltered("tracker_raw_chunks"))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_chunk_store_size():
+    """
+    Test, that a year of one tracker needs a fraction of the row by row storage.
+    """
+    timestamps = pd.date_range("2023-01-01", periods = 96 * 365, freq = "15min").strftime("%Y-%m-%d %H:%M")
+    data = pd.DataFrame({"timestamp": timestamps, "tracker_name": "a", "Production": np.round(np.random.default_rng(0).uniform(0, 1, len(timestamps)), 3)})
+    row_db_name = "row_" + DB_NAME
+    try:
+        for connector in [DBConnector(tu.get_test_results_path(), row_db_name), ChunkStore(tu.get_test_results_path(), DB_NAME)]:
+            connector.create_table(RAW_TABLE)
+            connector.insert_data(RAW_TABLE, data)
+        assert data.values.tolist() == ChunkStore(tu.get_test_results_path(), DB_NAME).select_data_unfiltered(RAW_TABLE.table_name).values.tolist()
+        assert 4 * os.path.getsize(os.path.join(tu.get_test_results_path(), DB_NAME)) < os.path.getsize(os.path.join(tu.get_test_results_path(), row_db_name))
+    finally:
+        for db_name in [DB_NAME, row_db_name]:
+            tu.remove_file(os.path.join(tu.get_test_results_path(), db_name))
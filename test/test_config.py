@@ -20,6 +20,7 @@ import sys
 sys.path.append(tu.get_src_path())
 import pytest
 import os
+import json
 
 import pandas as pd
 
@@ -39,20 +40,43 @@ def test_config_valid():
     assert all(["timestamp", "Production_1_1", "Production_1_2", "Production_1_3", 'Production', 'Consumption'] == conf.db_columns)
     assert ";" == conf.separator
     assert "pvdb.db" == conf.db_name
+    assert None == conf.db_shard
+    assert False == conf.db_zone_map
+    assert 0 == conf.db_cache_size
+    assert None == conf.db_journal_mode
+    assert False == conf.db_chunk_store
+    assert 5.0 == conf.db_busy_timeout
+    assert 5 == conf.db_write_retries
+    assert False == conf.db_lock_file
+    assert 50000 == conf.db_write_batch_size
+    assert 0.5 == conf.db_max_lock_seconds
+    assert {} == conf.db_retention
+    assert None == conf.db_resample
+    assert None == conf.db_validation
+    assert {} == conf.db_meta_files
+    assert None == conf.db_staging
     assert {'timestamp': 'DATE', 'Production_1_1': 'REAL', 'Production_1_2': 'REAL', 'Production_1_3': 'REAL', 'Production': 'REAL', 'Consumption': 'REAL', 'tracker_name': 'TEXT', "direction": "REAL", 'inclination_angle': 'REAL', 'latitude': 'REAL', 'longitude': 'REAL', 'solar_panel_width': 'REAL', 'solar_panel_height': 'REAL', 'solar_panel_energy_conversion_efficiency': 'REAL', 'solar_panel_number': 'REAL'} == conf.db_types
     assert ['main.raw', 'tracker.raw', 'tracker.meta'] == list(conf.tables.keys())
     assert 'main_raw' == conf.tables['main.raw'].table_name
     assert all(pd.core.indexes.base.Index(['timestamp', 'Production', 'Consumption'], dtype='object') == conf.tables['main.raw'].data_columns)
     assert ['DATE', 'REAL', 'REAL'] == conf.tables['main.raw'].data_types
     assert ['timestamp'] == conf.tables['main.raw'].primary_key_list
+    assert ['idx_main_raw_production'] == [i.index_name for i in conf.tables['main.raw'].indexes]
+    assert ['timestamp'] == conf.tables['main.raw'].indexes[0].column_list
+    assert ['Production'] == conf.tables['main.raw'].indexes[0].include_list
+    assert None == conf.tables['main.raw'].indexes[0].condition
     assert 'tracker_raw' == conf.tables['tracker.raw'].table_name
     assert all(pd.core.indexes.base.Index(['timestamp', 'tracker_name', 'Production'], dtype='object') == conf.tables['tracker.raw'].data_columns)
     assert ['DATE', 'TEXT', 'REAL'] == conf.tables['tracker.raw'].data_types
     assert ['timestamp', 'tracker_name'] == conf.tables['tracker.raw'].primary_key_list
+    assert ['idx_tracker_raw_tracker', 'idx_tracker_raw_production'] == [i.index_name for i in conf.tables['tracker.raw'].indexes]
+    assert ['tracker_name', 'timestamp', 'Production'] == conf.tables['tracker.raw'].indexes[0].get_indexed_columns()
+    assert "Production > 0" == conf.tables['tracker.raw'].indexes[1].condition
     assert 'tracker_meta' == conf.tables['tracker.meta'].table_name
     assert all(pd.core.indexes.base.Index(['tracker_name', 'direction', 'inclination_angle', 'latitude', 'longitude', 'solar_panel_width', 'solar_panel_height', 'solar_panel_energy_conversion_efficiency', 'solar_panel_number'], dtype='object') == conf.tables['tracker.meta'].data_columns)
     assert ['TEXT', 'REAL', 'REAL', 'REAL', 'REAL', 'REAL', 'REAL', 'REAL', 'REAL'] == conf.tables['tracker.meta'].data_types
     assert ['tracker_name'] == conf.tables['tracker.meta'].primary_key_list
+    assert [] == conf.tables['tracker.meta'].indexes
     assert ['Production_1_1', 'Production_1_2', 'Production_1_3'] == conf.tracker_names
     assert ['tracker.meta'] == list(conf.meta_data.keys())
     assert all(pd.core.indexes.base.Index(['tracker_name', 'direction', 'inclination_angle', 'latitude', 'longitude', 'solar_panel_width', 'solar_panel_height', 'solar_panel_energy_conversion_efficiency', 'solar_panel_number'], dtype='object') == conf.meta_data['tracker.meta'].columns)
@@ -60,6 +84,51 @@ def test_config_valid():
     assert 1 == len(meta_data)
     assert ["A", "59", "53", "52.37352", "7.10110", "1755", "1038", "19.9", "10"] == meta_data[0]
 
+def test_config_meta_data():
+    """
+    Test the meta data of many trackers and the meta files of a config.
+    """
+    config_fullpath = os.path.join(tu.get_test_results_path(), CONFIG_FILENAME_VALID)
+    with open(os.path.join(tu.get_test_data_path(), CONFIG_FILENAME_VALID)) as file:
+        data = json.load(file)
+    entry = data["tracker.meta.data"]["A"]
+    data["tracker.meta.data"] = {str(i): dict(entry, tracker_name = str(i)) for i in range(2000)}
+    data["tracker.meta.data"]["incomplete"] = {"tracker_name": "incomplete"}
+    data["db.meta.files"] = {"tracker.meta": "trackers.jsonl"}
+    try:
+        with open(config_fullpath, "w") as file:
+            json.dump(data, file)
+        conf = Config(config_fullpath)
+        assert 2000 == len(conf.meta_data["tracker.meta"])
+        assert ["1999", "59", "53", "52.37352", "7.10110", "1755", "1038", "19.9", "10"] == conf.meta_data["tracker.meta"].values.tolist()[-1]
+        assert {"tracker.meta": "trackers.jsonl"} == conf.db_meta_files
+        data["db.meta.files"] = {"tracker.meta": "trackers.xlsx"}
+        with open(config_fullpath, "w") as file:
+            json.dump(data, file)
+        with pytest.raises(Exception):
+            Config(config_fullpath)
+    finally:
+        tu.remove_file(config_fullpath)
+
+def test_config_chunk_store():
+    """
+    Test, that the chunk store is not combined with shards or the zone map.
+    """
+    config_fullpath = os.path.join(tu.get_test_results_path(), CONFIG_FILENAME_VALID)
+    with open(os.path.join(tu.get_test_data_path(), CONFIG_FILENAME_VALID)) as file:
+        data = json.load(file)
+    try:
+        for settings in [{"db.chunk.store": True}, {"db.chunk.store": True, "db.shard": "year"}, {"db.chunk.store": True, "db.zone.map": True}]:
+            with open(config_fullpath, "w") as file:
+                json.dump(dict(data, **settings), file)
+            if len(settings) == 1:
+                assert Config(config_fullpath).db_chunk_store
+            else:
+                with pytest.raises(Exception):
+                    Config(config_fullpath)
+    finally:
+        tu.remove_file(config_fullpath)
+
 def __validate_constants(conf: Config):
     """
     Validate the internal constants of the config.
@@ -73,9 +142,27 @@ def __validate_constants(conf: Config):
     assert "data.db.columns" == conf.DB_COLUMNS
     assert "separator" == conf.SEPARATOR
     assert "db.name" == conf.DB_NAME
+    assert "db.shard" == conf.DB_SHARD
+    assert "db.zone.map" == conf.DB_ZONE_MAP
+    assert "db.cache.size" == conf.DB_CACHE_SIZE
+    assert "db.journal.mode" == conf.DB_JOURNAL_MODE
+    assert "db.chunk.store" == conf.DB_CHUNK_STORE
+    assert "db.busy.timeout" == conf.DB_BUSY_TIMEOUT
+    assert "db.write.retries" == conf.DB_WRITE_RETRIES
+    assert "db.lock.file" == conf.DB_LOCK_FILE
+    assert "db.write.batch.size" == conf.DB_WRITE_BATCH_SIZE
+    assert "db.max.lock.seconds" == conf.DB_MAX_LOCK_SECONDS
+    assert "db.resample" == conf.DB_RESAMPLE
+    assert "db.validation" == conf.DB_VALIDATION
+    assert "db.meta.files" == conf.DB_META_FILES
+    assert "db.staging" == conf.DB_STAGING
+    assert "db.retention" == conf.DB_RETENTION
     assert "db.types" == conf.DB_TYPES
     assert "columns" == conf.DB_TABLE_COLUMNS
     assert "primary" == conf.DB_TABLE_PRIMARY_KEY
+    assert "indexes" == conf.DB_TABLE_INDEXES
+    assert "include" == conf.DB_INDEX_INCLUDE
+    assert "where" == conf.DB_INDEX_CONDITION
     assert "table.name" == conf.TABLE_NAME
     assert "tracker.names" == conf.TRACKER_NAMES
 
@@ -0,0 +1,57 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import sqlite3
+
+from connection_pool import ConnectionPool
+
+DB_NAME = "test_pool.db"
+
+def test_connection_pool():
+    """
+    Test borrowing and returning read only connections.
+    """
+    file_path = os.path.join(tu.get_test_results_path(), DB_NAME)
+    conn = sqlite3.connect(file_path)
+    conn.execute("""CREATE TABLE test(value REAL);""")
+    conn.execute("""INSERT INTO test VALUES (1.0);""")
+    conn.commit()
+    conn.close()
+    connection_pool = ConnectionPool(1, 0.1)
+    try:
+        pool_conn = connection_pool.acquire(file_path)
+        assert [(1.0,)] == pool_conn.execute("""SELECT * FROM test;""").fetchall()
+        with pytest.raises(sqlite3.OperationalError):
+            pool_conn.execute("""INSERT INTO test VALUES (2.0);""")
+        with pytest.raises(Exception):
+            connection_pool.acquire(file_path)
+        connection_pool.release(file_path, pool_conn)
+        assert pool_conn == connection_pool.acquire(file_path)
+        connection_pool.release(file_path, pool_conn)
+        assert 1 == connection_pool.connection_count
+    finally:
+        connection_pool.close()
+        tu.remove_file(file_path)
+    assert 0 == connection_pool.connection_count
+
+if __name__ == "__main__":
+    test_connection_pool()
@@ -0,0 +1,79 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import json
+
+import pandas as pd
+
+from db_connector import DBConnector
+from data_validation import DataValidator, RULE_DUPLICATE, RULE_NEGATIVE, RULE_PRODUCTION_SUM
+
+DB_NAME = "test_data_validation.db"
+TRACKER_COLUMNS = ["1.1", "1.2"]
+META_DATA = pd.DataFrame([["1.1", 1000, 1000, 20, 10], ["B", 1000, 1000, 20, 10]], columns = ["tracker_name", "solar_panel_width", "solar_panel_height", "solar_panel_energy_conversion_efficiency", "solar_panel_number"])
+INPUT_DATA = pd.DataFrame([
+    ["2023-03-02 16:00", 1.0, 2.0, 3.0, "2023-03.csv"],
+    ["2023-03-02 16:00", 1.0, 2.0, 3.0, "2023-03.csv"],
+    ["2023-03-02 16:15", -1.0, 2.0, 1.0, "2023-03.csv"],
+    ["2023-03-02 16:30", 1.0, 2.0, 9.0, "2023-03.csv"],
+    ["2023-03-02 16:45", 3.0, None, 5.0, "2023-03.csv"],
+    ["2023-03-02 16:00", 1.0, 2.0, 3.0, "2023-04.csv"],
+    ["16:15", 1.0, 2.0, 3.0, "2023-04.csv"]
+], columns = ["timestamp"] + TRACKER_COLUMNS + ["Production", DataValidator.FILE_NAME])
+
+def test_get_tracker_limits():
+    assert {"1.1": 2.5} == DataValidator.get_tracker_limits(META_DATA, {"1.1": "1.1"})
+    assert {"1.1": 2.0} == DataValidator.get_tracker_limits(META_DATA, {"1.1": "1.1", "C": "1.3"}, 1.0)
+
+def test_evaluate():
+    validator = DataValidator(None, TRACKER_COLUMNS, "Production", {"1.1": 2.5})
+    failed = validator.evaluate(INPUT_DATA)
+    assert [False, False, False, False, False, False, True] == failed["timestamp"].to_list()
+    assert [False, True, False, False, False, False, False] == failed[RULE_DUPLICATE].to_list()
+    assert [False, False, True, False, False, False, False] == failed[RULE_NEGATIVE].to_list()
+    # the missing tracker value fails no rule
+    assert [False, False, False, True, False, False, False] == failed[RULE_PRODUCTION_SUM].to_list()
+    assert [False, False, False, False, True, False, False] == failed["peak_power"].to_list()
+    with pytest.raises(Exception):
+        DataValidator(None, TRACKER_COLUMNS, rules = ["unknown"])
+
+def test_validate():
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        validator = DataValidator(db_connector, TRACKER_COLUMNS, "Production", {"1.1": 2.5})
+        data, report = validator.validate(INPUT_DATA)
+        assert ["timestamp"] + TRACKER_COLUMNS + ["Production"] == data.columns.to_list()
+        assert ["2023-03-02 16:00", "2023-03-02 16:00"] == data["timestamp"].to_list()
+        assert ["2023-03.csv", "2023-04.csv"] == report[DataValidator.FILE_NAME].to_list()
+        assert [5, 2] == report[DataValidator.ROW_COUNT].to_list()
+        assert [4, 1] == report[DataValidator.QUARANTINED].to_list()
+        quarantine = db_connector.select_data_unfiltered(DataValidator.QUARANTINE_TABLE_NAME, order_by = {DataValidator.FILE_NAME: "ASC", DataValidator.ROW_NUMBER: "ASC"})
+        assert [2, 3, 4, 5, 2] == quarantine[DataValidator.ROW_NUMBER].to_list()
+        assert ["duplicate", "negative", "production_sum", "peak_power", "timestamp"] == quarantine[DataValidator.RULES_COLUMN].to_list()
+        assert -1.0 == json.loads(quarantine[DataValidator.DATA_COLUMN].iloc[1])["1.1"]
+        # a re-ingest of the files replaces the report
+        validator.validate(INPUT_DATA)
+        assert 2 == len(db_connector.select_data_unfiltered(DataValidator.REPORT_TABLE_NAME))
+        assert 5 == len(db_connector.select_data_unfiltered(DataValidator.QUARANTINE_TABLE_NAME))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
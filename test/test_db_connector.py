@@ -22,8 +22,10 @@ import pytest
 import os
 import pandas as pd
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from db_connector import DBConnector, DBTable
+from db_connector import DBConnector, DBIndex, DBTable
 
 CREATE_DB_NAME = "test.db"
 TABLE_NAME = "test"
@@ -32,6 +34,9 @@ DATA_TYPES = ["DATE", "TEXT", "REAL"]
 PRIMARY_KEY_LIST = ["timestamp", "tracker_name"]
 DATA = [["2023-03-02 16:00", "a", 6], ["2023-03-02 16:00", "b", 7], ["2023-03-02 16:15", "a", 5], ["2023-03-02 16:15", "b", 8]]
 DATA_DF = pd.DataFrame(DATA, columns = DATA_COLUMNS)
+SHARD_DATA = [["2023-12-31 23:45", "a", 6.0], ["2024-01-01 00:00", "a", 7.0], ["2024-01-01 00:00", "b", 5.0], ["2025-03-02 16:15", "b", 8.0]]
+SHARD_DATA_DF = pd.DataFrame(SHARD_DATA, columns = DATA_COLUMNS)
+SHARD_KEYS = ["2023", "2024", "2025"]
 
 def test_DBTable():
     dbTable = __test_DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES,PRIMARY_KEY_LIST)
@@ -39,6 +44,15 @@ def test_DBTable():
     assert all(list(column_dict.keys()) == DATA_COLUMNS)
     assert list(column_dict.values()) == DATA_TYPES
 
+def test_DBIndex():
+    index = DBIndex("idx_test_tracker", ["tracker_name", "timestamp"], ["Production", "timestamp"], "Production > 0")
+    assert ["tracker_name", "timestamp", "Production"] == index.get_indexed_columns()
+    assert [index] == DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST, [index]).indexes
+    with pytest.raises(Exception):
+        DBIndex("idx_test_empty", [])
+    with pytest.raises(Exception):
+        DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST, [DBIndex("idx_test_invalid", ["Consumption"])])
+
 def __test_DBTable(table_name: str, data_columns: pd.core.indexes.base.Index, data_types: list[str], primary_key_list: list[str] = []):
     dbTable = DBTable(table_name, data_columns, data_types, primary_key_list)
     assert dbTable.table_name == table_name
@@ -51,10 +65,298 @@ def test_insert_into_table():
     __test_insert_into_table()
     tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
 
+def test_insert_ignore_existing():
+    dbConnector, dbTable = __test_insert_into_table()
+    try:
+        assert 1 == dbConnector.insert_data(dbTable, pd.concat([DATA_DF.iloc[2:], pd.DataFrame([["2023-03-02 16:30", "a", 9.0]], columns = DATA_COLUMNS)], ignore_index = True), ignore_existing = True)
+        assert 0 == dbConnector.insert_data(dbTable, DATA_DF)
+        assert DATA + [["2023-03-02 16:30", "a", 9.0]] == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+    dbConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, DBConnector.SHARD_YEAR)
+    try:
+        dbTable = DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST)
+        dbConnector.create_table(dbTable)
+        assert 2 == dbConnector.insert_data(dbTable, SHARD_DATA_DF.iloc[:2])
+        assert 2 == dbConnector.insert_data(dbTable, SHARD_DATA_DF, ignore_existing = True)
+        assert SHARD_DATA == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+    finally:
+        for file_path in dbConnector.get_shard_fullpaths() + [dbConnector.db_fullpath]:
+            tu.remove_file(file_path)
+
 def test_create_table():
     __test_create_table()
     tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
 
+def test_sharded_insert_into_table():
+    dbConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, DBConnector.SHARD_YEAR)
+    try:
+        dbTable = __test_DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST)
+        dbConnector.create_table(dbTable)
+        dbConnector.create_index("idx_" + dbTable.table_name, dbTable.table_name, dbTable.primary_key_list)
+        dbConnector.insert_data(dbTable, SHARD_DATA_DF)
+        dbConnector.insert_data(dbTable, SHARD_DATA_DF)
+        assert SHARD_KEYS == dbConnector.get_shard_keys()
+        assert [os.path.join(tu.get_test_results_path(), "test_%s.db"%(i)) for i in SHARD_KEYS] == dbConnector.get_shard_fullpaths()
+        conn = sqlite3.connect(dbConnector.get_shard_fullpaths()[1])
+        try:
+            assert [("2024-01-01 00:00", "a", 7.0), ("2024-01-01 00:00", "b", 5.0)] == conn.execute("""SELECT * FROM test ORDER BY tracker_name""").fetchall()
+            assert 1 == len(conn.execute("""SELECT name FROM sqlite_master WHERE type='index' AND name='idx_test';""").fetchall())
+        finally:
+            conn.close()
+        data = dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+        assert SHARD_DATA == data.values.tolist()
+        dbConnector.MAX_ATTACHED = 1
+        data = dbConnector.select_data_unfiltered(dbTable.table_name, ["timestamp", "Production"], {"timestamp": "DESC", "Production": "ASC"})
+        assert [["2025-03-02 16:15", 8.0], ["2024-01-01 00:00", 5.0], ["2024-01-01 00:00", 7.0], ["2023-12-31 23:45", 6.0]] == data.values.tolist()
+    finally:
+        for file_path in dbConnector.get_shard_fullpaths() + [dbConnector.db_fullpath]:
+            tu.remove_file(file_path)
+
+def test_zone_map():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.zone_map = True
+        dbConnector.insert_data(dbTable, DATA_DF)
+        zone_map = dbConnector.get_zone_map(dbTable.table_name)
+        assert [["a", "2023-03", "2023-03-02 16:00", "2023-03-02 16:15", 2], ["b", "2023-03", "2023-03-02 16:00", "2023-03-02 16:15", 2]] == zone_map[["tracker_name", "month", "min_timestamp", "max_timestamp", "row_count"]].values.tolist()
+        assert dbConnector._prepare_zone_map(None, dbTable, DATA_DF.iloc[:0]) == False
+        new_data = pd.DataFrame([["2023-04-01 00:00", "a", 1.0], ["2023-04-01 00:15", "a", 2.0]], columns = DATA_COLUMNS)
+        dbConnector.insert_data(dbTable, new_data)
+        dbConnector.insert_data(dbTable, pd.concat([DATA_DF, new_data], ignore_index = True))
+        assert 6 == len(dbConnector.select_data_unfiltered(dbTable.table_name))
+        zone_map = dbConnector.get_zone_map(dbTable.table_name)
+        assert [2, 2, 2] == zone_map["row_count"].tolist()
+        dbConnector.rebuild_zone_map(dbTable)
+        assert zone_map.values.tolist() == dbConnector.get_zone_map(dbTable.table_name).values.tolist()
+        data = dbConnector.select_data_range(dbTable.table_name, "2023-03-02 16:15", "2023-04-01 00:15", order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+        assert [["2023-03-02 16:15", "a", 5.0], ["2023-03-02 16:15", "b", 8.0], ["2023-04-01 00:00", "a", 1.0]] == data.values.tolist()
+        data = dbConnector.select_data_range(dbTable.table_name, "2023-04-01 00:00", tracker_names = ["b"])
+        assert 0 == len(data) and all(DATA_COLUMNS == data.columns)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_zone_map_without_flag():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        zoneMapConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, zone_map = True)
+        zoneMapConnector.insert_data(dbTable, DATA_DF)
+        assert not dbConnector.zone_map and dbConnector.has_zone_map(dbTable)
+        # the connector without zone map keeps the existing entries in sync
+        new_data = pd.DataFrame([["2023-04-01 00:00", "a", 1.0]], columns = DATA_COLUMNS)
+        dbConnector.insert_data(dbTable, new_data)
+        assert "2023-04-01 00:00" == dbConnector.get_zone_map(dbTable.table_name)["max_timestamp"].max()
+        zoneMapConnector.insert_data(dbTable, pd.concat([new_data, pd.DataFrame([["2023-04-01 00:15", "a", 2.0]], columns = DATA_COLUMNS)], ignore_index = True))
+        assert 1 == dbConnector.delete_data_range(dbTable, "2023-04-01 00:15")
+        zone_map = dbConnector.get_zone_map(dbTable.table_name)
+        assert [2, 1, 2] == zone_map["row_count"].tolist()
+        dbConnector.rebuild_zone_map(dbTable)
+        assert zone_map.values.tolist() == dbConnector.get_zone_map(dbTable.table_name).values.tolist()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_sharded_zone_map():
+    dbConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, DBConnector.SHARD_YEAR, zone_map = True, write_batch_size = 1)
+    try:
+        dbTable = DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST)
+        dbConnector.create_table(dbTable)
+        dbConnector.insert_data(dbTable, SHARD_DATA_DF)
+        assert SHARD_DATA == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+        corrected = SHARD_DATA_DF.copy()
+        corrected.loc[1, "Production"] = 17.0
+        assert {"inserted": 0, "updated": 1, "unchanged": 3} == dbConnector.upsert_data(dbTable, corrected)
+        assert 1 == dbConnector.delete_data_range(dbTable, "2025-01-01 00:00")
+        zone_map = dbConnector.get_zone_map(dbTable.table_name)
+        assert [["a", "2023-12", 1], ["a", "2024-01", 1], ["b", "2024-01", 1]] == zone_map[["tracker_name", "month", "row_count"]].values.tolist()
+        dbConnector.rebuild_zone_map(dbTable)
+        assert zone_map.values.tolist() == dbConnector.get_zone_map(dbTable.table_name).values.tolist()
+    finally:
+        for file_path in dbConnector.get_shard_fullpaths() + [dbConnector.db_fullpath]:
+            tu.remove_file(file_path)
+
+def test_upsert_data():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.zone_map = True
+        assert {"inserted": 4, "updated": 0, "unchanged": 0} == dbConnector.upsert_data(dbTable, DATA_DF)
+        assert {"inserted": 0, "updated": 0, "unchanged": 4} == dbConnector.upsert_data(dbTable, DATA_DF)
+        corrected = pd.DataFrame([["2023-03-02 16:00", "a", 6.0], ["2023-03-02 16:15", "a", None], ["2023-04-01 00:00", "a", 1.0]], columns = DATA_COLUMNS)
+        assert {"inserted": 1, "updated": 1, "unchanged": 1} == dbConnector.upsert_data(dbTable, corrected)
+        data = dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+        assert [["2023-03-02 16:00", "a", 6.0], ["2023-03-02 16:00", "b", 7.0], ["2023-03-02 16:15", "a", -1.0], ["2023-03-02 16:15", "b", 8.0], ["2023-04-01 00:00", "a", 1.0]] == data.fillna(-1.0).values.tolist()
+        zone_map = dbConnector.get_zone_map(dbTable.table_name)
+        dbConnector.rebuild_zone_map(dbTable)
+        assert zone_map.values.tolist() == dbConnector.get_zone_map(dbTable.table_name).values.tolist()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_upsert_tables():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.zone_map = True
+        stateTable = DBTable("test_state", pd.core.indexes.base.Index(["table_name", "max_timestamp"]), ["TEXT", "DATE"], ["table_name"])
+        dbConnector.create_table(stateTable)
+        state = pd.DataFrame([[TABLE_NAME, "2023-03-02 16:15"]], columns = stateTable.data_columns)
+        assert [{"inserted": 4, "updated": 0, "unchanged": 0}, {"inserted": 1, "updated": 0, "unchanged": 0}] == dbConnector.upsert_tables([dbTable, stateTable], [DATA_DF, state])
+        assert [{"inserted": 0, "updated": 0, "unchanged": 4}, {"inserted": 0, "updated": 0, "unchanged": 1}] == dbConnector.upsert_tables([dbTable, stateTable], [DATA_DF, state])
+        # a failing table rolls back the rows of all tables
+        corrected = pd.DataFrame([["2023-03-02 16:00", "a", 6.0]], columns = DATA_COLUMNS)
+        with pytest.raises(Exception):
+            dbConnector.upsert_tables([dbTable, DBTable("test_missing", stateTable.data_columns, ["TEXT", "DATE"], ["table_name"])], [corrected, state])
+        assert DATA == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+        with pytest.raises(Exception):
+            dbConnector.upsert_tables([dbTable], [])
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_sharded_upsert_data():
+    dbConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, DBConnector.SHARD_YEAR)
+    try:
+        dbTable = DBTable(TABLE_NAME, DATA_COLUMNS, DATA_TYPES, PRIMARY_KEY_LIST)
+        dbConnector.create_table(dbTable)
+        dbConnector.insert_data(dbTable, SHARD_DATA_DF)
+        corrected = SHARD_DATA_DF.copy()
+        corrected.loc[1, "Production"] = 17.0
+        assert {"inserted": 0, "updated": 1, "unchanged": 3} == dbConnector.upsert_data(dbTable, corrected)
+        assert [6.0, 17.0, 5.0, 8.0] == dbConnector.select_data_unfiltered(dbTable.table_name, ["Production"], {"timestamp": "ASC", "tracker_name": "ASC"})["Production"].tolist()
+        with pytest.raises(Exception):
+            dbConnector.upsert_data(DBTable("test_no_key", DATA_COLUMNS, DATA_TYPES), SHARD_DATA_DF)
+    finally:
+        for file_path in dbConnector.get_shard_fullpaths() + [dbConnector.db_fullpath]:
+            tu.remove_file(file_path)
+
+def test_query_cache():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        cachedConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, cache_size = 1 << 20)
+        assert 0 == len(cachedConnector.select_data_unfiltered(dbTable.table_name))
+        dbConnector.insert_data(dbTable, DATA_DF)
+        data = cachedConnector.select_data_unfiltered(dbTable.table_name)
+        assert all(DATA_DF == data)
+        assert all(DATA_DF == cachedConnector.select_data_unfiltered(dbTable.table_name))
+        statistics = cachedConnector.get_cache_statistics()
+        assert 1 == statistics["hits"] and 2 == statistics["misses"] and 1 == statistics["invalidations"]
+        dbConnector.insert_data(dbTable, pd.DataFrame([["2023-04-01 00:00", "a", 1.0]], columns = DATA_COLUMNS))
+        assert 5 == len(cachedConnector.select_data_unfiltered(dbTable.table_name))
+        assert 2 == cachedConnector.get_cache_statistics()["invalidations"]
+        assert {} == dbConnector.get_cache_statistics()
+        cachedConnector.close()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_read_only_connector():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.journal_mode = "WAL"
+        dbConnector.insert_data(dbTable, DATA_DF)
+        readConnector = DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, read_only = True, pool_size = 2)
+        with pytest.raises(Exception):
+            readConnector.insert_data(dbTable, DATA_DF)
+        with ThreadPoolExecutor(8) as executor:
+            futures = [executor.submit(readConnector.select_data_unfiltered, dbTable.table_name) for i in range(32)]
+            dbConnector.insert_data(dbTable, pd.DataFrame([["2023-04-01 00:00", "a", 1.0]], columns = DATA_COLUMNS))
+            assert all([len(future.result()) in [4, 5] for future in futures])
+        assert 5 == len(readConnector.select_data_unfiltered(dbTable.table_name))
+        assert readConnector.connection_pool.connection_count <= 2
+        readConnector.close()
+    finally:
+        for suffix in ["", "-wal", "-shm"]:
+            tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME + suffix))
+
+def test_select_data_chunks():
+    dbConnector, dbTable = __test_insert_into_table()
+    try:
+        chunks = list(dbConnector.select_data_chunks(dbTable.table_name, 3, ["Production"]))
+        assert [[6.0, 7.0, 5.0], [8.0]] == [chunk["Production"].tolist() for chunk in chunks]
+        chunks = list(dbConnector.select_data_chunks(dbTable.table_name, 1, start_timestamp = "2023-03-02 16:15", tracker_names = ["b"]))
+        assert 1 == len(chunks) and [["2023-03-02 16:15", "b", 8.0]] == chunks[0].values.tolist()
+        assert "2023-03-02 16:15" == dbConnector.select_max_timestamp(dbTable.table_name)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_delete_data_range():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.zone_map = True
+        dbConnector.insert_data(dbTable, pd.concat([DATA_DF, pd.DataFrame([["2023-04-01 00:00", "a", 1.0]], columns = DATA_COLUMNS)], ignore_index = True))
+        assert 2 == dbConnector.delete_data_range(dbTable, "2023-03-02 16:15", tracker_names = ["a"])
+        assert [["2023-03-02 16:00", "a", 6.0], ["2023-03-02 16:00", "b", 7.0], ["2023-03-02 16:15", "b", 8.0]] == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+        assert [["a", "2023-03", 1], ["b", "2023-03", 2]] == dbConnector.get_zone_map(dbTable.table_name)[["tracker_name", "month", "row_count"]].values.tolist()
+        assert 0 == dbConnector.delete_data_range(dbTable, "2024-01-01 00:00")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_replace_data_range():
+    dbConnector, dbTable = __test_create_table()
+    shardConnector = DBConnector(tu.get_test_results_path(), "test_sharded.db", DBConnector.SHARD_YEAR, zone_map = True)
+    try:
+        dbConnector.zone_map = True
+        dbConnector.insert_data(dbTable, DATA_DF)
+        replacement = pd.DataFrame([["2023-03-02 16:15", "a", 1.0], ["2023-04-01 00:00", "a", 2.0]], columns = DATA_COLUMNS)
+        assert 2 == dbConnector.replace_data_range(dbTable, replacement, "2023-03-02 16:15")
+        assert [6.0, 7.0, 1.0, 2.0] == dbConnector.select_data_unfiltered(dbTable.table_name, ["Production"], {"timestamp": "ASC", "tracker_name": "ASC"})["Production"].tolist()
+        assert [2, 1, 1] == dbConnector.get_zone_map(dbTable.table_name)["row_count"].tolist()
+        shardConnector.create_table(dbTable)
+        shardConnector.insert_data(dbTable, SHARD_DATA_DF)
+        assert 1 == shardConnector.replace_data_range(dbTable, SHARD_DATA_DF.iloc[3:], "2024-01-01 00:30")
+        assert 4 == shardConnector.replace_data_range(dbTable, SHARD_DATA_DF.iloc[:2])
+        assert SHARD_DATA[:2] == shardConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC"}).values.tolist()
+        assert [["a", "2023-12", 1], ["a", "2024-01", 1]] == shardConnector.get_zone_map(dbTable.table_name)[["tracker_name", "month", "row_count"]].values.tolist()
+    finally:
+        for file_path in shardConnector.get_shard_fullpaths() + [shardConnector.db_fullpath, dbConnector.db_fullpath]:
+            tu.remove_file(file_path)
+
+def test_write_retry():
+    dbConnector, dbTable = __test_create_table()
+    blocker = sqlite3.connect(dbConnector.db_fullpath, check_same_thread = False)
+    try:
+        dbConnector.busy_timeout = 0.01
+        blocker.execute("""BEGIN IMMEDIATE;""")
+        dbConnector.write_retries = 0
+        with pytest.raises(sqlite3.OperationalError):
+            dbConnector.insert_data(dbTable, DATA_DF)
+        dbConnector.write_retries = 20
+        timer = threading.Timer(0.2, blocker.rollback)
+        timer.start()
+        dbConnector.insert_data(dbTable, DATA_DF)
+        timer.join()
+        assert 4 == len(dbConnector.select_data_unfiltered(dbTable.table_name))
+    finally:
+        blocker.close()
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+
+def test_write_batches():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.zone_map = True
+        dbConnector.write_batch_size = 3
+        dbConnector.lock_fullpath = dbConnector.db_fullpath + DBConnector.LOCK_EXTENSION
+        dbConnector.insert_data(dbTable, DATA_DF)
+        assert DATA == dbConnector.select_data_unfiltered(dbTable.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"}).values.tolist()
+        assert [2, 2] == dbConnector.get_zone_map(dbTable.table_name)["row_count"].tolist()
+        assert 1500 == dbConnector._adapt_write_batch_size(3000, dbConnector.max_lock_seconds * 2)
+        assert DBConnector.MIN_WRITE_BATCH_SIZE == dbConnector._adapt_write_batch_size(DBConnector.MIN_WRITE_BATCH_SIZE, dbConnector.max_lock_seconds * 2)
+        assert 3 == dbConnector._adapt_write_batch_size(2, 0.0)
+        with pytest.raises(Exception):
+            DBConnector(tu.get_test_results_path(), CREATE_DB_NAME, write_batch_size = 0)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME + DBConnector.LOCK_EXTENSION))
+
+def test_run_write():
+    dbConnector, dbTable = __test_create_table()
+    try:
+        dbConnector.lock_fullpath = dbConnector.db_fullpath + DBConnector.LOCK_EXTENSION
+        assert 3 == dbConnector.run_write(lambda a, b = 0: a + b, 1, b = 2)
+        assert not dbConnector.is_sharded_table(dbTable)
+        assert dbConnector.get_create_statement(dbTable).startswith("CREATE TABLE %s("%(TABLE_NAME))
+        dbConnector.read_only = True
+        with pytest.raises(Exception):
+            dbConnector.run_write(lambda: None)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME))
+        tu.remove_file(os.path.join(tu.get_test_results_path(), CREATE_DB_NAME + DBConnector.LOCK_EXTENSION))
+
 def __test_insert_into_table():
     dbConnector, dbTable = __test_create_table()
     dbConnector.insert_data(dbTable, DATA_DF)
@@ -0,0 +1,96 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from db_maintenance import DBMaintenance
+
+DB_NAME = "test_db_maintenance.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+TIMESTAMPS = pd.date_range("2023-01-01 00:00", "2023-02-28 23:45", freq = "15min").strftime("%Y-%m-%d %H:%M")
+
+def test_run():
+    db_connector = __create_database()
+    try:
+        db_connector.delete_data_range(RAW_TABLE, "2023-02-01")
+        report = DBMaintenance(db_connector, vacuum_pages = 10).run(full_check = True)
+        database = report["databases"].iloc[0]
+        assert DB_NAME == database["database"]
+        assert "incremental" == database["auto_vacuum"]
+        assert DBMaintenance.INTEGRITY_OK == database["integrity"]
+        assert database["vacuumed_pages"] > 0 and 0 == database["freelist_count"]
+        assert 1 == database["analyzed_tables"] and database["complete"]
+        objects = report["objects"].set_index("name")
+        assert len(TIMESTAMPS[TIMESTAMPS < "2023-02-01"]) * 2 == objects.loc[RAW_TABLE.table_name, "row_count"]
+        assert objects.loc["idx_tracker_raw", "row_count"] == objects.loc[RAW_TABLE.table_name, "row_count"]
+        assert np.all(objects["page_count"] > 0)
+        assert np.all((objects["fill_ratio"] > 0) & (objects["fill_ratio"] <= 1))
+        assert np.all((objects["fragmentation"] >= 0) & (objects["fragmentation"] <= 1))
+        conn = sqlite3.connect(db_connector.db_fullpath)
+        try:
+            assert 0 != len(conn.execute("""SELECT * FROM sqlite_stat1 WHERE tbl = ?;""", (RAW_TABLE.table_name,)).fetchall())
+        finally:
+            conn.close()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_run_time_budget():
+    db_connector = __create_database()
+    try:
+        maintenance = DBMaintenance(db_connector, time_budget = 1e-9)
+        report = maintenance.run()
+        database = report["databases"].iloc[0]
+        assert 0 == database["analyzed_tables"] and 0 == database["vacuumed_pages"]
+        assert DBMaintenance.SKIPPED == database["integrity"] and not database["complete"]
+        assert np.all(np.isnan(report["objects"]["page_count"].astype(float)))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_convert_auto_vacuum():
+    db_fullpath = os.path.join(tu.get_test_results_path(), DB_NAME)
+    conn = sqlite3.connect(db_fullpath)
+    conn.execute("""CREATE TABLE t (a INTEGER);""")
+    conn.commit()
+    conn.close()
+    try:
+        db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+        assert "none" == DBMaintenance(db_connector).run()["databases"].iloc[0]["auto_vacuum"]
+        assert "incremental" == DBMaintenance(db_connector).run(convert_auto_vacuum = True)["databases"].iloc[0]["auto_vacuum"]
+    finally:
+        tu.remove_file(db_fullpath)
+
+def test_invalid_budget():
+    with pytest.raises(Exception):
+        DBMaintenance(DBConnector(tu.get_test_results_path(), DB_NAME), time_budget = 0)
+
+def __create_database() -> DBConnector:
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    db_connector.create_table(RAW_TABLE)
+    db_connector.create_index("idx_tracker_raw", RAW_TABLE.table_name, RAW_TABLE.primary_key_list)
+    data = pd.DataFrame({"timestamp": np.repeat(TIMESTAMPS, 2), "tracker_name": np.tile(["a", "b"], len(TIMESTAMPS)), "Production": np.arange(len(TIMESTAMPS) * 2, dtype = np.float64)})
+    db_connector.insert_data(RAW_TABLE, data)
+    return db_connector
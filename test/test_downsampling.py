@@ -0,0 +1,72 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from downsampling import Downsampler, get_lttb_indices, get_min_max_indices
+
+DB_NAME = "test_downsampling.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+TIMESTAMPS = pd.date_range("2023-06-01", periods = 96 * 4, freq = "15min").strftime("%Y-%m-%d %H:%M")
+
+def test_get_lttb_indices():
+    x = np.arange(10, dtype = np.float64)
+    y = np.array([0, 1, 0, 0, 9, 0, 0, -5, 0, 0], dtype = np.float64)
+    indices = get_lttb_indices(x, y, 4)
+    assert [0, 4, 7, 9] == indices.tolist()
+    assert [0, 9] == get_lttb_indices(x, y, 2).tolist()
+    assert 10 == len(get_lttb_indices(x, y, 20))
+
+def test_get_min_max_indices():
+    x = np.arange(8, dtype = np.float64)
+    y = np.array([1, 5, 2, 0, 3, 3, 9, 1], dtype = np.float64)
+    assert [1, 3, 6, 7] == get_min_max_indices(x, y, 4).tolist()
+    assert 8 == len(get_min_max_indices(x, y, 8))
+
+def test_select_downsampled():
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        db_connector.create_table(RAW_TABLE)
+        values = np.sin(np.arange(len(TIMESTAMPS)) / 96 * 2 * np.pi)
+        data = pd.concat([pd.DataFrame({"timestamp": TIMESTAMPS, "tracker_name": name, "Production": values * factor}) for name, factor in [("A", 1.0), ("B", 2.0)]], ignore_index = True)
+        db_connector.insert_data(RAW_TABLE, data)
+        downsampler = Downsampler(db_connector)
+        result = downsampler.select_downsampled(RAW_TABLE.table_name, "Production", 50, tracker_names = ["A", "B"])
+        assert ["timestamp", "tracker_name", "Production"] == result.columns.tolist()
+        assert [50, 50] == result.groupby("tracker_name").size().tolist()
+        assert np.isclose(2.0, result["Production"].max(), atol = 0.05) and np.isclose(-2.0, result["Production"].min(), atol = 0.05)
+        result = downsampler.select_downsampled(RAW_TABLE.table_name, "Production", 20, "2023-06-02 00:00", "2023-06-03 00:00", ["A"], method = "minmax")
+        assert len(result) <= 20 and result["timestamp"].is_monotonic_increasing
+        assert "2023-06-02 00:00" <= result["timestamp"].min() and result["timestamp"].max() < "2023-06-03 00:00"
+        assert np.isclose(1.0, result["Production"].max()) and np.isclose(-1.0, result["Production"].min())
+        with pytest.raises(Exception):
+            downsampler.select_downsampled(RAW_TABLE.table_name, "Production", 20, method = "mean")
+        rollup_table = DBTable(db_connector.get_rollup_table_name(RAW_TABLE.table_name), pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production", "sample_count"]), ["DATE", "TEXT", "REAL", "INTEGER"], ["timestamp", "tracker_name"])
+        db_connector.create_table(rollup_table)
+        db_connector.insert_data(rollup_table, pd.DataFrame([["2023-05-31 23:00", "A", 7.0, 4]], columns = rollup_table.data_columns))
+        result = downsampler.select_downsampled(RAW_TABLE.table_name, "Production", 1000, tracker_names = ["A"], use_rollup = True)
+        assert 1 + len(TIMESTAMPS) == len(result) and 7.0 == result["Production"][0]
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
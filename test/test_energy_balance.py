@@ -0,0 +1,70 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from energy_balance import EnergyBalance
+
+DB_NAME = "test_energy_balance.db"
+MAIN_TABLE = DBTable("main_raw", pd.core.indexes.base.Index(["timestamp", "Production", "Consumption"]), ["DATE", "REAL", "REAL"], ["timestamp"])
+MAIN_DATA = pd.DataFrame([["2023-03-31 23:45", 0.0, 2.0], ["2023-04-01 12:00", 5.0, 2.0], ["2023-04-01 12:15", 1.0, 3.0], ["2023-04-02 12:00", 4.0, 4.0]], columns = MAIN_TABLE.data_columns)
+
+def test_calculate():
+    """
+    Test the energy balance of each interval and its aggregation.
+    """
+    balance = EnergyBalance(None, MAIN_TABLE)
+    result = balance.calculate(MAIN_DATA)
+    assert [0.0, 2.0, 1.0, 4.0] == result["self_consumption"].tolist()
+    assert [0.0, 3.0, 0.0, 0.0] == result["grid_export"].tolist()
+    assert [2.0, 0.0, 2.0, 0.0] == result["grid_import"].tolist()
+    assert np.isnan(result["self_consumption_ratio"][0]) and np.isclose(0.4, result["self_consumption_ratio"][1])
+    assert [0.0, 1.0] == result["autarky"].tolist()[:2]
+    daily = balance.aggregate(result, EnergyBalance.DAY_KEY_LENGTH)
+    assert ["2023-03-31", "2023-04-01", "2023-04-02"] == daily["timestamp"].tolist()
+    assert np.isclose(3.0 / 6.0, daily["self_consumption_ratio"][1]) and np.isclose(3.0 / 5.0, daily["autarky"][1])
+    with pytest.raises(Exception):
+        EnergyBalance(None, MAIN_TABLE, consumption_column = "Load")
+
+def test_run():
+    """
+    Test the incremental calculation of the intervals and the aggregates.
+    """
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        db_connector.create_table(MAIN_TABLE)
+        db_connector.insert_data(MAIN_TABLE, MAIN_DATA.iloc[:2])
+        balance = EnergyBalance(db_connector, MAIN_TABLE, chunk_size = 1)
+        assert 2 == balance.run()
+        db_connector.insert_data(MAIN_TABLE, MAIN_DATA.iloc[2:])
+        assert 3 == balance.run()
+        assert 4 == len(db_connector.select_data_unfiltered(EnergyBalance.INTERVAL_TABLE_NAME))
+        daily = db_connector.select_data_unfiltered(EnergyBalance.DAILY_TABLE_NAME, order_by = {"timestamp": "ASC"})
+        assert [[0.0, 2.0], [3.0, 2.0], [4.0, 0.0]] == daily[["self_consumption", "grid_import"]].values.tolist()
+        monthly = db_connector.select_data_unfiltered(EnergyBalance.MONTHLY_TABLE_NAME, order_by = {"timestamp": "ASC"})
+        assert [["2023-03", 0.0, 2.0], ["2023-04", 10.0, 9.0]] == monthly[["timestamp", "Production", "Consumption"]].values.tolist()
+        assert np.isclose(7.0 / 9.0, monthly["autarky"][1])
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
@@ -0,0 +1,73 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from expected_yield import ExpectedYieldModel
+
+DB_NAME = "test_expected_yield.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+META_COLUMNS = ["tracker_name", "direction", "inclination_angle", "latitude", "longitude", "solar_panel_width", "solar_panel_height", "solar_panel_energy_conversion_efficiency", "solar_panel_number"]
+META_TABLE = DBTable("tracker_meta", pd.core.indexes.base.Index(META_COLUMNS), ["TEXT"] + ["REAL"] * 8, ["tracker_name"])
+META_DATA = pd.DataFrame([["A", 180, 53, 52.37352, 7.1011, 1755, 1038, 19.9, 10]], columns = META_COLUMNS)
+RAW_DATA = pd.DataFrame([["2023-06-21 02:00", "A", 0.0], ["2023-06-21 13:30", "A", 0.5], ["2023-06-21 13:45", "A", 0.6], ["2023-06-22 13:30", "A", 0.4]], columns = RAW_TABLE.data_columns)
+
+def test_calculate():
+    """
+    Test the expected production against the clear-sky bounds.
+    """
+    model = ExpectedYieldModel(None, RAW_TABLE, META_TABLE)
+    result = model.calculate(RAW_DATA, META_DATA)
+    assert ["timestamp", "tracker_name", "Production", "expected_Production", "performance_ratio"] == result.columns.tolist()
+    assert 0 == result["expected_Production"][0] and np.isnan(result["performance_ratio"][0])
+    # the irradiance of a south facing field at noon in june is close to the clear-sky maximum
+    peak = 1000 * 1.755 * 1.038 * 10 * 0.199 * 0.25 / 1000
+    assert 0.8 * peak < result["expected_Production"][1] < 1.1 * peak
+    assert np.isclose(0.5 / result["expected_Production"][1], result["performance_ratio"][1])
+    daily = model.aggregate_daily(result)
+    assert [["2023-06-21", "A"], ["2023-06-22", "A"]] == daily[["timestamp", "tracker_name"]].values.tolist()
+    assert np.isclose(1.1 / result["expected_Production"][:3].sum(), daily["performance_ratio"][0])
+
+def test_run():
+    """
+    Test the incremental calculation of the interval and the daily performance tables.
+    """
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        for table, data in [(RAW_TABLE, RAW_DATA.iloc[:3]), (META_TABLE, META_DATA)]:
+            db_connector.create_table(table)
+            db_connector.insert_data(table, data)
+        model = ExpectedYieldModel(db_connector, RAW_TABLE, META_TABLE, chunk_size = 2)
+        assert 3 == model.run()
+        daily = db_connector.select_data_unfiltered(ExpectedYieldModel.DAILY_TABLE_NAME)
+        assert 1 == len(daily) and np.isclose(1.1, daily["Production"][0])
+        db_connector.insert_data(RAW_TABLE, RAW_DATA.iloc[3:])
+        assert 2 == model.run()
+        assert 4 == len(db_connector.select_data_unfiltered(ExpectedYieldModel.RESULT_TABLE_NAME))
+        daily = db_connector.select_data_unfiltered(ExpectedYieldModel.DAILY_TABLE_NAME, order_by = {"timestamp": "ASC"})
+        assert ["2023-06-21", "2023-06-22"] == daily["timestamp"].tolist()
+        assert np.isclose(1.1, daily["Production"][0]) and np.isclose(0.4, daily["Production"][1])
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
@@ -0,0 +1,75 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from kpi_engine import KPIEngine
+from sun_position import get_sun_factor
+
+DB_NAME = "test_kpi.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+META_COLUMNS = ["tracker_name", "direction", "inclination_angle", "latitude", "longitude", "solar_panel_width", "solar_panel_height", "solar_panel_energy_conversion_efficiency", "solar_panel_number"]
+META_TABLE = DBTable("tracker_meta", pd.core.indexes.base.Index(META_COLUMNS), ["TEXT"] + ["REAL"] * 8, ["tracker_name"])
+META_DATA = pd.DataFrame([["A", 180, 30, 52.37352, 7.1011, 1000, 2000, 20, 10], ["B", 90, 53, 52.37352, 7.1011, 1755, 1038, 19.9, 5]], columns = META_COLUMNS)
+RAW_DATA = pd.DataFrame([["2023-06-21 12:00", "A", 10.0], ["2023-06-21 12:00", "B", 5.0], ["2023-06-21 12:15", "A", 12.0], ["2023-06-21 12:15", "C", 1.0]], columns = RAW_TABLE.data_columns)
+
+def test_calculate():
+    """
+    Test the KPIs against the formulas of Metadata$calculateResult.
+    """
+    engine = KPIEngine(None, RAW_TABLE, META_TABLE)
+    result = engine.calculate(RAW_DATA, META_DATA)
+    assert ["timestamp", "tracker_name", "Production", "Production_per_panel", "Production_per_square_meter", "Production_per_panel_sun_factor", "Production_per_square_meter_sun_factor", "sun_factor"] == result.columns.tolist()
+    assert [["2023-06-21 12:00", "A"], ["2023-06-21 12:00", "B"], ["2023-06-21 12:15", "A"]] == result[["timestamp", "tracker_name"]].values.tolist()
+    sun_factor = get_sun_factor(["2023-06-21 12:00"], 52.37352, 7.1011, 30, 180)[0]
+    assert np.isclose(1.0, result["Production_per_panel"][0])
+    assert np.isclose(10.0 / (10 * 20), result["Production_per_square_meter"][0])
+    assert np.isclose(sun_factor, result["sun_factor"][0])
+    assert np.isclose(1.0 * sun_factor, result["Production_per_panel_sun_factor"][0])
+    assert np.isclose(10.0 / (10 * 20) * sun_factor, result["Production_per_square_meter_sun_factor"][0])
+    assert np.isclose(5.0 / (5 * 1.755 * 1.038 * 5), result["Production_per_square_meter"][1])
+
+def test_run():
+    """
+    Test the incremental calculation of the KPI table.
+    """
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        for table, data in [(RAW_TABLE, RAW_DATA), (META_TABLE, META_DATA)]:
+            db_connector.create_table(table)
+            db_connector.insert_data(table, data)
+        engine = KPIEngine(db_connector, RAW_TABLE, META_TABLE, chunk_size = 1)
+        assert 4 == engine.run()
+        assert 3 == len(db_connector.select_data_unfiltered(KPIEngine.RESULT_TABLE_NAME))
+        db_connector.insert_data(RAW_TABLE, pd.DataFrame([["2023-06-21 12:30", "A", 8.0]], columns = RAW_TABLE.data_columns))
+        assert 3 == engine.run()
+        result = db_connector.select_data_unfiltered(KPIEngine.RESULT_TABLE_NAME, order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+        assert 4 == len(result)
+        assert np.isclose(0.8, result["Production_per_panel"].values[-1])
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
+
+if __name__ == "__main__":
+    test_calculate()
@@ -0,0 +1,87 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from load_profile import LoadProfile, DAY, WEEK
+
+DB_NAME = "test_load_profile.db"
+MAIN_TABLE = DBTable("main_raw", pd.core.indexes.base.Index(["timestamp", "Production", "Consumption"]), ["DATE", "REAL", "REAL"], ["timestamp"])
+
+def test_build_sketches():
+    load_profile = LoadProfile(None, MAIN_TABLE, interval_minutes = 60)
+    data = __create_data("2023-01-02 00:00", 24 * 21)
+    sketches = load_profile.build_sketches(data)
+    # the sketches of partial data are merged into the sketch of all data
+    assert sketches.equals(load_profile.merge_sketches([load_profile.build_sketches(data.iloc[:100]), load_profile.build_sketches(data.iloc[100:])]))
+    profiles = load_profile.estimate(sketches)
+    day = profiles[(profiles["profile"] == DAY) & (profiles["season"] == "winter") & (profiles["quantity"] == "Consumption")]
+    assert list(range(24)) == day["slot"].to_list()
+    assert [21] * 24 == day["count"].to_list()
+    # the consumption of the slots cycles through the days 1, 2, ... 21
+    assert np.allclose([3.0, 11.0, 19.0], day[["q10", "q50", "q90"]].values[0], rtol = 0.01)
+    week = profiles[(profiles["profile"] == WEEK) & (profiles["season"] == "all") & (profiles["quantity"] == "Production")]
+    assert 24 * 7 == len(week)
+    assert np.allclose([0.0] * 8 + [5.0] * 8 + [0.0] * 8, week["q50"].values[:24], rtol = 0.01)
+    with pytest.raises(Exception):
+        LoadProfile(None, MAIN_TABLE, ["Import"])
+    with pytest.raises(Exception):
+        LoadProfile(None, MAIN_TABLE, quantiles = [1.5])
+
+def test_run():
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        db_connector.create_table(MAIN_TABLE)
+        data = __create_data("2023-05-29 00:00", 24 * 4 * 14)
+        db_connector.insert_data(MAIN_TABLE, data.iloc[:1000])
+        load_profile = LoadProfile(db_connector, MAIN_TABLE, chunk_size = 300)
+        assert 1000 == load_profile.run()
+        assert 0 == load_profile.run()
+        db_connector.insert_data(MAIN_TABLE, data.iloc[1000:])
+        assert len(data) - 1000 == load_profile.run()
+        # the rows at or before the watermark are never folded in
+        db_connector.insert_data(MAIN_TABLE, __create_data("2023-05-28 00:00", 4))
+        assert 0 == load_profile.run()
+        # the incremental sketches equal the sketches of all data
+        expected = load_profile.build_sketches(data)
+        stored = load_profile.select_sketches().sort_values(list(expected.columns[:-1])).reset_index(drop = True)
+        assert expected[["bucket", "count"]].values.tolist() == stored[["bucket", "count"]].values.tolist()
+        summer = load_profile.get_profile(DAY, "summer", [0.5])
+        assert ["profile", "season", "slot", "quantity", "count", "q50"] == summer.columns.to_list()
+        # the 3 days of May are spring, the 11 days of June are summer
+        assert [11] * 96 * 2 == summer["count"].to_list()
+        assert 3 * 96 * 2 == len(load_profile.get_profile(WEEK, "spring"))
+        assert 0 == len(load_profile.get_profile(DAY, "winter"))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def __create_data(start_timestamp: str, periods: int) -> pd.core.frame.DataFrame:
+    timestamps = pd.date_range(start_timestamp, periods = periods, freq = "h" if periods < 1000 else "15min")
+    return pd.DataFrame({
+        "timestamp": timestamps.strftime("%Y-%m-%d %H:%M"),
+        "Production": np.where((timestamps.hour >= 8) & (timestamps.hour < 16), 5.0, 0.0),
+        "Consumption": (timestamps.dayofyear - timestamps[0].dayofyear + 1).astype(float)
+    })
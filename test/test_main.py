@@ -22,12 +22,14 @@ import pytest
 import os
 import pandas as pd
 import sqlite3
+import shutil
 
 from main import Main
 
 CONFIG_FILENAME_VALID = "config_valid.json"
 DB_NAME = "pvdb.db"
 TABLE_NAMES = ["main_raw", "tracker_raw", "tracker_meta"]
+INDEX_NAMES = {"main_raw": ["idx_main_raw_production"], "tracker_raw": ["idx_tracker_raw_production", "idx_tracker_raw_tracker"], "tracker_meta": ["idx_tracker_meta"]}
 DATA_DIR = "data"
 META_DATA = ('A', 59.0, 53.0, 52.37352, 7.1011, 1755.0, 1038.0, 19.9, 10.0)
 MAIN_DATA = [("2023-03-02 16:00", 6, 7), ("2023-03-02 16:15", 6, 7), ("2023-03-02 16:30", 6, 7), ("2023-03-02 16:45", 6, 7), ("2023-03-02 17:00", 6, 7), ("2023-03-02 17:15", 6, 7), ("2023-04-02 16:00", 6, 7), ("2023-04-02 16:15", 6, 7), ("2023-04-02 16:30", 6, 7), ("2023-04-02 16:45", 6, 7), ("2023-04-02 17:00", 6, 7), ("2023-04-02 17:15", 6, 7)]
@@ -35,7 +37,7 @@ TRACKER_DATA = [("2023-03-02 16:00", "1.1", 1.0), ("2023-03-02 16:15", "1.1", 1.
 
 def test_insert_raw_data():
     main = __test_create_tables()
-    main.insert_raw_data()
+    assert {"inserted": 12 + 36, "updated": 0, "unchanged": 0} == main.insert_raw_data()
     file_path = os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME)
     assert os.path.exists(file_path) and os.path.isfile(file_path)
     conn = sqlite3.connect(file_path)
@@ -57,6 +59,226 @@ def test_insert_raw_data():
     conn.close()
     tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
 
+def test_calculate_kpis():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        assert 36 == main.calculate_kpis()
+        assert main.db_connector.test_table_exists("tracker_kpi")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_calculate_performance():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        assert 36 == main.calculate_performance()
+        assert main.db_connector.test_table_exists("tracker_performance")
+        assert main.db_connector.test_table_exists("tracker_performance_daily")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_detect_anomalies():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        # the raw tracker names of the test data are not part of the meta data
+        assert 0 == main.detect_anomalies()
+        assert main.db_connector.test_table_exists("tracker_kpi")
+        assert main.db_connector.test_table_exists("tracker_anomaly")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_calculate_energy_balance():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        assert 12 == main.calculate_energy_balance()
+        daily = main.db_connector.select_data_unfiltered("energy_balance_daily")
+        assert ["2023-03-02", "2023-04-02"] == daily["timestamp"].tolist()
+        assert 2 == len(main.db_connector.select_data_unfiltered("energy_balance_monthly"))
+        assert 1 == main.calculate_energy_balance()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_calculate_load_profiles():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        assert 12 == main.calculate_load_profiles()
+        assert 0 == main.calculate_load_profiles()
+        profiles = main.db_connector.select_data_unfiltered("load_profile")
+        day = profiles[(profiles["profile"] == "day") & (profiles["season"] == "all") & (profiles["quantity"] == "Consumption")]
+        assert [64, 65, 66, 67, 68, 69] == sorted(day["slot"].to_list())
+        assert all(abs(day["q50"] - 7) < 0.07)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_apply_retention():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        main.config.db_retention = {"main.raw": 30, "tracker.raw": 30}
+        assert 6 + 18 == main.apply_retention("2023-04-10 12:00")
+        assert 6 == len(main.db_connector.select_data_unfiltered("main_raw"))
+        assert 2 == len(main.db_connector.select_data_unfiltered("main_raw_hourly"))
+        assert 0 == main.apply_retention("2023-04-10 12:00")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+        shutil.rmtree(os.path.join(tu.get_test_data_path(), DATA_DIR, "archive"), ignore_errors = True)
+
+def test_insert_raw_data_after_retention():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        main.config.db_retention = {"main.raw": 30, "tracker.raw": 30}
+        assert 6 + 18 == main.apply_retention("2023-04-10 12:00")
+        # the input files are read again, the archived rows are not restored
+        main.insert_raw_data()
+        assert 6 == len(main.db_connector.select_data_unfiltered("main_raw"))
+        assert 18 == len(main.db_connector.select_data_unfiltered("tracker_raw"))
+        assert {"inserted": 0, "updated": 0, "unchanged": 6 + 18} == main.insert_raw_data(upsert = True)
+        main.config.db_staging = "memory"
+        main.insert_raw_data()
+        assert 6 == len(main.db_connector.select_data_unfiltered("main_raw"))
+        assert 0 == main.apply_retention("2023-04-10 12:00")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+        shutil.rmtree(os.path.join(tu.get_test_data_path(), DATA_DIR, "archive"), ignore_errors = True)
+
+def test_insert_raw_data_upsert():
+    main = __test_create_tables()
+    try:
+        assert {"inserted": 12 + 36, "updated": 0, "unchanged": 0} == main.insert_raw_data(upsert = True)
+        assert {"inserted": 0, "updated": 0, "unchanged": 12 + 36} == main.insert_raw_data(upsert = True)
+        assert {"inserted": 0, "updated": 0, "unchanged": 12 + 36} == main.insert_raw_data()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_verify_indexes():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        result = main.verify_indexes()
+        assert ["idx_main_raw_production", "idx_tracker_raw_tracker", "idx_tracker_raw_production"] == result["index_name"].to_list()
+        assert all(result["used"])
+        assert "COVERING INDEX idx_main_raw_production" in result["plan"].iloc[0]
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_maintain_database():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        report = main.maintain_database(full_check = True)
+        assert ["ok"] == report["databases"]["integrity"].to_list()
+        assert set(TABLE_NAMES).issubset(set(report["objects"]["name"]))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_export_table():
+    main = __test_create_tables()
+    output_path = os.path.join(tu.get_test_data_path(), DATA_DIR, "tracker_raw_export")
+    try:
+        main.insert_raw_data()
+        schema = main.export_table("tracker.raw", output_path, start_timestamp = "2023-04-01", tracker_names = ["1.1"])
+        assert 6 == schema["row_count"]
+        assert os.path.exists(output_path + ".csv.gz") and os.path.exists(output_path + ".schema.json")
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+        tu.remove_file(output_path + ".csv.gz")
+        tu.remove_file(output_path + ".schema.json")
+
+def test_refresh_snapshots():
+    main = __test_create_tables()
+    try:
+        main.insert_raw_data()
+        assert 2 + 2 == main.refresh_snapshots()
+        assert 2 == main.refresh_snapshots()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+        shutil.rmtree(os.path.join(tu.get_test_data_path(), DATA_DIR, "snapshot"), ignore_errors = True)
+
+def test_insert_raw_data_resampled():
+    main = __test_create_tables()
+    try:
+        main.config.db_resample = {"interval.minutes": 30, "fill": "night"}
+        main.insert_raw_data()
+        assert [6.0] * 3 == main.db_connector.select_data_range("main_raw", "2023-03-02", "2023-03-03")["Production"].to_list()
+        assert 3 * 3 * 2 == len(main.db_connector.select_data_unfiltered("tracker_raw"))
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_insert_raw_data_resampled_late_file():
+    main = __test_create_tables()
+    late_fullpath = os.path.join(tu.get_test_data_path(), DATA_DIR, "2023-05.csv")
+    try:
+        main.config.db_resample = {"interval.minutes": 5}
+        main.insert_raw_data()
+        assert 12 == len(main.db_connector.select_data_unfiltered("main_raw"))
+        # the reading of a later file fills a slot, which was missing before
+        with open(late_fullpath, "w") as file:
+            file.write('"timestamp";"1.1";"1.2";"1.3";"Production";"Consumption"\n2023-03-02 16:05;1;2;3;9;7\n')
+        main.insert_raw_data()
+        assert [6.0, 9.0, 6.0] == main.db_connector.select_data_range("main_raw", "2023-03-02 16:00", "2023-03-02 16:20")["Production"].to_list()
+    finally:
+        tu.remove_file(late_fullpath)
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_get_resampler():
+    main = __test_create_tables()
+    try:
+        main.config.db_resample = {"fill": "night"}
+        main._get_meta_data = lambda: [pd.DataFrame([["a", 48.0, 10.0]], columns = ["tracker_name", "latitude", "longitude"]), pd.DataFrame([["b", "50.0", "12.0"], ["c", "52.0", "14.0"]], columns = ["tracker_name", "latitude", "longitude"]), pd.DataFrame([["a", 180.0]], columns = ["tracker_name", "direction"])]
+        resampler = main._get_resampler()
+        assert 50.0 == resampler.latitude
+        assert 12.0 == resampler.longitude
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_insert_raw_data_validated():
+    main = __test_create_tables()
+    try:
+        main.config.db_validation = {"sum.tolerance": 0.0}
+        main.insert_raw_data()
+        assert 12 == len(main.db_connector.select_data_unfiltered("main_raw"))
+        report = main.db_connector.select_data_unfiltered("raw_quality_report")
+        assert ["2023-01.csv", "2023-02.csv"] == sorted(report["file_name"].to_list())
+        assert [0, 0] == report["quarantined"].to_list()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_insert_raw_data_staged():
+    main = __test_create_tables()
+    try:
+        main.config.db_staging = "file"
+        assert {"inserted": 12 + 36, "updated": 0, "unchanged": 0} == main.insert_raw_data()
+        assert {"inserted": 0, "updated": 0, "unchanged": 12 + 36} == main.insert_raw_data()
+        assert MAIN_DATA == list(main.db_connector.select_data_unfiltered("main_raw").itertuples(index = False, name = None))
+        assert 36 == len(main.db_connector.select_data_unfiltered("tracker_raw"))
+        assert [DB_NAME] == [i for i in os.listdir(os.path.join(tu.get_test_data_path(), DATA_DIR)) if i.endswith(".db")]
+        with pytest.raises(Exception):
+            main.insert_raw_data(True)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+
+def test_insert_meta_file():
+    main = __test_create_tables()
+    meta_fullpath = os.path.join(tu.get_test_data_path(), DATA_DIR, "trackers.csv")
+    try:
+        with open(meta_fullpath, "w") as file:
+            file.write(";".join(main.config.tables["tracker.meta"].data_columns) + "\n")
+            file.write("\n".join(["B%i;59;53;52.37352;7.1011;1755;1038;19.9;10"%(i) for i in range(3)]) + "\n")
+        main.config.db_meta_files = {"tracker.meta": "trackers.csv"}
+        assert 3 == main.insert_meta_file("tracker.meta")
+        assert 3 == main.insert_meta_file("tracker.meta")
+        meta_data = main.db_connector.select_data_unfiltered("tracker_meta")
+        assert ["A", "B0", "B1", "B2"] == sorted(meta_data["tracker_name"].to_list())
+        assert [52.37352] * 4 == meta_data["latitude"].to_list()
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
+        tu.remove_file(meta_fullpath)
+
 def test_create_tables():
     __test_create_tables()
     tu.remove_file(os.path.join(tu.get_test_data_path(), DATA_DIR, DB_NAME))
@@ -82,10 +304,8 @@ def __test_create_tables():
         raise e
     try:
         for table_name in TABLE_NAMES:
-            table_list = cur.execute("""SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='%s' AND name='%s';"""%(table_name, "idx_" + table_name)).fetchall()
-            assert 1 == len(table_list)
-            assert 1 == len(table_list[0])
-            assert "idx_" + table_name == table_list[0][0]
+            index_list = cur.execute("""SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='%s' AND sql IS NOT NULL ORDER BY name;"""%(table_name)).fetchall()
+            assert INDEX_NAMES[table_name] == [i[0] for i in index_list]
     except Exception as e:
         conn.close()
         raise e
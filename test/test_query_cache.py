@@ -0,0 +1,75 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+
+import pandas as pd
+
+from query_cache import QueryCache
+
+DATA_DF = pd.DataFrame([[1.0, 2.0], [3.0, 4.0]], columns = ["a", "b"])
+DATA_SIZE = int(DATA_DF.memory_usage(index = True, deep = True).sum())
+
+def test_query_cache_lru():
+    """
+    Test the hits, misses and the eviction of the least recently used entry.
+    """
+    query_cache = QueryCache(2 * DATA_SIZE)
+    assert None == query_cache.get(("q", 1), (1,))
+    query_cache.put(("q", 1), (1,), DATA_DF)
+    query_cache.put(("q", 2), (1,), DATA_DF)
+    result = query_cache.get(("q", 1), (1,))
+    assert DATA_DF.equals(result)
+    result.loc[0, "a"] = 10.0
+    assert DATA_DF.equals(query_cache.get(("q", 1), (1,)))
+    query_cache.put(("q", 3), (1,), DATA_DF)
+    assert None == query_cache.get(("q", 2), (1,))
+    assert DATA_DF.equals(query_cache.get(("q", 3), (1,)))
+    statistics = query_cache.get_statistics()
+    assert 3 == statistics[QueryCache.HITS]
+    assert 2 == statistics[QueryCache.MISSES]
+    assert 1 == statistics[QueryCache.EVICTIONS]
+    assert 2 == statistics[QueryCache.ENTRIES]
+    assert 2 * DATA_SIZE == statistics[QueryCache.SIZE]
+
+def test_query_cache_version():
+    """
+    Test, that a changed version invalidates all entries.
+    """
+    query_cache = QueryCache(10 * DATA_SIZE)
+    query_cache.put(("q", 1), (1,), DATA_DF)
+    assert DATA_DF.equals(query_cache.get(("q", 1), (1,)))
+    assert None == query_cache.get(("q", 1), (2,))
+    statistics = query_cache.get_statistics()
+    assert 1 == statistics[QueryCache.INVALIDATIONS]
+    assert 0 == statistics[QueryCache.ENTRIES]
+    assert 0 == statistics[QueryCache.SIZE]
+
+def test_query_cache_too_large():
+    """
+    Test, that results exceeding the memory budget are not cached.
+    """
+    query_cache = QueryCache(DATA_SIZE - 1)
+    query_cache.put(("q", 1), (1,), DATA_DF)
+    assert None == query_cache.get(("q", 1), (1,))
+    assert 0 == query_cache.get_statistics()[QueryCache.ENTRIES]
+
+if __name__ == "__main__":
+    test_query_cache_lru()
@@ -23,7 +23,7 @@ import os
 
 import pandas as pd
 
-from read_pv_csv import search_csv_files
+from read_pv_csv import search_csv_files, read_meta_file
 
 DATA_DIR = "data"
 SEPARATOR = ";"
@@ -36,5 +36,27 @@ def test_search_csv_files():
     assert ["timestamp", "1.1", "1.2", "1.3", "Production", "Consumption"] == pv_data.columns.tolist()
     assert [["2023-03-02 16:00", 1, 2, 3, 6, 7], ["2023-03-02 16:15", 1, 2, 3, 6, 7], ["2023-03-02 16:30", 1, 2, 3, 6, 7], ["2023-03-02 16:45", 1, 2, 3, 6, 7], ["2023-03-02 17:00", 1, 2, 3, 6, 7], ["2023-03-02 17:15", 1, 2, 3, 6, 7], ["2023-04-02 16:00", 1, 2, 3, 6, 7], ["2023-04-02 16:15", 1, 2, 3, 6, 7], ["2023-04-02 16:30", 1, 2, 3, 6, 7], ["2023-04-02 16:45", 1, 2, 3, 6, 7], ["2023-04-02 17:00", 1, 2, 3, 6, 7], ["2023-04-02 17:15", 1, 2, 3, 6, 7]] == pv_data.values.tolist()
 
+def test_read_meta_file():
+    """
+    Test reading the meta data file in chunks.
+    """
+    csv_fullpath = os.path.join(tu.get_test_results_path(), "test_read_meta_file.csv")
+    jsonl_fullpath = os.path.join(tu.get_test_results_path(), "test_read_meta_file.jsonl")
+    try:
+        with open(csv_fullpath, "w") as file:
+            file.write("tracker_name;latitude;comment\n1.1;52.37352;a\n1.2;;b\n1.3;52.4;c\n")
+        with open(jsonl_fullpath, "w") as file:
+            file.write('{"tracker_name": "1.1", "latitude": 52.37352}\n{"tracker_name": "1.2"}\n{"tracker_name": "1.3", "latitude": 52.4}\n')
+        for fullpath in [csv_fullpath, jsonl_fullpath]:
+            chunks = list(read_meta_file(fullpath, ["tracker_name", "latitude"], SEPARATOR, 2))
+            assert 2 == len(chunks)
+            assert ["1.1", "1.3"] == pd.concat(chunks)["tracker_name"].tolist()
+            assert 52.4 == float(chunks[1]["latitude"].iloc[0])
+        with pytest.raises(Exception):
+            list(read_meta_file(csv_fullpath, ["tracker_name", "longitude"], SEPARATOR))
+    finally:
+        tu.remove_file(csv_fullpath)
+        tu.remove_file(jsonl_fullpath)
+
 if __name__ == "__main__":
     test_search_csv_files()
@@ -0,0 +1,79 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from resampling import Resampler, FILL_LINEAR, FILL_NIGHT
+
+DB_NAME = "test_resampling.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+# 5 minute readings, a shifted clock (16:44), a gap of two slots and a second tracker
+RAW_DATA = pd.DataFrame([["2023-03-02 16:00", "a", 1.0], ["2023-03-02 16:05", "a", 3.0], ["2023-03-02 16:44", "a", 5.0], ["2023-03-02 17:30", "a", 2.0], ["2023-03-02 16:15", "b", 4.0], ["2023-03-05 10:00", "a", 1.0]], columns = RAW_TABLE.data_columns)
+
+def test_resample():
+    result = Resampler().resample(RAW_DATA)
+    # the days without readings get no slots
+    assert ["2023-03-02 16:00", "2023-03-02 16:15", "2023-03-02 16:30", "2023-03-02 16:45", "2023-03-02 17:00", "2023-03-02 17:15", "2023-03-02 17:30", "2023-03-05 10:00"] == result["timestamp"].unique().tolist()
+    assert ["a", "b"] * 8 == result["tracker_name"].to_list()
+    tracker_a = result[result["tracker_name"] == "a"]["Production"].values
+    assert np.array_equal([2.0, np.nan, np.nan, 5.0, np.nan, np.nan, 2.0, 1.0], tracker_a, equal_nan = True)
+    main_data = Resampler(30).resample(RAW_DATA[["timestamp", "Production"]])
+    assert ["timestamp", "Production"] == main_data.columns.to_list()
+    assert np.array_equal([8.0 / 3.0, 5.0, np.nan, 2.0, 1.0], main_data["Production"].values, equal_nan = True)
+    assert 0 == len(Resampler().resample(RAW_DATA.iloc[0:0]))
+    with pytest.raises(Exception):
+        Resampler(7)
+    with pytest.raises(Exception):
+        Resampler(fill = "mean")
+    with pytest.raises(Exception):
+        Resampler(fill = FILL_NIGHT)
+
+def test_resample_fill():
+    result = Resampler(fill = FILL_LINEAR, max_gap = 2).resample(RAW_DATA)
+    tracker_a = result[result["tracker_name"] == "a"]["Production"].values
+    assert np.allclose([2.0, 3.0, 4.0, 5.0, 4.0, 3.0, 2.0, 1.0], tracker_a)
+    # the gap before the first reading of b stays NULL
+    assert np.isnan(result[result["tracker_name"] == "b"]["Production"].values[0])
+    assert np.isnan(Resampler(fill = FILL_LINEAR, max_gap = 1).resample(RAW_DATA)["Production"].values[8])
+    night = Resampler(fill = FILL_NIGHT, latitude = 52.37352, longitude = 7.1011).resample(RAW_DATA, "2023-03-02 17:30", "2023-03-02 19:00")
+    # the sun sets at about 18:10
+    assert np.array_equal([2.0, np.nan, np.nan, np.nan, np.nan, np.nan, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], night["Production"].values, equal_nan = True)
+
+def test_select_resampled():
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME)
+    try:
+        db_connector.create_table(RAW_TABLE)
+        db_connector.insert_data(RAW_TABLE, RAW_DATA.drop_duplicates(["timestamp", "tracker_name"]))
+        resampler = Resampler()
+        result = resampler.select_resampled(db_connector, RAW_TABLE.table_name, "2023-03-02 16:00", "2023-03-02 18:00", tracker_names = ["a"])
+        assert 8 == len(result)
+        assert [2.0, 5.0, 2.0] == result["Production"].dropna().to_list()
+        # the whole range of the table on the full grid
+        result = resampler.select_resampled(db_connector, RAW_TABLE.table_name)
+        assert ("2023-03-02 16:00", "2023-03-05 10:00") == (result["timestamp"].min(), result["timestamp"].max())
+        assert 2 * (4 * 66 + 1) == len(result)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
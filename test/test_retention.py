@@ -0,0 +1,74 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from retention import RetentionManager
+
+DB_NAME = "test_retention.db"
+ARCHIVE_DIR = "test_archive"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+MAIN_TABLE = DBTable("main_raw", pd.core.indexes.base.Index(["timestamp", "Production", "Consumption"]), ["DATE", "REAL", "REAL"], ["timestamp"])
+TIMESTAMPS = pd.date_range("2022-12-30 00:00", "2023-01-03 23:45", freq = "15min").strftime("%Y-%m-%d %H:%M")
+
+def test_rollup():
+    manager = RetentionManager(DBConnector(tu.get_test_results_path(), DB_NAME))
+    data = pd.DataFrame([["2023-01-01 10:00", "a", 1.0], ["2023-01-01 10:15", "a", 3.0], ["2023-01-01 10:00", "b", 5.0], ["2023-01-01 11:00", "a", 7.0]], columns = RAW_TABLE.data_columns)
+    rollup = manager.rollup(RAW_TABLE, data)
+    assert [["2023-01-01 10:00", "a", 2.0, 2], ["2023-01-01 10:00", "b", 5.0, 1], ["2023-01-01 11:00", "a", 7.0, 1]] == rollup.values.tolist()
+    assert ["timestamp", "Production", "Consumption", "sample_count"] == manager.get_rollup_table(MAIN_TABLE).data_columns.tolist()
+    assert "2023-01-02" == manager.get_cutoff(2, "2023-01-04 13:37")
+
+def test_apply():
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME, zone_map = True)
+    archive_path = os.path.join(tu.get_test_results_path(), ARCHIVE_DIR)
+    try:
+        data = pd.concat([pd.DataFrame({"timestamp": TIMESTAMPS, "tracker_name": name, "Production": np.arange(len(TIMESTAMPS), dtype = np.float64)}) for name in ["a", "b"]], ignore_index = True)
+        db_connector.create_table(RAW_TABLE)
+        db_connector.insert_data(RAW_TABLE, data)
+        manager = RetentionManager(db_connector, archive_path, chunk_size = 50, batch_days = 1)
+        assert 2 * 96 * 3 == manager.apply(RAW_TABLE, 2, "2023-01-04 12:00")
+        assert "2023-01-02 00:00" == db_connector.select_data_unfiltered(RAW_TABLE.table_name, order_by = {"timestamp": "ASC"})["timestamp"][0]
+        assert ["2022", "2023"] == manager.get_archive_years(RAW_TABLE.table_name)
+        rollup = db_connector.select_data_unfiltered("tracker_raw_hourly", order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+        assert 2 * 24 * 3 == len(rollup) and all(4 == rollup["sample_count"])
+        assert [["2022-12-30 00:00", "a", 1.5], ["2022-12-30 00:00", "b", 1.5]] == rollup[["timestamp", "tracker_name", "Production"]].values.tolist()[:2]
+        assert 0 == manager.apply(RAW_TABLE, 2, "2023-01-04 12:00")
+        assert "2023-01-02" == manager.get_stored_cutoff(RAW_TABLE.table_name)
+        assert 2 == len(manager.remove_expired(RAW_TABLE, data[data["timestamp"].isin(["2023-01-01 23:45", "2023-01-02 00:00"])]))
+        assert 0 == manager.apply(RAW_TABLE, 5, "2023-01-04 12:00") and "2023-01-02" == manager.get_stored_cutoff(RAW_TABLE.table_name)
+        archived = manager.select_archived(RAW_TABLE, "2022-12-31 23:45", "2023-01-01 00:15", ["b"])
+        assert [["2022-12-31 23:45", "b", 191.0], ["2023-01-01 00:00", "b", 192.0]] == archived.values.tolist()
+        assert 2 * 96 * 3 == len(manager.select_archived(RAW_TABLE))
+        # an interrupted run is repeated, the archive is read without duplicates
+        manager._append_archive(RAW_TABLE, archived)
+        assert 2 * 96 * 3 == len(manager.select_archived(RAW_TABLE))
+        assert ["2023-01"] == db_connector.get_zone_map(RAW_TABLE.table_name)["month"].unique().tolist()
+        with pytest.raises(Exception):
+            manager.apply(DBTable("meta", pd.core.indexes.base.Index(["tracker_name"]), ["TEXT"]), 2)
+    finally:
+        tu.remove_file(db_connector.db_fullpath)
+        shutil.rmtree(archive_path, ignore_errors = True)
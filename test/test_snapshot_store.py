@@ -0,0 +1,104 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from chunk_store import ChunkStore
+from snapshot_store import SnapshotStore
+
+DB_NAME = "test_snapshot_store.db"
+SNAPSHOT_DIR = "test_snapshot_store"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+RAW_DATA = pd.DataFrame([["2023-01-31 23:45", "b", 1.0], ["2023-01-31 23:45", "a", 2.0], ["2023-02-01 00:00", "a", 3.0], ["2023-03-15 12:00", "b", 4.0]], columns = RAW_TABLE.data_columns)
+NEW_DATA = pd.DataFrame([["2023-03-20 12:00", "c", 5.0], ["2023-04-01 00:00", "a", 6.0]], columns = RAW_TABLE.data_columns)
+
+def test_refresh():
+    for connector_class in [DBConnector, ChunkStore]:
+        db_connector, snapshot_store = __create_snapshot_store(connector_class)
+        try:
+            assert ["2023-01", "2023-02", "2023-03"] == snapshot_store.refresh(RAW_TABLE.table_name)
+            assert ["2023-03"] == snapshot_store.refresh(RAW_TABLE.table_name)
+            db_connector.insert_data(RAW_TABLE, NEW_DATA)
+            assert ["2023-03", "2023-04"] == snapshot_store.refresh(RAW_TABLE.table_name)
+            # a corrected older month is rebuilt without zone map
+            corrected = RAW_DATA.iloc[[1]].copy()
+            corrected["Production"] = 7.0
+            db_connector.upsert_data(RAW_TABLE, corrected)
+            assert ["2023-01", "2023-04"] == snapshot_store.refresh(RAW_TABLE.table_name)
+            assert [7.0, 1.0] == snapshot_store.load_month(RAW_TABLE.table_name, "2023-01")["Production"].tolist()
+            assert ["2023-04"] == snapshot_store.refresh(RAW_TABLE.table_name)
+            manifest = snapshot_store.get_manifest(RAW_TABLE.table_name)
+            assert ["a", "b", "c"] == manifest["tracker_names"]
+            assert 2 == manifest["months"]["2023-03"]["row_count"]
+            january = snapshot_store.load_month(RAW_TABLE.table_name, "2023-01")
+            assert ["timestamp", "tracker_code", "Production"] == list(january.keys())
+            assert ["2023-01-31 23:45"] * 2 == list(snapshot_store.to_timestamps(january["timestamp"]))
+            assert [0, 1] == january["tracker_code"].tolist()
+            assert [7.0, 1.0] == january["Production"].tolist()
+        finally:
+            __remove_snapshot_store()
+
+def test_load():
+    db_connector, snapshot_store = __create_snapshot_store(DBConnector)
+    try:
+        snapshot_store.refresh(RAW_TABLE.table_name)
+        snapshots = snapshot_store.load(RAW_TABLE.table_name, "2023-02", columns = ["Production"])
+        assert ["2023-02", "2023-03"] == list(snapshots.keys())
+        production = snapshots["2023-03"]["Production"]
+        assert isinstance(production, np.memmap) and not production.flags.writeable
+        assert [4.0] == production.tolist()
+        with pytest.raises(Exception):
+            snapshot_store.load_month(RAW_TABLE.table_name, "2022-12")
+        with pytest.raises(Exception):
+            snapshot_store.refresh("missing_table")
+    finally:
+        __remove_snapshot_store()
+
+def test_refresh_zone_map():
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = DBConnector(tu.get_test_results_path(), DB_NAME, zone_map = True)
+    db_connector.create_table(RAW_TABLE)
+    db_connector.insert_data(RAW_TABLE, RAW_DATA)
+    snapshot_store = SnapshotStore(db_connector, os.path.join(tu.get_test_results_path(), SNAPSHOT_DIR))
+    try:
+        snapshot_store.refresh(RAW_TABLE.table_name)
+        assert ["2023-03"] == snapshot_store.refresh(RAW_TABLE.table_name)
+        db_connector.upsert_data(RAW_TABLE, pd.DataFrame([["2023-01-31 23:45", "a", 7.0]], columns = RAW_TABLE.data_columns))
+        assert ["2023-01", "2023-03"] == snapshot_store.refresh(RAW_TABLE.table_name)
+        assert [7.0, 1.0] == snapshot_store.load_month(RAW_TABLE.table_name, "2023-01")["Production"].tolist()
+    finally:
+        __remove_snapshot_store()
+
+def __create_snapshot_store(connector_class) -> tuple[DBConnector, SnapshotStore]:
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = connector_class(tu.get_test_results_path(), DB_NAME)
+    db_connector.create_table(RAW_TABLE)
+    db_connector.insert_data(RAW_TABLE, RAW_DATA)
+    return db_connector, SnapshotStore(db_connector, os.path.join(tu.get_test_results_path(), SNAPSHOT_DIR))
+
+def __remove_snapshot_store():
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    shutil.rmtree(os.path.join(tu.get_test_results_path(), SNAPSHOT_DIR), ignore_errors = True)
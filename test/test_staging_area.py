@@ -0,0 +1,80 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from chunk_store import ChunkStore
+from staging_area import StagingArea
+
+DB_NAME = "test_staging_area.db"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+MAIN_TABLE = DBTable("main_raw", pd.core.indexes.base.Index(["timestamp", "Production"]), ["DATE", "REAL"], ["timestamp"])
+STORED_DATA = pd.DataFrame([["2023-03-02 16:00", "1.1", 1.0]], columns = RAW_TABLE.data_columns)
+RAW_DATA = pd.DataFrame([["2023-03-02 16:00", "1.1", 5.0], ["2023-03-02 16:00", "1.2", 2.0], ["2023-03-02 16:15", "1.1", None], ["16:15", "1.1", 3.0], [None, "1.2", 3.0]], columns = RAW_TABLE.data_columns)
+NEW_DATA = pd.DataFrame([["2023-03-02 16:15", "1.1", 4.0], ["2023-03-02 16:00", "1.2", 9.0]], columns = RAW_TABLE.data_columns)
+MAIN_DATA = pd.DataFrame([["2023-03-02 16:00", 6.0], ["2023-03-02 16:15", 7.0]], columns = MAIN_TABLE.data_columns)
+
+def test_transfer():
+    for in_memory in [True, False]:
+        db_connector = __create_database(DBConnector)
+        try:
+            with StagingArea(db_connector, in_memory) as staging_area:
+                assert 3 == staging_area.stage(RAW_TABLE, RAW_DATA)
+                # the first row of a primary key is kept
+                assert 0 == staging_area.stage(RAW_TABLE, NEW_DATA)
+                assert 2 == staging_area.stage(MAIN_TABLE, MAIN_DATA)
+                result = staging_area.transfer()
+                assert {"transferred": 2, "duplicated": 1, "rejected": 2} == result[RAW_TABLE.table_name]
+                assert {"transferred": 2, "duplicated": 0, "rejected": 0} == result[MAIN_TABLE.table_name]
+                assert {"transferred": 0, "duplicated": 0, "rejected": 0} == staging_area.transfer()[RAW_TABLE.table_name]
+                staging_fullpath = staging_area.staging_fullpath
+            assert staging_fullpath == None or not os.path.exists(staging_fullpath)
+            stored = db_connector.select_data_unfiltered(RAW_TABLE.table_name, order_by = {"timestamp": "ASC", "tracker_name": "ASC"})
+            assert ["1.1", "1.2", "1.1"] == stored["tracker_name"].to_list()
+            assert np.array_equal([1.0, 2.0, np.nan], stored["Production"].values.astype(float), equal_nan = True)
+            assert [6.0, 7.0] == db_connector.select_data_unfiltered(MAIN_TABLE.table_name)["Production"].to_list()
+        finally:
+            tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def test_transfer_connector():
+    for connector_class, arguments in [(DBConnector, {"zone_map": True}), (ChunkStore, {})]:
+        db_connector = __create_database(connector_class, **arguments)
+        try:
+            with StagingArea(db_connector) as staging_area:
+                staging_area.stage(RAW_TABLE, NEW_DATA)
+                assert 2 == staging_area.transfer()[RAW_TABLE.table_name]["transferred"]
+            assert 3 == len(db_connector.select_data_unfiltered(RAW_TABLE.table_name))
+            with pytest.raises(Exception):
+                StagingArea(db_connector).stage(DBTable("no_key", pd.core.indexes.base.Index(["timestamp"]), ["DATE"]), MAIN_DATA[["timestamp"]])
+        finally:
+            tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+
+def __create_database(connector_class, **arguments) -> DBConnector:
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = connector_class(tu.get_test_results_path(), DB_NAME, **arguments)
+    db_connector.create_table(RAW_TABLE)
+    db_connector.create_table(MAIN_TABLE)
+    db_connector.insert_data(RAW_TABLE, STORED_DATA)
+    return db_connector
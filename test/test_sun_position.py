@@ -0,0 +1,50 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+
+import numpy as np
+
+from sun_position import get_sun_position, get_suncalc_direction, get_sun_factor
+
+def test_get_sun_position():
+    """
+    Test the sun position against the reference values of suncalc.
+    """
+    altitude, azimuth = get_sun_position(["2013-03-05 00:00"], 50.5, 30.5, "UTC")
+    assert np.allclose([-0.7000406838781611], altitude)
+    assert np.allclose([-2.5003175907168385], azimuth)
+
+def test_get_suncalc_direction():
+    """
+    Test the conversion of the direction into the suncalc format.
+    """
+    assert np.allclose(np.array([-180, -90, 0, 90, 180, 90]) * np.pi / 180, get_suncalc_direction([0, 90, 180, 270, 360, 630]))
+
+def test_get_sun_factor():
+    """
+    Test the sun factor at day and night.
+    """
+    sun_factor = get_sun_factor(["2023-06-21 13:00", "2023-06-21 23:00"], [52.37352] * 2, [7.1011] * 2, [53] * 2, [180] * 2)
+    assert sun_factor[0] > 0.5
+    assert 0 == sun_factor[1]
+
+if __name__ == "__main__":
+    test_get_sun_position()
@@ -0,0 +1,107 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import gzip
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from db_connector import DBConnector, DBTable
+from chunk_store import ChunkStore
+from table_export import TableExporter, CSV, COLUMNAR
+
+DB_NAME = "test_table_export.db"
+EXPORT_NAME = "test_table_export"
+RAW_TABLE = DBTable("tracker_raw", pd.core.indexes.base.Index(["timestamp", "tracker_name", "Production"]), ["DATE", "TEXT", "REAL"], ["timestamp", "tracker_name"])
+RAW_DATA = pd.DataFrame([["2023-03-01 23:45", "a", 1.0], ["2023-03-02 00:00", "a", None], ["2023-03-02 00:00", "b", 3.0], ["2023-03-02 16:15", "a", 0.5], ["2023-03-03 08:00", "b", 2.5]], columns = RAW_TABLE.data_columns)
+
+def test_export_csv():
+    db_connector = __create_database(DBConnector)
+    output_path = os.path.join(tu.get_test_results_path(), EXPORT_NAME)
+    try:
+        schema = TableExporter(db_connector, chunk_size = 2).export(RAW_TABLE.table_name, output_path)
+        assert len(RAW_DATA) == schema["row_count"]
+        assert [("timestamp", "DATE", "POSIXct"), ("tracker_name", "TEXT", "factor"), ("Production", "REAL", "numeric")] == [(i["name"], i["sql_type"], i["r_type"]) for i in schema["columns"]]
+        with open(output_path + TableExporter.SCHEMA_EXTENSION) as file:
+            assert schema == json.load(file)
+        with gzip.open(output_path + TableExporter.CSV_EXTENSION, "rt") as file:
+            lines = file.read().splitlines()
+        assert "timestamp,tracker_name,Production" == lines[0]
+        assert "2023-03-02 00:00,a,NA" == lines[2]
+        result = pd.read_csv(output_path + TableExporter.CSV_EXTENSION, na_values = [schema["na"]])
+        assert np.array_equal(RAW_DATA["Production"].astype(float).values, result["Production"].values, equal_nan = True)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+        tu.remove_file(output_path + TableExporter.CSV_EXTENSION)
+        tu.remove_file(output_path + TableExporter.SCHEMA_EXTENSION)
+
+def test_export_columnar():
+    for connector_class in [DBConnector, ChunkStore]:
+        db_connector = __create_database(connector_class)
+        output_path = os.path.join(tu.get_test_results_path(), EXPORT_NAME)
+        # a chunk store keeps no slot without any value
+        expected = RAW_DATA if connector_class == DBConnector else RAW_DATA.dropna().reset_index(drop = True)
+        try:
+            exporter = TableExporter(db_connector, chunk_size = 2)
+            schema = exporter.export(RAW_TABLE.table_name, output_path, COLUMNAR)
+            assert len(expected) == schema["row_count"]
+            assert ["a", "b"] == schema["columns"][1]["levels"]
+            with gzip.open(os.path.join(output_path, "timestamp" + TableExporter.COLUMN_EXTENSION), "rb") as file:
+                minutes = np.frombuffer(file.read(), dtype = "<f8")
+            assert (pd.Timestamp("2023-03-01 23:45") - pd.Timestamp("1970-01-01")).total_seconds() / 60 == minutes[0]
+            # the order of the rows depends on the store
+            result = exporter.read_columnar(output_path).sort_values(["timestamp", "tracker_name"]).reset_index(drop = True)
+            assert expected["timestamp"].to_list() == result["timestamp"].to_list()
+            assert expected["tracker_name"].to_list() == result["tracker_name"].to_list()
+            assert np.array_equal(expected["Production"].astype(float).values, result["Production"].values, equal_nan = True)
+        finally:
+            tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+            tu.remove_file(output_path + TableExporter.SCHEMA_EXTENSION)
+            shutil.rmtree(output_path, ignore_errors = True)
+
+def test_export_filtered():
+    db_connector = __create_database(DBConnector)
+    output_path = os.path.join(tu.get_test_results_path(), EXPORT_NAME)
+    try:
+        exporter = TableExporter(db_connector)
+        schema = exporter.export(RAW_TABLE.table_name, output_path, COLUMNAR, ["timestamp", "Production"], "2023-03-02 00:00", "2023-03-03 00:00", ["a"])
+        assert {"start_timestamp": "2023-03-02 00:00", "end_timestamp": "2023-03-03 00:00", "tracker_names": ["a"]} == schema["filters"]
+        result = exporter.read_columnar(output_path)
+        assert ["2023-03-02 00:00", "2023-03-02 16:15"] == result["timestamp"].to_list()
+        assert np.array_equal([np.nan, 0.5], result["Production"].values, equal_nan = True)
+        with pytest.raises(Exception):
+            exporter.export(RAW_TABLE.table_name, output_path, "parquet")
+        with pytest.raises(Exception):
+            exporter.export("missing_table", output_path)
+    finally:
+        tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+        tu.remove_file(output_path + TableExporter.SCHEMA_EXTENSION)
+        shutil.rmtree(output_path, ignore_errors = True)
+
+def __create_database(connector_class) -> DBConnector:
+    tu.remove_file(os.path.join(tu.get_test_results_path(), DB_NAME))
+    db_connector = connector_class(tu.get_test_results_path(), DB_NAME)
+    db_connector.create_table(RAW_TABLE)
+    db_connector.insert_data(RAW_TABLE, RAW_DATA)
+    return db_connector
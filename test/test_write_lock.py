@@ -0,0 +1,51 @@
+# Copyright (C) 2025, 2026 flossCoder
+#
+# This file is part of PVProject.
+#
+# PVProject is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License as published by the
+# Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# PVProject is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import test_utility as tu
+import sys
+sys.path.append(tu.get_src_path())
+import pytest
+import os
+import threading
+
+from write_lock import WriteLock
+
+LOCK_NAME = "test_write_lock.lock"
+
+def test_write_lock():
+    lock_fullpath = os.path.join(tu.get_test_results_path(), LOCK_NAME)
+    try:
+        with WriteLock(lock_fullpath):
+            with pytest.raises(Exception):
+                WriteLock(lock_fullpath, timeout = 0.1).acquire()
+        with WriteLock(lock_fullpath, timeout = 0.1):
+            pass
+    finally:
+        tu.remove_file(lock_fullpath)
+
+def test_write_lock_wait():
+    lock_fullpath = os.path.join(tu.get_test_results_path(), LOCK_NAME)
+    try:
+        lock = WriteLock(lock_fullpath)
+        lock.acquire()
+        timer = threading.Timer(0.2, lock.release)
+        timer.start()
+        with WriteLock(lock_fullpath, timeout = 5.0):
+            assert None == lock.file
+        timer.join()
+    finally:
+        tu.remove_file(lock_fullpath)